@@ -44,10 +44,29 @@ class RAGAgent(BaseAgent):
         """Create RAG chain (returns Chain, not AgentExecutor)"""
         # Load top_k from RAGConfigManager
         top_k = self._load_top_k()
+        rerank_config = self._load_rerank_config()
+        diversity_kwargs = self._load_mmr_search_kwargs()
+        
+        # 채팅 모델 정보 (답변 생성용)
+        chat_model_name = str(getattr(self.llm, 'model_name', '') or getattr(self.llm, 'model', ''))
+        packer = self._load_context_packer(chat_model_name)
         
         try:
-            retriever = self.vectorstore.as_retriever(search_kwargs={"k": top_k})
-            logger.info(f"Using base retriever with embeddings (k={top_k})")
+            if rerank_config:
+                # fetch_k개 후보를 가져와 cross-encoder로 final_k개만 남김
+                fetch_k = max(rerank_config["fetch_k"], rerank_config["final_k"])
+                retriever = self.vectorstore.as_retriever(
+                    search_kwargs={"k": fetch_k, **diversity_kwargs}, rerank=rerank_config, packer=packer
+                )
+                logger.info(
+                    f"Using reranking retriever ({rerank_config['rerank_model']}, "
+                    f"fetch_k={fetch_k}, final_k={rerank_config['final_k']})"
+                )
+            else:
+                retriever = self.vectorstore.as_retriever(
+                    search_kwargs={"k": top_k, **diversity_kwargs}, packer=packer
+                )
+                logger.info(f"Using base retriever with embeddings (k={top_k}, {diversity_kwargs or 'no MMR'})")
         except Exception as e:
             logger.error(f"Retriever creation failed: {e}")
             logger.error(f"Available vectorstore methods: {[m for m in dir(self.vectorstore) if not m.startswith('_')]}")
@@ -60,8 +79,6 @@ class RAGAgent(BaseAgent):
         from langchain.prompts import PromptTemplate
         from ui.prompts import prompt_manager
         
-        # 채팅 모델 정보 (답변 생성용)
-        chat_model_name = str(getattr(self.llm, 'model_name', '') or getattr(self.llm, 'model', ''))
         model_type = prompt_manager.get_provider_from_model(chat_model_name)
         is_perplexity = 'sonar' in chat_model_name.lower() or 'perplexity' in chat_model_name.lower()
         
@@ -173,6 +190,59 @@ class RAGAgent(BaseAgent):
             logger.warning(f"Failed to load top_k from config: {e}")
             return 10  # Default
     
+    def _load_rerank_config(self) -> Optional[Dict]:
+        """Load rerank config from RAGConfigManager (None when disabled)"""
+        try:
+            from core.rag.config.rag_config_manager import RAGConfigManager
+            rerank_config = RAGConfigManager().get_rerank_config()
+            return rerank_config if rerank_config.get("rerank_model") else None
+        except Exception as e:
+            logger.warning(f"Failed to load rerank config: {e}")
+            return None
+    
+    def _load_mmr_search_kwargs(self) -> Dict:
+        """Load MMR / adjacent-merge search_kwargs from RAGConfigManager (empty when disabled)"""
+        try:
+            from core.rag.config.rag_config_manager import RAGConfigManager
+            mmr_config = RAGConfigManager().get_mmr_config()
+        except Exception as e:
+            logger.warning(f"Failed to load MMR config: {e}")
+            return {}
+        
+        search_kwargs = {}
+        if mmr_config.get("enabled"):
+            search_kwargs.update(
+                mmr=True,
+                fetch_k=mmr_config.get("fetch_k", 20),
+                lambda_mult=mmr_config.get("lambda_mult", 0.5)
+            )
+        if mmr_config.get("merge_adjacent"):
+            search_kwargs["merge_adjacent"] = True
+        return search_kwargs
+    
+    def _load_context_packer(self, chat_model_name: str):
+        """Load token-budget context packer from RAGConfigManager (None when disabled)"""
+        try:
+            from core.rag.config.rag_config_manager import RAGConfigManager
+            from core.rag.retrieval.context_packer import ContextPacker
+            packing_config = RAGConfigManager().get_context_packing_config()
+            if not packing_config.get("enabled"):
+                return None
+            packer = ContextPacker.from_config(packing_config, chat_model_name, history_tokens=self._history_tokens)
+            logger.info(f"Context packing budget for {chat_model_name or 'default model'}: {packer.max_tokens} tokens")
+            return packer
+        except Exception as e:
+            logger.warning(f"Failed to load context packing config: {e}")
+            return None
+    
+    def _history_tokens(self) -> int:
+        """대화 메모리가 차지하는 토큰 수 추정 (컨텍스트 예산에서 차감)"""
+        from core.token_logger import TokenLogger
+        
+        chat_memory = getattr(self.memory, "chat_memory", None)
+        messages = getattr(chat_memory, "messages", None) or []
+        return sum(TokenLogger.estimate_tokens(str(getattr(message, "content", message))) for message in messages)
+    
     def _get_current_embedding_model(self) -> str:
         """현재 임베딩 모델명 반환"""
         try:
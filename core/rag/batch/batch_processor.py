@@ -1,40 +1,92 @@
 """
 Batch Processor
+
+Pipeline:
+    parse/chunk workers (N threads) -> embed stage (1 thread, cross-file batching)
+    -> writer (calling thread, owns all SQLite/LanceDB writes)
+
+The embed stage drops near-duplicate chunks (SimHash, per topic) before
+embedding. Stages are connected by bounded queues for backpressure. Files are streamed
+(pages / row groups / line blocks) and flow through the pipeline in parts of
+at most flush_chunks chunks, so peak memory does not depend on file size.
 """
 
+import inspect
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import List, Callable, Optional
+from typing import Dict, Iterator, List, Callable, Optional, Set
 from PyQt6.QtCore import QObject, pyqtSignal
 from core.logging import get_logger
+from .chunk_dedup import ChunkDeduplicator, to_signed64, to_unsigned64
+from .ingest_profiler import IngestProfiler
 
 logger = get_logger("batch_processor")
 
+# 스테이지 종료 표시
+_DONE = object()
+
 
 class BatchProcessor(QObject):
-    """배치 프로세서 (병렬 처리, Thread-safe)"""
-    
+    """배치 프로세서 (파이프라인 병렬 처리, 단일 Writer)"""
+
     # Thread-safe signals
-    progress_signal = pyqtSignal(object, int, int)  # file_path, current, total
+    progress_signal = pyqtSignal(object, int, int, object)  # file_path, current, total, stats
     complete_signal = pyqtSignal(object, str, int)  # file_path, doc_id, chunk_count
     error_signal = pyqtSignal(object, str)  # file_path, error
-    
-    def __init__(self, storage_manager, embeddings, max_workers: int = 1, chunking_strategy: Optional[str] = None):
+
+    def __init__(
+        self,
+        storage_manager,
+        embeddings,
+        max_workers: int = 4,
+        chunking_strategy: Optional[str] = None,
+        embed_batch_size: int = 64,
+        queue_size: int = 8,
+        flush_chunks: Optional[int] = None,
+        embed_wait_ms: int = 200
+    ):
         """
         Initialize batch processor
-        
+
         Args:
             storage_manager: RAGStorageManager instance
             embeddings: Embedding model
-            max_workers: Max parallel workers (FORCED to 1 for SQLite)
+            max_workers: Parse/chunk worker threads (writes are always serialized)
             chunking_strategy: Override chunking strategy (None for auto)
+            embed_batch_size: Min chunks per embedding call (small files are coalesced)
+            queue_size: Max items buffered between stages
+            flush_chunks: Max chunks per streamed part (None for streaming config)
+            embed_wait_ms: Max wait for more files before embedding a partial batch
         """
         super().__init__()
         self.storage = storage_manager
         self.embeddings = embeddings
         self.chunking_strategy = chunking_strategy
-        self.max_workers = 1  # SQLite 안정성을 위해 강제 순차 처리
-        logger.info(f"Batch processor: sequential mode (workers=1), strategy={chunking_strategy or 'auto'}")
-    
+        self.max_workers = max(1, max_workers or 1)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.embed_wait_seconds = max(0, embed_wait_ms) / 1000
+        self.queue_size = max(1, queue_size)
+        self._streaming = self._load_streaming_config()
+        self.flush_chunks = max(1, flush_chunks or self._streaming["flush_chunks"])
+        self._embed_progress_supported = self._supports_kwarg(embeddings, "progress_callback")
+        self._embed_progress: Optional[Callable] = None
+        self._embedded_chunks = 0
+        self._queued_chunks = 0
+        self.profiler = IngestProfiler()
+        self.last_profile: Optional[dict] = None
+        self._dedup_config = self._load_dedup_config()
+        self.deduplicator: Optional[ChunkDeduplicator] = None
+        self._dedup_next_index: Dict[Path, int] = {}
+        self._doc_ids: Dict[Path, str] = {}
+        self._stored_files: Set[Path] = set()  # 모든 part 저장이 끝난 파일 (다른 파일의 원본 청크 후보)
+        self._vector_dimension = 0
+        logger.info(
+            f"Batch processor: pipeline mode (parse workers={self.max_workers}, "
+            f"embed batch={self.embed_batch_size}), strategy={chunking_strategy or 'auto'}"
+        )
+
     def process_files(
         self,
         files: List[Path],
@@ -42,194 +94,708 @@ class BatchProcessor(QObject):
         on_progress: Optional[Callable] = None,
         on_complete: Optional[Callable] = None,
         on_error: Optional[Callable] = None,
-        check_cancel: Optional[Callable] = None
+        check_cancel: Optional[Callable] = None,
+        fingerprints: Optional[Dict[Path, dict]] = None,
+        on_embed_progress: Optional[Callable] = None
     ):
         """
-        Process files in parallel (Thread-safe)
-        
+        Process files through the ingestion pipeline
+
         Args:
             files: List of file paths
             topic_id: Topic ID
-            on_progress: Progress callback (file_path, current, total)
+            on_progress: Progress callback (file_path, current, total[, stats]);
+                stats is {"file": per-file stage profile, "batch": IngestProfiler.summary()}
             on_complete: Complete callback (file_path, doc_id, chunk_count)
             on_error: Error callback (file_path, error)
             check_cancel: Cancel check callback
-        
+            fingerprints: Per-file fingerprint for incremental sync
+                {file_path: {file_path, file_size, mtime, content_hash, replaces}}
+            on_embed_progress: Embedding progress callback (embedded_chunks, queued_chunks),
+                called from the embedding thread (keep it thread-safe and cheap)
+
         Note:
-            Callbacks are invoked via Qt signals for thread safety
+            Callbacks are invoked via Qt signals for thread safety.
+            All storage writes happen on the calling thread.
+            Replaced documents and fingerprints are committed only after the
+            whole batch succeeds, so a cancelled sync keeps the old chunks.
         """
         # Connect callbacks to signals
-        if on_progress:
-            self.progress_signal.connect(on_progress)
+        progress_slot = self._progress_slot(on_progress) if on_progress else None
+        if progress_slot:
+            self.progress_signal.connect(progress_slot)
         if on_complete:
             self.complete_signal.connect(on_complete)
         if on_error:
             self.error_signal.connect(on_error)
+
         total = len(files)
-        logger.info(f"Processing {total} files sequentially (SQLite safe mode)")
+        logger.info(f"Processing {total} files (pipeline, {self.max_workers} parse workers)")
+        self._embed_progress = on_embed_progress
+        self._embedded_chunks = 0
+        self._queued_chunks = 0
+        self.profiler = IngestProfiler()
+        # 교체될 문서는 시드에서 제외 (변경 파일의 그대로인 청크가 곧 삭제될 원본에 링크되지 않도록)
+        replaced_doc_ids = {fp["replaces"] for fp in (fingerprints or {}).values() if fp.get("replaces")}
+        self.deduplicator = self._create_deduplicator(topic_id, exclude_doc_ids=replaced_doc_ids)
+        self._dedup_next_index = {}
+        self._doc_ids = {}
+        self._stored_files = set()
+
+        stop_event = threading.Event()
+
+        def is_cancelled() -> bool:
+            if stop_event.is_set():
+                return True
+            if check_cancel and check_cancel():
+                stop_event.set()
+                return True
+            return False
+
+        file_queue: "queue.Queue" = queue.Queue()
+        for file_path in files:
+            file_queue.put(file_path)
+
+        num_workers = min(self.max_workers, total) if total else 1
+        parsed_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        embedded_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+
+        workers = [
+            threading.Thread(
+                target=self._parse_worker,
+                args=(file_queue, parsed_queue, stop_event, is_cancelled),
+                name=f"rag-parse-{i}",
+                daemon=True
+            )
+            for i in range(num_workers)
+        ]
+        embedder = threading.Thread(
+            target=self._embed_worker,
+            args=(parsed_queue, embedded_queue, num_workers, stop_event, is_cancelled),
+            name="rag-embed",
+            daemon=True
+        )
+        for worker in workers:
+            worker.start()
+        embedder.start()
+
         processed_docs = []
+        written = []  # (file_path, doc_id)
+        open_docs = {}  # file_path -> {doc_id, chunk_count} (부분 저장 중인 문서)
+        failed = set()
         completed = 0
-        
-        # Sequential processing (no ThreadPoolExecutor)
-        for file_path in files:
-            # Check cancel
-            if check_cancel and check_cancel():
-                logger.warning(f"Processing cancelled at {completed}/{total}")
-                # Rollback
-                for doc_id in processed_docs:
-                    try:
-                        self.storage.delete_document(doc_id)
-                        logger.info(f"Rolled back: {doc_id}")
-                    except Exception as e:
-                        logger.error(f"Rollback failed for {doc_id}: {e}")
-                return
-            
-            try:
-                result = self._process_file(file_path, topic_id, check_cancel)
-                if result:
-                    processed_docs.append(result['doc_id'])
+
+        try:
+            # Writer: 호출 스레드가 모든 SQLite/LanceDB 쓰기를 담당
+            while True:
+                item = self._get(embedded_queue, stop_event)
+                if item is _DONE or item is None:
+                    break
+
+                if is_cancelled():
+                    continue  # 상위 스테이지 종료까지 큐 비우기
+
+                file_path = item["file_path"]
+                if file_path in failed:
+                    continue  # 실패한 파일의 남은 part 무시
+
+                if item.get("error"):
+                    failed.add(file_path)
+                    self.profiler.finish_file(file_path, status="failed")
+                    self._discard_partial(open_docs.pop(file_path, None), processed_docs)
+                    self._report_error(file_path, item["error"], on_error)
+                    continue
+
+                try:
+                    if file_path not in open_docs:
+                        open_docs[file_path] = {
+                            "doc_id": self._create_document(item, topic_id),
+                            "chunk_count": 0
+                        }
+                        processed_docs.append(open_docs[file_path]["doc_id"])
+                        self._doc_ids[file_path] = open_docs[file_path]["doc_id"]
+
+                    result = self._write_part(item, open_docs[file_path], topic_id)
+                    if not item["final"]:
+                        continue
+
+                    del open_docs[file_path]
+                    self._stored_files.add(file_path)
+                    written.append((file_path, result['doc_id']))
                     completed += 1
-                    
+                    file_profile = self.profiler.finish_file(file_path)
+                    logged_profile = file_profile or {}
+                    logger.info(
+                        f"Processed {file_path.name}: {result['chunk_count']} chunks "
+                        f"({logged_profile.get('seconds', 0):.2f}s, stages={logged_profile.get('stages')})"
+                    )
+
                     # Thread-safe: Signal 사용
                     if on_progress:
-                        self.progress_signal.emit(file_path, completed, total)
-                    
+                        stats = {"file": file_profile, "batch": self._batch_summary()}
+                        self.progress_signal.emit(file_path, completed, total, stats)
+
                     if on_complete:
                         self.complete_signal.emit(file_path, result['doc_id'], result['chunk_count'])
-            
-            except Exception as e:
-                error_msg = str(e)
-                logger.error(f"Failed to process {file_path}: {error_msg}")
-                
-                # DB 손상 오류 처리
-                if "database disk image is malformed" in error_msg or "database is locked" in error_msg:
-                    logger.warning(f"Database error detected, skipping file: {file_path.name}")
-                
-                # Thread-safe: Signal 사용
-                if on_error:
-                    self.error_signal.emit(file_path, error_msg)
-        
-        logger.info(f"Batch processing completed: {completed}/{total} files")
-        
-        # Disconnect signals
-        if on_progress:
-            self.progress_signal.disconnect(on_progress)
-        if on_complete:
-            self.complete_signal.disconnect(on_complete)
-        if on_error:
-            self.error_signal.disconnect(on_error)
-    
-    def _process_file(self, file_path: Path, topic_id: str, check_cancel: Optional[Callable] = None) -> dict:
-        """Process single file with cancellation support"""
-        from core.rag.chunking.chunking_factory import ChunkingFactory
+
+                except Exception as e:
+                    failed.add(file_path)
+                    self.profiler.finish_file(file_path, status="failed")
+                    self._discard_partial(open_docs.pop(file_path, None), processed_docs)
+                    self._report_error(file_path, str(e), on_error)
+        finally:
+            stop_requested = stop_event.is_set()
+            stop_event.set()
+            for worker in workers:
+                worker.join()
+            embedder.join()
+
+            if stop_requested:
+                logger.warning(f"Processing cancelled at {completed}/{total}")
+                # Rollback (일괄 삭제)
+                if processed_docs:
+                    try:
+                        rolled_back = self.storage.delete_documents(processed_docs)
+                        logger.info(f"Rolled back {rolled_back}/{len(processed_docs)} documents")
+                    except Exception as e:
+                        logger.error(f"Rollback failed: {e}")
+            else:
+                logger.info(f"Batch processing completed: {completed}/{total} files")
+                if fingerprints:
+                    self._commit_fingerprints(written, fingerprints, topic_id)
+                if completed and hasattr(self.storage, "schedule_index_maintenance"):
+                    # 대량 적재 후 ANN 인덱스 생성/증분 갱신 (백그라운드)
+                    self.storage.schedule_index_maintenance()
+
+            self.last_profile = self._batch_summary()
+            logger.info(
+                f"Ingest profile: {self.last_profile['chunks']} chunks, "
+                f"{self.last_profile['chunks_per_second']} chunks/s, "
+                f"slowest stage={self.last_profile['slowest_stage']}, stages={self.last_profile['stage_seconds']}"
+            )
+            if self.last_profile.get("dedup"):
+                logger.info(f"Chunk dedup: {self.last_profile['dedup']}")
+            self.profiler.save_run(
+                topic_id,
+                status="cancelled" if stop_requested else "completed",
+                extra={"dedup": self.last_profile.get("dedup")}
+            )
+
+            # Disconnect signals
+            if progress_slot:
+                self.progress_signal.disconnect(progress_slot)
+            if on_complete:
+                self.complete_signal.disconnect(on_complete)
+            if on_error:
+                self.error_signal.disconnect(on_error)
+
+    # ========== Pipeline Stages ==========
+
+    def _parse_worker(self, file_queue, parsed_queue, stop_event, is_cancelled):
+        """Stage 1: 파일 로드 + 청킹"""
+        try:
+            while not is_cancelled():
+                try:
+                    file_path = file_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if not self._stream_file(file_path, parsed_queue, stop_event, is_cancelled):
+                    break
+        finally:
+            self._put(parsed_queue, _DONE, stop_event)
+
+    def _embed_worker(self, parsed_queue, embedded_queue, num_workers, stop_event, is_cancelled):
+        """Stage 2: 여러 파일의 청크를 모아 일괄 임베딩"""
+        finished_workers = 0
+        pending = []
+        pending_chunks = 0
+        flush_deadline = 0.0
+
+        try:
+            while finished_workers < num_workers and not is_cancelled():
+                # 파싱이 임베딩보다 느리면 큐가 잠깐 비는 것이 정상: 배치가 차거나 대기 시간이 지날 때까지 수집
+                timeout = max(0.0, flush_deadline - time.monotonic()) if pending else 0.1
+                try:
+                    item = parsed_queue.get(timeout=timeout)
+                except queue.Empty:
+                    if pending and time.monotonic() >= flush_deadline:
+                        if not self._flush_embeddings(pending, embedded_queue, stop_event, is_cancelled):
+                            return
+                        pending, pending_chunks = [], 0
+                    continue
+
+                if item is _DONE:
+                    finished_workers += 1
+                    continue
+
+                if item.get("error"):
+                    if not self._put(embedded_queue, item, stop_event):
+                        return
+                    continue
+
+                self._dedup(item)
+                if not pending:
+                    flush_deadline = time.monotonic() + self.embed_wait_seconds
+                pending.append(item)
+                pending_chunks += len(item["chunks"])
+                if pending_chunks >= self.embed_batch_size:
+                    if not self._flush_embeddings(pending, embedded_queue, stop_event, is_cancelled):
+                        return
+                    pending, pending_chunks = [], 0
+
+            if pending and not is_cancelled():
+                self._flush_embeddings(pending, embedded_queue, stop_event, is_cancelled)
+        except Exception as e:
+            logger.error(f"Embedding stage failed: {e}", exc_info=True)
+            for item in pending:
+                item["error"] = str(e)
+                self._put(embedded_queue, item, stop_event)
+        finally:
+            self._put(embedded_queue, _DONE, stop_event)
+
+    def _flush_embeddings(self, items, embedded_queue, stop_event, is_cancelled) -> bool:
+        """대기 중인 파일들을 한 번의 embed_documents 호출로 임베딩 (청커가 계산한 벡터는 재사용)"""
+        texts = []
+        for item in items:
+            known = item.get("known_vectors") or [None] * len(item["chunks"])
+            texts.extend(c.page_content for c, vector in zip(item["chunks"], known) if vector is None)
+        reused = sum(len(item["chunks"]) for item in items) - len(texts)
+        logger.debug(f"Embedding {len(texts)} chunks from {len(items)} files ({reused} reused from chunker)")
+
+        base = self._embedded_chunks
+        self._queued_chunks += len(texts)
+        kwargs = {"check_cancel": is_cancelled}
+        if self._embed_progress and self._embed_progress_supported:
+            kwargs["progress_callback"] = lambda done, _total: self._report_embed_progress(base + done)
+
+        embedded_counts = {}
+        for item in items:
+            known = item.get("known_vectors") or [None] * len(item["chunks"])
+            embedded_counts[item["file_path"]] = (
+                embedded_counts.get(item["file_path"], 0) + sum(1 for vector in known if vector is None)
+            )
+
+        try:
+            started = time.perf_counter()
+            vectors = self.embeddings.embed_documents(texts, **kwargs) if texts else []
+            self.profiler.add_shared("embed", time.perf_counter() - started, embedded_counts)
+            if len(vectors):
+                self._vector_dimension = len(vectors[0])
+            self._report_embed_progress(base + len(texts))
+        except Exception as e:
+            logger.error(f"Embedding failed: {e}")
+            for item in items:
+                item["error"] = f"Embedding failed: {e}"
+                if not self._put(embedded_queue, item, stop_event):
+                    return False
+            return True
+
+        if is_cancelled():
+            logger.info("Embedding cancelled by user")
+            return False
+
+        new_vectors = iter(vectors)
+        for item in items:
+            known = item.pop("known_vectors", None) or [None] * len(item["chunks"])
+            item["vectors"] = [vector if vector is not None else next(new_vectors) for vector in known]
+            if not self._put(embedded_queue, item, stop_event):
+                return False
+        return True
+
+    def _stream_file(self, file_path: Path, parsed_queue, stop_event, is_cancelled: Callable) -> bool:
+        """파일 part를 다음 스테이지로 전달 (취소/중단 시 False)"""
+        try:
+            for item in self._iter_file_parts(file_path, is_cancelled):
+                if not self._put(parsed_queue, item, stop_event):
+                    return False
+        except Exception as e:
+            return self._put(parsed_queue, {"file_path": file_path, "error": str(e)}, stop_event)
+        return not is_cancelled()
+
+    def _iter_file_parts(self, file_path: Path, is_cancelled: Callable) -> Iterator[dict]:
+        """
+        Stream-load and chunk a file into bounded parts (no storage writes)
+
+        Args:
+            file_path: File path
+            is_cancelled: Cancel check
+
+        Yields:
+            Part dicts with up to flush_chunks chunks; the last one has final=True
+        """
         from core.rag.loaders.document_loader_factory import DocumentLoaderFactory
-        
+
         # 취소 확인
-        if check_cancel and check_cancel():
+        if is_cancelled():
             logger.info(f"File processing cancelled: {file_path.name}")
-            return None
-        
-        # 파일 읽기 (DocumentLoaderFactory 사용)
-        docs = DocumentLoaderFactory.load_document(str(file_path))
-        if not docs:
+            return
+
+        chunker = self._create_chunker(file_path)
+        logger.info(f"Selected chunker: {chunker.name} for {file_path.name}")
+
+        # 페이지/행 묶음/줄 묶음 단위로 읽으며 청킹 (전체 텍스트를 결합하지 않음)
+        # load / chunk 시간은 이터레이터 소비 시간으로 분리 측정
+        profiler = self.profiler
+        chunks = profiler.timed_iter(file_path, "chunk", chunker.chunk_stream(
+            profiler.timed_iter(file_path, "load", DocumentLoaderFactory.iter_raw_document(str(file_path))),
+            metadata={"source": file_path.name},
+            buffer_chars=self._streaming["block_chars"]
+        ))
+
+        part = {
+            "file_path": file_path,
+            "strategy": chunker.name,
+            "file_type": file_path.suffix.lstrip('.').lower(),
+            "file_size": file_path.stat().st_size
+        }
+        profiler.add(file_path, "load", 0.0, file_bytes=part["file_size"])
+        pending = []
+        total = 0
+        for chunk in chunks:
+            pending.append(chunk)
+            if len(pending) >= self.flush_chunks:
+                # 취소 확인
+                if is_cancelled():
+                    logger.info(f"File processing cancelled while loading: {file_path.name}")
+                    return
+                total += len(pending)
+                profiler.add(file_path, "chunk", 0.0, chunks=len(pending))
+                yield {**part, "chunks": pending, "known_vectors": chunker.pop_chunk_vectors(pending), "final": False}
+                pending = []
+
+        total += len(pending)
+        profiler.add(file_path, "chunk", 0.0, chunks=len(pending))
+        if total == 0:
             raise ValueError(f"Failed to load document: {file_path}")
-        
-        # 취소 확인
-        if check_cancel and check_cancel():
+        if is_cancelled():
             logger.info(f"File processing cancelled after loading: {file_path.name}")
-            return None
-        
-        # 모든 페이지/문서의 텍스트 결합
-        text = "\n\n".join([doc.page_content for doc in docs])
-        
-        # 문서 생성
+            return
+        yield {**part, "chunks": pending, "known_vectors": chunker.pop_chunk_vectors(pending), "final": True}
+
+    def _create_chunker(self, file_path: Path):
+        """파일별 청킹 전략 선택"""
+        from core.rag.chunking.chunking_factory import ChunkingFactory
+
+        if self.chunking_strategy:
+            logger.info(f"Using manual strategy: {self.chunking_strategy} for {file_path.name}")
+            # Code strategy needs language parameter
+            if self.chunking_strategy == "code":
+                ext = file_path.suffix.lstrip('.').lower()
+                logger.info(f"Creating code chunker with language: {ext}")
+                return ChunkingFactory.create(self.chunking_strategy, language=ext)
+            elif self.chunking_strategy == "semantic":
+                logger.info(f"Creating semantic chunker")
+                return ChunkingFactory.create(self.chunking_strategy, embeddings=self.embeddings)
+            else:
+                logger.info(f"Creating {self.chunking_strategy} chunker")
+                return ChunkingFactory.create(self.chunking_strategy)
+
+        logger.info(f"Using auto strategy for {file_path.name}")
+        return ChunkingFactory.get_strategy_for_file(file_path.name)
+
+    def _create_document(self, item: dict, topic_id: str) -> str:
+        """Stage 3: 파일의 첫 part 도착 시 SQLite 문서 생성 (Writer 스레드 전용)"""
+        file_path = item["file_path"]
+        started = time.perf_counter()
         doc_id = self.storage.create_document(
             topic_id=topic_id,
             filename=file_path.name,
             file_path=str(file_path),
-            file_type=file_path.suffix.lstrip('.').lower(),
-            file_size=file_path.stat().st_size
+            file_type=item["file_type"],
+            file_size=item["file_size"]
         )
-        
-        try:
-            # 취소 확인
-            if check_cancel and check_cancel():
-                logger.info(f"File processing cancelled before chunking: {file_path.name}")
-                self.storage.delete_document(doc_id)  # 생성된 문서 삭제
-                return None
-            
-            # 청킹
-            if self.chunking_strategy:
-                logger.info(f"Using manual strategy: {self.chunking_strategy} for {file_path.name}")
-                # Code strategy needs language parameter
-                if self.chunking_strategy == "code":
-                    ext = file_path.suffix.lstrip('.').lower()
-                    logger.info(f"Creating code chunker with language: {ext}")
-                    chunker = ChunkingFactory.create(self.chunking_strategy, language=ext)
-                elif self.chunking_strategy == "semantic":
-                    logger.info(f"Creating semantic chunker")
-                    chunker = ChunkingFactory.create(self.chunking_strategy, embeddings=self.embeddings)
-                else:
-                    logger.info(f"Creating {self.chunking_strategy} chunker")
-                    chunker = ChunkingFactory.create(self.chunking_strategy)
-            else:
-                logger.info(f"Using auto strategy for {file_path.name}")
-                chunker = ChunkingFactory.get_strategy_for_file(file_path.name)
-            
-            logger.info(f"Selected chunker: {chunker.name} for {file_path.name}")
-            chunks = chunker.chunk(text, metadata={"source": file_path.name})
-            
-            # 취소 확인
-            if check_cancel and check_cancel():
-                logger.info(f"File processing cancelled before embedding: {file_path.name}")
-                self.storage.delete_document(doc_id)
-                return None
-            
-            # 임베딩 (취소 확인 전달)
-            texts = [c.page_content for c in chunks]
-            logger.debug(f"Embedding {len(texts)} chunks for {file_path.name}")
-            vectors = self.embeddings.embed_documents(texts, check_cancel=check_cancel)
-            logger.debug(f"Embedding completed for {file_path.name}")
-            
-            # 취소 확인
-            if check_cancel and check_cancel():
-                logger.info(f"File processing cancelled before storage: {file_path.name}")
-                self.storage.delete_document(doc_id)
-                return None
-            
-            # 저장 (청킹 전략 포함)
+        self.profiler.add(file_path, "sqlite", time.perf_counter() - started)
+        return doc_id
+
+    def _dedup(self, item: dict):
+        """
+        Stage 2 (embed thread): drop near-duplicate chunks before embedding
+
+        Kept chunks get the chunk_index they will be stored with (indexes are
+        contiguous over kept chunks), so later duplicates can point at them.
+        Duplicates are replaced by canonical keys in item["links"].
+
+        A chunk of another file in this batch only counts as canonical once
+        that file is fully stored; a file that fails later would otherwise take
+        the only copy of its duplicates with it. Chunks of the same file share
+        its fate and always count.
+        """
+        dedup = self.deduplicator
+        if dedup is None:
+            return
+
+        started = time.perf_counter()
+        file_path = item["file_path"]
+        chunks = item["chunks"]
+        known = item.get("known_vectors") or [None] * len(chunks)
+        next_index = self._dedup_next_index.get(file_path, 0)
+        stored_files = self._stored_files
+
+        def accept(key) -> bool:
+            return key[0] == "doc" or key[1] == file_path or key[1] in stored_files
+
+        kept, kept_vectors, fingerprints, links = [], [], [], []
+        for chunk, vector in zip(chunks, known):
+            fingerprint = dedup.fingerprint(chunk.page_content)
+            canonical = dedup.check(chunk.page_content, fingerprint, ("file", file_path, next_index), accept)
+            if canonical is not None:
+                links.append(canonical)
+                continue
+            kept.append(chunk)
+            kept_vectors.append(vector)
+            fingerprints.append(fingerprint)
+            next_index += 1
+
+        self._dedup_next_index[file_path] = next_index
+        item["chunks"] = kept
+        item["known_vectors"] = kept_vectors if item.get("known_vectors") else None
+        item["fingerprints"] = fingerprints
+        item["links"] = links
+        self.profiler.add(file_path, "dedup", time.perf_counter() - started)
+        if links:
+            logger.debug(f"Dedup {file_path.name}: {len(links)}/{len(chunks)} near-duplicate chunks")
+
+    def _write_part(self, item: dict, state: dict, topic_id: str) -> dict:
+        """Stage 3: part 청크를 LanceDB에 추가, 마지막 part에서 문서 메타데이터 확정 (Writer 스레드 전용)"""
+        file_path = item["file_path"]
+        chunks = item["chunks"]
+        strategy = item["strategy"]
+        doc_id = state["doc_id"]
+        start_index = state["chunk_count"]
+
+        # 저장 (청킹 전략 포함, 이전 part에 이어서 chunk_index 부여)
+        if chunks:
             logger.debug(f"Storing {len(chunks)} chunks to LanceDB for {file_path.name}")
+            started = time.perf_counter()
             chunk_ids = self.storage.add_chunks(
                 doc_id=doc_id,
                 chunks=chunks,
-                embeddings=vectors,
-                chunking_strategy=chunker.name
+                embeddings=item["vectors"],
+                chunking_strategy=strategy,
+                start_index=start_index
             )
-            logger.debug(f"Storage completed for {file_path.name} with strategy: {chunker.name}")
-            
+            state["chunk_count"] += len(chunk_ids)
+            self.profiler.add(file_path, "write", time.perf_counter() - started)
+
+        if item.get("fingerprints") or item.get("links"):
+            started = time.perf_counter()
+            self._record_dedup(item, doc_id, topic_id, start_index)
+            self.profiler.add(file_path, "sqlite", time.perf_counter() - started)
+
+        if item["final"]:
             # 문서 메타데이터에도 청킹 전략 업데이트
+            started = time.perf_counter()
             self.storage.topic_db.conn.execute(
                 "UPDATE documents SET chunking_strategy = ? WHERE id = ?",
-                (chunker.name, doc_id)
+                (strategy, doc_id)
             )
             self.storage.topic_db.conn.commit()
-            logger.debug(f"Updated document chunking_strategy to: {chunker.name}")
-            
-            logger.info(f"Processed {file_path.name}: {len(chunk_ids)} chunks")
-            
-            return {
-                'doc_id': doc_id,
-                'chunk_count': len(chunk_ids),
-                'strategy': chunker.name
-            }
+            self.profiler.add(file_path, "sqlite", time.perf_counter() - started)
+            logger.debug(f"Updated document chunking_strategy to: {strategy}")
+
+        return {
+            'doc_id': doc_id,
+            'chunk_count': state["chunk_count"],
+            'strategy': strategy
+        }
+
+    def _record_dedup(self, item: dict, doc_id: str, topic_id: str, start_index: int):
+        """저장된 청크 지문과 (link 모드) 중복 청크 링크 기록 (Writer 스레드 전용)"""
+        rows = [
+            (start_index + offset, to_signed64(fingerprint))
+            for offset, fingerprint in enumerate(item.get("fingerprints") or [])
+            if fingerprint is not None
+        ]
+        self.storage.record_chunk_fingerprints(topic_id, doc_id, rows)
+
+        if self.deduplicator.mode != "link":
+            return
+        links = []
+        for kind, owner, chunk_index in item.get("links") or []:
+            # 같은 배치의 원본(자기 자신 또는 저장 완료된 파일)은 파일 경로 → 문서 ID로 변환
+            canonical_id = owner if kind == "doc" else self._doc_ids[owner]
+            links.append((canonical_id, chunk_index))
+        self.storage.record_chunk_links(topic_id, doc_id, links)
+
+    def _discard_partial(self, state: Optional[dict], processed_docs: list):
+        """오류 발생 시 부분 저장된 문서 삭제"""
+        if state is None:
+            return
+        # 저장 완료 전 파일은 다른 파일의 원본이 될 수 없으므로 이 문서를 가리키는 링크는 없음
+        for file_path, doc_id in list(self._doc_ids.items()):
+            if doc_id == state["doc_id"]:
+                del self._doc_ids[file_path]
+        doc_id = state["doc_id"]
+        if doc_id in processed_docs:
+            processed_docs.remove(doc_id)
+        try:
+            self.storage.delete_document(doc_id)
+            logger.info(f"Cleaned up document after error: {doc_id}")
+        except Exception as cleanup_error:
+            # DB 오류는 무시
+            if "database" not in str(cleanup_error).lower():
+                logger.error(f"Failed to cleanup document {doc_id}: {cleanup_error}")
+
+    def _commit_fingerprints(self, written: list, fingerprints: Dict[Path, dict], topic_id: str):
+        """새 문서 지문 저장 후 이전 버전 문서 일괄 삭제 (증분 동기화)"""
+        replaced = []
+        for file_path, doc_id in written:
+            fingerprint = fingerprints.get(file_path)
+            if not fingerprint:
+                continue
+            try:
+                self.storage.record_file_fingerprint(
+                    topic_id,
+                    fingerprint["file_path"],
+                    fingerprint["file_size"],
+                    fingerprint["mtime"],
+                    fingerprint["content_hash"],
+                    doc_id
+                )
+                old_doc_id = fingerprint.get("replaces")
+                if old_doc_id and old_doc_id != doc_id:
+                    replaced.append(old_doc_id)
+            except Exception as e:
+                logger.error(f"Failed to commit fingerprint for {file_path}: {e}")
+
+        if replaced:
+            removed = self.storage.delete_documents(replaced)
+            logger.info(f"Replaced {removed} changed documents")
+
+    # ========== Helpers ==========
+
+    @staticmethod
+    def _load_dedup_config() -> dict:
+        """근접 중복 제거 설정 (enabled, mode, max_hamming_distance, min_chars)"""
+        from core.rag.config.rag_config_manager import RAGConfigManager
+        try:
+            return RAGConfigManager().get_dedup_config()
+        except Exception as e:
+            logger.warning(f"Failed to load dedup config: {e}")
+            return dict(RAGConfigManager.DEFAULT_CONFIG["dedup"])
+
+    def _create_deduplicator(
+        self, topic_id: str, exclude_doc_ids: Optional[Set[str]] = None
+    ) -> Optional[ChunkDeduplicator]:
+        """
+        토픽의 기존 청크 지문으로 중복 인덱스 구성 (비활성/미지원 저장소면 None)
         
+        Args:
+            topic_id: Topic ID
+            exclude_doc_ids: Documents replaced by this batch (never used as canonical chunks)
+        """
+        if not self._dedup_config.get("enabled") or not hasattr(self.storage, "get_chunk_fingerprints"):
+            return None
+        dedup = ChunkDeduplicator.from_config(self._dedup_config)
+        try:
+            known = self.storage.get_chunk_fingerprints(topic_id, exclude_doc_ids=exclude_doc_ids)
         except Exception as e:
-            # 오류 발생 시 문서 삭제
+            logger.warning(f"Chunk fingerprints unavailable, dedup within batch only: {e}")
+            known = []
+        for simhash, doc_id, chunk_index in known:
+            dedup.add(to_unsigned64(simhash), ("doc", doc_id, chunk_index))
+        logger.info(
+            f"Chunk dedup enabled (mode={dedup.mode}, distance<={dedup.max_distance}, "
+            f"{len(known)} known chunks in topic)"
+        )
+        return dedup
+
+    def _batch_summary(self) -> dict:
+        """프로파일 요약 + 중복 제거로 절약한 임베딩/저장 용량"""
+        summary = self.profiler.summary()
+        if self.deduplicator is None:
+            return summary
+
+        stats = self.deduplicator.stats
+        vector_bytes = self._vector_dimension * 4
+        try:
+            vector_bytes = self.storage.vector_store.vector_codec.bytes_per_vector(self._vector_dimension)
+        except Exception:
+            pass
+        summary["dedup"] = {
+            "mode": self.deduplicator.mode,
+            "checked_chunks": stats["checked"],
+            "duplicate_chunks": stats["duplicates"],
+            "saved_embeddings": stats["duplicates"],
+            "saved_bytes": stats["saved_text_bytes"] + stats["duplicates"] * vector_bytes
+        }
+        return summary
+
+    @staticmethod
+    def _load_streaming_config() -> dict:
+        """스트리밍 적재 설정 (block_chars, flush_chunks)"""
+        from core.rag.config.rag_config_manager import RAGConfigManager
+        try:
+            return RAGConfigManager().get_streaming_config()
+        except Exception as e:
+            logger.warning(f"Failed to load streaming config: {e}")
+            return dict(RAGConfigManager.DEFAULT_CONFIG["streaming"])
+
+    def _report_embed_progress(self, embedded: int):
+        """임베딩 진행률 전달 (임베딩 스레드에서 호출)"""
+        self._embedded_chunks = embedded
+        if self._embed_progress:
+            try:
+                self._embed_progress(embedded, self._queued_chunks)
+            except Exception as e:
+                logger.debug(f"Embed progress callback failed: {e}")
+
+    @staticmethod
+    def _progress_slot(callback: Callable) -> Callable:
+        """3인자 progress 콜백 (file_path, current, total)도 연결되도록 stats 인자 흡수"""
+        try:
+            inspect.signature(callback).bind(None, 0, 0, None)
+            return callback
+        except TypeError:
+            return lambda file_path, current, total, stats: callback(file_path, current, total)
+        except ValueError:
+            return callback
+
+    @staticmethod
+    def _supports_kwarg(embeddings, name: str) -> bool:
+        """embed_documents가 키워드 인자를 지원하는지 확인"""
+        try:
+            return name in inspect.signature(embeddings.embed_documents).parameters
+        except (TypeError, ValueError, AttributeError):
+            return False
+
+    def _report_error(self, file_path: Path, error_msg: str, on_error: Optional[Callable]):
+        """파일 오류 기록 및 시그널 전송"""
+        logger.error(f"Failed to process {file_path}: {error_msg}")
+
+        # DB 손상 오류 처리
+        if "database disk image is malformed" in error_msg or "database is locked" in error_msg:
+            logger.warning(f"Database error detected, skipping file: {Path(file_path).name}")
+
+        # Thread-safe: Signal 사용
+        if on_error:
+            self.error_signal.emit(file_path, error_msg)
+
+    @staticmethod
+    def _put(q: "queue.Queue", item, stop_event: threading.Event) -> bool:
+        """Bounded put (취소 시 포기, 종료 표시는 항상 전달 시도)"""
+        while True:
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if stop_event.is_set():
+                    if item is _DONE:
+                        # 하위 스테이지가 큐를 비우는 중이면 자리가 생김
+                        try:
+                            q.get_nowait()
+                        except queue.Empty:
+                            pass
+                        continue
+                    return False
+
+    @staticmethod
+    def _get(q: "queue.Queue", stop_event: threading.Event):
+        """Blocking get that still observes the stop flag"""
+        while True:
             try:
-                self.storage.delete_document(doc_id)
-                logger.info(f"Cleaned up document after error: {doc_id}")
-            except Exception as cleanup_error:
-                # DB 오류는 무시
-                if "database" not in str(cleanup_error).lower():
-                    logger.error(f"Failed to cleanup document {doc_id}: {cleanup_error}")
-            raise e
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if stop_event.is_set():
+                    return None
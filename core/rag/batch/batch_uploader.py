@@ -4,7 +4,7 @@ Batch Uploader
 """
 
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from core.logging import get_logger
 from .file_scanner import FileScanner
 from .batch_processor import BatchProcessor
@@ -36,42 +36,69 @@ class BatchUploader:
             storage_manager,
             embeddings,
             max_workers=config.get('max_workers', 4),
-            chunking_strategy=config.get('chunking_strategy')
+            chunking_strategy=config.get('chunking_strategy'),
+            embed_batch_size=config.get('embed_batch_size', 64),
+            embed_wait_ms=config.get('embed_wait_ms', 200),
+            queue_size=config.get('queue_size', 8)
         )
         
+        self.incremental = config.get('incremental', True)
         self.tracker = ProgressTracker()
-        logger.info("Batch uploader initialized")
+        logger.info(f"Batch uploader initialized (incremental={self.incremental})")
     
     def upload_folder(
         self,
         folder_path: str,
         topic_id: str,
         on_progress: Optional[Callable] = None,
-        on_complete: Optional[Callable] = None
+        on_complete: Optional[Callable] = None,
+        check_cancel: Optional[Callable] = None,
+        on_embed_progress: Optional[Callable] = None
     ):
         """
         Upload entire folder
         
+        With incremental sync, unchanged files are skipped, changed files
+        replace their previous document, and documents of files deleted from
+        the folder are removed.
+        
         Args:
             folder_path: Folder path
             topic_id: Topic ID
-            on_progress: Progress callback (current, total, percentage, stats)
+            on_progress: Progress callback (current, total, percentage, stats);
+                stats['ingest'] holds the per-stage throughput summary
             on_complete: Complete callback (stats)
+            check_cancel: Cancel check callback (cancel rolls back the batch)
+            on_embed_progress: Embedding progress callback (embedded_chunks, queued_chunks)
         """
         # 파일 스캔
         files = self.scanner.scan_folder(folder_path)
-        if not files:
+        
+        fingerprints = None
+        skipped = deleted = 0
+        unreadable = []
+        if self.incremental:
+            files, fingerprints, skipped, removed_doc_ids, unreadable = self._plan_sync(
+                folder_path, files, topic_id
+            )
+            deleted = self._remove_documents(removed_doc_ids)
+        
+        if not files and not skipped and not deleted and not unreadable:
             logger.warning(f"No files found in {folder_path}")
             return
         
         # 진행 추적 시작
-        self.tracker.start(len(files))
+        self.tracker.start(len(files) + len(unreadable))
+        # 지문 계산 실패 파일은 기존 문서를 유지한 채 오류로 보고 (재수집 시 청크 중복 방지)
+        for file_path, error in unreadable:
+            self.tracker.add_error(str(file_path), f"Failed to fingerprint: {error}")
         
         # 콜백 래퍼
-        def progress_callback(file_path, current, total):
+        def progress_callback(file_path, current, total, ingest_stats):
             self.tracker.update()
             if on_progress:
                 stats = self.tracker.get_stats()
+                stats['ingest'] = ingest_stats.get('batch', {}) if ingest_stats else {}
                 percentage = self.tracker.get_progress_percentage()
                 on_progress(current, total, percentage, stats)
         
@@ -87,19 +114,102 @@ class BatchUploader:
             self.tracker.add_error(str(file_path), error)
         
         # 배치 처리
-        self.processor.process_files(
-            files,
-            topic_id,
-            on_progress=progress_callback,
-            on_complete=complete_callback,
-            on_error=error_callback
-        )
+        if files:
+            self.processor.process_files(
+                files,
+                topic_id,
+                on_progress=progress_callback,
+                on_complete=complete_callback,
+                on_error=error_callback,
+                check_cancel=check_cancel,
+                fingerprints=fingerprints,
+                on_embed_progress=on_embed_progress
+            )
         
         # 완료
         stats = self.tracker.get_stats()
+        stats['skipped_files'] = skipped
+        stats['deleted_files'] = deleted
+        stats['ingest'] = self.processor.last_profile or {}
         logger.info(f"Upload completed: {stats}")
         
         if on_complete:
             on_complete(stats)
         
         return stats
+    
+    def _plan_sync(
+        self, folder_path: str, files: List[Path], topic_id: str
+    ) -> Tuple[List[Path], Dict[Path, dict], int, List[str], List[Tuple[Path, str]]]:
+        """
+        Compare scanned files with stored fingerprints
+        
+        size + mtime match -> unchanged (no read); otherwise the content hash
+        decides, so touched-but-identical files are not re-embedded.
+        
+        Returns:
+            (files to process, fingerprints, unchanged count, doc IDs of deleted files,
+             (path, error) of files that could not be fingerprinted and were skipped)
+        """
+        storage = self.processor.storage
+        try:
+            known = storage.get_file_fingerprints(topic_id)
+        except Exception as e:
+            logger.warning(f"Fingerprints unavailable, full upload: {e}")
+            return files, {}, 0, [], []
+        
+        to_process = []
+        fingerprints = {}
+        unchanged = 0
+        unreadable = []
+        seen = set()
+        
+        for file_path in files:
+            key = str(file_path.resolve())
+            seen.add(key)
+            try:
+                stat = file_path.stat()
+                previous = known.get(key)
+                if previous and previous["file_size"] == stat.st_size and previous["mtime"] == stat.st_mtime:
+                    unchanged += 1
+                    continue
+                
+                content_hash = self.scanner.compute_content_hash(file_path)
+                if previous and previous["content_hash"] == content_hash:
+                    # 내용 동일: 지문만 갱신 (다음 동기화는 stat만으로 판단)
+                    storage.record_file_fingerprint(
+                        topic_id, key, stat.st_size, stat.st_mtime, content_hash, previous["document_id"]
+                    )
+                    unchanged += 1
+                    continue
+            except OSError as e:
+                # 지문 없이 재수집하면 replaces가 없어 이전 문서가 남고 청크가 중복됨
+                logger.warning(f"Failed to fingerprint {file_path}, skipped: {e}")
+                unreadable.append((file_path, str(e)))
+                continue
+            
+            to_process.append(file_path)
+            fingerprints[file_path] = {
+                "file_path": key,
+                "file_size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "content_hash": content_hash,
+                "replaces": previous["document_id"] if previous else None
+            }
+        
+        # 이 폴더 아래에서 사라진 파일만 삭제 대상 (다른 폴더에서 올린 문서는 유지)
+        folder = Path(folder_path).resolve()
+        removed_doc_ids = [
+            fp["document_id"] for path, fp in known.items()
+            if path not in seen and folder in Path(path).parents and not Path(path).exists()
+        ]
+        
+        logger.info(
+            f"Incremental sync {folder_path}: {len(to_process)} new/changed, "
+            f"{unchanged} unchanged, {len(removed_doc_ids)} deleted, {len(unreadable)} unreadable"
+        )
+        return to_process, fingerprints, unchanged, removed_doc_ids, unreadable
+    
+    def _remove_documents(self, doc_ids: List[str]) -> int:
+        """폴더에서 삭제된 파일의 문서/청크 제거"""
+        return self.processor.storage.delete_documents(doc_ids)
@@ -0,0 +1,161 @@
+"""
+Chunk Deduplication
+SimHash 지문으로 토픽 내 근접 중복 청크(라이선스 헤더, 반복 템플릿, 복사된 섹션) 탐지
+"""
+
+import hashlib
+import re
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+from core.logging import get_logger
+
+logger = get_logger("chunk_dedup")
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_SIGN_BIT = 1 << 63
+
+
+def simhash64(text: str, shingle_size: int = 3) -> int:
+    """
+    64-bit SimHash over word shingles (unsigned)
+
+    Args:
+        text: Chunk text
+        shingle_size: Words per shingle
+
+    Returns:
+        Fingerprint (0 for empty text)
+    """
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return 0
+    if len(tokens) < shingle_size:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = [" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+
+    digests = b"".join(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest() for shingle in shingles)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1)
+    # 비트별 다수결 (1이 더 많으면 1)
+    majority = bits.sum(axis=0) * 2 > len(shingles)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+def to_signed64(value: int) -> int:
+    """SQLite INTEGER 저장용 부호 있는 64비트 변환"""
+    return value - (1 << 64) if value & _SIGN_BIT else value
+
+
+def to_unsigned64(value: int) -> int:
+    """to_signed64 역변환"""
+    return value + (1 << 64) if value < 0 else value
+
+
+class ChunkDeduplicator:
+    """
+    SimHash 근접 중복 인덱스 (embed 스테이지 단일 스레드 전용)
+
+    Hamming 거리 d 이하의 지문은 (d + 1)개 밴드 중 하나가 반드시 일치하므로
+    밴드별 해시 테이블로 후보만 비교한다.
+    """
+
+    MODES = ("skip", "link")
+
+    def __init__(
+        self,
+        max_distance: int = 3,
+        mode: str = "link",
+        min_chars: int = 64,
+        shingle_size: int = 3
+    ):
+        """
+        Initialize deduplicator
+
+        Args:
+            max_distance: Max Hamming distance (of 64 bits) treated as a duplicate
+            mode: "skip" drops duplicates, "link" also records which stored chunk they duplicate
+                (linked canonical chunks are promoted when their document is deleted;
+                skipped duplicates are lost with it)
+            min_chars: Shorter chunks are never deduplicated
+            shingle_size: Words per SimHash shingle
+        """
+        self.max_distance = max(0, min(int(max_distance), 15))
+        self.mode = mode if mode in self.MODES else "link"
+        self.min_chars = min_chars
+        self.shingle_size = shingle_size
+        self._bands = self._band_layout(self.max_distance + 1)
+        self._tables: List[Dict[int, List[Tuple[int, Hashable]]]] = [{} for _ in self._bands]
+        self.stats = {"checked": 0, "duplicates": 0, "saved_text_bytes": 0}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "ChunkDeduplicator":
+        """RAGConfigManager.get_dedup_config()로 생성"""
+        return cls(
+            max_distance=config.get("max_hamming_distance", 3),
+            mode=config.get("mode", "link"),
+            min_chars=config.get("min_chars", 64),
+            shingle_size=config.get("shingle_size", 3)
+        )
+
+    @staticmethod
+    def _band_layout(count: int) -> List[Tuple[int, int]]:
+        """64비트를 count개 밴드 (shift, mask)로 분할"""
+        widths = [64 // count + (1 if i < 64 % count else 0) for i in range(count)]
+        layout, shift = [], 0
+        for width in widths:
+            layout.append((shift, (1 << width) - 1))
+            shift += width
+        return layout
+
+    def fingerprint(self, text: str) -> Optional[int]:
+        """청크 지문 (min_chars 미만이면 None: 중복 검사 제외)"""
+        if len(text.strip()) < self.min_chars:
+            return None
+        return simhash64(text, self.shingle_size)
+
+    def add(self, fingerprint: Optional[int], key: Hashable):
+        """저장된(또는 저장될) 청크 지문 등록"""
+        if fingerprint is None:
+            return
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            table.setdefault((fingerprint >> shift) & mask, []).append((fingerprint, key))
+
+    def find(
+        self, fingerprint: Optional[int], accept: Optional[Callable[[Hashable], bool]] = None
+    ) -> Optional[Hashable]:
+        """근접 중복 청크 키 조회 (accept가 거부한 키는 건너뜀, 없으면 None)"""
+        if fingerprint is None:
+            return None
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            for candidate, key in table.get((fingerprint >> shift) & mask, ()):
+                if bin(candidate ^ fingerprint).count("1") <= self.max_distance and (accept is None or accept(key)):
+                    return key
+        return None
+
+    def check(
+        self,
+        text: str,
+        fingerprint: Optional[int],
+        key: Hashable,
+        accept: Optional[Callable[[Hashable], bool]] = None
+    ) -> Optional[Hashable]:
+        """
+        Return the canonical key if the chunk is a near-duplicate, else register it
+
+        Args:
+            text: Chunk text (for saved-bytes accounting)
+            fingerprint: fingerprint(text)
+            key: Key identifying this chunk if it is kept
+            accept: Filter for canonical keys (e.g. only chunks already stored)
+
+        Returns:
+            Canonical chunk key, or None when the chunk is new
+        """
+        self.stats["checked"] += 1
+        canonical = self.find(fingerprint, accept)
+        if canonical is not None:
+            self.stats["duplicates"] += 1
+            self.stats["saved_text_bytes"] += len(text.encode("utf-8"))
+            return canonical
+        self.add(fingerprint, key)
+        return None
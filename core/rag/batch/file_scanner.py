@@ -2,6 +2,7 @@
 File Scanner
 """
 
+import hashlib
 from pathlib import Path
 from typing import List, Set
 from core.logging import get_logger
@@ -93,6 +94,24 @@ class FileScanner:
         
         return True
     
+    @staticmethod
+    def compute_content_hash(file_path: Path, block_size: int = 1024 * 1024) -> str:
+        """
+        Compute content hash (streamed, constant memory)
+        
+        Args:
+            file_path: File path
+            block_size: Read block size in bytes
+            
+        Returns:
+            BLAKE2b hex digest
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
     def get_file_info(self, file_path: Path) -> dict:
         """Get file information"""
         try:
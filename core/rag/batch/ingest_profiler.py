@@ -0,0 +1,233 @@
+"""
+Ingest Profiler
+파일별 단계(load / chunk / dedup / embed / write / sqlite) 시간·바이트·청크 수 집계 및 배치 처리량 리포트
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from threading import Lock, local
+from typing import Dict, Iterator, List, Optional
+from core.logging import get_logger
+
+logger = get_logger("ingest_profiler")
+
+STAGES = ("load", "chunk", "dedup", "embed", "write", "sqlite")
+
+
+@dataclass
+class FileProfile:
+    """Per-file stage timings and counters"""
+    file_path: str
+    file_bytes: int = 0
+    chunks: int = 0
+    stage_seconds: Dict[str, float] = field(default_factory=lambda: {stage: 0.0 for stage in STAGES})
+    status: str = "running"
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.stage_seconds.values())
+
+    @property
+    def slowest_stage(self) -> str:
+        return max(self.stage_seconds, key=self.stage_seconds.get)
+
+    def to_dict(self) -> Dict:
+        return {
+            "file": self.file_path,
+            "bytes": self.file_bytes,
+            "chunks": self.chunks,
+            "status": self.status,
+            "seconds": round(self.total_seconds, 4),
+            "slowest_stage": self.slowest_stage,
+            "stages": {stage: round(seconds, 4) for stage, seconds in self.stage_seconds.items()}
+        }
+
+
+class IngestProfiler:
+    """배치 적재 프로파일러 (파이프라인 스레드에서 동시 기록, Thread-safe)"""
+
+    def __init__(self, slowest_count: int = 5):
+        """
+        Initialize profiler
+
+        Args:
+            slowest_count: Slowest files listed in the summary
+        """
+        self.slowest_count = slowest_count
+        self._files: Dict[str, FileProfile] = {}
+        self._lock = Lock()
+        self._nested = local()
+        self._started = time.perf_counter()
+        self._started_at = datetime.now()
+
+    def _profile(self, file_path) -> FileProfile:
+        """파일 프로파일 조회/생성 (lock 보유 상태에서 호출)"""
+        key = str(file_path)
+        profile = self._files.get(key)
+        if profile is None:
+            profile = self._files[key] = FileProfile(file_path=key)
+        return profile
+
+    def add(self, file_path, stage: str, seconds: float, chunks: int = 0, file_bytes: int = 0):
+        """
+        Record time spent in a stage
+
+        Args:
+            file_path: File path
+            stage: One of STAGES
+            seconds: Elapsed seconds
+            chunks: Chunks produced (counted once, by the chunk stage)
+            file_bytes: File size (set once)
+        """
+        with self._lock:
+            profile = self._profile(file_path)
+            profile.stage_seconds[stage] = profile.stage_seconds.get(stage, 0.0) + seconds
+            profile.chunks += chunks
+            if file_bytes:
+                profile.file_bytes = file_bytes
+
+    def add_shared(self, stage: str, seconds: float, chunk_counts: Dict):
+        """여러 파일이 함께 처리된 단계(교차 파일 임베딩 배치) 시간을 청크 수 비율로 분배"""
+        total = sum(chunk_counts.values())
+        if not total:
+            return
+        with self._lock:
+            for file_path, count in chunk_counts.items():
+                profile = self._profile(file_path)
+                profile.stage_seconds[stage] = profile.stage_seconds.get(stage, 0.0) + seconds * count / total
+
+    def timed_iter(self, file_path, stage: str, iterable) -> Iterator:
+        """
+        Record time spent in next() of a lazy iterator as stage time
+
+        Time spent in nested timed iterators (e.g. the loader consumed by a
+        streaming chunker) is excluded, so load and chunk are not double-counted.
+        """
+        iterator = iter(iterable)
+        while True:
+            nested_before = getattr(self._nested, "seconds", 0.0)
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+                finished = False
+            except StopIteration:
+                finished = True
+            elapsed = time.perf_counter() - started
+            inner = getattr(self._nested, "seconds", 0.0) - nested_before
+            self._nested.seconds = nested_before + elapsed
+            self.add(file_path, stage, elapsed - inner)
+            if finished:
+                return
+            yield item
+
+    def finish_file(self, file_path, status: str = "done") -> Optional[Dict]:
+        """파일 처리 종료 표시"""
+        with self._lock:
+            profile = self._files.get(str(file_path))
+            if profile is None:
+                return None
+            profile.status = status
+            return profile.to_dict()
+
+    def summary(self) -> Dict:
+        """
+        Batch summary
+
+        Returns:
+            {files, chunks, bytes, elapsed_seconds, chunks_per_second, mb_per_second,
+             stage_seconds, slowest_stage, slowest_files}
+        """
+        with self._lock:
+            profiles = list(self._files.values())
+        finished = [profile for profile in profiles if profile.status == "done"]
+        elapsed = time.perf_counter() - self._started
+
+        stage_seconds = {stage: 0.0 for stage in STAGES}
+        for profile in profiles:
+            for stage, seconds in profile.stage_seconds.items():
+                stage_seconds[stage] = stage_seconds.get(stage, 0.0) + seconds
+
+        chunks = sum(profile.chunks for profile in finished)
+        file_bytes = sum(profile.file_bytes for profile in finished)
+        slowest = sorted(finished, key=lambda profile: profile.total_seconds, reverse=True)[:self.slowest_count]
+        return {
+            "files": len(finished),
+            "failed_files": sum(1 for profile in profiles if profile.status == "failed"),
+            "chunks": chunks,
+            "bytes": file_bytes,
+            "elapsed_seconds": round(elapsed, 3),
+            "chunks_per_second": round(chunks / elapsed, 2) if elapsed > 0 else 0.0,
+            "mb_per_second": round(file_bytes / 1048576 / elapsed, 3) if elapsed > 0 else 0.0,
+            "stage_seconds": {stage: round(seconds, 3) for stage, seconds in stage_seconds.items()},
+            "slowest_stage": max(stage_seconds, key=stage_seconds.get) if profiles else None,
+            "slowest_files": [profile.to_dict() for profile in slowest]
+        }
+
+    def save_run(
+        self,
+        topic_id: str = "",
+        status: str = "completed",
+        log_path: Optional[Path] = None,
+        extra: Optional[Dict] = None
+    ) -> Optional[Path]:
+        """
+        Append the run (summary + every file) to the ingest run log (JSON lines)
+
+        Args:
+            topic_id: Topic ID
+            status: completed / cancelled
+            log_path: Log file (None for <log dir>/ingest_runs.jsonl)
+            extra: Additional fields stored with the run (e.g. dedup savings)
+
+        Returns:
+            Log path, or None when saving failed
+        """
+        try:
+            if log_path is None:
+                from utils.path_helper import get_log_dir
+                log_path = get_log_dir() / "ingest_runs.jsonl"
+            with self._lock:
+                files = [profile.to_dict() for profile in self._files.values()]
+            record = {
+                "started_at": self._started_at.isoformat(timespec="seconds"),
+                "topic_id": topic_id,
+                "status": status,
+                "summary": self.summary(),
+                "files": files,
+                **(extra or {})
+            }
+            log_path = Path(log_path)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return log_path
+        except Exception as e:
+            logger.warning(f"Failed to save ingest run log: {e}")
+            return None
+
+    @staticmethod
+    def format_summary(summary: Dict, slowest_files: int = 3) -> str:
+        """진행 대화상자용 요약 문자열"""
+        if not summary:
+            return ""
+        stages = summary.get("stage_seconds", {})
+        busiest = sorted(stages.items(), key=lambda item: item[1], reverse=True)
+        lines = [
+            f"처리 속도: {summary.get('chunks_per_second', 0)} 청크/초",
+            "단계별 시간: " + ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in busiest if seconds > 0)
+        ]
+        dedup = summary.get("dedup")
+        if dedup and dedup.get("duplicate_chunks"):
+            lines.append(
+                f"중복 청크: {dedup['duplicate_chunks']}/{dedup['checked_chunks']} "
+                f"(임베딩 {dedup['saved_embeddings']}회, {dedup['saved_bytes'] / 1024:.1f} KB 절약)"
+            )
+        slow = summary.get("slowest_files", [])[:slowest_files]
+        if slow:
+            lines.append("느린 파일: " + ", ".join(
+                f"{Path(item['file']).name} ({item['seconds']:.1f}s, {item['slowest_stage']})" for item in slow
+            ))
+        return "\n".join(lines)
@@ -0,0 +1,383 @@
+"""
+Re-embedding Job
+임베딩 모델 변경 후 이전 모델 테이블의 청크 텍스트를 새 모델로 재임베딩하는 백그라운드 작업
+(TopicDatabase 체크포인트로 재시작 후 이어서 진행)
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from langchain.schema import Document
+from core.logging import get_logger
+
+logger = get_logger("reembed_job")
+
+# 재개 대상 작업 상태 (running: 앱 종료로 중단된 작업)
+RESUMABLE_STATUSES = ["pending", "running"]
+
+
+class ReembedRunner:
+    """
+    재임베딩 작업 실행기 (단일 백그라운드 스레드)
+
+    문서 단위로 이전 모델 테이블을 Arrow 배치로 읽어 새 모델로 임베딩 후 현재 모델 테이블에
+    쓰고, 문서가 끝날 때마다 documents.embedding_model을 갱신한다. 문서 도중 중단되면
+    재개 시 새 테이블에 이미 있는 청크 번호는 건너뛴다.
+    """
+
+    def __init__(
+        self,
+        storage,
+        config: Optional[Dict] = None,
+        on_progress: Optional[Callable[[Dict], None]] = None
+    ):
+        """
+        Initialize runner
+
+        Args:
+            storage: RAGStorageManager instance
+            config: Re-embedding config (None to load from RAGConfigManager)
+            on_progress: Called with the job dict after each document
+        """
+        self.storage = storage
+        self.config = config if config is not None else self._load_config()
+        self.on_progress = on_progress
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._restart_requested = False
+        self._last_chat = float("-inf")
+
+    def _load_config(self) -> Dict:
+        """RAG 설정에서 재임베딩 설정 로드"""
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            return RAGConfigManager().get_reembed_config()
+        except Exception as e:
+            logger.warning(f"Failed to load re-embedding config, using defaults: {e}")
+            return {}
+
+    # ========== Planning ==========
+
+    def plan(self, target_model: Optional[str] = None) -> List[Dict]:
+        """
+        Create jobs for documents still on another model and return runnable jobs
+
+        Jobs targeting a model that is no longer current are cancelled; their
+        already moved documents are picked up by a job from that model instead.
+
+        Args:
+            target_model: Model to migrate to (None for current)
+
+        Returns:
+            Pending/interrupted jobs targeting target_model
+        """
+        from ..embeddings.embedding_model_manager import EmbeddingModelManager
+        from ..vector_store.lancedb_store import LanceDBStore
+
+        manager = EmbeddingModelManager()
+        target_model = target_model or manager.get_current_model()
+
+        jobs = self.storage.get_reembed_jobs(RESUMABLE_STATUSES)
+        for job in jobs:
+            if job["target_model"] != target_model:
+                self.storage.update_reembed_job(job["id"], status="cancelled")
+                logger.info(f"Cancelled re-embedding job {job['id']} (target {job['target_model']} is no longer current)")
+        jobs = [job for job in jobs if job["target_model"] == target_model]
+
+        planned = {job["source_model"] for job in jobs}
+        for source_model, count in self.storage.get_embedding_model_counts().items():
+            if source_model == target_model or source_model in planned:
+                continue
+            if not LanceDBStore.has_model_data(source_model, manager.get_table_name(source_model)):
+                logger.debug(f"No vectors for {source_model}, documents must be re-uploaded")
+                continue
+            job_id = self.storage.create_reembed_job(source_model, target_model, count)
+            jobs.append(self.storage.get_reembed_job(job_id))
+        return jobs
+
+    # ========== Lifecycle ==========
+
+    def start(self) -> bool:
+        """
+        Plan jobs and run them in a background thread
+
+        Returns:
+            True if a run was started
+        """
+        if not self.config.get("enabled", True):
+            return False
+        with self._lock:
+            if self._thread is not None:
+                return False
+            try:
+                jobs = self.plan()
+            except Exception as e:
+                logger.error(f"Re-embedding planning failed: {e}", exc_info=True)
+                return False
+            if not jobs:
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(jobs,), name="reembed-job", daemon=True)
+            self._thread.start()
+        logger.info(f"Re-embedding started: {len(jobs)} job(s)")
+        return True
+
+    def restart(self) -> bool:
+        """
+        Re-plan against the current model (e.g. after a model change) without blocking
+
+        A running thread is asked to stop and re-plans itself on exit, so the
+        restart cannot be lost to a thread that is still shutting down.
+
+        Returns:
+            True if a run was started or is scheduled to restart
+        """
+        with self._lock:
+            if self._thread is not None:
+                self._restart_requested = True
+                self._stop.set()
+                return True
+        return self.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """중지 요청 (진행 중 문서는 다음 실행 시 이어서 처리)"""
+        with self._lock:
+            self._restart_requested = False
+            self._stop.set()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def is_running(self) -> bool:
+        """백그라운드 실행 여부"""
+        with self._lock:
+            return self._thread is not None
+
+    def get_status(self) -> List[Dict]:
+        """재임베딩 작업 목록 (진행률 표시용)"""
+        return self.storage.get_reembed_jobs()
+
+    def _run(self, jobs: List[Dict]):
+        """작업 순차 실행"""
+        try:
+            for job in jobs:
+                if self._stop.is_set():
+                    break
+                self.run_job(job)
+        finally:
+            with self._lock:
+                self._thread = None
+                restart = self._restart_requested
+                self._restart_requested = False
+            if restart:
+                self.start()
+
+    # ========== Execution ==========
+
+    def run_job(self, job: Dict) -> str:
+        """
+        Re-embed every remaining document of a job
+
+        Args:
+            job: Job dict from TopicDatabase
+
+        Returns:
+            Final status (completed / failed / pending when stopped)
+        """
+        from ..embeddings.embedding_pool import embedding_pool
+        from ..vector_store.lancedb_store import LanceDBStore
+
+        job_id, source_model, target_model = job["id"], job["source_model"], job["target_model"]
+        documents = self.storage.get_documents_by_embedding_model(source_model)
+        self.storage.update_reembed_job(
+            job_id, status="running", total_documents=job["done_documents"] + len(documents), error=None
+        )
+        logger.info(f"Re-embedding {len(documents)} documents: {source_model} -> {target_model}")
+
+        source_store = target_store = None
+        failures = 0
+        last_error = None
+        try:
+            source_store = LanceDBStore(model_id=source_model)
+            target_store = self._get_target_store(target_model)
+            embeddings = embedding_pool.get_embeddings(target_model)
+
+            for document in documents:
+                if self._stop.is_set():
+                    self.storage.update_reembed_job(job_id, status="pending")
+                    logger.info(f"Re-embedding job {job_id} paused, will resume on next start")
+                    return "pending"
+
+                self.storage.update_reembed_job(job_id, current_document_id=document["id"])
+                try:
+                    chunk_count = self._migrate_document(document, source_store, target_store, embeddings, target_model)
+                except _Stopped:
+                    self.storage.update_reembed_job(job_id, status="pending")
+                    logger.info(f"Re-embedding job {job_id} paused mid-document {document['id']}")
+                    return "pending"
+                except Exception as e:
+                    failures += 1
+                    last_error = f"{document.get('filename', document['id'])}: {e}"
+                    logger.error(f"Re-embedding failed for {document['id']}: {e}", exc_info=True)
+                    continue
+
+                self.storage.complete_document_reembed(job_id, document["id"], source_model, target_model, chunk_count)
+                self._report(job_id)
+
+            target_store.index_manager.schedule_maintenance()
+        except Exception as e:
+            logger.error(f"Re-embedding job {job_id} failed: {e}", exc_info=True)
+            self.storage.update_reembed_job(job_id, status="failed", error=str(e))
+            return "failed"
+        finally:
+            if source_store is not None:
+                source_store.close()
+
+        # 실패 문서는 다음 시작 시 새 작업으로 재시도 (여전히 이전 모델로 기록됨)
+        status = "failed" if failures else "completed"
+        self.storage.update_reembed_job(
+            job_id, status=status, current_document_id=None,
+            error=f"{failures} document(s) failed, last: {last_error}" if failures else None
+        )
+        logger.info(f"Re-embedding job {job_id} {status}: {source_model} -> {target_model}")
+        self._report(job_id)
+        return status
+
+    def _get_target_store(self, target_model: str):
+        """검색과 같은 인스턴스에 쓰도록 저장소 관리자의 현재 모델 스토어 사용"""
+        self.storage._ensure_vector_store()
+        store = self.storage.vector_store
+        if store is not None and store.model_id == target_model:
+            return store
+        from ..vector_store.lancedb_store import LanceDBStore
+        return LanceDBStore(model_id=target_model)
+
+    def _migrate_document(self, document: Dict, source_store, target_store, embeddings, target_model: str) -> int:
+        """
+        Re-embed one document (resumable)
+
+        A document without rows in the source table is reported as a failure,
+        so its recorded chunk count and embedding model are left untouched.
+
+        Returns:
+            Number of chunks stored for the document under target_model
+        """
+        doc_id = document["id"]
+        existing = target_store.get_chunk_indexes(doc_id)
+        stored = len(existing)
+        embed_batch_size = max(1, int(self.config.get("embed_batch_size", 32)))
+        source_rows = 0
+
+        for batch in source_store.iter_document_batches(
+            doc_id, ["text", "metadata"], batch_size=self.config.get("scan_batch_size", 256)
+        ):
+            rows = []
+            source_rows += batch.num_rows
+            for text, metadata in zip(batch.column("text").to_pylist(), batch.column("metadata").to_pylist()):
+                metadata = dict(metadata or {})
+                chunk_index = int(metadata.get("chunk_index") or 0)
+                if chunk_index not in existing:
+                    rows.append((chunk_index, text or "", metadata))
+
+            for start in range(0, len(rows), embed_batch_size):
+                self._throttle()
+                part = rows[start:start + embed_batch_size]
+                vectors = embeddings.embed_documents([text for _, text, _ in part])
+                self._write_rows(document, target_store, part, vectors, target_model)
+                stored += len(part)
+                existing.update(chunk_index for chunk_index, _, _ in part)
+
+        if not source_rows:
+            raise RuntimeError(f"No chunks found in the {source_store.model_id} vector store")
+        return stored
+
+    @staticmethod
+    def _write_rows(document: Dict, target_store, rows: List[tuple], vectors: List, target_model: str):
+        """연속된 chunk_index 구간마다 add_documents (청크 ID를 원본과 동일하게 유지)"""
+        runs, current = [], []
+        for row, vector in zip(rows, vectors):
+            if current and row[0] != current[-1][0][0] + 1:
+                runs.append(current)
+                current = []
+            current.append((row, vector))
+        if current:
+            runs.append(current)
+
+        for run in runs:
+            chunks = [
+                Document(page_content=text, metadata={**metadata, "embedding_model": target_model})
+                for (_, text, metadata), _ in run
+            ]
+            chunk_ids = target_store.add_documents(
+                chunks,
+                embeddings=[vector for _, vector in run],
+                document_id=document["id"],
+                topic_id=document["topic_id"],
+                chunking_strategy=document.get("chunking_strategy") or "sliding_window",
+                embedding_model=target_model,
+                start_index=run[0][0][0]
+            )
+            if len(chunk_ids) != len(chunks):
+                raise RuntimeError(f"Failed to write {len(chunks)} chunks to {target_model}")
+
+    # ========== Throttling ==========
+
+    def _throttle(self):
+        """채팅 처리 중(및 종료 후 quiet_seconds)에는 대기, 배치 사이 짧은 휴식"""
+        if self.config.get("pause_while_chatting", True):
+            poll = self.config.get("poll_seconds", 1.0)
+            while self._user_busy():
+                if self._stop.wait(poll):
+                    break
+        if self._stop.wait(self.config.get("batch_pause_ms", 20) / 1000):
+            raise _Stopped()
+
+    def _user_busy(self) -> bool:
+        """통합 토큰 트래커 기준 대화 진행 중 여부"""
+        now = time.monotonic()
+        try:
+            from core.token_tracking import get_unified_tracker
+            if get_unified_tracker().is_conversation_active():
+                self._last_chat = now
+        except Exception:
+            pass  # 트래커 미초기화: 채팅 없음
+        return now - self._last_chat < self.config.get("quiet_seconds", 10)
+
+    def _report(self, job_id: str):
+        """진행 콜백 호출"""
+        if self.on_progress is None:
+            return
+        try:
+            self.on_progress(self.storage.get_reembed_job(job_id))
+        except Exception as e:
+            logger.debug(f"Re-embedding progress callback failed: {e}")
+
+
+class _Stopped(Exception):
+    """중지 요청으로 문서 처리 중단"""
+
+
+_runner: Optional[ReembedRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_reembed_runner(storage=None) -> ReembedRunner:
+    """
+    Get the global re-embedding runner
+
+    Args:
+        storage: RAGStorageManager (None for the shared instance)
+
+    Returns:
+        ReembedRunner instance
+    """
+    global _runner
+
+    with _runner_lock:
+        if _runner is None:
+            if storage is None:
+                from ..storage.rag_storage_manager import RAGStorageManager
+                storage = RAGStorageManager(lazy_load_vector=True)
+            _runner = ReembedRunner(storage)
+        return _runner
@@ -0,0 +1,9 @@
+"""RAG retrieval benchmark (recall@k, MRR, latency, ingest throughput, storage)"""
+
+from .corpus import BenchmarkCorpus, BenchmarkQuery, generate_corpus
+from .runner import RetrievalBenchmark, compare_results, save_result
+
+__all__ = [
+    'BenchmarkCorpus', 'BenchmarkQuery', 'generate_corpus',
+    'RetrievalBenchmark', 'compare_results', 'save_result'
+]
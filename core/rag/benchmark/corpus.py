@@ -0,0 +1,152 @@
+"""
+Benchmark Corpus
+정답 청크를 알 수 있는 합성 한국어/영어/코드 코퍼스 생성 및 로드
+"""
+
+import json
+import random
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List
+
+# 언어별 배경 문장 (정답 문장과 섞어 distractor 역할)
+_FILLER = {
+    "ko": [
+        "이 문서는 사내 시스템 운영 절차를 설명한다.",
+        "변경 사항은 매주 화요일 정기 점검 시간에 반영된다.",
+        "장애가 발생하면 담당 부서에 즉시 보고해야 한다.",
+        "모든 배포는 스테이징 환경에서 검증을 마친 뒤 진행한다.",
+        "데이터 백업은 매일 새벽 세 시에 자동으로 수행된다.",
+        "접근 권한은 최소 권한 원칙에 따라 부여된다.",
+        "분기별 보안 감사 결과는 별도 보고서로 공유된다.",
+        "신규 입사자는 첫 주에 온보딩 교육을 이수해야 한다.",
+    ],
+    "en": [
+        "This document describes the operating procedures for internal systems.",
+        "Changes are rolled out during the regular Tuesday maintenance window.",
+        "Incidents must be reported to the owning team immediately.",
+        "Every deployment is verified in the staging environment first.",
+        "Database backups run automatically every night at 3 AM.",
+        "Access is granted following the principle of least privilege.",
+        "Quarterly security audit results are shared in a separate report.",
+        "New hires complete onboarding training during their first week.",
+    ],
+    "code": [
+        "import logging\nlogger = logging.getLogger(__name__)",
+        "def load_settings(path):\n    with open(path) as f:\n        return json.load(f)",
+        "class RetryPolicy:\n    def __init__(self, attempts=3):\n        self.attempts = attempts",
+        "def chunked(items, size):\n    for i in range(0, len(items), size):\n        yield items[i:i + size]",
+        "async def fetch(session, url):\n    async with session.get(url) as response:\n        return await response.text()",
+        "def normalize(vector):\n    norm = sum(v * v for v in vector) ** 0.5\n    return [v / norm for v in vector]",
+    ],
+}
+
+_NAMES = ["김하늘", "이서준", "박지민", "최유나", "정도윤", "Alice Park", "Brian Lee", "Chloe Kim", "Daniel Cho", "Emma Yoon"]
+_CITIES = ["서울", "부산", "대전", "광주", "Seoul", "Busan", "Incheon", "Daegu"]
+
+
+@dataclass
+class BenchmarkQuery:
+    """Query with the marker that identifies its relevant chunks"""
+    query: str
+    marker: str
+    language: str
+
+
+@dataclass
+class BenchmarkCorpus:
+    """Synthetic corpus (documents + queries with known relevant chunks)"""
+    documents: List[Dict] = field(default_factory=list)
+    queries: List[BenchmarkQuery] = field(default_factory=list)
+    seed: int = 0
+
+    def save(self, path: str):
+        """JSON 저장"""
+        data = {
+            "seed": self.seed,
+            "documents": self.documents,
+            "queries": [asdict(query) for query in self.queries]
+        }
+        Path(path).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str) -> "BenchmarkCorpus":
+        """JSON 로드 (documents: [{id, language, text}], queries: [{query, marker, language}])"""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            documents=data["documents"],
+            queries=[BenchmarkQuery(**query) for query in data["queries"]],
+            seed=data.get("seed", 0)
+        )
+
+
+def _fact(language: str, marker: str, rng: random.Random):
+    """정답 문장과 해당 질의 생성 (marker는 정답 청크 판별용 고유 토큰)"""
+    name = rng.choice(_NAMES)
+    city = rng.choice(_CITIES)
+    port = rng.randint(1024, 65000)
+
+    if language == "ko":
+        templates = [
+            (f"프로젝트 {marker}의 배포 담당자는 {name}이며 {city} 데이터센터를 사용한다.",
+             f"{marker} 프로젝트 배포 담당자는 누구인가?"),
+            (f"{marker} 서비스는 {port}번 포트에서 동작하고 {city} 리전에 있다.",
+             f"{marker} 서비스는 몇 번 포트를 사용하나요?"),
+        ]
+    elif language == "en":
+        templates = [
+            (f"Project {marker} is owned by {name} and runs in the {city} data center.",
+             f"Who owns project {marker}?"),
+            (f"The {marker} service listens on port {port} in the {city} region.",
+             f"Which port does the {marker} service listen on?"),
+        ]
+    else:
+        function = f"handle_{marker.lower().replace('-', '_')}"
+        templates = [
+            (f"def {function}(request):\n    # {marker}: retry the upstream call on port {port}\n"
+             f"    return forward(request, port={port}, retries=3)",
+             f"function that retries the upstream call for {marker}"),
+        ]
+    return rng.choice(templates)
+
+
+def generate_corpus(
+    documents_per_language: int = 20,
+    sentences_per_document: int = 40,
+    seed: int = 42
+) -> BenchmarkCorpus:
+    """
+    Generate a deterministic Korean / English / code corpus
+
+    Each document hides one fact among filler sentences; the fact contains a unique
+    marker, so a retrieved chunk is relevant iff its text contains the query marker.
+    This keeps relevance judgements valid when chunking settings change.
+
+    Args:
+        documents_per_language: Documents per language (ko, en, code)
+        sentences_per_document: Filler sentences per document
+        seed: Random seed
+
+    Returns:
+        BenchmarkCorpus
+    """
+    rng = random.Random(seed)
+    corpus = BenchmarkCorpus(seed=seed)
+
+    for language in ("ko", "en", "code"):
+        separator = "\n\n" if language == "code" else " "
+        for index in range(documents_per_language):
+            marker = f"{language.upper()}-{rng.randint(1000, 9999)}{index:03d}"
+            fact, query = _fact(language, marker, rng)
+
+            sentences = [rng.choice(_FILLER[language]) for _ in range(sentences_per_document)]
+            sentences.insert(rng.randint(0, len(sentences)), fact)
+
+            corpus.documents.append({
+                "id": f"{language}_{index:03d}",
+                "language": language,
+                "text": separator.join(sentences)
+            })
+            corpus.queries.append(BenchmarkQuery(query=query, marker=marker, language=language))
+
+    return corpus
@@ -0,0 +1,293 @@
+"""
+Retrieval Benchmark Runner
+RAGStorageManager + LanceDBStore + EmbeddingFactory 기반 검색 품질/지연 측정 (CPU, 오프라인)
+"""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from core.logging import get_logger
+from .corpus import BenchmarkCorpus
+
+logger = get_logger("rag_benchmark")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """선형 보간 백분위수 (q: 0~100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def directory_size(path: Path) -> int:
+    """디렉터리 전체 바이트"""
+    return sum(file.stat().st_size for file in Path(path).rglob("*") if file.is_file())
+
+
+class RetrievalBenchmark:
+    """임시 저장소에 코퍼스를 적재한 뒤 recall@k, MRR, 지연, 적재 속도, 청크당 디스크 사용량 측정"""
+
+    def __init__(
+        self,
+        corpus: BenchmarkCorpus,
+        model_id: Optional[str] = None,
+        chunking_strategy: str = "sliding_window",
+        k_values: tuple = (1, 5, 10),
+        search_kwargs: Optional[Dict] = None,
+        work_dir: Optional[str] = None,
+        warmup_queries: int = 3
+    ):
+        """
+        Initialize benchmark
+
+        Args:
+            corpus: Benchmark corpus
+            model_id: Embedding model ID (None for current model)
+            chunking_strategy: ChunkingFactory strategy name
+            k_values: Cutoffs for recall@k
+            search_kwargs: Extra LanceDBStore.search options (search_mode, mmr, ...)
+            work_dir: Storage directory (None for a temporary directory removed after the run)
+            warmup_queries: Untimed queries run before measuring latency
+        """
+        self.corpus = corpus
+        self.model_id = model_id
+        self.chunking_strategy = chunking_strategy
+        self.k_values = tuple(sorted(k_values))
+        self.search_kwargs = search_kwargs or {}
+        self.work_dir = work_dir
+        self.warmup_queries = warmup_queries
+
+    @staticmethod
+    def force_offline():
+        """HuggingFace 네트워크 접근 차단 (로컬 캐시/모델 경로만 사용)"""
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+        os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+    def run(self) -> Dict:
+        """
+        Run ingest + query benchmark
+
+        Returns:
+            Result dict (config, ingest, retrieval, latency, storage)
+        """
+        self.force_offline()
+
+        from ..embeddings.embedding_factory import EmbeddingFactory
+        from ..storage.rag_storage_manager import RAGStorageManager
+
+        temporary = self.work_dir is None
+        work_dir = Path(self.work_dir or tempfile.mkdtemp(prefix="rag_benchmark_"))
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        # 싱글톤을 벤치마크 전용 경로로 재생성
+        RAGStorageManager.reset_instance()
+        storage = None
+        try:
+            # 영구 임베딩 캐시를 쓰면 두 번째 실행부터 인코딩이 생략되어 적재 속도/지연 비교 불가
+            embeddings = EmbeddingFactory.create_embeddings(self.model_id, enable_cache=False)
+            # 저장소 코덱/인덱스 설정과 문서 기록도 벤치마크 대상 모델 기준
+            storage = RAGStorageManager(
+                sqlite_path=str(work_dir / "benchmark.db"),
+                lancedb_path=str(work_dir / "vectordb"),
+                model_id=self.model_id
+            )
+
+            ingest = self._ingest(storage, embeddings)
+            retrieval = self._query(storage, embeddings, ingest["topic_id"])
+
+            vector_store = storage.vector_store
+            vector_store.index_manager.wait()
+            disk_bytes = directory_size(work_dir / "vectordb")
+
+            return {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "config": {
+                    "model_id": vector_store.model_id,
+                    "chunking_strategy": self.chunking_strategy,
+                    "search_kwargs": self.search_kwargs,
+                    "vector_storage": vector_store.vector_codec.mode,
+                    "embedding_cache": False,
+                    "documents": len(self.corpus.documents),
+                    "queries": len(self.corpus.queries),
+                    "corpus_seed": self.corpus.seed,
+                    "platform": platform.platform(),
+                    "python": platform.python_version()
+                },
+                "ingest": {key: value for key, value in ingest.items() if key != "topic_id"},
+                **retrieval,
+                "storage": {
+                    "disk_bytes": disk_bytes,
+                    "bytes_per_chunk": round(disk_bytes / ingest["chunks"], 1) if ingest["chunks"] else 0.0
+                }
+            }
+        finally:
+            if storage is not None:
+                if storage.vector_store is not None:
+                    storage.vector_store.close()
+                storage.close()
+            RAGStorageManager.reset_instance()
+            if temporary:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _ingest(self, storage, embeddings) -> Dict:
+        """청킹 → 임베딩 → 저장 (단계별 시간 측정)"""
+        from ..chunking.chunking_factory import ChunkingFactory
+
+        chunker = ChunkingFactory.create(self.chunking_strategy, embeddings=embeddings)
+        topic_id = storage.create_topic("benchmark", description="Retrieval benchmark corpus")
+
+        timings = {"chunk_seconds": 0.0, "embed_seconds": 0.0, "write_seconds": 0.0}
+        total_chunks = 0
+        started = time.perf_counter()
+
+        for document in self.corpus.documents:
+            text = document["text"]
+            doc_id = storage.create_document(
+                topic_id, f"{document['id']}.txt", document["id"],
+                "code" if document.get("language") == "code" else "txt",
+                len(text.encode("utf-8")), chunker.name
+            )
+
+            stage = time.perf_counter()
+            chunks = chunker.chunk(text, {"source": document["id"], "language": document.get("language")})
+            timings["chunk_seconds"] += time.perf_counter() - stage
+
+            stage = time.perf_counter()
+            vectors = chunker.pop_chunk_vectors(chunks)
+            if vectors is None or any(vector is None for vector in vectors):
+                vectors = embeddings.embed_documents([chunk.page_content for chunk in chunks])
+            timings["embed_seconds"] += time.perf_counter() - stage
+
+            stage = time.perf_counter()
+            storage.add_chunks(doc_id, chunks, vectors, chunking_strategy=chunker.name)
+            timings["write_seconds"] += time.perf_counter() - stage
+            total_chunks += len(chunks)
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Benchmark ingest: {total_chunks} chunks in {elapsed:.2f}s")
+        return {
+            "topic_id": topic_id,
+            "chunks": total_chunks,
+            "seconds": round(elapsed, 3),
+            "chunks_per_second": round(total_chunks / elapsed, 2) if elapsed > 0 else 0.0,
+            **{key: round(value, 3) for key, value in timings.items()}
+        }
+
+    def _query(self, storage, embeddings, topic_id: str) -> Dict:
+        """질의별 순위 평가 + 지연 측정"""
+        max_k = self.k_values[-1]
+        queries = self.corpus.queries
+
+        for query in queries[:self.warmup_queries]:
+            storage.search_chunks(query.query, k=max_k, topic_id=topic_id,
+                                  query_vector=embeddings.embed_query(query.query), **self.search_kwargs)
+
+        hits = {k: 0 for k in self.k_values}
+        hits_by_language: Dict[str, Dict[int, int]] = {}
+        count_by_language: Dict[str, int] = {}
+        reciprocal_ranks = []
+        total_latencies = []
+        search_latencies = []
+
+        for query in queries:
+            started = time.perf_counter()
+            query_vector = embeddings.embed_query(query.query)
+            search_started = time.perf_counter()
+            results = storage.search_chunks(query.query, k=max_k, topic_id=topic_id,
+                                            query_vector=query_vector, **self.search_kwargs)
+            finished = time.perf_counter()
+            total_latencies.append((finished - started) * 1000)
+            search_latencies.append((finished - search_started) * 1000)
+
+            rank = next(
+                (position for position, doc in enumerate(results, 1) if query.marker in doc.page_content),
+                None
+            )
+            reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+            language_hits = hits_by_language.setdefault(query.language, {k: 0 for k in self.k_values})
+            count_by_language[query.language] = count_by_language.get(query.language, 0) + 1
+            for k in self.k_values:
+                if rank and rank <= k:
+                    hits[k] += 1
+                    language_hits[k] += 1
+
+        total = len(queries) or 1
+        return {
+            "retrieval": {
+                **{f"recall@{k}": round(hits[k] / total, 4) for k in self.k_values},
+                "mrr": round(statistics.fmean(reciprocal_ranks), 4) if reciprocal_ranks else 0.0,
+                "by_language": {
+                    language: {
+                        f"recall@{k}": round(language_hits[k] / count_by_language[language], 4)
+                        for k in self.k_values
+                    }
+                    for language, language_hits in hits_by_language.items()
+                }
+            },
+            "latency_ms": {
+                "query": self._latency_summary(total_latencies),
+                "search": self._latency_summary(search_latencies)
+            }
+        }
+
+    @staticmethod
+    def _latency_summary(latencies: List[float]) -> Dict:
+        """p50/p95/p99/mean (ms)"""
+        return {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "mean": round(statistics.fmean(latencies), 3) if latencies else 0.0
+        }
+
+
+def save_result(result: Dict, path: str):
+    """결과 JSON 저장"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info(f"Benchmark result saved: {path}")
+
+
+def compare_results(baseline: Dict, current: Dict) -> List[Dict]:
+    """
+    Compare two result dicts metric by metric
+
+    Returns:
+        [{metric, baseline, current, delta}] for recall/MRR, latency, throughput and storage
+    """
+    def flatten(result: Dict) -> Dict[str, float]:
+        metrics = {
+            key: value for key, value in result.get("retrieval", {}).items()
+            if isinstance(value, (int, float))
+        }
+        for kind, summary in result.get("latency_ms", {}).items():
+            for name, value in summary.items():
+                metrics[f"latency_ms.{kind}.{name}"] = value
+        metrics["ingest.chunks_per_second"] = result.get("ingest", {}).get("chunks_per_second", 0.0)
+        metrics["storage.bytes_per_chunk"] = result.get("storage", {}).get("bytes_per_chunk", 0.0)
+        return metrics
+
+    before, after = flatten(baseline), flatten(current)
+    return [
+        {
+            "metric": metric,
+            "baseline": before[metric],
+            "current": after[metric],
+            "delta": round(after[metric] - before[metric], 4)
+        }
+        for metric in before
+        if metric in after
+    ]
@@ -3,13 +3,19 @@ Base Chunker Interface
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 from langchain.schema import Document
+from core.logging import get_logger
+
+logger = get_logger("base_chunker")
 
 
 class BaseChunker(ABC):
     """청킹 전략 추상 인터페이스"""
     
+    # 스트림 블록(페이지/행 묶음/줄 묶음) 연결 구분자
+    stream_separator = "\n\n"
+    
     @abstractmethod
     def chunk(self, text: str, metadata: dict = None) -> List[Document]:
         """
@@ -24,6 +30,110 @@ class BaseChunker(ABC):
         """
         pass
     
+    def chunk_stream(self, blocks: Iterable, metadata: dict = None, buffer_chars: int = 32768) -> Iterator[Document]:
+        """
+        Chunk a stream of text blocks with bounded memory
+        
+        블록을 버퍼에 모으다가 buffer_chars를 넘으면 청킹하고, 마지막(미완성) 청크는
+        다음 블록과 이어 붙여 다시 청킹 → 경계/오버랩이 전체 텍스트 청킹과 같게 유지
+        
+        Args:
+            blocks: Documents or strings (pages, row groups, line blocks)
+            metadata: Metadata to attach to chunks
+            buffer_chars: Buffered text size that triggers chunking
+            
+        Yields:
+            Document chunks in order
+        """
+        limit = max(buffer_chars, 4 * getattr(self, "chunk_size", 0))
+        buffer = ""
+        for block in blocks:
+            text = block.page_content if isinstance(block, Document) else block
+            if not text or not text.strip():
+                continue
+            
+            buffer = f"{buffer}{self.stream_separator}{text}" if buffer else text
+            if len(buffer) < limit:
+                continue
+            
+            chunks, buffer = self._flush_stream_buffer(buffer, metadata)
+            yield from chunks
+        
+        if buffer.strip():
+            yield from self.chunk(buffer, metadata)
+    
+    def _flush_stream_buffer(self, buffer: str, metadata: dict = None) -> Tuple[List[Document], str]:
+        """
+        Chunk the stream buffer and keep the trailing chunk as carry-over
+        
+        Args:
+            buffer: Buffered text
+            metadata: Metadata to attach to chunks
+            
+        Returns:
+            (finished chunks, text carried into the next buffer)
+        """
+        chunks, starts = self._split_chunks(buffer, metadata)
+        if len(chunks) < 2:
+            return chunks, ""
+        
+        # 마지막 청크 시작 위치부터 이월
+        start = starts[-1]
+        if start is None:
+            # 위치를 모르면 마지막 청크 길이만큼 끝부분을 이월해 연속성 유지
+            logger.debug(f"{self.name}: no start offset for the last chunk, carrying its length over")
+            start = max(0, len(buffer) - len(chunks[-1].page_content))
+        if start <= 0:
+            return chunks, ""
+        return chunks[:-1], buffer[start:]
+    
+    def _split_chunks(self, text: str, metadata: dict = None) -> Tuple[List[Document], List[Optional[int]]]:
+        """
+        Split text and report where each chunk starts
+        
+        Chunkers whose splitter knows the offsets override this; the default
+        locates the chunks of chunk() in order.
+        
+        Args:
+            text: Input text
+            metadata: Metadata to attach to chunks
+            
+        Returns:
+            (chunks, start offset of each chunk in text or None if unknown)
+        """
+        chunks = self.chunk(text, metadata)
+        starts, position = [], 0
+        for chunk in chunks:
+            start = text.find(chunk.page_content, position)
+            starts.append(start if start >= 0 else None)
+            if start >= 0:
+                position = start + 1
+        return chunks, starts
+    
+    @staticmethod
+    def _split_with_splitter(splitter, text: str, metadata: dict = None) -> Tuple[List[Document], List[Optional[int]]]:
+        """
+        Split with a LangChain text splitter created with add_start_index=True
+        
+        Returns:
+            (chunks, splitter start offset of each chunk; removed from chunk metadata)
+        """
+        chunks = splitter.create_documents([text], metadatas=[metadata or {}])
+        starts = [chunk.metadata.pop("start_index", None) for chunk in chunks]
+        return chunks, starts
+    
+    def pop_chunk_vectors(self, chunks: List[Document]) -> Optional[List[Optional[List[float]]]]:
+        """
+        Take chunk vectors computed while chunking (e.g. semantic sentence vectors)
+        
+        Args:
+            chunks: Chunks produced by this chunker
+            
+        Returns:
+            Vector (or None) per chunk, or None if the chunker computes no vectors
+        """
+        return None
+    
     @property
     @abstractmethod
     def name(self) -> str:
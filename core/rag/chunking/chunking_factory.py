@@ -49,10 +49,17 @@ class ChunkingFactory:
             if not embeddings:
                 raise ValueError("Embeddings required for semantic chunking")
             sem_config = strategies_config.get("semantic", {})
-            threshold_type = kwargs.get("threshold_type", "percentile")
-            threshold = kwargs.get("threshold", sem_config.get("threshold", 95))
+            threshold_type = kwargs.get("threshold_type", sem_config.get("threshold_type", "percentile"))
+            threshold = kwargs.get("threshold", sem_config.get("threshold_amount", sem_config.get("threshold", 95)))
             logger.info(f"Semantic: threshold={threshold}")
-            return SemanticChunker(embeddings, threshold_type, threshold)
+            return SemanticChunker(
+                embeddings,
+                threshold_type,
+                threshold,
+                buffer_size=kwargs.get("buffer_size", sem_config.get("buffer_size", 1)),
+                batch_size=kwargs.get("batch_size", sem_config.get("batch_size", 64)),
+                chunk_vectors=kwargs.get("chunk_vectors", sem_config.get("chunk_vectors", "exact"))
+            )
         
         elif strategy == "code":
             from .code_chunker import CodeChunker
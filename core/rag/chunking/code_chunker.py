@@ -2,7 +2,7 @@
 Code Chunker
 """
 
-from typing import List
+from typing import List, Optional, Tuple
 from langchain.schema import Document
 from langchain.text_splitter import Language, RecursiveCharacterTextSplitter
 from core.logging import get_logger
@@ -58,30 +58,38 @@ class CodeChunker(BaseChunker):
                 logger.warning(f"Unknown language: {self.language}, using default")
                 return RecursiveCharacterTextSplitter(
                     chunk_size=self.chunk_size,
-                    chunk_overlap=self.overlap
+                    chunk_overlap=self.overlap,
+                    add_start_index=True
                 )
             
             return RecursiveCharacterTextSplitter.from_language(
                 language=lang_enum,
                 chunk_size=self.chunk_size,
-                chunk_overlap=self.overlap
+                chunk_overlap=self.overlap,
+                add_start_index=True
             )
         except Exception as e:
             logger.error(f"Failed to create code splitter: {e}")
             return RecursiveCharacterTextSplitter(
                 chunk_size=self.chunk_size,
-                chunk_overlap=self.overlap
+                chunk_overlap=self.overlap,
+                add_start_index=True
             )
     
     def chunk(self, text: str, metadata: dict = None) -> List[Document]:
         """Split code into chunks"""
+        chunks, _ = self._split_chunks(text, metadata)
+        return chunks
+    
+    def _split_chunks(self, text: str, metadata: dict = None) -> Tuple[List[Document], List[Optional[int]]]:
+        """Split code and return splitter start offsets"""
         try:
-            chunks = self.splitter.create_documents([text], metadatas=[metadata or {}])
+            chunks, starts = self._split_with_splitter(self.splitter, text, metadata)
             logger.debug(f"Created {len(chunks)} code chunks")
-            return chunks
+            return chunks, starts
         except Exception as e:
             logger.error(f"Code chunking failed: {e}")
-            return [Document(page_content=text, metadata=metadata or {})]
+            return [Document(page_content=text, metadata=metadata or {})], [0]
     
     @property
     def name(self) -> str:
@@ -2,7 +2,8 @@
 Markdown Chunker
 """
 
-from typing import List
+import re
+from typing import List, Tuple
 from langchain.schema import Document
 from langchain.text_splitter import MarkdownHeaderTextSplitter
 from core.logging import get_logger
@@ -42,6 +43,15 @@ class MarkdownChunker(BaseChunker):
             logger.error(f"Markdown chunking failed: {e}")
             return [Document(page_content=text, metadata=metadata or {})]
     
+    def _flush_stream_buffer(self, buffer: str, metadata: dict = None) -> Tuple[List[Document], str]:
+        """마지막 헤더부터 이월 (헤더 메타데이터가 섹션과 함께 유지되도록)"""
+        headers = [match.start() for match in re.finditer(r"^#{1,3} ", buffer, re.MULTILINE)]
+        if not headers or headers[-1] == 0:
+            return self.chunk(buffer, metadata), ""
+        
+        cut = headers[-1]
+        return self.chunk(buffer[:cut], metadata), buffer[cut:]
+    
     @property
     def name(self) -> str:
         return "markdown"
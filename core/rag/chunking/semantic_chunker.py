@@ -2,7 +2,10 @@
 Semantic Chunker
 """
 
-from typing import List
+import re
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import numpy as np
 from langchain.schema import Document
 from core.logging import get_logger
 from .base_chunker import BaseChunker
@@ -11,53 +14,207 @@ logger = get_logger("semantic_chunker")
 
 
 class SemanticChunker(BaseChunker):
-    """의미 기반 청킹 (LangChain SemanticChunker)"""
+    """의미 기반 청킹 (문장 임베딩 거리 기반 분할, 문장 벡터 재사용)"""
     
-    def __init__(self, embeddings, threshold_type: str = "percentile", threshold: float = 95):
+    THRESHOLD_TYPES = ("percentile", "standard_deviation", "interquartile", "gradient")
+    CHUNK_VECTOR_MODES = ("exact", "mean")
+    SENTENCE_SPLIT_REGEX = r"(?<=[.?!。])\s+|\n\s*\n"
+    
+    # 꺼내가지 않은 청크 벡터 보관 상한 (pop_chunk_vectors를 쓰지 않는 호출자 대비)
+    MAX_PENDING_VECTORS = 4096
+    
+    def __init__(
+        self,
+        embeddings,
+        threshold_type: str = "percentile",
+        threshold: float = 95,
+        buffer_size: int = 1,
+        batch_size: int = 64,
+        chunk_vectors: str = "exact"
+    ):
         """
         Initialize semantic chunker
         
         Args:
             embeddings: Embedding model
-            threshold_type: percentile, standard_deviation, interquartile
+            threshold_type: percentile, standard_deviation, interquartile, gradient
             threshold: Threshold value
+            buffer_size: Neighbour sentences pooled on each side when comparing sentences
+            batch_size: Sentences per embedding call
+            chunk_vectors: "exact" to let the caller embed chunk text (single-sentence chunks
+                are seeded into the embedding cache, so only multi-sentence chunks are
+                encoded again), "mean" to reuse mean-pooled sentence vectors as chunk
+                vectors (approximate, skips chunk embedding)
         """
+        if threshold_type not in self.THRESHOLD_TYPES:
+            raise ValueError(f"Unknown threshold type: {threshold_type}")
+        if chunk_vectors not in self.CHUNK_VECTOR_MODES:
+            raise ValueError(f"Unknown chunk vector mode: {chunk_vectors}")
+        
         self.embeddings = embeddings
         self.threshold_type = threshold_type
         self.threshold = threshold
-        self.splitter = None
-        self._load_splitter()
-        logger.info(f"Semantic chunker: {threshold_type}={threshold}")
-    
-    def _load_splitter(self):
-        """Load semantic splitter"""
-        try:
-            from langchain_experimental.text_splitter import SemanticChunker
-            self.splitter = SemanticChunker(
-                self.embeddings,
-                breakpoint_threshold_type=self.threshold_type,
-                breakpoint_threshold_amount=self.threshold
-            )
-        except ImportError:
-            logger.error("langchain-experimental not installed")
-            self.splitter = None
-        except Exception as e:
-            logger.error(f"Failed to load semantic chunker: {e}")
-            self.splitter = None
+        self.buffer_size = max(0, buffer_size)
+        self.batch_size = max(1, batch_size)
+        self.chunk_vectors = chunk_vectors
+        self._pending_vectors: "OrderedDict[str, List[float]]" = OrderedDict()
+        logger.info(
+            f"Semantic chunker: {threshold_type}={threshold}, buffer={self.buffer_size}, "
+            f"batch={self.batch_size}, chunk_vectors={chunk_vectors}"
+        )
     
     def chunk(self, text: str, metadata: dict = None) -> List[Document]:
         """Split text into semantic chunks"""
-        if not self.splitter:
-            logger.warning("Semantic chunker not available, using simple split")
-            return [Document(page_content=text, metadata=metadata or {})]
+        chunks, _ = self._split_chunks(text, metadata)
+        return chunks
+    
+    def pop_chunk_vectors(self, chunks: List[Document]) -> Optional[List[Optional[List[float]]]]:
+        """
+        Take the mean-pooled vectors of chunks produced by this chunker
+        
+        Args:
+            chunks: Chunks to look up
+        
+        Returns:
+            Vector (or None) per chunk, or None when chunk vectors are not reused
+        """
+        if self.chunk_vectors != "mean":
+            return None
+        vectors = [self._pending_vectors.get(chunk.page_content) for chunk in chunks]
+        for chunk in chunks:
+            self._pending_vectors.pop(chunk.page_content, None)
+        return vectors
+    
+    # ========== Splitting ==========
+    
+    def _split_chunks(self, text: str, metadata: dict = None) -> Tuple[List[Document], List[int]]:
+        """
+        Split text at semantic breakpoints
+        
+        Returns:
+            (chunks, start offset of each chunk in text)
+        """
+        spans = self._split_sentences(text)
+        if not spans:
+            return [], []
+        if len(spans) == 1:
+            return self._build_chunks(text, [spans], None, metadata)
         
         try:
-            chunks = self.splitter.create_documents([text], metadatas=[metadata or {}])
-            logger.debug(f"Created {len(chunks)} semantic chunks")
-            return chunks
+            vectors = self._embed_sentences([text[start:end] for start, end in spans])
         except Exception as e:
             logger.error(f"Semantic chunking failed: {e}")
-            return [Document(page_content=text, metadata=metadata or {})]
+            return [Document(page_content=text, metadata=dict(metadata or {}))], [0]
+        
+        breakpoints = self._find_breakpoints(vectors)
+        groups = []
+        start = 0
+        for index in breakpoints:
+            groups.append(spans[start:index + 1])
+            start = index + 1
+        groups.append(spans[start:])
+        
+        chunks, starts = self._build_chunks(text, groups, vectors, metadata)
+        logger.debug(f"Created {len(chunks)} semantic chunks from {len(spans)} sentences")
+        return chunks, starts
+    
+    def _split_sentences(self, text: str) -> List[Tuple[int, int]]:
+        """문장 (시작, 끝) 위치 목록 (공백 문장 제외)"""
+        spans = []
+        position = 0
+        for match in re.finditer(self.SENTENCE_SPLIT_REGEX, text):
+            if text[position:match.start()].strip():
+                spans.append((position, match.start()))
+            position = match.end()
+        if text[position:].strip():
+            spans.append((position, len(text)))
+        return spans
+    
+    def _embed_sentences(self, sentences: List[str]) -> np.ndarray:
+        """문장을 batch_size 단위로 한 번씩만 임베딩"""
+        vectors = []
+        for start in range(0, len(sentences), self.batch_size):
+            vectors.extend(self.embeddings.embed_documents(sentences[start:start + self.batch_size]))
+        return np.asarray(vectors, dtype=np.float32)
+    
+    def _find_breakpoints(self, vectors: np.ndarray) -> List[int]:
+        """인접 문장 윈도우 간 코사인 거리가 임계값을 넘는 문장 인덱스"""
+        # 앞뒤 buffer_size 문장 벡터 평균으로 문맥 윈도우 구성 (연결 텍스트 재임베딩 없이)
+        if self.buffer_size:
+            cumulative = np.vstack([np.zeros((1, vectors.shape[1]), dtype=np.float32), np.cumsum(vectors, axis=0)])
+            indices = np.arange(len(vectors))
+            lower = np.maximum(indices - self.buffer_size, 0)
+            upper = np.minimum(indices + self.buffer_size + 1, len(vectors))
+            windows = (cumulative[upper] - cumulative[lower]) / (upper - lower)[:, None]
+        else:
+            windows = vectors
+        
+        norms = np.maximum(np.linalg.norm(windows, axis=1), 1e-12)
+        similarities = np.einsum("ij,ij->i", windows[:-1], windows[1:]) / (norms[:-1] * norms[1:])
+        distances = 1.0 - similarities
+        
+        if self.threshold_type == "gradient":
+            distances = np.gradient(distances) if len(distances) > 1 else distances
+            threshold = np.percentile(distances, self.threshold)
+        elif self.threshold_type == "standard_deviation":
+            threshold = np.mean(distances) + self.threshold * np.std(distances)
+        elif self.threshold_type == "interquartile":
+            q1, q3 = np.percentile(distances, [25, 75])
+            threshold = np.mean(distances) + self.threshold * (q3 - q1)
+        else:
+            threshold = np.percentile(distances, self.threshold)
+        
+        return [int(index) for index in np.flatnonzero(distances > threshold)]
+    
+    def _build_chunks(
+        self,
+        text: str,
+        groups: List[List[Tuple[int, int]]],
+        vectors: Optional[np.ndarray],
+        metadata: dict = None
+    ) -> Tuple[List[Document], List[int]]:
+        """문장 그룹 → 청크 (mean 모드는 문장 벡터 평균을 청크 벡터로 보관, exact 모드는 단일 문장 청크를 캐시에 등록)"""
+        chunks, starts = [], []
+        seed_texts, seed_vectors = [], []
+        normalized = vectors is not None and np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-3)
+        offset = 0
+        for group in groups:
+            content = text[group[0][0]:group[-1][1]].strip()
+            chunks.append(Document(page_content=content, metadata=dict(metadata or {})))
+            starts.append(group[0][0])
+            
+            if vectors is not None and self.chunk_vectors == "mean":
+                pooled = vectors[offset:offset + len(group)].mean(axis=0)
+                if normalized:
+                    pooled /= max(float(np.linalg.norm(pooled)), 1e-12)
+                self._remember_vector(content, pooled.tolist())
+            elif vectors is not None and len(group) == 1:
+                # 단일 문장 청크의 정확한 임베딩 = 문장 벡터 (앞뒤 공백은 토큰화에 영향 없음)
+                seed_texts.append(content)
+                seed_vectors.append(vectors[offset].tolist())
+            offset += len(group)
+        
+        if seed_texts:
+            self._seed_embedding_cache(seed_texts, seed_vectors)
+        return chunks, starts
+    
+    def _seed_embedding_cache(self, texts: List[str], vectors: List[List[float]]):
+        """청크 텍스트 키로 문장 벡터를 임베딩 캐시에 등록 (exact 모드에서 재인코딩 생략)"""
+        cache = getattr(self.embeddings, "embedding_cache", None)
+        if cache is None:
+            return
+        try:
+            cache.set_many(texts, vectors)
+            logger.debug(f"Seeded embedding cache with {len(texts)} single-sentence chunks")
+        except Exception as e:
+            logger.warning(f"Failed to seed embedding cache: {e}")
+    
+    def _remember_vector(self, content: str, vector: List[float]):
+        """청크 벡터 보관 (상한 초과 시 오래된 것부터 제거)"""
+        self._pending_vectors[content] = vector
+        self._pending_vectors.move_to_end(content)
+        while len(self._pending_vectors) > self.MAX_PENDING_VECTORS:
+            self._pending_vectors.popitem(last=False)
     
     @property
     def name(self) -> str:
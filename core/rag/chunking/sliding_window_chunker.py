@@ -2,7 +2,7 @@
 Sliding Window Chunker
 """
 
-from typing import List
+from typing import List, Optional, Tuple
 from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from core.logging import get_logger
@@ -27,19 +27,25 @@ class SlidingWindowChunker(BaseChunker):
         self.splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=overlap,
-            length_function=len
+            length_function=len,
+            add_start_index=True  # 스트리밍 이월 위치 계산용
         )
         logger.info(f"Sliding window chunker: size={chunk_size}, overlap={overlap}")
     
     def chunk(self, text: str, metadata: dict = None) -> List[Document]:
         """Split text into chunks"""
+        chunks, _ = self._split_chunks(text, metadata)
+        return chunks
+    
+    def _split_chunks(self, text: str, metadata: dict = None) -> Tuple[List[Document], List[Optional[int]]]:
+        """Split text and return splitter start offsets"""
         try:
-            chunks = self.splitter.create_documents([text], metadatas=[metadata or {}])
+            chunks, starts = self._split_with_splitter(self.splitter, text, metadata)
             logger.debug(f"Created {len(chunks)} chunks")
-            return chunks
+            return chunks, starts
         except Exception as e:
             logger.error(f"Chunking failed: {e}")
-            return [Document(page_content=text, metadata=metadata or {})]
+            return [Document(page_content=text, metadata=metadata or {})], [0]
     
     @property
     def name(self) -> str:
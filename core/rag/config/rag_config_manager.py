@@ -17,14 +17,37 @@ class RAGConfigManager:
     DEFAULT_CONFIG = {
         "embedding": {
             "current": DEFAULT_EMBEDDING_MODEL,
-            "models": {}
+            "models": {},
+            "batching": {
+                "token_budget": 16384,
+                "max_batch_size": 128
+            },
+            "runtime": {
+                "backend": "torch",
+                "quantize": False,
+                "quantization_config": "avx2",
+                "parity_threshold": 0.99
+            },
+            "workers": {
+                "enabled": False,
+                "num_workers": 0,
+                "min_texts": 64
+            },
+            "micro_batching": {
+                "enabled": True,
+                "max_batch_size": 32,
+                "max_wait_ms": 5
+            }
         },
         "chunking": {
             "default_strategy": "sliding_window",
             "strategies": {
                 "semantic": {
                     "threshold_type": "percentile",
-                    "threshold_amount": 95
+                    "threshold_amount": 95,
+                    "buffer_size": 1,
+                    "batch_size": 64,
+                    "chunk_vectors": "exact"
                 },
                 "sliding_window": {
                     "window_size": 500,
@@ -35,11 +58,131 @@ class RAGConfigManager:
         "batch_upload": {
             "max_workers": 4,
             "max_file_size_mb": 50,
+            "embed_batch_size": 64,
+            "embed_wait_ms": 200,
+            "queue_size": 8,
+            "incremental": True,
             "exclude_patterns": ["node_modules", ".git", "venv", "__pycache__"]
         },
+        "dedup": {
+            "enabled": False,
+            "mode": "link",
+            "max_hamming_distance": 3,
+            "min_chars": 64,
+            "shingle_size": 3
+        },
+        "reembed": {
+            "enabled": True,
+            "embed_batch_size": 32,
+            "scan_batch_size": 256,
+            "pause_while_chatting": True,
+            "quiet_seconds": 10,
+            "poll_seconds": 1.0,
+            "batch_pause_ms": 20
+        },
+        "streaming": {
+            "block_chars": 32768,
+            "rows_per_block": 200,
+            "flush_chunks": 256
+        },
+        "parser_pool": {
+            "enabled": True,
+            "num_workers": 0,
+            "timeout_seconds": 120,
+            "memory_limit_mb": 2048,
+            "max_tasks_per_worker": 50
+        },
+        "pools": {
+            "embedding": {
+                "max_items": 2,
+                "idle_ttl_seconds": 1800,
+                "memory_budget_mb": 1024
+            },
+            "vector_store": {
+                "max_items": 4,
+                "idle_ttl_seconds": 1800,
+                "memory_budget_mb": 0
+            }
+        },
+        "vector_storage": {
+            "mode": "float32",
+            "models": {},
+            "rescore_multiplier": 4,
+            "scan_batch_size": 8192,
+            "scan_warn_rows": 50000,
+            "recall_sample_rows": 2000
+        },
+        "compaction": {
+            "enabled": True,
+            "check_interval_seconds": 30,
+            "quiet_seconds": 5,
+            "max_fragments": 32,
+            "deleted_ratio": 0.1,
+            "idle_seconds": 300,
+            "retain_versions_seconds": 600
+        },
         "retrieval": {
             "top_k": 10,
-            "description": "Number of documents to retrieve from vector database"
+            "description": "Number of documents to retrieve from vector database",
+            "search_mode": "vector",
+            "rerank_model": "",
+            "fetch_k": 30,
+            "final_k": 5,
+            "rerank": {
+                "batch_size": 16,
+                "max_length": 256,
+                "time_budget_ms": 800,
+                "cache_max_entries": 4096
+            },
+            "mmr": {
+                "enabled": False,
+                "fetch_k": 20,
+                "lambda_mult": 0.5,
+                "merge_adjacent": False
+            },
+            "context_packing": {
+                "enabled": True,
+                "max_tokens": 4000,
+                "model_budgets": {
+                    "gpt-4o": 8000,
+                    "gpt-3.5": 3000,
+                    "gemini": 8000,
+                    "claude": 8000,
+                    "sonar": 3000
+                },
+                "min_chunk_tokens": 32,
+                "min_overlap_chars": 16
+            },
+            "fan_out": {
+                "enabled": False,
+                "models": [],
+                "include_previous_models": True,
+                "model_weights": {},
+                "normalization": "minmax",
+                "max_workers": 4
+            },
+            "hybrid": {
+                "fts_enabled": True,
+                "base_tokenizer": "ngram",
+                "ngram_min_length": 2,
+                "ngram_max_length": 3,
+                "rrf_k": 60,
+                "candidate_multiplier": 4
+            },
+            "cache": {
+                "max_entries": 256,
+                "ttl_seconds": 600
+            },
+            "ann_index": {
+                "enabled": True,
+                "index_type": "IVF_PQ",
+                "metric": "l2",
+                "min_rows": 10000,
+                "reindex_ratio": 0.1,
+                "retrain_growth": 2.0,
+                "nprobes": 20,
+                "refine_factor": 5
+            }
         }
     }
     
@@ -171,6 +314,76 @@ class RAGConfigManager:
         """배치 업로드 설정 조회"""
         return self.config.get("batch_upload", self.DEFAULT_CONFIG["batch_upload"])
     
+    def get_dedup_config(self) -> Dict:
+        """근접 중복 청크 제거 설정 조회 (enabled, mode, max_hamming_distance, min_chars)"""
+        defaults = self.DEFAULT_CONFIG["dedup"]
+        return {**defaults, **self.config.get("dedup", {})}
+    
+    def get_reembed_config(self) -> Dict:
+        """임베딩 모델 변경 후 백그라운드 재임베딩 설정 조회 (enabled, 배치 크기, 채팅 중 일시정지)"""
+        defaults = self.DEFAULT_CONFIG["reembed"]
+        return {**defaults, **self.config.get("reembed", {})}
+    
+    def get_streaming_config(self) -> Dict:
+        """스트리밍 적재 설정 조회 (block_chars, rows_per_block, flush_chunks)"""
+        defaults = self.DEFAULT_CONFIG["streaming"]
+        return {**defaults, **self.config.get("streaming", {})}
+    
+    def get_parser_pool_config(self) -> Dict:
+        """문서 파서 프로세스 풀 설정 조회 (timeout_seconds, memory_limit_mb 등)"""
+        defaults = self.DEFAULT_CONFIG["parser_pool"]
+        return {**defaults, **self.config.get("parser_pool", {})}
+    
+    def get_embedding_batching_config(self) -> Dict:
+        """임베딩 동적 배치 설정 조회 (token_budget, max_batch_size)"""
+        defaults = self.DEFAULT_CONFIG["embedding"]["batching"]
+        return {**defaults, **self.config.get("embedding", {}).get("batching", {})}
+    
+    def get_embedding_runtime_config(self) -> Dict:
+        """로컬 임베딩 실행 백엔드 설정 조회 (torch / onnx, int8 양자화)"""
+        defaults = self.DEFAULT_CONFIG["embedding"]["runtime"]
+        return {**defaults, **self.config.get("embedding", {}).get("runtime", {})}
+    
+    def get_embedding_workers_config(self) -> Dict:
+        """멀티프로세스 임베딩 워커 설정 조회 (enabled, num_workers, min_texts)"""
+        defaults = self.DEFAULT_CONFIG["embedding"]["workers"]
+        return {**defaults, **self.config.get("embedding", {}).get("workers", {})}
+    
+    def get_embedding_micro_batching_config(self) -> Dict:
+        """쿼리 임베딩 마이크로 배치 설정 조회 (max_batch_size, max_wait_ms)"""
+        defaults = self.DEFAULT_CONFIG["embedding"]["micro_batching"]
+        return {**defaults, **self.config.get("embedding", {}).get("micro_batching", {})}
+    
+    def get_pool_config(self, name: str) -> Dict:
+        """모델/스토어 풀 해제 정책 설정 조회 (max_items, idle_ttl_seconds, memory_budget_mb)"""
+        defaults = self.DEFAULT_CONFIG["pools"].get(name, {})
+        return {**defaults, **self.config.get("pools", {}).get(name, {})}
+    
+    def get_vector_storage_config(self, model_id: Optional[str] = None) -> Dict:
+        """
+        벡터 저장 형식 설정 조회 (모델별 mode가 기본 mode보다 우선)
+        
+        Args:
+            model_id: Embedding model ID (None for the default mode)
+        """
+        defaults = self.DEFAULT_CONFIG["vector_storage"]
+        storage_config = {**defaults, **self.config.get("vector_storage", {})}
+        if model_id and model_id in storage_config.get("models", {}):
+            storage_config["mode"] = storage_config["models"][model_id]
+        return storage_config
+    
+    def set_vector_storage_mode(self, model_id: str, mode: str):
+        """모델별 벡터 저장 형식 설정 (float32 / float16 / int8 / binary)"""
+        storage_config = self.config.setdefault("vector_storage", {})
+        storage_config.setdefault("models", {})[model_id] = mode
+        self._save_config(self.config)
+        logger.info(f"Vector storage mode for {model_id}: {mode}")
+    
+    def get_compaction_config(self) -> Dict:
+        """LanceDB compaction 스케줄러 설정 조회"""
+        defaults = self.DEFAULT_CONFIG["compaction"]
+        return {**defaults, **self.config.get("compaction", {})}
+    
     def get_retrieval_config(self) -> Dict:
         """검색 설정 조회"""
         return self.config.get("retrieval", self.DEFAULT_CONFIG["retrieval"])
@@ -180,6 +393,58 @@ class RAGConfigManager:
         retrieval_config = self.get_retrieval_config()
         return retrieval_config.get("top_k", 10)
     
+    def get_search_mode(self) -> str:
+        """검색 모드 조회 (vector | fts | hybrid, 기본값: vector)"""
+        mode = self.get_retrieval_config().get("search_mode", "vector")
+        return mode if mode in ("vector", "fts", "hybrid") else "vector"
+    
+    def get_hybrid_config(self) -> Dict:
+        """하이브리드 검색 설정 조회 (FTS 토크나이저, RRF 상수 등)"""
+        defaults = self.DEFAULT_CONFIG["retrieval"]["hybrid"]
+        return {**defaults, **self.get_retrieval_config().get("hybrid", {})}
+    
+    def get_rerank_config(self) -> Dict:
+        """
+        Cross-encoder 재정렬 설정 조회 (rerank_model이 비어 있으면 비활성)
+        
+        Returns:
+            {rerank_model, fetch_k, final_k, batch_size, max_length, time_budget_ms, cache_max_entries}
+        """
+        defaults = self.DEFAULT_CONFIG["retrieval"]
+        retrieval_config = self.get_retrieval_config()
+        return {
+            **defaults["rerank"],
+            **retrieval_config.get("rerank", {}),
+            "rerank_model": retrieval_config.get("rerank_model", defaults["rerank_model"]),
+            "fetch_k": retrieval_config.get("fetch_k", defaults["fetch_k"]),
+            "final_k": retrieval_config.get("final_k", defaults["final_k"])
+        }
+    
+    def get_mmr_config(self) -> Dict:
+        """MMR 다양성 선택 설정 조회 (enabled, fetch_k, lambda_mult, merge_adjacent)"""
+        defaults = self.DEFAULT_CONFIG["retrieval"]["mmr"]
+        return {**defaults, **self.get_retrieval_config().get("mmr", {})}
+    
+    def get_context_packing_config(self) -> Dict:
+        """RAG 컨텍스트 패킹 설정 조회 (enabled, max_tokens, model_budgets 등)"""
+        defaults = self.DEFAULT_CONFIG["retrieval"]["context_packing"]
+        return {**defaults, **self.get_retrieval_config().get("context_packing", {})}
+    
+    def get_fan_out_config(self) -> Dict:
+        """다중 토픽·모델 병렬 검색 설정 조회 (enabled, models, model_weights, normalization 등)"""
+        defaults = self.DEFAULT_CONFIG["retrieval"]["fan_out"]
+        return {**defaults, **self.get_retrieval_config().get("fan_out", {})}
+    
+    def get_index_config(self) -> Dict:
+        """ANN 인덱스 설정 조회 (index_type, min_rows, nprobes, refine_factor 등)"""
+        defaults = self.DEFAULT_CONFIG["retrieval"]["ann_index"]
+        return {**defaults, **self.get_retrieval_config().get("ann_index", {})}
+    
+    def get_retrieval_cache_config(self) -> Dict:
+        """검색 결과 캐시 설정 조회"""
+        defaults = self.DEFAULT_CONFIG["retrieval"]["cache"]
+        return {**defaults, **self.get_retrieval_config().get("cache", {})}
+    
     def add_embedding_model(self, name: str, config: Dict):
         """새 임베딩 모델 추가"""
         if "embedding" not in self.config:
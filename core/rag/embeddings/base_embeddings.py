@@ -36,6 +36,22 @@ class BaseEmbeddings(ABC):
         """
         pass
     
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several queries at once (override to batch)
+        
+        Args:
+            texts: Query texts
+            
+        Returns:
+            Embedding vectors in input order
+        """
+        return [self.embed_query(text) for text in texts]
+    
+    def release(self):
+        """Release model resources (override to free memory)"""
+        pass
+    
     @property
     @abstractmethod
     def dimension(self) -> int:
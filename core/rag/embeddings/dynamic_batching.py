@@ -0,0 +1,47 @@
+"""
+Dynamic Batching
+토큰 길이 기준 정렬 + 토큰 예산 기반 배치 구성 (패딩 낭비 최소화)
+"""
+
+from typing import List, Sequence
+
+
+def plan_token_batches(
+    lengths: Sequence[int],
+    token_budget: int = 16384,
+    max_batch_size: int = 128
+) -> List[List[int]]:
+    """
+    Group text indices into batches of similar token length
+
+    Texts are sorted longest-first and a batch is closed when
+    (batch size x longest length in batch) would exceed the token budget,
+    i.e. the padded tensor size the model actually processes.
+
+    Args:
+        lengths: Token length of each text
+        token_budget: Max padded tokens per batch
+        max_batch_size: Max texts per batch
+
+    Returns:
+        List of batches, each a list of original indices
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_max = 0
+
+    for index in order:
+        length = max(1, lengths[index])
+        # 내림차순 정렬이므로 배치의 최대 길이는 첫 항목 길이
+        padded_max = current_max or length
+        if current and ((len(current) + 1) * padded_max > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, padded_max = [], length
+        current.append(index)
+        current_max = padded_max
+
+    if current:
+        batches.append(current)
+    return batches
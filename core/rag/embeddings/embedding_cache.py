@@ -1,128 +1,476 @@
 """
 Embedding Cache
 임베딩 결과 캐싱으로 성능 향상
+
+디스크 캐시는 모델/차원별 네임스페이스 폴더에 저장:
+- vectors.f32 (압축 후 vectors.<세대>.f32): append-only float32 행렬 (memory-mapped 읽기)
+- index.sqlite: 텍스트 해시 → 행 번호 인덱스 + 현재 세대
+
+같은 저장소를 여러 인스턴스/프로세스가 공유하므로 append·압축·삭제는 인덱스의
+BEGIN IMMEDIATE 쓰기 락 안에서 수행하고, 새 행 번호는 파일 크기에서 계산한다.
+압축/삭제는 새 세대 파일에 쓰므로 읽는 쪽은 인덱스 스냅샷의 세대 파일과 행 번호를 함께 사용한다.
 """
 
-from typing import List, Optional
-from functools import lru_cache
+import re
+import sqlite3
 import hashlib
-import pickle
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import RLock
+from typing import List, Optional, Sequence
 from pathlib import Path
+import numpy as np
 from core.logging import get_logger
 
 logger = get_logger("embedding_cache")
 
 
 class EmbeddingCache:
-    """임베딩 캐시 관리"""
-    
-    def __init__(self, cache_dir: Optional[str] = None, max_memory_cache: int = 1000):
+    """임베딩 캐시 관리 (메모리 LRU + memory-mapped 디스크 저장소)"""
+
+    VECTORS_FILE = "vectors.f32"
+    INDEX_FILE = "index.sqlite"
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_memory_cache: int = 1000,
+        namespace: str = "default",
+        dimension: Optional[int] = None,
+        max_disk_items: int = 200000
+    ):
         """
         Initialize embedding cache
-        
+
         Args:
             cache_dir: Disk cache directory (None for memory only)
             max_memory_cache: Max items in memory cache
+            namespace: Cache namespace (embedding model ID)
+            dimension: Embedding dimension (None to infer from first write)
+            max_disk_items: Disk rows before compaction keeps the most recent ones
         """
         self.cache_dir = Path(cache_dir) if cache_dir else None
         self.max_memory_cache = max_memory_cache
-        self.memory_cache = {}
-        
+        self.namespace = re.sub(r"[^0-9A-Za-z_.-]", "_", namespace or "default")
+        self.dimension = dimension
+        self.max_disk_items = max_disk_items
+        self.memory_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+
+        self._lock = RLock()
+        self._store_dir: Optional[Path] = None
+        self._index: Optional[sqlite3.Connection] = None
+        self._mmap: Optional[np.memmap] = None
+        self._disk_rows = 0
+        self._generation = 0  # 압축/삭제 세대 (다른 인스턴스의 파일 재작성 감지)
+
         if self.cache_dir:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Disk cache enabled: {cache_dir}")
+            if self.dimension:
+                self._open_store(self.dimension)
+            logger.info(f"Disk cache enabled: {cache_dir} (namespace={self.namespace})")
         else:
             logger.info("Memory cache only")
-    
+
     def _get_hash(self, text: str) -> str:
         """텍스트 해시 생성"""
         return hashlib.md5(text.encode()).hexdigest()
-    
+
+    # ========== Disk Store ==========
+
+    def _open_store(self, dimension: int):
+        """모델/차원별 디스크 저장소 열기"""
+        self.dimension = dimension
+        self._store_dir = self.cache_dir / f"{self.namespace}_{dimension}"
+        self._store_dir.mkdir(parents=True, exist_ok=True)
+
+        self._index = sqlite3.connect(
+            str(self._store_dir / self.INDEX_FILE), check_same_thread=False, timeout=30.0
+        )
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute("PRAGMA synchronous=NORMAL")
+        self._index.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                hash TEXT PRIMARY KEY,
+                row INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._index.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        self._index.commit()
+
+        with self._write_transaction():
+            # 쓰기 도중 종료된 경우: 불완전한 행과 범위 밖 인덱스 정리 (다른 쓰기와 동시 실행 안 됨)
+            self._generation = self._read_generation()
+            file_rows = self._truncate_partial_row()
+            self._index.execute("DELETE FROM entries WHERE row >= ?", (file_rows,))
+            self._remove_stale_files()
+
+        self._disk_rows = file_rows
+        self._mmap = None
+        logger.debug(f"Disk store opened: {self._store_dir} ({file_rows} rows)")
+
+    @contextmanager
+    def _write_transaction(self):
+        """인덱스 쓰기 락 (BEGIN IMMEDIATE: 같은 저장소를 여는 모든 프로세스 간 직렬화)"""
+        self._index.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._index.rollback()
+            raise
+        self._index.commit()
+
+    def _vectors_path(self, generation: Optional[int] = None) -> Path:
+        """세대별 벡터 파일 경로 (세대 0은 기존 파일명)"""
+        generation = self._generation if generation is None else generation
+        if generation == 0:
+            return self._store_dir / self.VECTORS_FILE
+        return self._store_dir / f"vectors.{generation}.f32"
+
+    def _remove_stale_files(self, generation: Optional[int] = None):
+        """이전 세대 벡터 파일 삭제 (None이면 현재 세대 외 전부, 다른 프로세스가 매핑 중이면 다음 기회에)"""
+        if generation is not None:
+            paths = [self._vectors_path(generation)]
+        else:
+            current = self._vectors_path()
+            paths = [path for path in self._store_dir.glob("vectors*.f32") if path != current]
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"Stale cache file still in use: {path.name} ({e})")
+
+    def _file_rows(self) -> int:
+        """벡터 파일의 완전한 행 수"""
+        vectors_path = self._vectors_path()
+        if not vectors_path.exists():
+            return 0
+        return vectors_path.stat().st_size // (self.dimension * 4)
+
+    def _truncate_partial_row(self) -> int:
+        """불완전한 마지막 행 제거 후 행 수 반환 (쓰기 락 보유 상태에서 호출)"""
+        vectors_path = self._vectors_path()
+        file_rows = self._file_rows()
+        if vectors_path.exists() and vectors_path.stat().st_size != file_rows * self.dimension * 4:
+            with open(vectors_path, "r+b") as f:
+                f.truncate(file_rows * self.dimension * 4)
+        return file_rows
+
+    def _read_generation(self) -> int:
+        """저장소 세대 번호"""
+        row = self._index.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def _write_generation(self, generation: int):
+        """새 세대 파일로 전환 기록 (쓰기 락 보유 상태에서 호출, 커밋 시 다른 인스턴스에 보임)"""
+        self._index.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)", (generation,)
+        )
+        self._generation = generation
+
+    def _sync_with_disk(self):
+        """다른 인스턴스의 append/압축 반영 (행 수 갱신, 세대 변경 시 memory map 폐기)"""
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._generation = generation
+            self._mmap = None
+        self._disk_rows = self._file_rows()
+
+    def _get_mmap(self) -> Optional[np.memmap]:
+        """현재 행 수에 맞는 memory map 반환 (파일 증가 시 재매핑)"""
+        if self._disk_rows == 0:
+            return None
+        if self._mmap is None or self._mmap.shape[0] < self._disk_rows:
+            self._mmap = np.memmap(
+                self._vectors_path(),
+                dtype=np.float32,
+                mode="r",
+                shape=(self._disk_rows, self.dimension)
+            )
+        return self._mmap
+
+    def _disk_get_many(self, hashes: Sequence[str]) -> dict:
+        """디스크에서 해시 목록 조회"""
+        found = {}
+        if self._index is None or not hashes:
+            return found
+
+        rows = {}
+        # 인덱스 조회와 파일 상태를 한 읽기 트랜잭션에서 확인 (도중 압축 방지)
+        self._index.execute("BEGIN")
+        try:
+            self._sync_with_disk()
+            # SQLite 변수 개수 제한 고려
+            for i in range(0, len(hashes), 500):
+                batch = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                cursor = self._index.execute(
+                    f"SELECT hash, row FROM entries WHERE hash IN ({placeholders})", batch
+                )
+                rows.update(cursor.fetchall())
+
+            matrix = self._get_mmap()
+            if matrix is not None:
+                for text_hash, row in rows.items():
+                    if row < matrix.shape[0]:
+                        found[text_hash] = matrix[row].tolist()
+        finally:
+            self._index.commit()
+
+        if not found:
+            return found
+
+        now = time.time()
+        self._index.executemany(
+            "UPDATE entries SET last_access = ? WHERE hash = ?",
+            [(now, text_hash) for text_hash in found]
+        )
+        self._index.commit()
+        return found
+
+    def _disk_set_many(self, items: Sequence[tuple]):
+        """디스크 저장소에 append (이미 있는 해시는 건너뜀)"""
+        if not items:
+            return
+        if self._index is None:
+            self._open_store(len(items[0][1]))
+
+        items = [(h, e) for h, e in items if len(e) == self.dimension]
+        if not items:
+            return
+
+        with self._write_transaction():
+            hashes = [h for h, _ in items]
+            existing = set()
+            for i in range(0, len(hashes), 500):
+                batch = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                cursor = self._index.execute(
+                    f"SELECT hash FROM entries WHERE hash IN ({placeholders})", batch
+                )
+                existing.update(row[0] for row in cursor.fetchall())
+
+            new_items = []
+            seen = set(existing)
+            for text_hash, embedding in items:
+                if text_hash not in seen:
+                    seen.add(text_hash)
+                    new_items.append((text_hash, embedding))
+            if not new_items:
+                return
+
+            # 다른 인스턴스/프로세스가 추가한 행 뒤에 이어서 기록
+            start_row = self._truncate_partial_row()
+            matrix = np.asarray([e for _, e in new_items], dtype=np.float32)
+            with open(self._vectors_path(), "ab") as f:
+                f.write(matrix.tobytes())
+
+            now = time.time()
+            self._index.executemany(
+                "INSERT OR REPLACE INTO entries (hash, row, last_access) VALUES (?, ?, ?)",
+                [(h, start_row + i, now) for i, (h, _) in enumerate(new_items)]
+            )
+            self._disk_rows = start_row + len(new_items)
+
+        if self.max_disk_items and self._disk_rows > self.max_disk_items:
+            self.compact()
+
+    def compact(self, max_items: Optional[int] = None) -> int:
+        """
+        디스크 저장소 압축 (최근 사용 항목만 유지, 고아 행 제거)
+
+        Args:
+            max_items: Rows to keep (None for 80% of max_disk_items)
+
+        Returns:
+            Number of rows removed
+        """
+        with self._lock:
+            if self._index is None:
+                return 0
+
+            with self._write_transaction():
+                self._sync_with_disk()
+                keep = max_items if max_items is not None else int(self.max_disk_items * 0.8)
+                cursor = self._index.execute(
+                    "SELECT hash, row FROM entries ORDER BY last_access DESC LIMIT ?", (keep,)
+                )
+                kept = cursor.fetchall()
+
+                matrix = self._get_mmap()
+                previous = self._generation
+
+                if matrix is not None and kept:
+                    rows = np.asarray([row for _, row in kept], dtype=np.int64)
+                    order = np.argsort(rows)  # 순차 읽기
+                    compacted = np.ascontiguousarray(matrix[rows[order]])
+                    hashes = [kept[i][0] for i in order]
+                else:
+                    compacted = np.empty((0, self.dimension), dtype=np.float32)
+                    hashes = []
+
+                # 새 세대 파일에 기록 (이전 스냅샷으로 읽는 인스턴스는 기존 파일을 계속 사용)
+                with open(self._vectors_path(previous + 1), "wb") as f:
+                    f.write(compacted.tobytes())
+
+                self._mmap = None
+                del matrix
+
+                removed = self._disk_rows - len(hashes)
+                now = time.time()
+                self._index.execute("DELETE FROM entries")
+                self._index.executemany(
+                    "INSERT INTO entries (hash, row, last_access) VALUES (?, ?, ?)",
+                    [(h, i, now) for i, h in enumerate(hashes)]
+                )
+                self._write_generation(previous + 1)
+                self._disk_rows = len(hashes)
+            self._remove_stale_files(previous)
+
+            logger.info(f"Embedding cache compacted: kept {len(hashes)}, removed {removed}")
+            return removed
+
+    # ========== Public API ==========
+
     def get(self, text: str) -> Optional[List[float]]:
         """
         Get cached embedding
-        
+
         Args:
             text: Input text
-            
+
         Returns:
             Cached embedding or None
         """
-        text_hash = self._get_hash(text)
-        
-        # Memory cache 확인
-        if text_hash in self.memory_cache:
-            logger.debug(f"Memory cache hit: {text[:50]}")
-            return self.memory_cache[text_hash]
-        
-        # Disk cache 확인
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{text_hash}.pkl"
-            if cache_file.exists():
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Get cached embeddings in one batch
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            List of cached embeddings (None for misses)
+        """
+        hashes = [self._get_hash(text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        with self._lock:
+            missing = []
+            for i, text_hash in enumerate(hashes):
+                embedding = self.memory_cache.get(text_hash)
+                if embedding is not None:
+                    self.memory_cache.move_to_end(text_hash)
+                    results[i] = embedding
+                else:
+                    missing.append(i)
+
+            if missing and self._index is not None:
                 try:
-                    with open(cache_file, 'rb') as f:
-                        embedding = pickle.load(f)
-                    
-                    # Memory cache에 추가
-                    self._add_to_memory(text_hash, embedding)
-                    
-                    logger.debug(f"Disk cache hit: {text[:50]}")
-                    return embedding
+                    found = self._disk_get_many([hashes[i] for i in missing])
+                    for i in missing:
+                        embedding = found.get(hashes[i])
+                        if embedding is not None:
+                            results[i] = embedding
+                            self._add_to_memory(hashes[i], embedding)
+                    if found:
+                        logger.debug(f"Disk cache hit: {len(found)}/{len(missing)}")
                 except Exception as e:
                     logger.error(f"Failed to load cache: {e}")
-        
-        return None
-    
+
+        return results
+
     def set(self, text: str, embedding: List[float]):
         """
         Cache embedding
-        
+
         Args:
             text: Input text
             embedding: Embedding vector
         """
-        text_hash = self._get_hash(text)
-        
-        # Memory cache에 추가
-        self._add_to_memory(text_hash, embedding)
-        
-        # Disk cache에 저장
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{text_hash}.pkl"
-            try:
-                with open(cache_file, 'wb') as f:
-                    pickle.dump(embedding, f)
-                logger.debug(f"Cached to disk: {text[:50]}")
-            except Exception as e:
-                logger.error(f"Failed to save cache: {e}")
-    
+        self.set_many([text], [embedding])
+
+    def set_many(self, texts: Sequence[str], embeddings: Sequence[List[float]]):
+        """
+        Cache embeddings in one batch (single append + single commit)
+
+        Args:
+            texts: Input texts
+            embeddings: Embedding vectors
+        """
+        items = [(self._get_hash(text), list(embedding)) for text, embedding in zip(texts, embeddings)]
+
+        with self._lock:
+            for text_hash, embedding in items:
+                self._add_to_memory(text_hash, embedding)
+
+            if self.cache_dir:
+                try:
+                    self._disk_set_many(items)
+                    logger.debug(f"Cached to disk: {len(items)} items")
+                except Exception as e:
+                    logger.error(f"Failed to save cache: {e}")
+
     def _add_to_memory(self, text_hash: str, embedding: List[float]):
         """Memory cache에 추가 (LRU)"""
-        if len(self.memory_cache) >= self.max_memory_cache:
-            # 가장 오래된 항목 제거
-            oldest = next(iter(self.memory_cache))
-            del self.memory_cache[oldest]
-        
         self.memory_cache[text_hash] = embedding
-    
+        self.memory_cache.move_to_end(text_hash)
+        while len(self.memory_cache) > self.max_memory_cache:
+            self.memory_cache.popitem(last=False)
+
     def clear(self):
         """캐시 전체 삭제"""
-        self.memory_cache.clear()
-        
-        if self.cache_dir and self.cache_dir.exists():
-            for cache_file in self.cache_dir.glob("*.pkl"):
-                cache_file.unlink()
-            logger.info("Cache cleared")
-    
+        with self._lock:
+            self.memory_cache.clear()
+
+            if self._index is not None:
+                self._mmap = None
+                with self._write_transaction():
+                    previous = self._read_generation()
+                    self._index.execute("DELETE FROM entries")
+                    with open(self._vectors_path(previous + 1), "wb"):
+                        pass
+                    self._write_generation(previous + 1)
+                self._disk_rows = 0
+                self._remove_stale_files(previous)
+
+            if self.cache_dir and self.cache_dir.exists():
+                # 이전 버전의 텍스트별 pickle 파일 정리
+                for cache_file in self.cache_dir.glob("*.pkl"):
+                    cache_file.unlink()
+                logger.info("Cache cleared")
+
+    def close(self):
+        """디스크 인덱스 연결 종료"""
+        with self._lock:
+            self._mmap = None
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+
     def get_stats(self) -> dict:
         """캐시 통계"""
         stats = {
             "memory_items": len(self.memory_cache),
             "max_memory": self.max_memory_cache
         }
-        
-        if self.cache_dir and self.cache_dir.exists():
-            disk_items = len(list(self.cache_dir.glob("*.pkl")))
+
+        if self._index is not None:
+            with self._lock:
+                self._sync_with_disk()
+                disk_items = self._index.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
             stats["disk_items"] = disk_items
-        
+            stats["disk_rows"] = self._disk_rows
+            stats["disk_bytes"] = self._disk_rows * self.dimension * 4
+
         return stats
@@ -15,12 +15,13 @@ class EmbeddingFactory:
     """임베딩 모델 팩토리"""
     
     @staticmethod
-    def create_embeddings(model_id: Optional[str] = None) -> BaseEmbeddings:
+    def create_embeddings(model_id: Optional[str] = None, enable_cache: bool = True) -> BaseEmbeddings:
         """
         현재 모델 기반 임베딩 생성
         
         Args:
             model_id: 모델 ID (None이면 현재 모델 사용)
+            enable_cache: 로컬 모델의 임베딩 캐시 사용 여부 (워커 프로세스는 False)
             
         Returns:
             BaseEmbeddings instance
@@ -56,8 +57,10 @@ class EmbeddingFactory:
                 # 추가 설정이 있으면 포함
                 if "model_path" in model_info:
                     model_config["model_path"] = model_info["model_path"]
+                if "backend" in model_info:
+                    model_config["backend"] = model_info["backend"]
                 
-                return SentenceTransformerEmbeddings(model_config)
+                return SentenceTransformerEmbeddings(model_config, enable_cache=enable_cache)
             
             elif provider == "openai":
                 from .openai_embeddings import OpenAIEmbeddings
@@ -137,6 +140,8 @@ class EmbeddingFactory:
                 "provider": "sentence_transformers",
                 "model_path": model_path
             }
+            if kwargs.get("backend"):
+                model_config["backend"] = kwargs["backend"]
             
             # 사용자 커스텀 모델 처리
             if kwargs.get("use_custom_model") and kwargs.get("custom_model_path"):
@@ -44,6 +44,8 @@ class EmbeddingModelManager:
                     "description": default_config.get("description", "한국어 최적화 경량 모델"),
                     "model_path": default_config.get("model", DEFAULT_EMBEDDING_PATH)
                 }
+                if "backend" in default_config:
+                    models[self.DEFAULT_MODEL]["backend"] = default_config["backend"]
         except Exception as e:
             logger.warning(f"Failed to load default model config: {e}")
             # 폴백: 기본값 사용
@@ -67,6 +69,8 @@ class EmbeddingModelManager:
                     "description": model_config.get("description", ""),
                     "model_path": model_config.get("model", model_id)
                 }
+                if "backend" in model_config:
+                    models[model_id]["backend"] = model_config["backend"]
         
         return models
     
@@ -150,12 +154,14 @@ class EmbeddingModelManager:
                 from ..vector_store.lancedb_store import LanceDBStore
                 
                 table_name = self.get_table_name(model_id)
-                store = LanceDBStore(table_name=table_name)
                 
+                # 모델 폴더가 없으면 만들지 않고 0건 처리
                 doc_count = 0
-                if store.db and table_name in store.db.table_names():
-                    table = store.db.open_table(table_name)
-                    doc_count = table.count_rows()
+                if LanceDBStore.has_model_data(model_id, table_name):
+                    store = LanceDBStore(table_name=table_name, model_id=model_id)
+                    if store.db and table_name in store.db.table_names():
+                        table = store.db.open_table(table_name)
+                        doc_count = table.count_rows()
                 
                 result[model_id] = {
                     "document_count": doc_count,
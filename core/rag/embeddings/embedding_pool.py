@@ -3,9 +3,12 @@ Embedding Model Pool (Singleton)
 임베딩 모델 캐싱으로 매번 초기화 방지
 """
 
-from typing import Dict, Optional
+import weakref
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
 from threading import Lock
 from core.logging import get_logger
+from ..pool_policy import PoolEvictionPolicy, get_process_rss, release_memory
 
 logger = get_logger("embedding_pool")
 
@@ -29,9 +32,28 @@ class EmbeddingPool:
             return
         
         self._models: Dict[str, any] = {}  # model_id -> Embeddings
+        self._worker_pools: Dict[str, any] = {}  # model_id -> EmbeddingWorkerPool
+        self._batchers: Dict[str, any] = {}  # model_id -> MicroBatcher
+        # 해제 후에도 외부에서 참조 중인 인스턴스 (재사용 시 중복 로드 방지)
+        self._released = weakref.WeakValueDictionary()
+        self._policy = self._create_policy()
         self._initialized = True
         logger.info("EmbeddingPool initialized")
     
+    def _create_policy(self) -> PoolEvictionPolicy:
+        """RAG 설정 기반 해제 정책 생성"""
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            pool_config = RAGConfigManager().get_pool_config("embedding")
+        except Exception as e:
+            logger.warning(f"Failed to load pool config, using defaults: {e}")
+            pool_config = {}
+        return PoolEvictionPolicy(
+            max_items=pool_config.get("max_items", 2),
+            idle_ttl_seconds=pool_config.get("idle_ttl_seconds", 1800),
+            memory_budget_mb=pool_config.get("memory_budget_mb", 1024)
+        )
+    
     def get_embeddings(self, model_id: Optional[str] = None) -> any:
         """
         Get or create embeddings for model
@@ -46,19 +68,219 @@ class EmbeddingPool:
             model_id = self._get_current_model_id()
         
         # 캐시된 모델 반환
-        if model_id in self._models:
+        embeddings = self._models.get(model_id)
+        if embeddings is not None:
             logger.debug(f"Reusing cached embeddings for: {model_id}")
-            return self._models[model_id]
+            self._policy.touch(model_id)
+            return embeddings
         
         # 새 모델 생성 및 캐시
         with self._lock:
             if model_id not in self._models:
                 from .embedding_factory import EmbeddingFactory
-                embeddings = EmbeddingFactory.create_embeddings()
+                rss_before = get_process_rss()
+                embeddings = self._released.pop(model_id, None)
+                if embeddings is not None and hasattr(embeddings, "ensure_loaded"):
+                    embeddings.ensure_loaded()
+                else:
+                    embeddings = EmbeddingFactory.create_embeddings(model_id)
+                rss_after = get_process_rss()
+                self._attach_worker_pool(model_id, embeddings)
                 self._models[model_id] = embeddings
+                
+                estimate = getattr(embeddings, "estimate_memory_bytes", None)
+                self._policy.record_load(
+                    model_id,
+                    memory_bytes=estimate() if estimate else None,
+                    rss_delta=rss_after - rss_before if rss_before and rss_after else None
+                )
                 logger.info(f"Created new embeddings for: {model_id}")
+            embeddings = self._models[model_id]
+        
+        # 예산 초과 시 가장 오래 사용하지 않은 모델 해제
+        for victim in self._policy.select_over_budget(protect=model_id):
+            self.release(victim)
+        return embeddings
+    
+    def _attach_worker_pool(self, model_id: str, embeddings):
+        """설정 시 로컬 모델에 멀티프로세스 워커 풀 연결 (opt-in)"""
+        if not hasattr(embeddings, "worker_pool") or getattr(embeddings, "model", None) is None:
+            return
+        
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            workers_config = RAGConfigManager().get_embedding_workers_config()
+        except Exception as e:
+            logger.warning(f"Failed to load workers config: {e}")
+            return
+        
+        if not workers_config.get("enabled", False):
+            return
+        
+        from .embedding_workers import EmbeddingWorkerPool
+        worker_pool = EmbeddingWorkerPool(
+            model_id,
+            num_workers=workers_config.get("num_workers", 0),
+            min_texts=workers_config.get("min_texts", 64)
+        )
+        embeddings.worker_pool = worker_pool
+        self._worker_pools[model_id] = worker_pool
+        logger.info(f"Embedding worker pool attached for {model_id}: {worker_pool.get_info()}")
+    
+    def submit(self, text: str, model_id: Optional[str] = None) -> Future:
+        """
+        Queue a query for embedding; concurrent requests are encoded together
+        
+        Args:
+            text: Query text
+            model_id: Embedding model ID (None for current)
+            
+        Returns:
+            Future resolving to the embedding vector
+        """
+        if model_id is None:
+            model_id = self._get_current_model_id()
+        
+        batcher = self._batchers.get(model_id)
+        if batcher is None:
+            batcher = self._get_batcher(model_id)
+        
+        if batcher is not None:
+            future = batcher.submit(text)
+            if not (batcher.stopped and future.done() and future.exception() is not None):
+                return future
+            # 해제로 멈춘 배처와 경합: 새 배처(또는 직접 계산)로 재시도
+            batcher = self._get_batcher(model_id)
+            if batcher is not None:
+                return batcher.submit(text)
+        
+        # 마이크로 배치 비활성화: 즉시 계산
+        future: Future = Future()
+        try:
+            future.set_result(self.get_embeddings(model_id).embed_query(text))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def embed_query(self, text: str, model_id: Optional[str] = None) -> List[float]:
+        """
+        Embed a query through the micro-batching queue (blocking)
         
-        return self._models[model_id]
+        Args:
+            text: Query text
+            model_id: Embedding model ID (None for current)
+            
+        Returns:
+            Embedding vector
+        """
+        return self.submit(text, model_id).result()
+    
+    def _get_batcher(self, model_id: str):
+        """모델별 마이크로 배처 생성 (비활성화 시 None)"""
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            batching_config = RAGConfigManager().get_embedding_micro_batching_config()
+        except Exception as e:
+            logger.warning(f"Failed to load micro batching config: {e}")
+            batching_config = {}
+        
+        if not batching_config.get("enabled", True):
+            return None
+        
+        embeddings = self.get_embeddings(model_id)
+        with self._lock:
+            if model_id not in self._batchers:
+                from .micro_batcher import MicroBatcher
+                self._batchers[model_id] = MicroBatcher(
+                    embeddings.embed_queries,
+                    max_batch_size=batching_config.get("max_batch_size", 32),
+                    max_wait_ms=batching_config.get("max_wait_ms", 5),
+                    name=model_id
+                )
+            return self._batchers[model_id]
+    
+    def get_batch_metrics(self, model_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get micro batching metrics
+        
+        Args:
+            model_id: Specific model (None for all)
+            
+        Returns:
+            Metrics dict (per model when model_id is None)
+        """
+        if model_id:
+            batcher = self._batchers.get(model_id)
+            return batcher.get_metrics() if batcher else {}
+        return {pooled_id: batcher.get_metrics() for pooled_id, batcher in list(self._batchers.items())}
+    
+    def release(self, model_id: str) -> bool:
+        """
+        Unload a model and its workers/batcher
+        
+        Holders of the released instance keep working; the model reloads on next use.
+        A model that is encoding right now (ingest, re-embedding, fan-out search)
+        is never released.
+        
+        Args:
+            model_id: Embedding model ID
+            
+        Returns:
+            True if the model was resident and released
+        """
+        with self._lock:
+            embeddings = self._models.get(model_id)
+            if embeddings is None:
+                return False
+            if getattr(embeddings, "is_in_use", lambda: False)():
+                logger.debug(f"Embeddings in use, not released: {model_id}")
+                self._policy.touch(model_id)
+                return False
+            self._models.pop(model_id)
+            batcher = self._batchers.pop(model_id, None)
+            worker_pool = self._worker_pools.pop(model_id, None)
+            if hasattr(embeddings, "worker_pool"):
+                embeddings.worker_pool = None
+            self._policy.forget(model_id)
+        
+        # 스레드 join/프로세스 종료는 락 밖에서 (다른 모델의 get_embeddings·embed_query 차단 방지)
+        self._stop_batcher(batcher)
+        self._stop_worker_pool(worker_pool)
+        # 확인 직후 사용이 시작됐으면 모델은 남고 다음 get_embeddings에서 재사용
+        if embeddings.release() is False:
+            logger.debug(f"Embeddings became busy during release, kept loaded: {model_id}")
+        self._released[model_id] = embeddings
+        release_memory()
+        logger.info(f"Released embeddings for: {model_id}")
+        return True
+    
+    def evict_idle(self) -> List[str]:
+        """
+        Release models unused longer than the idle TTL (current model is kept)
+        
+        Returns:
+            Released model IDs
+        """
+        released = [
+            model_id for model_id in self._policy.select_idle(protect=self._get_current_model_id())
+            if self.release(model_id)
+        ]
+        if released:
+            logger.info(f"Evicted idle embeddings: {released}")
+        return released
+    
+    def get_memory_report(self) -> Dict[str, Any]:
+        """
+        Per-model memory estimate and idle time
+        
+        Returns:
+            {model_id: {memory_mb, rss_delta_mb, idle_seconds, age_seconds, workers}}
+        """
+        report = self._policy.get_report()
+        for model_id, worker_pool in list(self._worker_pools.items()):
+            if model_id in report:
+                report[model_id]["workers"] = worker_pool.get_info()
+        return report
     
     def clear_cache(self, model_id: Optional[str] = None):
         """
@@ -67,14 +289,37 @@ class EmbeddingPool:
         Args:
             model_id: Specific model to clear (None for all)
         """
+        if model_id:
+            if self.release(model_id):
+                logger.info(f"Cleared embeddings cache for: {model_id}")
+        else:
+            for pooled_id in list(self._models):
+                self.release(pooled_id)
+            logger.info("Cleared all embeddings cache")
+    
+    @staticmethod
+    def _stop_worker_pool(worker_pool):
+        """풀에서 꺼낸 워커 프로세스 종료 (락 밖에서 호출)"""
+        if worker_pool is not None:
+            worker_pool.shutdown()
+    
+    @staticmethod
+    def _stop_batcher(batcher):
+        """풀에서 꺼낸 마이크로 배치 스레드 종료 (대기 요청은 처리 후 종료, 락 밖에서 호출)"""
+        if batcher is not None:
+            batcher.stop(timeout=5)
+    
+    def shutdown(self):
+        """앱 종료 시 마이크로 배치 스레드와 워커 프로세스 정리"""
         with self._lock:
-            if model_id:
-                if model_id in self._models:
-                    del self._models[model_id]
-                    logger.info(f"Cleared embeddings cache for: {model_id}")
-            else:
-                self._models.clear()
-                logger.info("Cleared all embeddings cache")
+            batchers = list(self._batchers.values())
+            worker_pools = list(self._worker_pools.values())
+            self._batchers.clear()
+            self._worker_pools.clear()
+        for batcher in batchers:
+            self._stop_batcher(batcher)
+        for worker_pool in worker_pools:
+            self._stop_worker_pool(worker_pool)
     
     def _get_current_model_id(self) -> str:
         """Get current embedding model ID"""
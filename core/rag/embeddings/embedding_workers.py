@@ -0,0 +1,172 @@
+"""
+Embedding Worker Pool
+프로세스별로 모델을 한 번만 로드하고 공유 메모리로 벡터를 돌려받는 멀티프로세스 임베딩
+"""
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context, shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from core.logging import get_logger
+
+logger = get_logger("embedding_workers")
+
+# 워커 프로세스 전역 모델 (프로세스당 1회 로드)
+_worker_embeddings = None
+
+
+def _init_worker(model_id: str, torch_threads: int):
+    """워커 초기화: 모델 로드 및 스레드 수 제한 (코어 과다 점유 방지)"""
+    global _worker_embeddings
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+
+    from .embedding_factory import EmbeddingFactory
+    # 캐시는 부모 프로세스에서만 관리 (워커가 디스크 저장소를 열지 않도록 생성 시 비활성화)
+    _worker_embeddings = EmbeddingFactory.create_embeddings(model_id, enable_cache=False)
+
+
+def _encode_task(shm_name: str, shape: tuple, indices: List[int], texts: List[str]) -> int:
+    """
+    Encode one batch and write rows into the shared output buffer
+
+    Args:
+        shm_name: Shared memory block name
+        shape: Output array shape (rows, dimension)
+        indices: Output row of each text
+        texts: Batch texts
+
+    Returns:
+        Number of rows written
+    """
+    import numpy as np
+
+    vectors = _worker_embeddings.model.encode(
+        texts,
+        batch_size=len(texts),
+        convert_to_numpy=True,
+        show_progress_bar=False
+    )
+    block = shared_memory.SharedMemory(name=shm_name)
+    try:
+        output = np.ndarray(shape, dtype=np.float32, buffer=block.buf)
+        output[indices] = vectors
+        del output  # 버퍼 참조 해제 후 close
+    finally:
+        block.close()
+    return len(indices)
+
+
+class EmbeddingWorkerPool:
+    """모델을 상주시킨 임베딩 워커 프로세스 풀"""
+
+    def __init__(self, model_id: str, num_workers: int = 0, min_texts: int = 64):
+        """
+        Initialize worker pool (processes start lazily on first encode)
+
+        Args:
+            model_id: Embedding model ID loaded in each worker
+            num_workers: Worker processes (0 for CPU count - 1)
+            min_texts: Smaller requests are encoded in-process (IPC overhead)
+        """
+        cpu_count = os.cpu_count() or 2
+        self.model_id = model_id
+        self.num_workers = num_workers if num_workers > 0 else max(1, cpu_count - 1)
+        self.torch_threads = max(1, cpu_count // self.num_workers)
+        self.min_texts = min_texts
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """프로세스 풀 지연 생성 (spawn: Qt/torch 스레드 상태 fork 방지)"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.num_workers,
+                    mp_context=get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_id, self.torch_threads)
+                )
+                logger.info(f"Started {self.num_workers} embedding workers for {self.model_id}")
+            return self._executor
+
+    def encode_batches(
+        self,
+        texts: Sequence[str],
+        batches: List[List[int]],
+        dimension: int,
+        check_cancel: Optional[Callable[[], bool]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Optional[List[List[float]]]:
+        """
+        Encode planned batches across worker processes
+
+        Batches are queued on the shared executor queue, so idle workers
+        pull the next batch regardless of which file it came from.
+
+        Args:
+            texts: Texts to embed
+            batches: Index batches (see plan_token_batches)
+            dimension: Embedding dimension
+            check_cancel: Optional cancellation check function
+            progress_callback: Optional progress callback (embedded, total)
+
+        Returns:
+            Embeddings in input order, or None if cancelled
+        """
+        import numpy as np
+
+        shape = (len(texts), dimension)
+        block = shared_memory.SharedMemory(create=True, size=max(1, len(texts) * dimension * 4))
+        pending = set()
+        try:
+            executor = self._get_executor()
+            pending = {
+                executor.submit(_encode_task, block.name, shape, batch, [texts[i] for i in batch])
+                for batch in batches
+            }
+
+            done = 0
+            while pending:
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done += future.result()
+                if finished and progress_callback:
+                    progress_callback(done, len(texts))
+                if pending and check_cancel and check_cancel():
+                    logger.info(f"Worker embedding cancelled ({done}/{len(texts)})")
+                    return None
+
+            output = np.ndarray(shape, dtype=np.float32, buffer=block.buf)
+            results = output.tolist()
+            del output
+            return results
+        finally:
+            # 실행 중인 배치가 공유 메모리에 쓰는 동안 해제하지 않음
+            for future in pending:
+                future.cancel()
+            wait(pending)
+            block.close()
+            block.unlink()
+
+    def shutdown(self, wait_for_tasks: bool = False):
+        """워커 프로세스 종료"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait_for_tasks, cancel_futures=True)
+            logger.info(f"Embedding workers stopped for {self.model_id}")
+
+    def get_info(self) -> Dict[str, Any]:
+        """워커 풀 상태"""
+        return {
+            "model_id": self.model_id,
+            "num_workers": self.num_workers,
+            "torch_threads": self.torch_threads,
+            "min_texts": self.min_texts,
+            "running": self._executor is not None
+        }
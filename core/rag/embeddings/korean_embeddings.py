@@ -37,7 +37,12 @@ class KoreanEmbeddings(BaseEmbeddings):
             self.model_name = DEFAULT_EMBEDDING_MODEL
         
         # 임베딩 캐시 초기화
-        self.embedding_cache = EmbeddingCache(cache_dir=cache_folder, max_memory_cache=1000) if enable_cache else None
+        self.embedding_cache = EmbeddingCache(
+            cache_dir=cache_folder,
+            max_memory_cache=1000,
+            namespace=self.model_name,
+            dimension=self._dimension
+        ) if enable_cache else None
         
         self._load_model()
         logger.info(f"Korean embeddings initialized: {model_path} (cache: {enable_cache})")
@@ -109,19 +114,10 @@ class KoreanEmbeddings(BaseEmbeddings):
                 embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
                 return embeddings.tolist()
             
-            # 캐시에서 검색
-            results = []
-            to_embed = []
-            to_embed_indices = []
-            
-            for i, text in enumerate(texts):
-                cached = self.embedding_cache.get(text)
-                if cached:
-                    results.append(cached)
-                else:
-                    results.append(None)
-                    to_embed.append(text)
-                    to_embed_indices.append(i)
+            # 캐시에서 일괄 검색
+            results = self.embedding_cache.get_many(texts)
+            to_embed_indices = [i for i, cached in enumerate(results) if cached is None]
+            to_embed = [texts[i] for i in to_embed_indices]
             
             # 캐시 미스: 새로 임베딩
             if to_embed:
@@ -129,7 +125,7 @@ class KoreanEmbeddings(BaseEmbeddings):
                 
                 for idx, embedding in zip(to_embed_indices, new_embeddings):
                     results[idx] = embedding
-                    self.embedding_cache.set(texts[idx], embedding)
+                self.embedding_cache.set_many(to_embed, new_embeddings)
                 
                 logger.debug(f"Cache miss: {len(to_embed)}/{len(texts)} texts")
             else:
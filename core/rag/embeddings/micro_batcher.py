@@ -0,0 +1,174 @@
+"""
+Micro Batcher
+짧은 시간 창 안에 들어온 동시 쿼리 임베딩 요청을 한 번의 배치 인코딩으로 병합
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+from core.logging import get_logger
+
+logger = get_logger("micro_batcher")
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """Future 기반 임베딩 요청 병합기"""
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "embedding"
+    ):
+        """
+        Initialize micro batcher (worker thread starts on first submit)
+
+        Args:
+            embed_fn: Batch embedding function (texts -> vectors, same order)
+            max_batch_size: Max requests per batch
+            max_wait_ms: Max time the first request waits for others
+            name: Thread/log name
+        """
+        self.embed_fn = embed_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._metrics = {
+            "batches": 0,
+            "items": 0,
+            "max_batch_size": 0,
+            "total_wait_ms": 0.0,
+            "total_encode_ms": 0.0,
+            "last_batch": None
+        }
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for embedding
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Future resolving to the embedding vector
+            (use asyncio.wrap_future to await it)
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._stopped:
+                future.set_exception(RuntimeError(f"MicroBatcher '{self.name}' is stopped"))
+                return future
+            self._ensure_thread()
+            self._queue.put((text, future, time.monotonic()))
+        return future
+
+    def _ensure_thread(self):
+        """배치 스레드 지연 시작 (self._lock 보유 상태에서 호출)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"micro-batch-{self.name}", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """요청 수집 → 시간 창/최대 크기 도달 시 일괄 처리"""
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+
+            batch = [first]
+            deadline = first[2] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._process(batch)
+
+    def _process(self, batch: list):
+        """배치 인코딩 후 각 Future에 결과 전달"""
+        # 호출자가 취소한 요청 제외
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        started = time.monotonic()
+        try:
+            vectors = self.embed_fn([text for text, _, _ in batch])
+            if len(vectors) != len(batch):
+                raise RuntimeError(f"Expected {len(batch)} vectors, got {len(vectors)}")
+        except Exception as e:
+            logger.error(f"Micro batch embedding failed ({len(batch)} items): {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future, _), vector in zip(batch, vectors):
+            future.set_result(vector)
+        self._record(batch, started)
+
+    def _record(self, batch: list, started: float):
+        """배치 단위 지표 기록"""
+        finished = time.monotonic()
+        wait_ms = (started - batch[0][2]) * 1000
+        encode_ms = (finished - started) * 1000
+        with self._lock:
+            metrics = self._metrics
+            metrics["batches"] += 1
+            metrics["items"] += len(batch)
+            metrics["max_batch_size"] = max(metrics["max_batch_size"], len(batch))
+            metrics["total_wait_ms"] += wait_ms
+            metrics["total_encode_ms"] += encode_ms
+            metrics["last_batch"] = {
+                "size": len(batch),
+                "wait_ms": round(wait_ms, 3),
+                "encode_ms": round(encode_ms, 3)
+            }
+        logger.debug(f"[{self.name}] batch of {len(batch)}: wait {wait_ms:.1f}ms, encode {encode_ms:.1f}ms")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get batching metrics
+
+        Returns:
+            Dict with batch/item counts, averages and the last batch
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        batches = metrics["batches"]
+        metrics["avg_batch_size"] = round(metrics["items"] / batches, 2) if batches else 0.0
+        metrics["avg_wait_ms"] = round(metrics.pop("total_wait_ms") / batches, 3) if batches else 0.0
+        metrics["avg_encode_ms"] = round(metrics.pop("total_encode_ms") / batches, 3) if batches else 0.0
+        metrics["pending"] = self._queue.qsize()
+        return metrics
+
+    @property
+    def stopped(self) -> bool:
+        """stop() 호출 여부 (이후 submit은 실패)"""
+        return self._stopped
+
+    def stop(self, timeout: Optional[float] = None):
+        """대기 중인 요청 처리 후 배치 스레드 종료"""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            thread = self._thread
+            self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
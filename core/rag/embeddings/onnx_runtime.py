@@ -0,0 +1,250 @@
+"""
+ONNX Runtime Backend
+SentenceTransformer 모델을 ONNX(선택적 int8 동적 양자화)로 내보내고 CPU에서 실행
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from core.logging import get_logger
+
+logger = get_logger("onnx_runtime")
+
+# torch 출력과 비교할 parity 샘플 (한국어/영어/코드 혼합)
+PARITY_SAMPLES = [
+    "벡터 데이터베이스에 문서를 저장하고 검색합니다.",
+    "서버 오류코드 500이 발생하면 로그를 확인하세요.",
+    "The quick brown fox jumps over the lazy dog.",
+    "def embed_documents(self, texts: List[str]) -> List[List[float]]:",
+    "RAG 파이프라인은 청킹, 임베딩, 검색 단계로 구성된다.",
+]
+
+PARITY_FILE = "parity.json"
+
+
+def get_variant(quantize: bool, quantization_config: str) -> str:
+    """ONNX 내보내기 변형 이름 (fp32 또는 int8_<target>)"""
+    return f"int8_{quantization_config}" if quantize else "fp32"
+
+
+def get_export_dir(model_id: str, quantize: bool, quantization_config: str, base_dir: Optional[str] = None) -> Path:
+    """
+    Directory holding the ONNX export of a model
+
+    Args:
+        model_id: Embedding model ID
+        quantize: Whether the export is int8-quantized
+        quantization_config: Quantization target (arm64, avx2, avx512, avx512_vnni)
+        base_dir: Base directory (None for the user config path)
+
+    Returns:
+        Export directory path
+    """
+    if base_dir:
+        base_path = Path(base_dir)
+    else:
+        try:
+            from utils.config_path import config_path_manager
+            user_config_path = config_path_manager.get_user_config_path()
+            if not (user_config_path and user_config_path.exists()):
+                raise Exception("Use default path")
+            base_path = user_config_path / "embeddings_onnx"
+        except Exception:
+            import os
+            if os.name == "nt":
+                base_path = Path.home() / "AppData" / "Local" / "ChatAIAgent" / "embeddings_onnx"
+            else:
+                base_path = Path.home() / ".chat-ai-agent" / "embeddings_onnx"
+
+    variant = get_variant(quantize, quantization_config)
+    safe_id = re.sub(r"[^0-9A-Za-z_.-]", "_", model_id)
+    return base_path / safe_id / variant
+
+
+def get_onnx_file_name(quantize: bool, quantization_config: str) -> str:
+    """내보낸 디렉터리 기준 ONNX 파일 상대 경로"""
+    if quantize:
+        return f"onnx/model_int8_{quantization_config}.onnx"
+    return "onnx/model.onnx"
+
+
+def get_onnx_model_bytes(model_id: str, runtime: Dict[str, Any]) -> int:
+    """
+    Size of the exported ONNX weights (ONNX Runtime keeps them resident)
+
+    Args:
+        model_id: Embedding model ID
+        runtime: Runtime config (quantize, quantization_config, export_dir)
+
+    Returns:
+        Bytes of the model file plus external data files (0 if not exported)
+    """
+    quantize = runtime.get("quantize", False)
+    quantization_config = runtime.get("quantization_config", "avx2")
+    export_dir = get_export_dir(model_id, quantize, quantization_config, runtime.get("export_dir"))
+    model_file = export_dir / get_onnx_file_name(quantize, quantization_config)
+    if not model_file.exists():
+        return 0
+    # 2GB 초과 모델은 가중치를 <파일명>_data 등 외부 파일에 저장
+    files = [model_file] + list(model_file.parent.glob(f"{model_file.name}_data*"))
+    return sum(path.stat().st_size for path in files if path.is_file())
+
+
+def cosine_parity(reference: List[List[float]], candidate: List[List[float]]) -> float:
+    """
+    Minimum row-wise cosine similarity between two embedding sets
+
+    Args:
+        reference: Embeddings from the torch model
+        candidate: Embeddings from the ONNX model (same texts, same order)
+
+    Returns:
+        Lowest cosine similarity across rows
+    """
+    import numpy as np
+
+    a = np.asarray(reference, dtype=np.float32)
+    b = np.asarray(candidate, dtype=np.float32)
+    norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    cosines = (a * b).sum(axis=1) / np.maximum(norms, 1e-12)
+    return float(cosines.min())
+
+
+def check_parity(reference_model, candidate_model, texts: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Compare ONNX output against the torch model on sample texts
+
+    Tokenizer parity is checked first (identical input_ids), then the
+    cosine similarity of the pooled embeddings.
+
+    Args:
+        reference_model: Torch SentenceTransformer
+        candidate_model: ONNX SentenceTransformer
+        texts: Sample texts (None for PARITY_SAMPLES)
+
+    Returns:
+        Dict with tokenizer_match and min_cosine
+    """
+    texts = texts or PARITY_SAMPLES
+
+    reference_ids = reference_model.tokenize(texts)["input_ids"].tolist()
+    candidate_ids = candidate_model.tokenize(texts)["input_ids"].tolist()
+
+    reference = reference_model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+    candidate = candidate_model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+    return {
+        "tokenizer_match": reference_ids == candidate_ids,
+        "min_cosine": round(cosine_parity(reference, candidate), 6),
+        "samples": len(texts)
+    }
+
+
+def read_parity(export_dir: Path) -> Optional[Dict[str, Any]]:
+    """내보내기 시 기록한 parity 결과 로드"""
+    try:
+        return json.loads((export_dir / PARITY_FILE).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def export_onnx_model(
+    model_path: str,
+    export_dir: Path,
+    quantize: bool = False,
+    quantization_config: str = "avx2",
+    cache_folder: Optional[str] = None
+) -> Path:
+    """
+    Export a SentenceTransformer model to ONNX (and optionally int8)
+
+    Args:
+        model_path: Local path or HuggingFace model ID
+        export_dir: Target directory
+        quantize: Apply dynamic int8 quantization
+        quantization_config: Quantization target (arm64, avx2, avx512, avx512_vnni)
+        cache_folder: HuggingFace cache directory
+
+    Returns:
+        Export directory
+    """
+    from sentence_transformers import SentenceTransformer
+
+    logger.info(f"Exporting {model_path} to ONNX: {export_dir}")
+    # backend="onnx"로 로드하면 ONNX 파일이 없을 때 optimum이 자동 변환
+    onnx_model = SentenceTransformer(model_path, backend="onnx", cache_folder=cache_folder)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    onnx_model.save_pretrained(str(export_dir))
+
+    if quantize:
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        export_dynamic_quantized_onnx_model(
+            onnx_model,
+            quantization_config,
+            str(export_dir),
+            file_suffix=f"int8_{quantization_config}"
+        )
+        logger.info(f"Quantized ONNX model saved ({quantization_config})")
+    return export_dir
+
+
+def load_onnx_model(
+    model_path: str,
+    model_id: str,
+    runtime: Dict[str, Any],
+    cache_folder: Optional[str] = None,
+    reference_model=None
+):
+    """
+    Load (exporting on first use) the ONNX version of a model
+
+    On first export the output is compared with the torch model and the
+    result is stored next to the export; exports that fail the parity
+    threshold are rejected so the caller falls back to torch.
+
+    Args:
+        model_path: Local path or HuggingFace model ID
+        model_id: Embedding model ID (export directory key)
+        runtime: Runtime config (quantize, quantization_config, parity_threshold, export_dir)
+        cache_folder: HuggingFace cache directory
+        reference_model: Loaded torch model for the parity check (None to load on demand)
+
+    Returns:
+        ONNX SentenceTransformer
+
+    Raises:
+        RuntimeError: If the export fails the parity check
+    """
+    from sentence_transformers import SentenceTransformer
+
+    quantize = runtime.get("quantize", False)
+    quantization_config = runtime.get("quantization_config", "avx2")
+    threshold = runtime.get("parity_threshold", 0.99)
+    export_dir = get_export_dir(model_id, quantize, quantization_config, runtime.get("export_dir"))
+    file_name = get_onnx_file_name(quantize, quantization_config)
+
+    parity = read_parity(export_dir)
+    if parity is None or not (export_dir / file_name).exists():
+        export_onnx_model(model_path, export_dir, quantize, quantization_config, cache_folder)
+        parity = None
+    elif not _passes(parity, threshold):
+        raise RuntimeError(f"ONNX export of {model_id} failed parity check: {parity}")
+
+    model = SentenceTransformer(str(export_dir), backend="onnx", model_kwargs={"file_name": file_name})
+
+    if parity is None:
+        if reference_model is None:
+            reference_model = SentenceTransformer(model_path, cache_folder=cache_folder)
+        parity = check_parity(reference_model, model)
+        parity["threshold"] = threshold
+        (export_dir / PARITY_FILE).write_text(json.dumps(parity, indent=2), encoding="utf-8")
+        logger.info(f"ONNX parity for {model_id}: {parity}")
+
+    if not _passes(parity, threshold):
+        raise RuntimeError(f"ONNX export of {model_id} failed parity check: {parity}")
+    return model
+
+
+def _passes(parity: Dict[str, Any], threshold: float) -> bool:
+    """토크나이저 일치 + 최소 코사인 유사도 기준 통과 여부"""
+    return bool(parity.get("tokenizer_match")) and parity.get("min_cosine", 0.0) >= threshold
@@ -71,6 +71,10 @@ class OpenAIEmbeddings(BaseEmbeddings):
             logger.error(f"OpenAI query embedding failed: {e}")
             return [0.0] * self._dimension
     
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries in one request (same endpoint as documents)"""
+        return self.embed_documents(texts)
+    
     @property
     def dimension(self) -> int:
         """Get embedding dimension"""
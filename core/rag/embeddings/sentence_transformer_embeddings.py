@@ -3,12 +3,15 @@ Universal SentenceTransformer Embeddings
 설정된 모든 sentence_transformers 모델 지원
 """
 
-from typing import List, Optional, Dict, Any
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Dict, Any
 from pathlib import Path
 import sys
+import threading
 from core.logging import get_logger
 from .base_embeddings import BaseEmbeddings
 from .embedding_cache import EmbeddingCache
+from .dynamic_batching import plan_token_batches
 
 logger = get_logger("sentence_transformer_embeddings")
 
@@ -16,7 +19,8 @@ logger = get_logger("sentence_transformer_embeddings")
 class SentenceTransformerEmbeddings(BaseEmbeddings):
     """범용 SentenceTransformer 임베딩 클래스"""
     
-    def __init__(self, model_config: Dict[str, Any], cache_folder: Optional[str] = None, enable_cache: bool = True):
+    def __init__(self, model_config: Dict[str, Any], cache_folder: Optional[str] = None, enable_cache: bool = True,
+                 batching: Optional[Dict[str, Any]] = None, runtime: Optional[Dict[str, Any]] = None):
         """
         Initialize SentenceTransformer embeddings
         
@@ -24,6 +28,8 @@ class SentenceTransformerEmbeddings(BaseEmbeddings):
             model_config: 모델 설정 정보 (name, dimension, model_path 등)
             cache_folder: Cache directory
             enable_cache: Enable embedding cache
+            batching: Dynamic batching config (token_budget, max_batch_size; None to load from RAGConfigManager)
+            runtime: Runtime backend config (backend, quantize, ...; None to load from RAGConfigManager)
         """
         self.model_config = model_config
         self.model_name = model_config.get("name", "Unknown Model")
@@ -32,16 +38,61 @@ class SentenceTransformerEmbeddings(BaseEmbeddings):
         self.model = None
         from ..constants import DEFAULT_EMBEDDING_DIMENSION
         self._dimension = model_config.get("dimension", DEFAULT_EMBEDDING_DIMENSION)
+        self.batching = batching if batching is not None else self._load_batching_config()
+        self.runtime = runtime if runtime is not None else self._load_runtime_config()
+        self.backend = "torch"
+        self.worker_pool = None  # EmbeddingPool이 연결하는 멀티프로세스 워커 (opt-in)
+        self._released = False
+        self._reload_lock = threading.Lock()
+        self._use_count = 0  # 인코딩 중인 호출 수 (0일 때만 release 가능)
         
-        # 임베딩 캐시 초기화
+        self._load_model()
+        
+        # 임베딩 캐시 초기화 (모델 로드 후 실제 백엔드/차원으로 네임스페이스 분리)
         self.embedding_cache = EmbeddingCache(
             cache_dir=cache_folder, 
-            max_memory_cache=1000
+            max_memory_cache=1000,
+            namespace=self._get_cache_namespace(),
+            dimension=self._dimension
         ) if enable_cache else None
-        
-        self._load_model()
         logger.info(f"SentenceTransformer embeddings initialized: {self.model_name} (dimension: {self._dimension})")
     
+    def _get_cache_namespace(self) -> str:
+        """
+        Embedding cache namespace of the loaded model and backend
+        
+        torch vectors keep the plain model ID; ONNX exports (fp32 or int8 per
+        quantization target) get their own namespace so backends never serve
+        each other's cached vectors.
+        """
+        model_id = self.model_config.get("id", self.model_name)
+        if self.backend != "onnx":
+            return model_id
+        from .onnx_runtime import get_variant
+        variant = get_variant(self.runtime.get("quantize", False), self.runtime.get("quantization_config", "avx2"))
+        return f"{model_id}:onnx-{variant.replace('_', '-')}"
+    
+    def _load_batching_config(self) -> Dict[str, Any]:
+        """동적 배치 설정 로드"""
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            return RAGConfigManager().get_embedding_batching_config()
+        except Exception as e:
+            logger.warning(f"Failed to load batching config, using defaults: {e}")
+            return {}
+    
+    def _load_runtime_config(self) -> Dict[str, Any]:
+        """실행 백엔드 설정 로드 (모델별 backend 설정이 전역 설정보다 우선)"""
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            runtime = RAGConfigManager().get_embedding_runtime_config()
+        except Exception as e:
+            logger.warning(f"Failed to load runtime config, using torch: {e}")
+            runtime = {}
+        if self.model_config.get("backend"):
+            runtime = {**runtime, "backend": self.model_config["backend"]}
+        return runtime
+    
     def _resolve_model_path(self, model_config: Dict[str, Any]) -> str:
         """모델 경로 결정 (설정 기반)"""
         # 1. model 필드 우선 사용
@@ -74,33 +125,38 @@ class SentenceTransformerEmbeddings(BaseEmbeddings):
                 model_path = self.model_path
                 logger.info(f"[MODEL_LOAD] Step 2: Using configured model: {model_path}")
             
+            # ONNX Runtime 백엔드 (실패 시 torch로 폴백)
+            if self.runtime.get("backend") == "onnx":
+                self.model = self._load_onnx_model(model_path)
+            
             # HuggingFace 모델 다운로드 시 자동 재시도
-            logger.info(f"[MODEL_LOAD] Step 3: Creating SentenceTransformer instance")
-            try:
-                self.model = SentenceTransformer(
-                    model_path,
-                    cache_folder=self.cache_folder
-                )
-                logger.info(f"[MODEL_LOAD] Step 3: SUCCESS - SentenceTransformer created: {model_path}")
-            except Exception as download_error:
-                logger.error(f"[MODEL_LOAD] Step 3: FAILED - {type(download_error).__name__}: {download_error}")
+            if self.model is None:
+                logger.info(f"[MODEL_LOAD] Step 3: Creating SentenceTransformer instance")
+                try:
+                    self.model = SentenceTransformer(
+                        model_path,
+                        cache_folder=self.cache_folder
+                    )
+                    logger.info(f"[MODEL_LOAD] Step 3: SUCCESS - SentenceTransformer created: {model_path}")
+                except Exception as download_error:
+                    logger.error(f"[MODEL_LOAD] Step 3: FAILED - {type(download_error).__name__}: {download_error}")
                 
-                # 잘못된 모델 ID 형식 자동 수정 시도
-                if "_" in model_path and "/" not in model_path:
-                    corrected_path = model_path.replace("_", "/", 1)
-                    logger.info(f"[MODEL_LOAD] Step 3b: Retry with corrected path: {corrected_path}")
-                    try:
-                        self.model = SentenceTransformer(
-                            corrected_path,
-                            cache_folder=self.cache_folder
-                        )
-                        self.model_path = corrected_path
-                        logger.info(f"[MODEL_LOAD] Step 3b: SUCCESS - Model loaded with corrected path")
-                    except Exception as retry_error:
-                        logger.error(f"[MODEL_LOAD] Step 3b: FAILED - {type(retry_error).__name__}: {retry_error}")
+                    # 잘못된 모델 ID 형식 자동 수정 시도
+                    if "_" in model_path and "/" not in model_path:
+                        corrected_path = model_path.replace("_", "/", 1)
+                        logger.info(f"[MODEL_LOAD] Step 3b: Retry with corrected path: {corrected_path}")
+                        try:
+                            self.model = SentenceTransformer(
+                                corrected_path,
+                                cache_folder=self.cache_folder
+                            )
+                            self.model_path = corrected_path
+                            logger.info(f"[MODEL_LOAD] Step 3b: SUCCESS - Model loaded with corrected path")
+                        except Exception as retry_error:
+                            logger.error(f"[MODEL_LOAD] Step 3b: FAILED - {type(retry_error).__name__}: {retry_error}")
+                            raise download_error
+                    else:
                         raise download_error
-                else:
-                    raise download_error
             
             # 실제 차원 확인 및 업데이트
             logger.info(f"[MODEL_LOAD] Step 4: Testing model with sample text")
@@ -140,6 +196,26 @@ class SentenceTransformerEmbeddings(BaseEmbeddings):
             
             self.model = None
     
+    def _load_onnx_model(self, model_path: str):
+        """ONNX Runtime 모델 로드 (최초 사용 시 내보내기 + parity 검사, 실패 시 None)"""
+        try:
+            from .onnx_runtime import load_onnx_model
+            logger.info(f"[MODEL_LOAD] Step 3: Loading ONNX Runtime model (quantize={self.runtime.get('quantize', False)})")
+            model = load_onnx_model(
+                model_path,
+                self.model_config.get("id", self.model_name),
+                self.runtime,
+                cache_folder=self.cache_folder
+            )
+            self.backend = "onnx"
+            logger.info(f"[MODEL_LOAD] Step 3: SUCCESS - ONNX Runtime model loaded: {model_path}")
+            return model
+        except ImportError as ie:
+            logger.warning(f"[MODEL_LOAD] ONNX Runtime unavailable (pip install sentence-transformers[onnx]), using torch: {ie}")
+        except Exception as e:
+            logger.warning(f"[MODEL_LOAD] ONNX backend failed, using torch: {type(e).__name__}: {e}")
+        return None
+    
     def _get_local_model_path(self) -> Optional[Path]:
         """로컬 모델 경로 반환 (기본 모델만)"""
         try:
@@ -174,78 +250,76 @@ class SentenceTransformerEmbeddings(BaseEmbeddings):
             logger.error(f"Error resolving local model path: {e}")
             return None
     
-    def embed_documents(self, texts: List[str], check_cancel: Optional[callable] = None) -> List[List[float]]:
+    def embed_documents(
+        self,
+        texts: List[str],
+        check_cancel: Optional[Callable[[], bool]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[List[float]]:
         """
         Embed multiple documents with caching and cancellation support
         
+        Cache misses are encoded in length-sorted, token-budgeted batches;
+        cancellation is checked between batches.
+        
         Args:
             texts: List of text documents
             check_cancel: Optional cancellation check function
+            progress_callback: Optional progress callback (embedded, total)
             
         Returns:
             List of embedding vectors
         """
-        if not self.model:
-            logger.warning("Model not available, returning zero vectors")
-            return [[0.0] * self._dimension for _ in texts]
-        
+        with self._use_model() as model:
+            if model is None:
+                logger.warning("Model not available, returning zero vectors")
+                return [[0.0] * self._dimension for _ in texts]
+            return self._embed_documents(model, texts, check_cancel, progress_callback)
+    
+    def _embed_documents(
+        self,
+        model,
+        texts: List[str],
+        check_cancel: Optional[Callable[[], bool]],
+        progress_callback: Optional[Callable[[int, int], None]]
+    ) -> List[List[float]]:
+        """embed_documents 본문 (model은 호출 동안 고정된 참조)"""
         # 취소 확인
         if check_cancel and check_cancel():
             logger.info("Embedding cancelled by user")
             return [[0.0] * self._dimension for _ in texts]
         
         try:
-            if not self.embedding_cache:
-                # 캐시 비활성화 - 배치 처리로 취소 확인
-                if len(texts) > 10:  # 큰 배치는 분할 처리
-                    batch_size = 10
-                    all_embeddings = []
-                    for i in range(0, len(texts), batch_size):
-                        if check_cancel and check_cancel():
-                            logger.info(f"Embedding cancelled at batch {i//batch_size + 1}")
-                            return [[0.0] * self._dimension for _ in texts]
-                        
-                        batch = texts[i:i + batch_size]
-                        batch_embeddings = self.model.encode(batch, convert_to_numpy=True, show_progress_bar=False)
-                        all_embeddings.extend(batch_embeddings.tolist())
-                    return all_embeddings
-                else:
-                    embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-                    return embeddings.tolist()
-            
-            # 캐시에서 검색
-            results = []
-            to_embed = []
-            to_embed_indices = []
-            
-            for i, text in enumerate(texts):
-                if check_cancel and check_cancel():
-                    logger.info("Embedding cancelled during cache check")
-                    return [[0.0] * self._dimension for _ in texts]
-                
-                cached = self.embedding_cache.get(text)
-                if cached:
-                    results.append(cached)
-                else:
-                    results.append(None)
-                    to_embed.append(text)
-                    to_embed_indices.append(i)
-            
-            # 캐시 미스: 새로 임베딩
-            if to_embed:
-                if check_cancel and check_cancel():
-                    logger.info("Embedding cancelled before processing")
-                    return [[0.0] * self._dimension for _ in texts]
-                
-                new_embeddings = self.model.encode(to_embed, convert_to_numpy=True, show_progress_bar=False).tolist()
-                
-                for idx, embedding in zip(to_embed_indices, new_embeddings):
-                    results[idx] = embedding
-                    self.embedding_cache.set(texts[idx], embedding)
-                
-                logger.debug(f"Cache miss: {len(to_embed)}/{len(texts)} texts")
+            # 캐시에서 일괄 검색
+            if self.embedding_cache:
+                results = self.embedding_cache.get_many(texts)
             else:
+                results = [None] * len(texts)
+            to_embed_indices = [i for i, cached in enumerate(results) if cached is None]
+            to_embed = [texts[i] for i in to_embed_indices]
+            
+            if not to_embed:
                 logger.debug(f"Cache hit: {len(texts)}/{len(texts)} texts")
+                if progress_callback:
+                    progress_callback(len(texts), len(texts))
+                return results
+            
+            # 캐시 미스: 동적 배치로 새로 임베딩
+            cached_count = len(texts) - len(to_embed)
+            batch_progress = None
+            if progress_callback:
+                def batch_progress(done, _total):
+                    progress_callback(cached_count + done, len(texts))
+            
+            new_embeddings = self._encode_batched(model, to_embed, check_cancel, batch_progress)
+            if new_embeddings is None:
+                return [[0.0] * self._dimension for _ in texts]
+            
+            for idx, embedding in zip(to_embed_indices, new_embeddings):
+                results[idx] = embedding
+            if self.embedding_cache:
+                self.embedding_cache.set_many(to_embed, new_embeddings)
+                logger.debug(f"Cache miss: {len(to_embed)}/{len(texts)} texts")
             
             return results
             
@@ -253,6 +327,76 @@ class SentenceTransformerEmbeddings(BaseEmbeddings):
             logger.error(f"Embedding failed: {e}")
             return [[0.0] * self._dimension for _ in texts]
     
+    def _encode_batched(
+        self,
+        model,
+        texts: List[str],
+        check_cancel: Optional[Callable[[], bool]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Optional[List[List[float]]]:
+        """
+        길이 정렬 + 토큰 예산 배치 인코딩 (원래 순서로 복원)
+        
+        Returns:
+            Embeddings in input order, or None if cancelled
+        """
+        lengths = self._estimate_token_lengths(model, texts)
+        batches = plan_token_batches(
+            lengths,
+            token_budget=self.batching.get("token_budget", 16384),
+            max_batch_size=self.batching.get("max_batch_size", 128)
+        )
+        
+        if self.worker_pool is not None and len(texts) >= self.worker_pool.min_texts:
+            try:
+                return self.worker_pool.encode_batches(
+                    texts, batches, self._dimension, check_cancel, progress_callback
+                )
+            except Exception as e:
+                logger.warning(f"Worker pool encode failed, encoding in-process: {e}")
+        
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        done = 0
+        for batch_number, batch in enumerate(batches, start=1):
+            if check_cancel and check_cancel():
+                logger.info(f"Embedding cancelled at batch {batch_number}/{len(batches)}")
+                return None
+            
+            vectors = model.encode(
+                [texts[i] for i in batch],
+                batch_size=len(batch),
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+            for index, vector in zip(batch, vectors):
+                results[index] = vector.tolist()
+            
+            done += len(batch)
+            if progress_callback:
+                progress_callback(done, len(texts))
+        
+        logger.debug(f"Encoded {len(texts)} texts in {len(batches)} batches")
+        return results
+    
+    def _estimate_token_lengths(self, model, texts: List[str]) -> List[int]:
+        """토크나이저 기준 토큰 길이 (max_seq_length로 절단, 실패 시 문자 수 근사)"""
+        max_length = getattr(model, "max_seq_length", None) or 512
+        tokenizer = getattr(model, "tokenizer", None)
+        if tokenizer is not None:
+            try:
+                encoded = tokenizer(
+                    texts,
+                    add_special_tokens=True,
+                    truncation=True,
+                    max_length=max_length,
+                    return_attention_mask=False,
+                    return_token_type_ids=False
+                )
+                return [len(ids) for ids in encoded["input_ids"]]
+            except Exception as e:
+                logger.debug(f"Tokenizer length estimate failed, using characters: {e}")
+        return [min(max_length, len(text) // 2 + 2) for text in texts]
+    
     def embed_query(self, text: str) -> List[float]:
         """
         Embed a single query with caching
@@ -263,10 +407,14 @@ class SentenceTransformerEmbeddings(BaseEmbeddings):
         Returns:
             Embedding vector
         """
-        if not self.model:
-            logger.warning("Model not available, returning zero vector")
-            return [0.0] * self._dimension
-        
+        with self._use_model() as model:
+            if model is None:
+                logger.warning("Model not available, returning zero vector")
+                return [0.0] * self._dimension
+            return self._embed_query(model, text)
+    
+    def _embed_query(self, model, text: str) -> List[float]:
+        """embed_query 본문 (model은 호출 동안 고정된 참조)"""
         try:
             # 캐시 확인
             if self.embedding_cache:
@@ -276,7 +424,7 @@ class SentenceTransformerEmbeddings(BaseEmbeddings):
                     return cached
             
             # 임베딩 생성
-            embedding = self.model.encode(text, convert_to_numpy=True, show_progress_bar=False)
+            embedding = model.encode(text, convert_to_numpy=True, show_progress_bar=False)
             result = embedding.tolist()
             
             # 캐시 저장
@@ -290,6 +438,123 @@ class SentenceTransformerEmbeddings(BaseEmbeddings):
             logger.error(f"Query embedding failed: {e}")
             return [0.0] * self._dimension
     
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several queries in one encode call (shares the query cache)
+        
+        Args:
+            texts: Query texts
+            
+        Returns:
+            Embedding vectors in input order
+        """
+        with self._use_model() as model:
+            if model is None:
+                logger.warning("Model not available, returning zero vectors")
+                return [[0.0] * self._dimension for _ in texts]
+            return self._embed_queries(model, texts)
+    
+    def _embed_queries(self, model, texts: List[str]) -> List[List[float]]:
+        """embed_queries 본문 (model은 호출 동안 고정된 참조)"""
+        try:
+            if self.embedding_cache:
+                results = self.embedding_cache.get_many(texts)
+            else:
+                results = [None] * len(texts)
+            missing = [i for i, cached in enumerate(results) if cached is None]
+            
+            if missing:
+                vectors = model.encode(
+                    [texts[i] for i in missing],
+                    batch_size=len(missing),
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                )
+                for index, vector in zip(missing, vectors):
+                    results[index] = vector.tolist()
+                if self.embedding_cache:
+                    self.embedding_cache.set_many([texts[i] for i in missing], [results[i] for i in missing])
+            
+            logger.debug(f"Embedded {len(texts)} queries ({len(missing)} encoded)")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Query batch embedding failed: {e}")
+            return [[0.0] * self._dimension for _ in texts]
+    
+    def ensure_loaded(self) -> bool:
+        """release() 이후 다시 사용되면 모델 재로드"""
+        if self.model is None and self._released:
+            with self._reload_lock:
+                if self.model is None and self._released:
+                    logger.info(f"Reloading released model: {self.model_name}")
+                    self._released = False
+                    self._load_model()
+        return self.model is not None
+    
+    @contextmanager
+    def _use_model(self):
+        """
+        Pin the model for one encode call (reloads a released model)
+        
+        Yields the model reference to use for the whole call (None if unavailable);
+        release() refuses to unload while any call holds it.
+        """
+        with self._reload_lock:
+            if self.model is None and self._released:
+                logger.info(f"Reloading released model: {self.model_name}")
+                self._released = False
+                self._load_model()
+            model = self.model
+            if model is not None:
+                self._use_count += 1
+        try:
+            yield model
+        finally:
+            if model is not None:
+                with self._reload_lock:
+                    self._use_count -= 1
+    
+    def is_in_use(self) -> bool:
+        """인코딩 중인 호출이 있는지"""
+        with self._reload_lock:
+            return self._use_count > 0
+    
+    def release(self) -> bool:
+        """
+        모델/토크나이저 해제 (다음 사용 시 재로드)
+        
+        Returns:
+            False if the model is in use (kept loaded)
+        """
+        with self._reload_lock:
+            if self.model is None:
+                return True
+            if self._use_count:
+                logger.debug(f"Model in use, release skipped: {self.model_name}")
+                return False
+            self.model = None
+            self._released = True
+        logger.info(f"Released model: {self.model_name}")
+        return True
+    
+    def estimate_memory_bytes(self) -> int:
+        """모델 가중치/버퍼 크기 추정 (torch 파라미터, ONNX는 내보낸 가중치 파일 크기)"""
+        model = self.model
+        if model is None:
+            return 0
+        if self.backend == "onnx":
+            try:
+                from .onnx_runtime import get_onnx_model_bytes
+                return get_onnx_model_bytes(self.model_config.get("id", self.model_name), self.runtime)
+            except Exception:
+                return 0
+        try:
+            tensors = list(model.parameters()) + list(model.buffers())
+            return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+        except Exception:
+            return 0
+    
     @property
     def dimension(self) -> int:
         """
@@ -311,6 +576,8 @@ class SentenceTransformerEmbeddings(BaseEmbeddings):
             "model_name": self.model_name,
             "model_path": self.model_path,
             "dimension": self._dimension,
+            "backend": self.backend,
+            "quantized": self.backend == "onnx" and self.runtime.get("quantize", False),
             "cache_enabled": self.embedding_cache is not None,
             "model_config": self.model_config
         }
\ No newline at end of file
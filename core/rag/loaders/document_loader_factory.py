@@ -3,7 +3,7 @@ Document Loader Factory
 Factory 패턴: 파일 형식별 로더 생성
 """
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from pathlib import Path
 from langchain.schema import Document
 from core.logging import get_logger
@@ -16,6 +16,14 @@ logger = get_logger("document_loader_factory")
 class DocumentLoaderFactory:
     """문서 로더 팩토리"""
     
+    # 코드 파일 확장자 목록
+    CODE_EXTENSIONS = {
+        '.py', '.js', '.ts', '.java', '.cpp', '.c', '.go', '.rs', '.rb', 
+        '.php', '.swift', '.kt', '.scala', '.cs', '.lua', '.html', '.css',
+        '.sol', '.sh', '.bash', '.zsh', '.xml', '.yaml', '.yml', '.sql',
+        '.r', '.m', '.pl', '.ps1', '.bat', '.cmd', '.vbs', '.asm', '.s'
+    }
+    
     @staticmethod
     def load_document(file_path: str, chunker: Optional[BaseChunker] = None, **chunk_kwargs) -> List[Document]:
         """
@@ -40,6 +48,83 @@ class DocumentLoaderFactory:
         
         return DocumentLoaderFactory._load_raw_document(path)
     
+    @staticmethod
+    def load_document_stream(file_path: str, chunker: Optional[BaseChunker] = None, **chunk_kwargs) -> Iterator[Document]:
+        """
+        Stream chunks of a document with bounded memory
+        
+        페이지/행 묶음/줄 묶음 단위로 읽어 청커가 이어서 청킹 (파일 크기와 무관한 메모리)
+        
+        Args:
+            file_path: File path
+            chunker: Optional chunker instance. If None, auto-selects based on file type
+            **chunk_kwargs: Parameters for chunker creation
+            
+        Yields:
+            Chunked Document objects in order
+        """
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        if chunker is None:
+            chunker = ChunkingFactory.get_strategy_for_file(path.name, **chunk_kwargs)
+        
+        config = DocumentLoaderFactory._get_streaming_config()
+        yield from chunker.chunk_stream(
+            DocumentLoaderFactory.iter_raw_document(str(path)),
+            metadata={"source": str(path)},
+            buffer_chars=config["block_chars"]
+        )
+    
+    @staticmethod
+    def iter_raw_document(file_path: str) -> Iterator[Document]:
+        """
+        Stream raw document blocks without chunking
+        
+        PDF는 페이지, Excel/CSV는 행 묶음, 텍스트/코드는 줄 묶음 단위로 생성.
+        그 외 형식은 전체 로드 후 순서대로 반환.
+        PDF/DOCX/PPTX/XLSX는 파서 풀이 켜져 있으면 워커 프로세스에서 파싱.
+        
+        Args:
+            file_path: File path
+            
+        Yields:
+            Raw Document blocks
+        """
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        config = DocumentLoaderFactory._get_streaming_config()
+        file_type = path.suffix.lower()
+        
+        from .parser_pool import ParserPool, get_parser_pool
+        parser_pool = get_parser_pool() if ParserPool.supports(path) else None
+        
+        if parser_pool is not None:
+            yield from parser_pool.iter_parse(path, config["rows_per_block"])
+        elif file_type == '.pdf':
+            yield from DocumentLoaderFactory._iter_pdf(path)
+        elif file_type in ['.xlsx', '.xls']:
+            yield from DocumentLoaderFactory._iter_excel(path, config["rows_per_block"])
+        elif file_type == '.csv':
+            yield from DocumentLoaderFactory._iter_csv(path, config["rows_per_block"])
+        elif file_type in DocumentLoaderFactory.CODE_EXTENSIONS or file_type == '.txt':
+            yield from DocumentLoaderFactory._iter_text(path, config["block_chars"])
+        else:
+            yield from DocumentLoaderFactory._load_raw_document(path)
+    
+    @staticmethod
+    def _get_streaming_config() -> dict:
+        """스트리밍 적재 설정 (설정 로드 실패 시 기본값)"""
+        from core.rag.config.rag_config_manager import RAGConfigManager
+        try:
+            return RAGConfigManager().get_streaming_config()
+        except Exception as e:
+            logger.warning(f"Failed to load streaming config: {e}")
+            return dict(RAGConfigManager.DEFAULT_CONFIG["streaming"])
+    
     @staticmethod
     def _load_with_chunking(file_path: str, chunker: Optional[BaseChunker] = None, **chunk_kwargs) -> List[Document]:
         """
@@ -90,14 +175,6 @@ class DocumentLoaderFactory:
         """
         file_type = path.suffix.lower()
         
-        # 코드 파일 확장자 목록
-        code_extensions = {
-            '.py', '.js', '.ts', '.java', '.cpp', '.c', '.go', '.rs', '.rb', 
-            '.php', '.swift', '.kt', '.scala', '.cs', '.lua', '.html', '.css',
-            '.sol', '.sh', '.bash', '.zsh', '.xml', '.yaml', '.yml', '.sql',
-            '.r', '.m', '.pl', '.ps1', '.bat', '.cmd', '.vbs', '.asm', '.s'
-        }
-        
         # 파일 형식별 로더 선택
         if file_type == '.pdf':
             return DocumentLoaderFactory._load_pdf(path)
@@ -116,7 +193,7 @@ class DocumentLoaderFactory:
             return DocumentLoaderFactory._load_json(path)
         elif file_type in ['.png', '.jpg', '.jpeg']:
             return DocumentLoaderFactory._load_image(path)
-        elif file_type in code_extensions or file_type == '.txt':
+        elif file_type in DocumentLoaderFactory.CODE_EXTENSIONS or file_type == '.txt':
             return DocumentLoaderFactory._load_text(path)
         else:
             logger.warning(f"Unsupported file type: {file_type}")
@@ -126,48 +203,61 @@ class DocumentLoaderFactory:
     def _load_pdf(path: Path) -> List[Document]:
         """Load PDF file with Korean support"""
         try:
-            import pdfplumber
-            
-            documents = []
-            with pdfplumber.open(str(path)) as pdf:
-                for i, page in enumerate(pdf.pages):
-                    text = page.extract_text()
-                    if text and text.strip():
-                        doc = Document(
-                            page_content=text,
-                            metadata={"source": str(path), "page": i+1}
-                        )
-                        documents.append(doc)
-            
+            documents = list(DocumentLoaderFactory._iter_pdf(path))
             logger.info(f"Loaded PDF: {path.name} ({len(documents)} pages)")
             return documents
-            
-        except ImportError:
-            logger.info("Using PyPDF2 for PDF processing")
-            try:
-                from PyPDF2 import PdfReader
-                
-                reader = PdfReader(str(path))
-                documents = []
-                
-                for i, page in enumerate(reader.pages):
-                    text = page.extract_text()
-                    if text and text.strip():
-                        doc = Document(
-                            page_content=text,
-                            metadata={"source": str(path), "page": i+1}
-                        )
-                        documents.append(doc)
-                
-                logger.info(f"Loaded PDF: {path.name} ({len(documents)} pages)")
-                return documents
-            except Exception as e:
-                logger.error(f"Failed to load PDF with PyPDF2: {e}")
-                return []
         except Exception as e:
             logger.error(f"Failed to load PDF: {e}")
             return []
     
+    @staticmethod
+    def _iter_pdf(path: Path, engine: Optional[str] = None, start_page: int = 0) -> Iterator[Document]:
+        """
+        Stream PDF pages
+        
+        Args:
+            path: PDF path
+            engine: "pdfplumber" or "pypdf2" (None for pdfplumber, PyPDF2 if not installed)
+            start_page: First page index to extract (resume after a failed engine)
+        """
+        if engine is None:
+            try:
+                import pdfplumber  # noqa: F401
+                engine = "pdfplumber"
+            except ImportError:
+                logger.info("Using PyPDF2 for PDF processing")
+                engine = "pypdf2"
+        
+        if engine == "pypdf2":
+            from PyPDF2 import PdfReader
+            
+            reader = PdfReader(str(path))
+            for i in range(start_page, len(reader.pages)):
+                text = reader.pages[i].extract_text()
+                if text and text.strip():
+                    yield Document(
+                        page_content=text,
+                        metadata={"source": str(path), "page": i+1}
+                    )
+            return
+        
+        import pdfplumber
+        
+        with pdfplumber.open(str(path)) as pdf:
+            for i in range(start_page, len(pdf.pages)):
+                page = pdf.pages[i]
+                text = page.extract_text()
+                # 페이지 파싱 캐시 해제 (전체 페이지 객체가 누적되지 않도록)
+                if hasattr(page, "close"):
+                    page.close()
+                else:
+                    page.flush_cache()
+                if text and text.strip():
+                    yield Document(
+                        page_content=text,
+                        metadata={"source": str(path), "page": i+1}
+                    )
+    
     @staticmethod
     def _load_word(path: Path) -> List[Document]:
         """Load Word file"""
@@ -273,6 +363,99 @@ class DocumentLoaderFactory:
         logger.error(f"Failed to decode: {path.name}")
         return []
     
+    @staticmethod
+    def _iter_excel(path: Path, rows_per_block: int = 200) -> Iterator[Document]:
+        """Stream Excel rows in groups (header repeated per group)"""
+        if path.suffix.lower() == '.xlsx':
+            from openpyxl import load_workbook
+            
+            # read_only: 시트 전체를 메모리에 올리지 않고 행 단위로 읽기
+            workbook = load_workbook(str(path), read_only=True, data_only=True)
+            try:
+                for sheet in workbook.worksheets:
+                    rows = sheet.iter_rows(values_only=True)
+                    header = next(rows, None)
+                    if header is None:
+                        continue
+                    header_line = "\t".join("" if value is None else str(value) for value in header)
+                    
+                    block = []
+                    for row in rows:
+                        if all(value is None for value in row):
+                            continue
+                        block.append("\t".join("" if value is None else str(value) for value in row))
+                        if len(block) >= rows_per_block:
+                            yield DocumentLoaderFactory._row_block(path, sheet.title, header_line, block)
+                            block = []
+                    if block:
+                        yield DocumentLoaderFactory._row_block(path, sheet.title, header_line, block)
+            finally:
+                workbook.close()
+            return
+        
+        # .xls: 시트 단위로 읽어 행 묶음으로 분할
+        import pandas as pd
+        
+        excel_file = pd.ExcelFile(str(path))
+        for sheet_name in excel_file.sheet_names:
+            df = pd.read_excel(excel_file, sheet_name=sheet_name)
+            for start in range(0, len(df), rows_per_block):
+                text = f"Sheet: {sheet_name}\n\n"
+                text += df.iloc[start:start + rows_per_block].to_string(index=False)
+                yield Document(page_content=text, metadata={"source": str(path)})
+            del df
+    
+    @staticmethod
+    def _row_block(path: Path, sheet_name: str, header_line: str, rows: List[str]) -> Document:
+        """행 묶음 → Document (시트 이름/헤더 포함)"""
+        text = f"Sheet: {sheet_name}\n\n{header_line}\n" + "\n".join(rows)
+        return Document(page_content=text, metadata={"source": str(path)})
+    
+    @staticmethod
+    def _iter_csv(path: Path, rows_per_block: int = 200) -> Iterator[Document]:
+        """Stream CSV rows in groups"""
+        import pandas as pd
+        
+        for df in pd.read_csv(str(path), chunksize=rows_per_block):
+            yield Document(page_content=df.to_string(index=False), metadata={"source": str(path)})
+    
+    @staticmethod
+    def _iter_text(path: Path, block_chars: int = 32768) -> Iterator[Document]:
+        """Stream text file in line-aligned blocks"""
+        encoding = DocumentLoaderFactory._detect_encoding(path, ['utf-8', 'cp949', 'euc-kr'])
+        if encoding is None:
+            raise ValueError(f"Failed to decode: {path.name}")
+        
+        with open(path, 'r', encoding=encoding) as f:
+            while True:
+                # 블록 끝을 줄 경계에 맞춤 (아주 긴 한 줄은 block_chars 단위로 자름)
+                block = f.read(block_chars)
+                if not block:
+                    break
+                if not block.endswith("\n"):
+                    block += f.readline(block_chars)
+                if block.strip():
+                    yield Document(page_content=block, metadata={"source": str(path)})
+    
+    @staticmethod
+    def _detect_encoding(path: Path, encodings: List[str], read_size: int = 1024 * 1024) -> Optional[str]:
+        """파일 전체를 조각 단위로 디코딩해 보고 첫 번째로 성공한 인코딩 반환"""
+        import codecs
+        
+        for encoding in encodings:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            try:
+                with open(path, 'rb') as f:
+                    while True:
+                        data = f.read(read_size)
+                        decoder.decode(data, final=not data)
+                        if not data:
+                            break
+                return encoding
+            except (UnicodeDecodeError, LookupError):
+                continue
+        return None
+    
     @staticmethod
     def _load_powerpoint(path: Path) -> List[Document]:
         """Load PowerPoint file"""
@@ -0,0 +1,412 @@
+"""
+Parser Pool
+CPU 부하가 큰 문서(PDF, DOCX, PPTX, XLSX)를 워커 프로세스에서 파싱하고 추출된 텍스트만 돌려받는 풀
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from langchain.schema import Document
+from core.logging import get_logger
+
+logger = get_logger("parser_pool")
+
+# 워커 프로세스에서 파싱할 형식
+PARSE_POOL_EXTENSIONS = {'.pdf', '.docx', '.pptx', '.xlsx', '.xls'}
+
+
+def _apply_memory_limit(memory_limit_mb: int):
+    """워커 프로세스 힙 상한 설정 (지원하는 OS만, 초과 시 MemoryError)"""
+    if not memory_limit_mb or sys.platform == "win32":
+        return
+    try:
+        import resource
+        limit_kind = getattr(resource, "RLIMIT_DATA", None) or resource.RLIMIT_AS
+        limit = int(memory_limit_mb) * 1024 * 1024
+        resource.setrlimit(limit_kind, (limit, limit))
+    except Exception as e:
+        logger.debug(f"Memory limit not applied in parser worker: {e}")
+
+
+def _parse_blocks(path: Path, options: Dict[str, Any]) -> Iterator[Document]:
+    """워커 프로세스: 형식별 파싱 (PDF는 pdfplumber 실패 시 PyPDF2로 이어서 추출)"""
+    from .document_loader_factory import DocumentLoaderFactory
+
+    file_type = path.suffix.lower()
+    if file_type == '.pdf':
+        engine = options.get("pdf_engine") or "pdfplumber"
+        next_page = options.get("start_page", 0)
+        try:
+            for doc in DocumentLoaderFactory._iter_pdf(path, engine, next_page):
+                next_page = doc.metadata["page"]
+                yield doc
+        except Exception as e:
+            if engine == "pypdf2":
+                raise
+            logger.warning(f"pdfplumber failed on {path.name} at page {next_page + 1}: {e}, falling back to PyPDF2")
+            yield from DocumentLoaderFactory._iter_pdf(path, "pypdf2", next_page)
+    elif file_type in ('.xlsx', '.xls'):
+        yield from DocumentLoaderFactory._iter_excel(path, options.get("rows_per_block", 200))
+    elif file_type == '.docx':
+        yield from DocumentLoaderFactory._load_word(path)
+    elif file_type == '.pptx':
+        yield from DocumentLoaderFactory._load_powerpoint(path)
+    else:
+        yield from DocumentLoaderFactory._load_raw_document(path)
+
+
+def _worker_main(conn, memory_limit_mb: int):
+    """
+    Parser worker loop
+
+    Sends ("ready",) once imports are done, then receives (path, options)
+    tasks and sends ("block", text, metadata) per extracted block, then
+    ("done",) or ("error", message).
+    """
+    # 파서 모듈 미리 로드 (시작 시간이 파일별 시간 제한에 포함되지 않도록)
+    from .document_loader_factory import DocumentLoaderFactory  # noqa: F401
+    _apply_memory_limit(memory_limit_mb)
+    conn.send(("ready", None, None))
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+
+        path, options = task
+        try:
+            for doc in _parse_blocks(Path(path), options):
+                conn.send(("block", doc.page_content, doc.metadata))
+            conn.send(("done", None, None))
+        except MemoryError:
+            # 힙 상한 초과 후에는 프로세스 상태를 신뢰할 수 없으므로 종료 (부모가 재시작)
+            conn.send(("error", f"Parser exceeded memory limit ({memory_limit_mb}MB)", None))
+            break
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", None))
+
+
+class _WorkerLost(Exception):
+    """워커가 시간/메모리 초과로 종료되었거나 비정상 종료됨 (error: 호출자에게 전달할 예외)"""
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+class _ParserWorker:
+    """파서 프로세스 1개와 통신 파이프"""
+
+    def __init__(self, context, memory_limit_mb: int):
+        self.context = context
+        self.memory_limit_mb = memory_limit_mb
+        self.process = None
+        self.conn = None
+        self.tasks = 0
+        self.start()
+
+    def start(self):
+        """프로세스 시작"""
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(
+            target=_worker_main,
+            args=(child_conn, self.memory_limit_mb),
+            name="rag-parser",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.tasks = 0
+        self.ready = False
+
+    def wait_ready(self, timeout: float = 120):
+        """워커 시작(모듈 로드) 완료 대기"""
+        if self.ready:
+            return
+        if not self.conn.poll(timeout):
+            raise RuntimeError(f"Parser worker did not start within {timeout}s")
+        try:
+            kind, _, _ = self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(1)
+            raise RuntimeError(f"Parser worker failed to start (code {self.process.exitcode})")
+        self.ready = kind == "ready"
+
+    def restart(self):
+        """작업 중인 프로세스 강제 종료 후 재시작"""
+        self.stop(force=True)
+        self.start()
+
+    def stop(self, force: bool = False):
+        """프로세스 종료"""
+        try:
+            if not force and self.process.is_alive():
+                self.conn.send(None)
+                self.process.join(1)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(1)
+        except Exception as e:
+            logger.debug(f"Parser worker stop failed: {e}")
+        finally:
+            self.conn.close()
+
+    def rss(self) -> Optional[int]:
+        """워커 RSS (bytes, psutil 없으면 None)"""
+        try:
+            import psutil
+            return psutil.Process(self.process.pid).memory_info().rss
+        except Exception:
+            return None
+
+
+class ParserPool:
+    """시간 제한/메모리 상한이 있는 문서 파서 프로세스 풀 (Thread-safe)"""
+
+    def __init__(
+        self,
+        num_workers: int = 0,
+        timeout_seconds: float = 120,
+        memory_limit_mb: int = 2048,
+        max_tasks_per_worker: int = 50,
+        poll_interval: float = 0.5
+    ):
+        """
+        Initialize parser pool (processes start lazily on first parse)
+
+        Args:
+            num_workers: Worker processes (0 for half the CPUs, max 4)
+            timeout_seconds: Max parse time per file (time spent waiting on the consumer is excluded)
+            memory_limit_mb: Per-worker memory cap (0 for no cap)
+            max_tasks_per_worker: Recycle a worker after this many files (0 to never recycle)
+            poll_interval: Watchdog interval for timeout/memory checks
+        """
+        cpu_count = os.cpu_count() or 2
+        self.num_workers = num_workers if num_workers > 0 else max(1, min(4, cpu_count // 2))
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.poll_interval = poll_interval
+        self._context = get_context("spawn")
+        self._idle: "queue.Queue" = queue.Queue()
+        self._workers: List[_ParserWorker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {"files": 0, "timeouts": 0, "memory_kills": 0, "crashes": 0, "fallbacks": 0}
+
+    @staticmethod
+    def supports(path: Path) -> bool:
+        """워커 프로세스에서 파싱하는 형식인지 확인"""
+        return Path(path).suffix.lower() in PARSE_POOL_EXTENSIONS
+
+    def iter_parse(self, path: Path, rows_per_block: int = 200) -> Iterator[Document]:
+        """
+        Parse a file in a worker process and stream the extracted blocks
+
+        Args:
+            path: File path
+            rows_per_block: Spreadsheet rows per block
+
+        Yields:
+            Raw Document blocks (text and metadata only)
+
+        Raises:
+            TimeoutError: Parsing exceeded timeout_seconds
+            RuntimeError: Parser failed, crashed or exceeded the memory cap
+        """
+        path = Path(path)
+        # PDF는 pdfplumber가 시간/메모리 초과 시 PyPDF2로 남은 페이지 재시도
+        engines = ["pdfplumber", "pypdf2"] if path.suffix.lower() == '.pdf' else [None]
+        next_page = 0
+
+        worker = self._acquire()
+        busy = False
+        try:
+            for attempt, engine in enumerate(engines):
+                busy = True
+                worker.wait_ready()
+                options = {"pdf_engine": engine, "start_page": next_page, "rows_per_block": rows_per_block}
+                worker.conn.send((str(path), options))
+                try:
+                    for doc in self._receive(worker, path):
+                        next_page = doc.metadata.get("page", next_page)
+                        yield doc
+                    busy = False
+                    break
+                except _WorkerLost as e:
+                    worker.restart()
+                    busy = False
+                    if attempt == len(engines) - 1:
+                        raise e.error from None
+                    self._stats["fallbacks"] += 1
+                    logger.warning(f"{e}; retrying {path.name} with PyPDF2 from page {next_page + 1}")
+        finally:
+            with self._lock:
+                self._stats["files"] += 1
+                closed = self._closed
+            # 종료 중 반환된 워커는 풀 목록에 없으므로 여기서 정지
+            if closed:
+                worker.stop(force=busy)
+                return
+            # 소비자가 중간에 멈췄거나 오류가 난 작업은 프로세스째 정리
+            if busy:
+                worker.restart()
+            else:
+                worker.tasks += 1
+                if self.max_tasks_per_worker and worker.tasks >= self.max_tasks_per_worker:
+                    worker.restart()  # 파서 메모리 단편화 해소
+            self._idle.put(worker)
+
+    def _receive(self, worker: _ParserWorker, path: Path) -> Iterator[Document]:
+        """워커 메시지 수신 (대기 시간 누적으로 시간 제한, RSS로 메모리 상한 감시)"""
+        waited = 0.0
+        memory_limit = self.memory_limit_mb * 1024 * 1024
+        while True:
+            started = time.monotonic()
+            ready = worker.conn.poll(self.poll_interval)
+            waited += time.monotonic() - started
+
+            if not ready:
+                if not worker.process.is_alive():
+                    self._count("crashes")
+                    raise _WorkerLost(RuntimeError(
+                        f"Parser worker exited while parsing {path.name} (code {worker.process.exitcode})"
+                    ))
+                if self.timeout_seconds and waited > self.timeout_seconds:
+                    self._count("timeouts")
+                    raise _WorkerLost(TimeoutError(
+                        f"Parsing {path.name} timed out after {self.timeout_seconds}s"
+                    ))
+                rss = worker.rss()
+                if memory_limit and rss and rss > memory_limit:
+                    self._count("memory_kills")
+                    raise _WorkerLost(RuntimeError(
+                        f"Parsing {path.name} exceeded memory limit ({rss // (1024 * 1024)}MB > {self.memory_limit_mb}MB)"
+                    ))
+                continue
+
+            try:
+                kind, text, metadata = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.process.join(1)
+                self._count("crashes")
+                raise _WorkerLost(RuntimeError(
+                    f"Parser worker exited while parsing {path.name} (code {worker.process.exitcode})"
+                ))
+
+            if kind == "block":
+                yield Document(page_content=text, metadata=metadata)
+            elif kind == "done":
+                return
+            else:
+                if "memory limit" in text:
+                    self._count("memory_kills")
+                    raise _WorkerLost(RuntimeError(f"Failed to parse {path.name}: {text}"))
+                raise RuntimeError(f"Failed to parse {path.name}: {text}")
+
+    def _acquire(self) -> _ParserWorker:
+        """유휴 워커 획득 (없으면 num_workers까지 생성, 그 이상은 대기)"""
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Parser pool is shut down")
+                if len(self._workers) < self.num_workers:
+                    worker = _ParserWorker(self._context, self.memory_limit_mb)
+                    self._workers.append(worker)
+                    logger.info(f"Started parser worker {len(self._workers)}/{self.num_workers}")
+                    return worker
+            # 종료되면 반환 워커가 큐에 들어오지 않으므로 주기적으로 확인
+            while True:
+                try:
+                    worker = self._idle.get(timeout=self.poll_interval)
+                    break
+                except queue.Empty:
+                    if self._closed:
+                        raise RuntimeError("Parser pool is shut down") from None
+
+        # 유휴 중 종료된 워커는 재시작
+        if not worker.process.is_alive():
+            worker.restart()
+        return worker
+
+    def _count(self, key: str):
+        """통계 증가"""
+        with self._lock:
+            self._stats[key] += 1
+
+    def shutdown(self):
+        """워커 프로세스 종료 (사용 중인 워커는 iter_parse가 반환할 때 종료)"""
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for worker in workers:
+            worker.stop()
+        if workers:
+            logger.info(f"Stopped {len(workers)} parser workers")
+
+    def get_info(self) -> Dict[str, Any]:
+        """파서 풀 상태 및 통계"""
+        with self._lock:
+            return {
+                "num_workers": self.num_workers,
+                "running": len(self._workers),
+                "timeout_seconds": self.timeout_seconds,
+                "memory_limit_mb": self.memory_limit_mb,
+                **self._stats
+            }
+
+
+_parser_pool: Optional[ParserPool] = None
+_parser_pool_lock = threading.Lock()
+
+
+def get_parser_pool() -> Optional[ParserPool]:
+    """
+    Shared parser pool from config (None when disabled)
+
+    Returns:
+        ParserPool instance or None
+    """
+    global _parser_pool
+    with _parser_pool_lock:
+        if _parser_pool is None:
+            try:
+                from core.rag.config.rag_config_manager import RAGConfigManager
+                config = RAGConfigManager().get_parser_pool_config()
+            except Exception as e:
+                logger.warning(f"Failed to load parser pool config: {e}")
+                return None
+            if not config.get("enabled", True):
+                return None
+            _parser_pool = ParserPool(
+                num_workers=config.get("num_workers", 0),
+                timeout_seconds=config.get("timeout_seconds", 120),
+                memory_limit_mb=config.get("memory_limit_mb", 2048),
+                max_tasks_per_worker=config.get("max_tasks_per_worker", 50)
+            )
+        return _parser_pool
+
+
+def shutdown_parser_pool():
+    """공유 파서 풀 종료 (앱 종료 시)"""
+    global _parser_pool
+    with _parser_pool_lock:
+        pool, _parser_pool = _parser_pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,150 @@
+"""
+Pool Eviction Policy
+모델/커넥션 풀의 LRU + 유휴 TTL + 메모리 예산 기반 해제 정책
+"""
+
+import gc
+import sys
+import time
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Optional
+from core.logging import get_logger
+
+logger = get_logger("pool_policy")
+
+
+def get_process_rss() -> Optional[int]:
+    """현재 프로세스 RSS (bytes, psutil 없으면 None)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def release_memory():
+    """해제된 객체 회수 후 가능하면 힙을 OS에 반환"""
+    gc.collect()
+    if sys.platform.startswith("linux"):
+        try:
+            import ctypes
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except Exception:
+            pass
+
+
+class PoolEvictionPolicy:
+    """풀 항목별 사용 시각/메모리 추적 및 해제 대상 선정 (Thread-safe)"""
+
+    def __init__(self, max_items: int = 0, idle_ttl_seconds: float = 0, memory_budget_mb: float = 0):
+        """
+        Initialize eviction policy
+
+        Args:
+            max_items: Max resident items (0 for no limit)
+            idle_ttl_seconds: Release items unused this long (0 for no expiry)
+            memory_budget_mb: Max estimated memory of all items (0 for no limit)
+        """
+        self.max_items = max_items
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self._entries: Dict[Hashable, Dict[str, Any]] = {}
+        self._lock = Lock()
+
+    def record_load(self, key: Hashable, memory_bytes: Optional[int] = None, rss_delta: Optional[int] = None):
+        """
+        Register a newly loaded item
+
+        Args:
+            key: Pool key
+            memory_bytes: Estimated size from the object itself (e.g. tensor bytes)
+            rss_delta: Process RSS growth measured around the load
+        """
+        now = time.monotonic()
+        estimates = [value for value in (memory_bytes, rss_delta) if value and value > 0]
+        with self._lock:
+            self._entries[key] = {
+                "loaded_at": now,
+                "last_used": now,
+                "memory_bytes": max(estimates) if estimates else 0,
+                "rss_delta": rss_delta
+            }
+
+    def touch(self, key: Hashable):
+        """사용 시각 갱신"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["last_used"] = time.monotonic()
+
+    def forget(self, key: Hashable):
+        """해제된 항목 제거"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def select_idle(self, protect: Optional[Hashable] = None) -> List[Hashable]:
+        """
+        Items unused for longer than the idle TTL
+
+        Args:
+            protect: Key that must stay resident (e.g. current model)
+
+        Returns:
+            Keys to release
+        """
+        if not self.idle_ttl_seconds:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            return [
+                key for key, entry in self._entries.items()
+                if key != protect and now - entry["last_used"] > self.idle_ttl_seconds
+            ]
+
+    def select_over_budget(self, protect: Optional[Hashable] = None) -> List[Hashable]:
+        """
+        Least recently used items to release until count/memory limits hold
+
+        Args:
+            protect: Key that must stay resident (e.g. the item just loaded)
+
+        Returns:
+            Keys to release (LRU first)
+        """
+        with self._lock:
+            ordered = sorted(self._entries.items(), key=lambda item: item[1]["last_used"])
+            count = len(ordered)
+            total = sum(entry["memory_bytes"] for _, entry in ordered)
+
+        victims = []
+        for key, entry in ordered:
+            over_count = self.max_items and count > self.max_items
+            over_memory = self.memory_budget_bytes and total > self.memory_budget_bytes
+            if not (over_count or over_memory):
+                break
+            if key == protect:
+                continue
+            victims.append(key)
+            count -= 1
+            total -= entry["memory_bytes"]
+        return victims
+
+    def get_report(self) -> Dict[Hashable, Dict[str, Any]]:
+        """
+        Per-item memory and idle time
+
+        Returns:
+            {key: {memory_mb, rss_delta_mb, idle_seconds, age_seconds}}
+        """
+        now = time.monotonic()
+        to_mb = lambda value: round(value / (1024 * 1024), 1) if value else None
+        with self._lock:
+            return {
+                key: {
+                    "memory_mb": to_mb(entry["memory_bytes"]),
+                    "rss_delta_mb": to_mb(entry["rss_delta"]),
+                    "idle_seconds": round(now - entry["last_used"], 1),
+                    "age_seconds": round(now - entry["loaded_at"], 1)
+                }
+                for key, entry in self._entries.items()
+            }
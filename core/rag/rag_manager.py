@@ -27,6 +27,8 @@ class RAGManager:
         self.vectorstore = None
         self.embeddings = None
         self.storage = None
+        self.fan_out = None
+        self.fan_out_enabled = False
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=500,
             chunk_overlap=50
@@ -37,9 +39,9 @@ class RAGManager:
     def _init_components(self):
         """Initialize components"""
         try:
-            # Embeddings 초기화 (설정된 모델 사용)
-            from core.rag.embeddings.embedding_factory import EmbeddingFactory
-            self.embeddings = EmbeddingFactory.create_embeddings()
+            # Embeddings 초기화 (풀에서 설정된 모델 공유)
+            from core.rag.embeddings.embedding_pool import embedding_pool
+            self.embeddings = embedding_pool.get_embeddings()
             logger.info("Embeddings initialized")
             
             # Vector store 초기화 (현재 모델에 맞는 테이블 사용)
@@ -57,6 +59,10 @@ class RAGManager:
             self.storage = RAGStorageManager(lazy_load_vector=True)
             logger.info("Storage manager initialized")
             
+            # 임베딩 모델 변경 후 이전 모델 문서 백그라운드 재임베딩 (재시작 시 이어서 진행)
+            from core.rag.batch.reembed_job import get_reembed_runner
+            get_reembed_runner(self.storage).start()
+            
         except Exception as e:
             logger.error(f"Failed to initialize RAG components: {e}")
     
@@ -71,33 +77,44 @@ class RAGManager:
             Success status
         """
         try:
-            # 문서 로드 (청킹 전략 자동 적용)
+            # 문서 스트리밍 로드 (청킹 전략 자동 적용, 파일 크기와 무관한 메모리)
             from core.rag.loaders.document_loader_factory import DocumentLoaderFactory
-            chunks = DocumentLoaderFactory.load_document(file_path)
+            from core.rag.config.rag_config_manager import RAGConfigManager
+            flush_chunks = RAGConfigManager().get_streaming_config()["flush_chunks"]
+            
+            added = 0
+            batch = []
+            for chunk in DocumentLoaderFactory.load_document_stream(file_path):
+                batch.append(chunk)
+                if len(batch) >= flush_chunks:
+                    added += self._add_chunk_batch(batch, start_index=added)
+                    batch = []
+            if batch:
+                added += self._add_chunk_batch(batch, start_index=added)
             
-            if not chunks:
+            if not added:
                 logger.warning(f"No chunks loaded from {file_path}")
                 return False
             
-            logger.info(f"Loaded {len(chunks)} chunks with auto-chunking strategy")
-            
-            # 임베딩 생성
-            texts = [chunk.page_content for chunk in chunks]
-            embeddings = self.embeddings.embed_documents(texts)
-            
-            # Vector store에 추가
-            doc_ids = self.vectorstore.add_documents(
-                chunks,
-                embeddings=embeddings
-            )
-            
-            logger.info(f"Added {len(doc_ids)} chunks to vector store")
+            logger.info(f"Added {added} chunks to vector store")
             return True
             
         except Exception as e:
             logger.error(f"Failed to add document: {e}")
             return False
     
+    def _add_chunk_batch(self, chunks: List[Document], start_index: int = 0) -> int:
+        """청크 묶음 임베딩 후 벡터 스토어에 추가 (추가된 청크 수 반환)"""
+        texts = [chunk.page_content for chunk in chunks]
+        embeddings = self.embeddings.embed_documents(texts)
+        
+        doc_ids = self.vectorstore.add_documents(
+            chunks,
+            embeddings=embeddings,
+            start_index=start_index
+        )
+        return len(doc_ids)
+    
     def search(self, query: str, k: int = 5, topic_id: Optional[str] = None) -> List[Document]:
         """
         Search similar documents
@@ -122,8 +139,14 @@ class RAGManager:
                     topic_id = selected_topic['id']
                     logger.info(f"Using selected topic: {selected_topic['name']}")
             
-            # 쿼리 임베딩
-            query_vector = self.embeddings.embed_query(query)
+            # 다중 모델 검색 사용 시 이전 모델 폴더도 함께 검색
+            fan_out = self._get_fan_out()
+            if fan_out is not None:
+                return self.search_multi(query, k=k, topic_ids=[topic_id] if topic_id else None)
+            
+            # 쿼리 임베딩 (동시 요청은 마이크로 배치로 병합)
+            from core.rag.embeddings.embedding_pool import embedding_pool
+            query_vector = embedding_pool.embed_query(query)
             
             # 검색 (선택된 topic으로 필터링)
             if topic_id:
@@ -148,6 +171,59 @@ class RAGManager:
             logger.error(f"Search failed: {e}")
             return []
     
+    def search_multi(
+        self,
+        query: str,
+        k: int = 5,
+        topic_ids: Optional[List[str]] = None,
+        model_ids: Optional[List[str]] = None,
+        **search_kwargs
+    ) -> List[Document]:
+        """
+        Search several topics and embedding model folders concurrently
+        
+        Documents embedded with a previous model stay searchable after a model
+        switch; scores are normalized per model and merged into one ranking.
+        
+        Args:
+            query: Search query
+            k: Number of merged results
+            topic_ids: Topics to search (None = all topics)
+            model_ids: Embedding models to search (None = fan_out config / populated folders)
+            **search_kwargs: LanceDBStore.search options
+            
+        Returns:
+            Merged documents (metadata: search_model, search_score)
+        """
+        try:
+            fan_out = self._get_fan_out(force=True)
+            return fan_out.search(query, k=k, topic_ids=topic_ids, model_ids=model_ids, **search_kwargs)
+        except Exception as e:
+            logger.error(f"Multi search failed: {e}")
+            return []
+    
+    def _get_fan_out(self, force: bool = False):
+        """
+        Fan-out searcher from retrieval.fan_out config
+        
+        Args:
+            force: Create even when fan_out.enabled is off (explicit search_multi)
+            
+        Returns:
+            FanOutSearcher, or None when disabled
+        """
+        if self.fan_out is None:
+            from core.rag.config.rag_config_manager import RAGConfigManager
+            from core.rag.retrieval.fan_out import FanOutSearcher
+            
+            config_manager = RAGConfigManager()
+            config = config_manager.get_fan_out_config()
+            self.fan_out = FanOutSearcher.from_config(config, rrf_k=config_manager.get_hybrid_config().get("rrf_k", 60))
+            self.fan_out_enabled = bool(config.get("enabled", False))
+        if force or self.fan_out_enabled:
+            return self.fan_out
+        return None
+    
     def is_available(self) -> bool:
         """Check if RAG system is available"""
         return self.vectorstore is not None and self.embeddings is not None
@@ -165,25 +241,28 @@ class RAGManager:
     def refresh_embeddings(self):
         """임베딩 모델 새로고침 (모델 변경 시 호출)"""
         try:
-            from core.rag.embeddings.embedding_factory import EmbeddingFactory
+            from core.rag.embeddings.embedding_pool import embedding_pool
             from core.rag.embeddings.embedding_model_manager import EmbeddingModelManager
             
-            # 새 임베딩 모델 로드
-            self.embeddings = EmbeddingFactory.create_embeddings()
+            # 새 임베딩 모델 로드 (풀에서 현재 모델 조회)
+            self.embeddings = embedding_pool.get_embeddings()
             
-            # 새 테이블로 벡터 스토어 업데이트
+            # 새 모델 폴더로 벡터 스토어 업데이트 (테이블명은 모델과 무관하게 "documents")
             manager = EmbeddingModelManager()
-            table_name = manager.get_table_name()
+            current_model = manager.get_current_model()
+            
+            if self.vectorstore and self.vectorstore.model_id != current_model:
+                # 스토어를 새로 열어 모델 폴더·유지보수 락/compaction 스케줄러 키(table_uri)를 맞춤
+                from core.rag.vector_store.lancedb_store import LanceDBStore
+                previous = self.vectorstore
+                self.vectorstore = LanceDBStore(db_path=self.db_path, model_id=current_model)
+                previous.close()
+                logger.info(f"Switched vector store to model: {current_model} ({self.vectorstore.db_path})")
             
-            if self.vectorstore:
-                self.vectorstore.table_name = table_name
-                # 테이블 재초기화
-                self.vectorstore.table = None
-                if self.vectorstore.db and table_name in self.vectorstore.db.table_names():
-                    self.vectorstore.table = self.vectorstore.db.open_table(table_name)
-                    logger.info(f"Switched to table: {table_name}")
-                else:
-                    logger.info(f"Table {table_name} not found, will be created when needed")
+            # 새 모델 기준으로 재임베딩 재계획 (이전 대상 작업은 취소, 남은 문서는 새 작업)
+            if self.storage:
+                from core.rag.batch.reembed_job import get_reembed_runner
+                get_reembed_runner(self.storage).restart()
             
             logger.info("Embeddings refreshed successfully")
             return True
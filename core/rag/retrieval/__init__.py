@@ -1,5 +1,13 @@
 """RAG Retrieval Module"""
 
-from .multi_query_retriever import MultiQueryRetrieverWrapper
+from .retrieval_cache import RetrievalCache, retrieval_cache
+from .rank_fusion import reciprocal_rank_fusion
+from .diversity import maximal_marginal_relevance, merge_adjacent_chunks
+from .context_packer import ContextPacker, PackResult
+from .fan_out import FanOutSearcher, SearchLeg
 
-__all__ = ['MultiQueryRetrieverWrapper']
+__all__ = [
+    'RetrievalCache', 'retrieval_cache', 'reciprocal_rank_fusion',
+    'maximal_marginal_relevance', 'merge_adjacent_chunks',
+    'ContextPacker', 'PackResult', 'FanOutSearcher', 'SearchLeg'
+]
@@ -0,0 +1,206 @@
+"""
+Context Packer
+검색된 청크를 채팅 모델별 토큰 예산 안에서 관련도 순으로 채워 넣는 RAG 프롬프트 컨텍스트 구성기
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from langchain.schema import Document
+from core.logging import get_logger
+from core.token_logger import TokenLogger
+
+logger = get_logger("context_packer")
+
+# 문장 경계 (종결 부호 뒤 공백, 또는 줄바꿈)
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+
+
+@dataclass
+class PackResult:
+    """Context packing result"""
+    documents: List[Document] = field(default_factory=list)
+    budget_tokens: int = 0
+    packed_tokens: int = 0
+    dropped_tokens: int = 0
+    dropped_count: int = 0
+    truncated_count: int = 0
+    deduped_count: int = 0
+
+    @property
+    def packed_count(self) -> int:
+        return len(self.documents)
+
+
+class ContextPacker:
+    """관련도 순 greedy 패킹 + 슬라이딩 윈도우 오버랩 제거 + 문장 경계 절단"""
+
+    def __init__(
+        self,
+        max_tokens: int = 4000,
+        min_chunk_tokens: int = 32,
+        min_overlap_chars: int = 16,
+        history_tokens: Optional[Callable[[], int]] = None,
+        model_name: str = "",
+        agent_name: str = "RAGAgent"
+    ):
+        """
+        Initialize packer
+
+        Args:
+            max_tokens: Context token budget for the chat model
+            min_chunk_tokens: Smallest truncated chunk worth keeping
+            min_overlap_chars: Shortest overlap treated as a sliding-window duplicate
+            history_tokens: Callable returning tokens already used by conversation history
+                (subtracted from the budget at pack time)
+            model_name: Chat model name (token estimation and tracker reporting)
+            agent_name: Agent name reported to the unified token tracker
+        """
+        self.max_tokens = max_tokens
+        self.min_chunk_tokens = min_chunk_tokens
+        self.min_overlap_chars = min_overlap_chars
+        self.history_tokens = history_tokens
+        self.model_name = model_name
+        self.agent_name = agent_name
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict,
+        model_name: str = "",
+        history_tokens: Optional[Callable[[], int]] = None
+    ) -> "ContextPacker":
+        """
+        Create packer from RAGConfigManager.get_context_packing_config()
+
+        The budget is the first model_budgets entry whose key appears in the model
+        name (case-insensitive), otherwise max_tokens.
+        """
+        max_tokens = config.get("max_tokens", 4000)
+        lowered = model_name.lower()
+        for pattern, budget in config.get("model_budgets", {}).items():
+            if pattern.lower() in lowered:
+                max_tokens = budget
+                break
+
+        return cls(
+            max_tokens=max_tokens,
+            min_chunk_tokens=config.get("min_chunk_tokens", 32),
+            min_overlap_chars=config.get("min_overlap_chars", 16),
+            history_tokens=history_tokens,
+            model_name=model_name
+        )
+
+    def count_tokens(self, text: str) -> int:
+        """청크 토큰 수 추정"""
+        return TokenLogger.estimate_tokens(text, self.model_name)
+
+    def budget(self) -> int:
+        """현재 대화 히스토리 사용량을 뺀 컨텍스트 예산"""
+        used = 0
+        if self.history_tokens is not None:
+            try:
+                used = int(self.history_tokens() or 0)
+            except Exception as e:
+                logger.warning(f"Failed to count history tokens: {e}")
+        return max(self.min_chunk_tokens, self.max_tokens - used)
+
+    def pack(self, documents: List[Document]) -> PackResult:
+        """
+        Pack documents (ranked best-first) into the token budget
+
+        Args:
+            documents: Retrieved documents ordered by relevance
+
+        Returns:
+            PackResult with packed documents (relevance order kept) and counters
+        """
+        result = PackResult(budget_tokens=self.budget())
+        remaining = result.budget_tokens
+        # document_id → 이미 포함된 본문 목록 (오버랩 비교용)
+        packed_texts: Dict[object, List[str]] = {}
+
+        for doc in documents:
+            metadata = doc.metadata or {}
+            document_id = metadata.get("document_id")
+            text = self._strip_overlap(doc.page_content, packed_texts.get(document_id, []))
+            if not text.strip():
+                result.deduped_count += 1
+                continue
+
+            tokens = self.count_tokens(text)
+            if tokens > remaining:
+                truncated = self._truncate_sentences(text, remaining)
+                truncated_tokens = self.count_tokens(truncated)
+                if not truncated or truncated_tokens < self.min_chunk_tokens:
+                    result.dropped_count += 1
+                    result.dropped_tokens += tokens
+                    continue
+                result.truncated_count += 1
+                result.dropped_tokens += tokens - truncated_tokens
+                text, tokens = truncated, truncated_tokens
+
+            if text != doc.page_content:
+                doc = Document(page_content=text, metadata=dict(metadata))
+            result.documents.append(doc)
+            result.packed_tokens += tokens
+            remaining -= tokens
+            packed_texts.setdefault(document_id, []).append(text)
+
+        logger.info(
+            f"Packed {result.packed_count}/{len(documents)} chunks "
+            f"({result.packed_tokens}/{result.budget_tokens} tokens, dropped={result.dropped_count}, "
+            f"truncated={result.truncated_count}, deduped={result.deduped_count})"
+        )
+        self._report(result)
+        return result
+
+    def _strip_overlap(self, text: str, packed: List[str]) -> str:
+        """같은 문서의 이미 포함된 청크와 겹치는 앞/뒤 구간 제거"""
+        for other in packed:
+            if text in other:
+                return ""
+            # 앞 청크 끝 == 현재 청크 시작
+            size = self._overlap(other, text)
+            if size:
+                text = text[size:].lstrip()
+            # 현재 청크 끝 == 뒤 청크 시작
+            size = self._overlap(text, other)
+            if size:
+                text = text[:-size].rstrip()
+        return text
+
+    def _overlap(self, left: str, right: str) -> int:
+        """left 끝과 right 시작이 겹치는 길이 (min_overlap_chars 미만이면 0)"""
+        for size in range(min(len(left), len(right)), self.min_overlap_chars - 1, -1):
+            if left.endswith(right[:size]):
+                return size
+        return 0
+
+    def _truncate_sentences(self, text: str, max_tokens: int) -> str:
+        """max_tokens 안에 들어가는 앞쪽 문장들만 유지"""
+        if max_tokens <= 0:
+            return ""
+        kept = ""
+        for match in _SENTENCE_END.finditer(text):
+            candidate = text[:match.start()].rstrip()
+            if self.count_tokens(candidate) > max_tokens:
+                break
+            kept = candidate
+        return kept
+
+    def _report(self, result: PackResult):
+        """통합 토큰 트래커에 패킹 통계 보고 (트래커 미초기화 시 생략)"""
+        try:
+            from core.token_tracking import get_unified_tracker
+            tracker = get_unified_tracker()
+        except Exception:
+            return
+        tracker.track_context_packing(
+            agent_name=self.agent_name,
+            model=self.model_name,
+            packed_chunks=result.packed_count,
+            dropped_chunks=result.dropped_count,
+            packed_tokens=result.packed_tokens,
+            dropped_tokens=result.dropped_tokens
+        )
@@ -0,0 +1,126 @@
+"""
+Diversity Selection
+Maximal Marginal Relevance(MMR) 후보 선택 및 인접 청크 병합
+"""
+
+from typing import List, Sequence
+import numpy as np
+from langchain.schema import Document
+
+
+def maximal_marginal_relevance(
+    query_vector: Sequence[float],
+    vectors: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5
+) -> List[int]:
+    """
+    Select k diverse candidates with MMR (cosine similarity)
+
+    score = lambda_mult * sim(query, doc) - (1 - lambda_mult) * max sim(doc, selected)
+
+    Args:
+        query_vector: Query embedding
+        vectors: (candidates, dimension) candidate embeddings, best-first
+        k: Number of candidates to select
+        lambda_mult: 1.0 for pure relevance, 0.0 for pure diversity
+
+    Returns:
+        Selected candidate indices in selection order
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if len(vectors) == 0 or k <= 0:
+        return []
+
+    query = np.asarray(query_vector, dtype=np.float32)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = vectors @ query
+    # 선택된 후보와의 최대 유사도 (선택할 때마다 한 열씩 갱신)
+    redundancy = np.full(len(vectors), -np.inf, dtype=np.float32)
+    available = np.ones(len(vectors), dtype=bool)
+    selected = []
+
+    for _ in range(min(k, len(vectors))):
+        if selected:
+            scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, vectors @ vectors[best])
+
+    return selected
+
+
+def merge_adjacent_chunks(documents: List[Document], separator: str = "\n") -> List[Document]:
+    """
+    Merge hits that are consecutive chunks of the same document into one passage
+
+    Sliding-window overlap between neighbours is removed when joining. A merged
+    passage takes the rank of its best-ranked member.
+
+    Args:
+        documents: Ranked documents with document_id / chunk_index metadata
+        separator: Joiner when neighbouring chunks do not overlap
+
+    Returns:
+        Ranked passages (metadata of the best member, plus merged_chunk_indexes)
+    """
+    # 문서별 (chunk_index, 순위) 목록
+    groups = {}
+    for rank, doc in enumerate(documents):
+        metadata = doc.metadata or {}
+        document_id = metadata.get("document_id")
+        chunk_index = metadata.get("chunk_index")
+        if document_id is None or chunk_index is None:
+            continue
+        groups.setdefault(document_id, []).append((int(chunk_index), rank))
+
+    # 연속 chunk_index 구간 → 구간 내 최고 순위 위치에 병합 결과 배치
+    merged_at = {}
+    absorbed = set()
+    for members in groups.values():
+        members.sort()
+        run = [members[0]]
+        for member in members[1:]:
+            if member[0] == run[-1][0] + 1:
+                run.append(member)
+                continue
+            _merge_run(documents, run, separator, merged_at, absorbed)
+            run = [member]
+        _merge_run(documents, run, separator, merged_at, absorbed)
+
+    return [
+        merged_at.get(rank, doc)
+        for rank, doc in enumerate(documents)
+        if rank not in absorbed
+    ]
+
+
+def _merge_run(documents: List[Document], run: list, separator: str, merged_at: dict, absorbed: set):
+    """연속 청크 구간 하나를 병합"""
+    if len(run) < 2:
+        return
+
+    text = documents[run[0][1]].page_content
+    for _, rank in run[1:]:
+        text = _join_overlapping(text, documents[rank].page_content, separator)
+
+    best_rank = min(rank for _, rank in run)
+    metadata = dict(documents[best_rank].metadata or {})
+    metadata["chunk_index"] = run[0][0]
+    metadata["merged_chunk_indexes"] = [chunk_index for chunk_index, _ in run]
+    merged_at[best_rank] = Document(page_content=text, metadata=metadata)
+    absorbed.update(rank for _, rank in run if rank != best_rank)
+
+
+def _join_overlapping(left: str, right: str, separator: str, min_overlap: int = 16) -> str:
+    """left 끝과 right 시작의 겹치는 부분(슬라이딩 윈도우 오버랩)을 한 번만 남기고 연결"""
+    for size in range(min(len(left), len(right)), min_overlap - 1, -1):
+        if left.endswith(right[:size]):
+            return left + right[size:]
+    return left + separator + right
@@ -0,0 +1,275 @@
+"""
+Fan-out Search
+여러 토픽 · 여러 임베딩 모델 폴더를 병렬 검색한 뒤 점수를 정규화해 하나의 순위로 병합
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+from langchain.schema import Document
+from core.logging import get_logger
+
+logger = get_logger("fan_out_search")
+
+
+@dataclass
+class SearchLeg:
+    """One (model, topic) search and its ranked results"""
+    model_id: str
+    topic_id: Optional[str]
+    documents: List[Document] = field(default_factory=list)
+
+
+class FanOutSearcher:
+    """
+    다중 토픽·모델 검색기
+
+    쿼리는 모델마다 한 번만 (임베딩 풀 마이크로 배치로) 임베딩하고, (모델, 토픽) 쌍마다
+    검색을 동시에 실행한다. 모델마다 거리 척도가 다르므로 모델 단위로 점수를 정규화한 뒤
+    병합해, 모델 전환 직후에도 이전 모델 폴더의 문서가 검색된다.
+    """
+
+    NORMALIZATIONS = ("minmax", "rrf")
+
+    def __init__(
+        self,
+        models: Optional[Sequence[str]] = None,
+        include_previous_models: bool = True,
+        model_weights: Optional[Dict[str, float]] = None,
+        normalization: str = "minmax",
+        max_workers: int = 4,
+        rrf_k: int = 60
+    ):
+        """
+        Initialize searcher
+
+        Args:
+            models: Default model IDs to search (empty for current model
+                plus, with include_previous_models, every model folder that has data)
+            include_previous_models: Search other populated model folders by default
+            model_weights: Multiplier applied to a model's normalized scores (default 1.0)
+            normalization: "minmax" (per-model min-max of raw scores) or "rrf" (rank fusion)
+            max_workers: Concurrent (model, topic) searches
+            rrf_k: RRF constant for rrf normalization
+        """
+        self.models = list(models or [])
+        self.include_previous_models = include_previous_models
+        self.model_weights = dict(model_weights or {})
+        self.normalization = normalization if normalization in self.NORMALIZATIONS else "minmax"
+        self.max_workers = max(1, int(max_workers))
+        self.rrf_k = rrf_k
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls, config: Dict, rrf_k: int = 60) -> "FanOutSearcher":
+        """RAGConfigManager.get_fan_out_config()로 생성"""
+        return cls(
+            models=config.get("models", []),
+            include_previous_models=config.get("include_previous_models", True),
+            model_weights=config.get("model_weights", {}),
+            normalization=config.get("normalization", "minmax"),
+            max_workers=config.get("max_workers", 4),
+            rrf_k=rrf_k
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """검색 스레드 풀 (지연 생성)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fan-out-search")
+        return self._executor
+
+    def resolve_models(self, model_ids: Optional[Sequence[str]] = None) -> List[str]:
+        """
+        Models to search: explicit IDs, else configured models, else current + populated folders
+
+        Models without a table in their folder are skipped (folders are never created).
+        """
+        from ..embeddings.embedding_model_manager import EmbeddingModelManager
+        from ..vector_store.lancedb_store import LanceDBStore
+
+        manager = EmbeddingModelManager()
+        current = manager.get_current_model()
+        candidates = list(model_ids or self.models)
+        if not candidates:
+            candidates = [current]
+            if self.include_previous_models:
+                candidates += [model_id for model_id in manager.get_available_models() if model_id != current]
+
+        resolved = []
+        for model_id in dict.fromkeys(candidates):
+            if LanceDBStore.has_model_data(model_id, manager.get_table_name(model_id)):
+                resolved.append(model_id)
+            else:
+                logger.debug(f"Fan-out skips model without data: {model_id}")
+        return resolved
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        topic_ids: Optional[Sequence[str]] = None,
+        model_ids: Optional[Sequence[str]] = None,
+        **search_kwargs
+    ) -> List[Document]:
+        """
+        Search every (model, topic) pair concurrently and merge the rankings
+
+        Args:
+            query: Search query
+            k: Number of merged results (each leg also fetches k)
+            topic_ids: Topics to search (None or empty for all topics)
+            model_ids: Embedding models to search (None for resolve_models defaults)
+            **search_kwargs: LanceDBStore.search options (search_mode, mmr, ...)
+
+        Returns:
+            Merged documents; metadata gains search_model and search_score (0..1)
+        """
+        from ..embeddings.embedding_pool import embedding_pool
+        from ..vector_store.vector_store_pool import vector_store_pool
+
+        models = self.resolve_models(model_ids)
+        if not models:
+            logger.warning("Fan-out search: no model folder with data")
+            return []
+        topics = list(dict.fromkeys(topic_ids)) if topic_ids else [None]
+
+        # 모델당 한 번 임베딩 (동시 제출 → 모델별 마이크로 배치)
+        vector_futures = {}
+        for model_id in models:
+            try:
+                vector_futures[model_id] = embedding_pool.submit(query, model_id)
+            except Exception as e:
+                logger.warning(f"Fan-out search: embedding unavailable for {model_id}: {e}")
+
+        executor = self._get_executor()
+        leg_futures = []
+        for model_id, vector_future in vector_futures.items():
+            try:
+                query_vector = vector_future.result()
+            except Exception as e:
+                logger.warning(f"Fan-out search: skipping {model_id}: {e}")
+                continue
+            for topic_id in topics:
+                leg = SearchLeg(model_id=model_id, topic_id=topic_id)
+                future = executor.submit(
+                    self._search_leg,
+                    vector_store_pool,
+                    leg,
+                    query,
+                    query_vector,
+                    k,
+                    search_kwargs
+                )
+                leg_futures.append((leg, future))
+
+        legs = []
+        for leg, future in leg_futures:
+            try:
+                leg.documents = future.result()
+                legs.append(leg)
+            except Exception as e:
+                logger.warning(f"Fan-out leg failed ({leg.model_id}, {leg.topic_id}): {e}")
+
+        merged = self.merge(legs, k)
+        logger.info(
+            f"Fan-out search: {len(models)} models x {len(topics)} topics, "
+            f"{sum(len(leg.documents) for leg in legs)} candidates -> {len(merged)} for: {query[:50]}"
+        )
+        return merged
+
+    @staticmethod
+    def _search_leg(pool, leg: SearchLeg, query: str, query_vector, k: int, search_kwargs: Dict) -> List[Document]:
+        """(모델, 토픽) 검색 한 건 (검색 중 풀이 스토어를 닫지 않도록 고정)"""
+        with pool.use_store(leg.model_id) as store:
+            return store.search(
+                query,
+                k=k,
+                filter={"topic_id": leg.topic_id} if leg.topic_id else None,
+                query_vector=query_vector,
+                with_scores=True,
+                **search_kwargs
+            )
+
+    def merge(self, legs: List[SearchLeg], k: int) -> List[Document]:
+        """
+        Normalize leg scores, drop duplicate chunks and return the top k
+
+        A chunk found by several legs (same text under another topic or model)
+        keeps its best score.
+        """
+        if self.normalization == "rrf":
+            scored = self._rrf_scores(legs)
+        else:
+            scored = self._minmax_scores(legs)
+
+        best: Dict[str, tuple] = {}
+        for score, model_id, document in scored:
+            score *= self.model_weights.get(model_id, 1.0)
+            key = self._chunk_key(document)
+            if key not in best or score > best[key][0]:
+                best[key] = (score, model_id, document)
+
+        ranked = sorted(best.values(), key=lambda item: item[0], reverse=True)[:k]
+        results = []
+        for score, model_id, document in ranked:
+            metadata = {**document.metadata, "search_model": model_id, "search_score": round(score, 6)}
+            metadata.pop("search_distance", None)
+            results.append(Document(page_content=document.page_content, metadata=metadata))
+        return results
+
+    def _minmax_scores(self, legs: List[SearchLeg]) -> List[tuple]:
+        """
+        Per-model min-max normalization to 0..1
+
+        Topics of one model share a distance scale, so their legs are normalized
+        together. Models whose rows lack vector distances (FTS/hybrid) fall back
+        to rank position.
+        """
+        by_model: Dict[str, List[SearchLeg]] = {}
+        for leg in legs:
+            by_model.setdefault(leg.model_id, []).append(leg)
+
+        scored = []
+        for model_id, model_legs in by_model.items():
+            rows = [
+                (rank, document)
+                for leg in model_legs
+                for rank, document in enumerate(leg.documents)
+            ]
+            if not rows:
+                continue
+            if all("search_distance" in document.metadata for _, document in rows):
+                raw = [-document.metadata["search_distance"] for _, document in rows]
+            else:
+                raw = [-float(rank) for rank, _ in rows]
+
+            low, high = min(raw), max(raw)
+            span = high - low
+            for value, (_, document) in zip(raw, rows):
+                scored.append(((value - low) / span if span > 0 else 1.0, model_id, document))
+        return scored
+
+    def _rrf_scores(self, legs: List[SearchLeg]) -> List[tuple]:
+        """RRF over all legs (sum of 1 / (rrf_k + rank)), scaled so a chunk ranked first everywhere scores 1.0"""
+        scores: Dict[str, float] = {}
+        found: Dict[str, tuple] = {}
+        for leg in legs:
+            for rank, document in enumerate(leg.documents, start=1):
+                key = self._chunk_key(document)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (self.rrf_k + rank)
+                found.setdefault(key, (leg.model_id, document))
+
+        top = len(legs) / (self.rrf_k + 1) if legs else 1.0
+        return [(score / top, *found[key]) for key, score in scores.items()]
+
+    @staticmethod
+    def _chunk_key(document: Document) -> str:
+        """중복 판정 키 (같은 본문이면 토픽·모델이 달라도 같은 청크)"""
+        return hashlib.blake2b(document.page_content.strip().encode("utf-8"), digest_size=16).hexdigest()
+
+    def close(self):
+        """스레드 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,40 @@
+"""
+Rank Fusion
+여러 검색 결과 목록을 Reciprocal Rank Fusion(RRF)으로 병합
+"""
+
+from typing import Any, Callable, Dict, List, Sequence
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[Sequence[Any]],
+    key: Callable[[Any], Any],
+    k: int = 60,
+    limit: int = None
+) -> List[Any]:
+    """
+    Fuse ranked result lists with RRF (score = sum of 1 / (k + rank))
+
+    Args:
+        ranked_lists: Result lists, each ordered best-first
+        key: Function returning the identity of an item (duplicates are merged)
+        k: RRF constant (larger values flatten rank differences)
+        limit: Max items to return (None for all)
+
+    Returns:
+        Items ordered by fused score (first occurrence of each key is kept)
+    """
+    scores: Dict[Any, float] = {}
+    items: Dict[Any, Any] = {}
+
+    for results in ranked_lists:
+        for rank, item in enumerate(results, start=1):
+            item_key = key(item)
+            scores[item_key] = scores.get(item_key, 0.0) + 1.0 / (k + rank)
+            items.setdefault(item_key, item)
+
+    # 동점이면 먼저 등장한 항목 우선 (dict 순서 유지 + 안정 정렬)
+    ordered = sorted(items, key=lambda item_key: scores[item_key], reverse=True)
+    if limit is not None:
+        ordered = ordered[:limit]
+    return [items[item_key] for item_key in ordered]
@@ -0,0 +1,218 @@
+"""
+Cross-Encoder Reranker
+벡터 검색 후보를 로컬 cross-encoder로 (query, chunk) 점수화해 상위 k개만 남기는 재정렬 단계
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+from langchain.schema import Document
+from core.logging import get_logger
+
+logger = get_logger("reranker")
+
+
+class CrossEncoderReranker:
+    """로컬 cross-encoder 재정렬기 (CPU 배치 점수화 + 점수 LRU 캐시, Thread-safe)"""
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 16,
+        max_length: int = 256,
+        cache_max_entries: int = 4096,
+        device: str = "cpu"
+    ):
+        """
+        Initialize reranker (model loads lazily on first rerank)
+
+        Args:
+            model_name: sentence-transformers CrossEncoder model name or path
+            batch_size: (query, chunk) pairs per forward pass
+            max_length: Max tokens per pair (longer chunks are truncated)
+            cache_max_entries: Max cached (query, chunk) scores
+            device: Inference device
+        """
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
+        self.cache_max_entries = cache_max_entries
+        self.device = device
+        self.model = None
+        self._load_failed = False
+        self._model_lock = Lock()
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._cache_lock = Lock()
+        self._stats = {"queries": 0, "scored": 0, "cache_hits": 0, "budget_exceeded": 0}
+
+    def _ensure_model(self) -> bool:
+        """모델 지연 로드 (실패 시 재시도하지 않음)"""
+        with self._model_lock:
+            if self.model is not None:
+                return True
+            if self._load_failed:
+                return False
+            try:
+                from sentence_transformers import CrossEncoder
+                started = time.monotonic()
+                self.model = CrossEncoder(self.model_name, max_length=self.max_length, device=self.device)
+                logger.info(f"Cross-encoder loaded: {self.model_name} ({time.monotonic() - started:.1f}s)")
+                return True
+            except Exception as e:
+                self._load_failed = True
+                logger.error(f"Failed to load cross-encoder {self.model_name}: {e}")
+                return False
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        """쿼리 해시"""
+        return hashlib.md5(query.encode()).hexdigest()
+
+    @staticmethod
+    def _chunk_key(doc: Document) -> str:
+        """청크 식별자 (문서 ID + 청크 인덱스, 없으면 본문 해시)"""
+        metadata = doc.metadata or {}
+        if metadata.get("document_id") is not None and metadata.get("chunk_index") is not None:
+            return f"{metadata['document_id']}:{metadata['chunk_index']}"
+        return hashlib.md5(doc.page_content.encode()).hexdigest()
+
+    def rerank(
+        self,
+        query: str,
+        documents: List[Document],
+        top_k: int,
+        time_budget_ms: Optional[float] = None
+    ) -> List[Document]:
+        """
+        Score (query, chunk) pairs and keep the best top_k
+
+        후보는 검색 순위대로 배치 점수화하며, 시간 예산을 넘기면 남은 후보는
+        점수 없이 검색 순위 그대로 뒤에 붙인다.
+
+        Args:
+            query: User query
+            documents: Candidates in retrieval order
+            top_k: Number of documents to keep
+            time_budget_ms: Max scoring time (None or 0 for no limit)
+
+        Returns:
+            Top documents (copies with metadata["rerank_score"] when scored)
+        """
+        if not documents or not query:
+            return documents[:top_k]
+        if not self._ensure_model():
+            return documents[:top_k]
+
+        started = time.monotonic()
+        deadline = started + time_budget_ms / 1000.0 if time_budget_ms else None
+        query_hash = self._query_hash(query)
+        keys = [(query_hash, self._chunk_key(doc)) for doc in documents]
+
+        scores: List[Optional[float]] = self._get_cached(keys)
+        cache_hits = sum(score is not None for score in scores)
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        for start in range(0, len(missing), self.batch_size):
+            if deadline and time.monotonic() > deadline:
+                self._stats["budget_exceeded"] += 1
+                logger.warning(
+                    f"Rerank budget {time_budget_ms}ms exceeded: scored "
+                    f"{len(documents) - len(missing) + start}/{len(documents)} candidates"
+                )
+                break
+            batch = missing[start:start + self.batch_size]
+            pairs = [(query, documents[i].page_content) for i in batch]
+            try:
+                batch_scores = self.model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+            except Exception as e:
+                logger.error(f"Cross-encoder scoring failed: {e}")
+                break
+            for i, score in zip(batch, batch_scores):
+                scores[i] = float(score)
+            self._set_cached([keys[i] for i in batch], [scores[i] for i in batch])
+
+        # 점수 순 → 미점수 후보는 검색 순위 유지
+        scored = sorted((i for i, score in enumerate(scores) if score is not None), key=lambda i: -scores[i])
+        unscored = [i for i, score in enumerate(scores) if score is None]
+        results = []
+        for i in (scored + unscored)[:top_k]:
+            doc = documents[i]
+            metadata = dict(doc.metadata or {})
+            if scores[i] is not None:
+                metadata["rerank_score"] = scores[i]
+            results.append(Document(page_content=doc.page_content, metadata=metadata))
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self._stats["queries"] += 1
+        self._stats["scored"] += len(scored) - cache_hits
+        self._stats["cache_hits"] += cache_hits
+        logger.info(
+            f"[RERANK] {len(documents)} -> {len(results)} in {elapsed_ms:.0f}ms "
+            f"(cache hits {cache_hits}, unscored {len(unscored)})"
+        )
+        return results
+
+    # ========== Score Cache ==========
+
+    def _get_cached(self, keys: List[Tuple[str, str]]) -> List[Optional[float]]:
+        """캐시된 점수 조회"""
+        with self._cache_lock:
+            scores = []
+            for key in keys:
+                score = self._cache.get(key)
+                if score is not None:
+                    self._cache.move_to_end(key)
+                scores.append(score)
+            return scores
+
+    def _set_cached(self, keys: List[Tuple[str, str]], scores: List[float]):
+        """점수 저장 (LRU)"""
+        with self._cache_lock:
+            for key, score in zip(keys, scores):
+                self._cache[key] = score
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        """점수 캐시 비우기"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """재정렬 통계"""
+        with self._cache_lock:
+            cached = len(self._cache)
+        return {"model": self.model_name, "loaded": self.model is not None, "cached_scores": cached, **self._stats}
+
+
+_rerankers: Dict[str, CrossEncoderReranker] = {}
+_rerankers_lock = Lock()
+
+
+def get_reranker(config: Dict[str, Any]) -> Optional[CrossEncoderReranker]:
+    """
+    Shared reranker for the configured model (None when reranking is disabled)
+
+    Args:
+        config: Rerank config (rerank_model, batch_size, max_length, cache_max_entries)
+
+    Returns:
+        CrossEncoderReranker instance or None
+    """
+    model_name = config.get("rerank_model")
+    if not model_name:
+        return None
+    with _rerankers_lock:
+        reranker = _rerankers.get(model_name)
+        if reranker is None:
+            reranker = CrossEncoderReranker(
+                model_name,
+                batch_size=config.get("batch_size", 16),
+                max_length=config.get("max_length", 256),
+                cache_max_entries=config.get("cache_max_entries", 4096)
+            )
+            _rerankers[model_name] = reranker
+        return reranker
@@ -0,0 +1,161 @@
+"""
+Retrieval Result Cache
+검색 결과 LRU/TTL 캐시 (테이블 버전 기반 무효화)
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+from core.logging import get_logger
+
+logger = get_logger("retrieval_cache")
+
+
+class RetrievalCache:
+    """검색 결과 캐시 (LRU + TTL, Thread-safe)"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600):
+        """
+        Initialize retrieval cache
+
+        Args:
+            max_entries: Max cached queries (LRU eviction)
+            ttl_seconds: Entry time-to-live in seconds (0 for no expiry)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(
+        model_id: str,
+        table_version: Any,
+        filter: Optional[Dict[str, Any]],
+        k: int,
+        query: str,
+        **extra
+    ) -> Tuple:
+        """
+        Build cache key
+
+        Args:
+            model_id: Embedding model ID
+            table_version: LanceDB table version (changes after add/delete)
+            filter: Topic/metadata filter
+            k: Number of results
+            query: Query text
+            **extra: Additional search options affecting results
+
+        Returns:
+            Hashable key tuple
+        """
+        # 목록 값(IN 필터)은 순서 무관한 튜플로 고정 (리스트는 해시 불가)
+        filter_key = tuple(sorted(
+            (key, tuple(sorted(value, key=repr)) if isinstance(value, (list, set, tuple)) else value)
+            for key, value in (filter or {}).items()
+        ))
+        extra_key = tuple(sorted((key, repr(value)) for key, value in extra.items()))
+        return (model_id, table_version, filter_key, k, query, extra_key)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None (missing/expired)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            created_at, value = entry
+            if self.ttl_seconds and time.monotonic() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Cache value
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, model_id: Optional[str] = None):
+        """
+        Invalidate cached results
+
+        Args:
+            model_id: Only drop entries for this model (None for all)
+        """
+        with self._lock:
+            if model_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == model_id]:
+                    del self._entries[key]
+        logger.debug(f"Retrieval cache invalidated (model={model_id or 'all'})")
+
+    def configure(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        """Update cache limits"""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            while len(self._entries) > max(self.max_entries, 0):
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0
+            }
+
+
+def _create_default_cache() -> RetrievalCache:
+    """RAG 설정 기반 캐시 생성"""
+    try:
+        from ..config.rag_config_manager import RAGConfigManager
+        cache_config = RAGConfigManager().get_retrieval_cache_config()
+        return RetrievalCache(
+            max_entries=cache_config.get("max_entries", 256),
+            ttl_seconds=cache_config.get("ttl_seconds", 600)
+        )
+    except Exception as e:
+        logger.warning(f"Failed to load retrieval cache config: {e}")
+        return RetrievalCache()
+
+
+# 전역 싱글톤 인스턴스
+retrieval_cache = _create_default_cache()
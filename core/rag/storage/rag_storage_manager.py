@@ -3,7 +3,7 @@ RAG Storage Manager
 SQLite + LanceDB 통합 관리
 """
 
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
 from pathlib import Path
 from core.logging import get_logger
 from .topic_database import TopicDatabase
@@ -18,16 +18,21 @@ class RAGStorageManager:
     _instance = None
     _initialized = False
     
+    # LanceDBStore.add_documents가 저장 위치 기준으로 채우는 메타데이터 키
+    _STORAGE_METADATA_FIELDS = ("document_id", "topic_id", "chunk_index", "chunking_strategy", "embedding_model")
+    
     def __new__(cls, sqlite_path: Optional[str] = None, 
                 lancedb_path: Optional[str] = None,
-                lazy_load_vector: bool = False):
+                lazy_load_vector: bool = False,
+                model_id: Optional[str] = None):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self, sqlite_path: Optional[str] = None, 
                  lancedb_path: Optional[str] = None,
-                 lazy_load_vector: bool = False):
+                 lazy_load_vector: bool = False,
+                 model_id: Optional[str] = None):
         """
         Initialize RAG storage manager (Singleton)
         
@@ -35,6 +40,7 @@ class RAGStorageManager:
             sqlite_path: SQLite database path (None for auto-detection)
             lancedb_path: LanceDB path (None for auto-detection)
             lazy_load_vector: Lazy load vector store (True for UI operations)
+            model_id: Embedding model for the vector store and new documents (None for current)
         """
         if self._initialized:
             return
@@ -44,14 +50,15 @@ class RAGStorageManager:
         
         self.topic_db = TopicDatabase(sqlite_path)
         self.lancedb_path = lancedb_path
-        self.vector_store = None if lazy_load_vector else LanceDBStore(lancedb_path)
+        self.model_id = model_id
+        self.vector_store = None if lazy_load_vector else LanceDBStore(lancedb_path, model_id=model_id)
         self._initialized = True
         logger.info(f"RAG Storage Manager initialized (Singleton, lazy_vector={lazy_load_vector})")
     
     def _ensure_vector_store(self):
         """Lazy load vector store"""
         if self.vector_store is None:
-            self.vector_store = LanceDBStore(self.lancedb_path)
+            self.vector_store = LanceDBStore(self.lancedb_path, model_id=self.model_id)
             logger.info("Vector store lazy loaded")
     
     # ========== Topic Operations ==========
@@ -95,10 +102,12 @@ class RAGStorageManager:
         Delete topic with cascading deletion
         
         Deletes:
-        1. SQLite documents (100개씩)
-        2. LanceDB vectors (100개씩)
+        1. SQLite documents (500개씩 IN 조건)
+        2. LanceDB vectors (topic_id 조건 1회, 논리적 삭제)
         3. Topic itself
         
+        Note: 물리적 정리는 백그라운드 compaction 스케줄러가 수행
+        
         Args:
             topic_id: 토픽 ID
             progress_callback: 진행 콜백 (deleted_count, total_count)
@@ -112,18 +121,23 @@ class RAGStorageManager:
             doc_ids = [doc["id"] for doc in documents]
             total_docs = len(doc_ids)
             
+            self.topic_db.delete_fingerprints_by_topic(topic_id)
+            
             if not doc_ids:
                 self.topic_db.conn.execute("DELETE FROM topics WHERE id = ?", (topic_id,))
                 self.topic_db.conn.commit()
                 logger.info(f"Empty topic deleted: {topic_id}")
                 return True
             
-            # 2. Delete in batches of 100
-            batch_size = 100
+            # 2. Delete LanceDB vectors (단일 스캔)
+            self._ensure_vector_store()
+            if self.vector_store and not self.vector_store.delete_by_topic_id(topic_id):
+                logger.warning(f"Vector delete failed for topic {topic_id}")
+            
+            # 3. Delete SQLite documents in batches
+            batch_size = 500
             for i in range(0, total_docs, batch_size):
                 batch_ids = doc_ids[i:i+batch_size]
-                
-                # Delete SQLite documents
                 placeholders = ','.join(['?'] * len(batch_ids))
                 self.topic_db.conn.execute(
                     f"DELETE FROM documents WHERE id IN ({placeholders})",
@@ -131,49 +145,15 @@ class RAGStorageManager:
                 )
                 self.topic_db.conn.commit()
                 
-                # Delete LanceDB vectors (without compact)
-                self._ensure_vector_store()
-                for doc_id in batch_ids:
-                    try:
-                        if self.vector_store and self.vector_store.table:
-                            delete_expr = f"metadata['document_id'] = '{doc_id}'"
-                            self.vector_store.table.delete(delete_expr)
-                    except Exception as e:
-                        logger.warning(f"Vector delete failed for {doc_id}: {e}")
-                
                 deleted_count = min(i + batch_size, total_docs)
                 if progress_callback:
                     progress_callback(deleted_count, total_docs)
                 logger.debug(f"삭제 진행: {deleted_count}/{total_docs}")
             
-            # 3. Delete topic
+            # 4. Delete topic
             self.topic_db.conn.execute("DELETE FROM topics WHERE id = ?", (topic_id,))
             self.topic_db.conn.commit()
             
-            # 4. Final cleanup - physically remove deleted data
-            self._ensure_vector_store()
-            try:
-                if self.vector_store and self.vector_store.db and self.vector_store.table_name in self.vector_store.db.table_names():
-                    table = self.vector_store.db.open_table(self.vector_store.table_name)
-                    
-                    # Step 1: Compact files to merge fragments
-                    table.compact_files()
-                    logger.info("Compacted files")
-                    
-                    # Step 2: Cleanup old versions (no time limit)
-                    from datetime import timedelta
-                    stats = table.cleanup_old_versions(
-                        older_than=timedelta(seconds=0),
-                        delete_unverified=True
-                    )
-                    logger.info(f"Cleanup stats: {stats}")
-                    
-                    # Step 3: Optimize to physically remove deleted rows
-                    table.optimize()
-                    logger.info(f"Vector DB optimized after deleting topic {topic_id}")
-            except Exception as e:
-                logger.error(f"Optimize failed: {e}", exc_info=True)
-            
             logger.info(f"Topic deleted: {topic_id}, docs={total_docs}")
             return True
             
@@ -189,7 +169,7 @@ class RAGStorageManager:
         """Create document metadata"""
         return self.topic_db.create_document(
             topic_id, filename, file_path, file_type, 
-            file_size, chunking_strategy
+            file_size, chunking_strategy, embedding_model=self.model_id
         )
     
     def get_document(self, doc_id: str) -> Optional[Dict]:
@@ -208,37 +188,191 @@ class RAGStorageManager:
         1. All chunks in LanceDB (논리적 삭제)
         2. Document metadata in SQLite
         
-        Note: 물리적 삭제(optimize)는 수동으로 수행하거나 주기적으로 실행
+        Note: 물리적 삭제는 백그라운드 compaction 스케줄러가 수행
         
         Returns:
             Success status
         """
+        return self.delete_documents([doc_id]) == 1
+    
+    def delete_documents(self, doc_ids: List[str]) -> int:
+        """
+        Delete multiple documents (single batched vector delete)
+        
+        Args:
+            doc_ids: Document IDs
+            
+        Returns:
+            Number of documents deleted
+        """
+        if not doc_ids:
+            return 0
+        
         try:
-            # 1. Delete vectors (논리적 삭제만)
+            # 0. 링크된 중복 청크가 가리키는 원본을 살아있는 문서로 승격
+            self._promote_linked_chunks(doc_ids)
+            
+            # 1. Delete vectors (IN 조건 일괄 삭제)
             self._ensure_vector_store()
-            if self.vector_store and self.vector_store.db and self.vector_store.table_name in self.vector_store.db.table_names():
-                try:
-                    table = self.vector_store.db.open_table(self.vector_store.table_name)
-                    delete_expr = f"metadata['document_id'] = '{doc_id}'"
-                    table.delete(delete_expr)
-                    logger.info(f"Logically deleted vectors for document {doc_id}")
-                except Exception as e:
-                    logger.warning(f"Vector delete failed for {doc_id}: {e}")
+            if self.vector_store and not self.vector_store.delete_by_document_ids(doc_ids):
+                logger.warning(f"Vector delete failed for {len(doc_ids)} documents")
             
             # 2. Delete document metadata
-            self.topic_db.delete_document(doc_id)
+            deleted = 0
+            for doc_id in doc_ids:
+                if self.topic_db.delete_document(doc_id):
+                    deleted += 1
             
-            logger.info(f"Document deleted: {doc_id}")
-            return True
+            logger.info(f"Documents deleted: {deleted}/{len(doc_ids)}")
+            return deleted
             
         except Exception as e:
-            logger.error(f"Failed to delete document: {e}", exc_info=True)
-            return False
+            logger.error(f"Failed to delete documents: {e}", exc_info=True)
+            return 0
+    
+    def _promote_linked_chunks(self, doc_ids: List[str]) -> int:
+        """
+        Move canonical chunks of deleted documents into a document that links to them
+        
+        Link-mode dedup stores a duplicate chunk only as a link to its canonical
+        chunk. Before the canonical document is deleted, each linked chunk is
+        re-embedded and appended to the first surviving linking document, and the
+        remaining links are repointed to that copy.
+        
+        Args:
+            doc_ids: Documents about to be deleted
+            
+        Returns:
+            Number of promoted chunks
+        """
+        deleting = set(doc_ids)
+        links = [
+            link for link in self.topic_db.get_links_to_documents(list(deleting))
+            if link["document_id"] not in deleting
+        ]
+        if not links:
+            return 0
+        
+        # 원본 청크별 링크 묶음 (첫 링크 문서가 새 원본)
+        groups: Dict[tuple, List[Dict]] = {}
+        for link in links:
+            groups.setdefault((link["canonical_document_id"], link["canonical_chunk_index"]), []).append(link)
+        
+        self._ensure_vector_store()
+        rows: Dict[tuple, tuple] = {}
+        for canonical_id in {key[0] for key in groups}:
+            wanted = {index for doc_id, index in groups if doc_id == canonical_id}
+            for batch in self.vector_store.iter_document_batches(canonical_id, ["text", "metadata"]):
+                for text, metadata in zip(batch.column("text").to_pylist(), batch.column("metadata").to_pylist()):
+                    chunk_index = int((metadata or {}).get("chunk_index") or 0)
+                    if chunk_index in wanted:
+                        rows[(canonical_id, chunk_index)] = (text or "", dict(metadata or {}))
+        
+        from langchain.schema import Document
+        from ..embeddings.embedding_pool import embedding_pool
+        # 저장소 모델로 재임베딩 (현재 모델과 다르면 차원/공간이 달라짐)
+        embeddings = embedding_pool.get_embeddings(self.vector_store.model_id)
+        promoted = 0
+        for key, group in groups.items():
+            if key not in rows:
+                logger.warning(f"Canonical chunk {key} not found, {len(group)} linked duplicates are lost")
+                continue
+            owner = group[0]
+            doc = self.topic_db.get_document(owner["document_id"])
+            if not doc:
+                continue
+            
+            text, metadata = rows[key]
+            # 원본 메타데이터 유지, 저장 위치 관련 키는 add_chunks가 새 문서 기준으로 채움
+            for field in self._STORAGE_METADATA_FIELDS:
+                metadata.pop(field, None)
+            metadata["source"] = doc.get("file_path") or doc.get("filename")
+            
+            start_index = doc.get("chunk_count") or 0
+            chunk_ids = self.add_chunks(
+                owner["document_id"],
+                [Document(page_content=text, metadata=metadata)],
+                embeddings.embed_documents([text]),
+                chunking_strategy=doc.get("chunking_strategy") or "sliding_window",
+                start_index=start_index
+            )
+            if not chunk_ids:
+                logger.error(f"Failed to promote canonical chunk {key} to {owner['document_id']}")
+                continue
+            promoted += 1
+            
+            simhash = self.topic_db.get_chunk_simhash(*key)
+            if simhash is not None:
+                self.topic_db.add_chunk_fingerprints(owner["topic_id"], owner["document_id"], [(start_index, simhash)])
+            # 나머지 링크는 승격된 청크로 재연결 (기존 링크 행은 원본 문서 삭제 시 제거)
+            for link in group[1:]:
+                self.topic_db.add_chunk_links(
+                    link["topic_id"], link["document_id"], [(owner["document_id"], start_index)]
+                )
+        
+        if promoted:
+            logger.info(f"Promoted {promoted} linked chunks before deleting {len(deleting)} documents")
+        return promoted
+    
+    def get_file_fingerprints(self, topic_id: str) -> Dict[str, Dict]:
+        """Get file fingerprints of a topic for the storage embedding model"""
+        return self.topic_db.get_file_fingerprints(topic_id, self.model_id)
+    
+    def record_file_fingerprint(self, topic_id: str, file_path: str, file_size: int,
+                                mtime: float, content_hash: str, doc_id: str):
+        """Record file fingerprint after a successful ingest"""
+        self.topic_db.upsert_file_fingerprint(
+            topic_id, file_path, file_size, mtime, content_hash, doc_id, self.model_id
+        )
+    
+    def get_chunk_fingerprints(self, topic_id: str, exclude_doc_ids: Optional[Iterable[str]] = None) -> List[tuple]:
+        """Get chunk SimHash fingerprints of a topic [(simhash, doc_id, chunk_index)], minus excluded documents"""
+        return self.topic_db.get_chunk_fingerprints(topic_id, self.model_id, exclude_doc_ids=exclude_doc_ids)
+    
+    def record_chunk_fingerprints(self, topic_id: str, doc_id: str, rows: List[tuple]):
+        """Record SimHash fingerprints of stored chunks [(chunk_index, simhash)]"""
+        self.topic_db.add_chunk_fingerprints(topic_id, doc_id, rows)
+    
+    def record_chunk_links(self, topic_id: str, doc_id: str, links: List[tuple]):
+        """Record duplicates of doc_id that link to stored chunks [(canonical_doc_id, chunk_index)]"""
+        self.topic_db.add_chunk_links(topic_id, doc_id, links)
+    
+    # ========== Re-embedding Jobs ==========
+    
+    def get_embedding_model_counts(self) -> Dict[str, int]:
+        """Get document counts per embedding model"""
+        return self.topic_db.get_embedding_model_counts()
+    
+    def get_documents_by_embedding_model(self, embedding_model: str) -> List[Dict]:
+        """Get all documents embedded with a model"""
+        return self.topic_db.get_documents_by_embedding_model(embedding_model)
+    
+    def create_reembed_job(self, source_model: str, target_model: str, total_documents: int) -> str:
+        """Create a re-embedding job"""
+        return self.topic_db.create_reembed_job(source_model, target_model, total_documents)
+    
+    def get_reembed_job(self, job_id: str) -> Optional[Dict]:
+        """Get a re-embedding job"""
+        return self.topic_db.get_reembed_job(job_id)
+    
+    def get_reembed_jobs(self, statuses: Optional[List[str]] = None) -> List[Dict]:
+        """Get re-embedding jobs (optionally by status)"""
+        return self.topic_db.get_reembed_jobs(statuses)
+    
+    def update_reembed_job(self, job_id: str, **fields):
+        """Update re-embedding job status/progress"""
+        self.topic_db.update_reembed_job(job_id, **fields)
+    
+    def complete_document_reembed(self, job_id: str, doc_id: str, source_model: str,
+                                  target_model: str, chunk_count: int):
+        """Checkpoint a re-embedded document (moves it to target_model)"""
+        self.topic_db.complete_document_reembed(job_id, doc_id, source_model, target_model, chunk_count)
     
     # ========== Chunk Operations ==========
     
     def add_chunks(self, doc_id: str, chunks: List, embeddings: List,
-                  chunking_strategy: str = "sliding_window") -> List[str]:
+                  chunking_strategy: str = "sliding_window",
+                  start_index: int = 0) -> List[str]:
         """
         Add chunks to LanceDB with metadata
         
@@ -247,6 +381,7 @@ class RAGStorageManager:
             chunks: List of Document objects
             embeddings: Pre-computed embeddings
             chunking_strategy: Chunking strategy name
+            start_index: Index of the first chunk (streamed documents are added in parts)
             
         Returns:
             List of chunk IDs
@@ -261,15 +396,16 @@ class RAGStorageManager:
         self._ensure_vector_store()
         
         # Get embedding model name from current embeddings instance
-        embedding_model = "unknown"
-        try:
-            from core.rag.config.rag_config_manager import RAGConfigManager
-            config_manager = RAGConfigManager()
-            current_model = config_manager.get_current_embedding_model()
-            embedding_model = current_model
-            logger.info(f"[VECTOR STORE] Using embedding model: {embedding_model}")
-        except Exception as e:
-            logger.warning(f"Failed to get embedding model info: {e}")
+        embedding_model = self.model_id or "unknown"
+        if self.model_id is None:
+            try:
+                from core.rag.config.rag_config_manager import RAGConfigManager
+                config_manager = RAGConfigManager()
+                current_model = config_manager.get_current_embedding_model()
+                embedding_model = current_model
+                logger.info(f"[VECTOR STORE] Using embedding model: {embedding_model}")
+            except Exception as e:
+                logger.warning(f"Failed to get embedding model info: {e}")
         
         chunk_ids = self.vector_store.add_documents(
             chunks,
@@ -277,18 +413,21 @@ class RAGStorageManager:
             document_id=doc_id,
             topic_id=doc["topic_id"],
             chunking_strategy=chunking_strategy,
-            embedding_model=embedding_model
+            embedding_model=embedding_model,
+            file_type=doc.get("file_type"),
+            start_index=start_index
         )
         
         # Update chunk count in SQLite
-        self.topic_db.update_document_chunks(doc_id, len(chunk_ids))
+        self.topic_db.update_document_chunks(doc_id, start_index + len(chunk_ids))
         
         logger.info(f"Added {len(chunk_ids)} chunks for document {doc_id}")
         return chunk_ids
     
     def search_chunks(self, query: str, k: int = 5, 
                      topic_id: Optional[str] = None,
-                     query_vector: Optional[List[float]] = None) -> List:
+                     query_vector: Optional[List[float]] = None,
+                     **search_kwargs) -> List:
         """
         Search chunks with optional topic filtering
         
@@ -297,6 +436,8 @@ class RAGStorageManager:
             k: Number of results
             topic_id: Optional topic filter
             query_vector: Pre-computed query embedding
+            **search_kwargs: LanceDBStore.search options
+                (search_mode, mmr, fetch_k, lambda_mult, merge_adjacent)
             
         Returns:
             List of Document objects
@@ -308,9 +449,25 @@ class RAGStorageManager:
             query,
             k=k,
             filter=filter_dict,
-            query_vector=query_vector
+            query_vector=query_vector,
+            **search_kwargs
         )
     
+    def schedule_index_maintenance(self, force: bool = False) -> bool:
+        """
+        Build/refresh the ANN index in the background
+        
+        Args:
+            force: Rebuild regardless of thresholds
+            
+        Returns:
+            True if a maintenance run was started
+        """
+        self._ensure_vector_store()
+        if not self.vector_store:
+            return False
+        return self.vector_store.index_manager.schedule_maintenance(force=force)
+    
     # ========== Statistics ==========
     
     def get_statistics(self) -> Dict:
@@ -354,21 +511,23 @@ class RAGStorageManager:
             before_count = table.count_rows()
             logger.info(f"Before optimization: {before_count} rows")
             
-            # Step 1: Compact files (안전)
-            table.compact_files()
-            logger.info("✓ Compacted files")
-            
-            # Step 2: Cleanup old versions (안전하게)
-            from datetime import timedelta
-            stats = table.cleanup_old_versions(
-                older_than=timedelta(hours=1),  # ✅ 1시간 이상 된 것만
-                delete_unverified=False  # ✅ 검증된 것만 삭제
-            )
-            logger.info(f"✓ Cleanup stats: {stats}")
-            
-            # Step 3: Optimize (물리적 삭제)
-            table.optimize()
-            logger.info("✓ Optimize completed")
+            # 백그라운드 인덱스 빌드/compaction과 동시 실행 방지 (완료까지 대기)
+            with self.vector_store.index_manager.maintenance_lock:
+                # Step 1: Compact files (안전)
+                table.compact_files()
+                logger.info("✓ Compacted files")
+                
+                # Step 2: Cleanup old versions (안전하게)
+                from datetime import timedelta
+                stats = table.cleanup_old_versions(
+                    older_than=timedelta(hours=1),  # ✅ 1시간 이상 된 것만
+                    delete_unverified=False  # ✅ 검증된 것만 삭제
+                )
+                logger.info(f"✓ Cleanup stats: {stats}")
+                
+                # Step 3: Optimize (물리적 삭제)
+                table.optimize()
+                logger.info("✓ Optimize completed")
             
             # 최적화 후 행 수 확인
             after_count = table.count_rows()
@@ -7,7 +7,7 @@ import sqlite3
 import hashlib
 import threading
 import time
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
 from datetime import datetime
 from pathlib import Path
 from core.logging import get_logger
@@ -102,6 +102,60 @@ class TopicDatabase:
             )
         """)
         
+        # File fingerprints 테이블 (폴더 재업로드 시 변경 감지)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS file_fingerprints (
+                topic_id TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                embedding_model TEXT NOT NULL DEFAULT '',
+                file_size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                content_hash TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (topic_id, file_path, embedding_model)
+            )
+        """)
+        
+        # Chunk fingerprints 테이블 (SimHash 근접 중복 탐지)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_fingerprints (
+                topic_id TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                simhash INTEGER NOT NULL,
+                PRIMARY KEY (document_id, chunk_index)
+            )
+        """)
+        
+        # Chunk links 테이블 (저장하지 않은 중복 청크 → 저장된 원본 청크)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_links (
+                topic_id TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                canonical_document_id TEXT NOT NULL,
+                canonical_chunk_index INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Re-embedding jobs 테이블 (임베딩 모델 변경 시 백그라운드 재임베딩 체크포인트)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS reembed_jobs (
+                id TEXT PRIMARY KEY,
+                source_model TEXT NOT NULL,
+                target_model TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                total_documents INTEGER DEFAULT 0,
+                done_documents INTEGER DEFAULT 0,
+                done_chunks INTEGER DEFAULT 0,
+                current_document_id TEXT,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
         # 인덱스 생성
         self.conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_topics_parent 
@@ -118,6 +172,26 @@ class TopicDatabase:
             ON documents(embedding_model)
         """)
         
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_fingerprints_document 
+            ON file_fingerprints(document_id)
+        """)
+        
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chunk_fingerprints_topic 
+            ON chunk_fingerprints(topic_id)
+        """)
+        
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chunk_links_document 
+            ON chunk_links(document_id)
+        """)
+        
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chunk_links_canonical 
+            ON chunk_links(canonical_document_id)
+        """)
+        
         self.conn.commit()
         
         # is_selected 컬럼 추가 (기존 DB 호환)
@@ -281,6 +355,9 @@ class TopicDatabase:
         # 2. 토픽 삭제 (CASCADE로 문서도 자동 삭제)
         with self._write_lock:
             self.conn.execute("DELETE FROM topics WHERE id = ?", (topic_id,))
+            self.conn.execute("DELETE FROM file_fingerprints WHERE topic_id = ?", (topic_id,))
+            self.conn.execute("DELETE FROM chunk_fingerprints WHERE topic_id = ?", (topic_id,))
+            self.conn.execute("DELETE FROM chunk_links WHERE topic_id = ?", (topic_id,))
             self.conn.commit()
         
         logger.info(f"Deleted topic: {topic_id} ({len(doc_ids)} documents)")
@@ -415,6 +492,11 @@ class TopicDatabase:
         with self._write_lock:
             # 문서 삭제
             self.conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+            self.conn.execute("DELETE FROM file_fingerprints WHERE document_id = ?", (doc_id,))
+            self.conn.execute("DELETE FROM chunk_fingerprints WHERE document_id = ?", (doc_id,))
+            self.conn.execute(
+                "DELETE FROM chunk_links WHERE document_id = ? OR canonical_document_id = ?", (doc_id, doc_id)
+            )
             
             # 토픽 문서 수 감소 (Lock 내부에서 직접 실행)
             self.conn.execute("""
@@ -427,6 +509,226 @@ class TopicDatabase:
         logger.info(f"Deleted document: {doc_id}")
         return topic_id
     
+    # ========== File Fingerprints ==========
+    
+    def get_file_fingerprints(self, topic_id: str, embedding_model: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        토픽의 파일 지문 조회 (문서가 남아있는 항목만)
+        
+        Args:
+            topic_id: 토픽 ID
+            embedding_model: 임베딩 모델 (None이면 현재 모델)
+            
+        Returns:
+            {file_path: {file_size, mtime, content_hash, document_id}}
+        """
+        if embedding_model is None:
+            embedding_model = self._get_current_embedding_model()
+        
+        cursor = self.conn.execute("""
+            SELECT f.file_path, f.file_size, f.mtime, f.content_hash, f.document_id
+            FROM file_fingerprints f
+            JOIN documents d ON d.id = f.document_id
+            WHERE f.topic_id = ? AND f.embedding_model = ?
+        """, (topic_id, embedding_model))
+        
+        return {row["file_path"]: dict(row) for row in cursor.fetchall()}
+    
+    def upsert_file_fingerprint(self, topic_id: str, file_path: str, file_size: int,
+                                mtime: float, content_hash: str, document_id: str,
+                                embedding_model: Optional[str] = None):
+        """파일 지문 저장 (같은 경로는 교체)"""
+        if embedding_model is None:
+            embedding_model = self._get_current_embedding_model()
+        
+        with self._write_lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO file_fingerprints
+                (topic_id, file_path, embedding_model, file_size, mtime, content_hash, document_id, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, (topic_id, file_path, embedding_model, file_size, mtime, content_hash, document_id))
+            self.conn.commit()
+    
+    def delete_fingerprints_by_topic(self, topic_id: str):
+        """토픽의 파일/청크 지문과 청크 링크 전체 삭제 (한 트랜잭션)"""
+        with self._write_lock:
+            self.conn.execute("DELETE FROM file_fingerprints WHERE topic_id = ?", (topic_id,))
+            self.conn.execute("DELETE FROM chunk_fingerprints WHERE topic_id = ?", (topic_id,))
+            self.conn.execute("DELETE FROM chunk_links WHERE topic_id = ?", (topic_id,))
+            self.conn.commit()
+    
+    # ========== Chunk Fingerprints ==========
+    
+    def get_chunk_fingerprints(self, topic_id: str, embedding_model: Optional[str] = None,
+                               exclude_doc_ids: Optional[Iterable[str]] = None) -> List[tuple]:
+        """
+        토픽의 청크 SimHash 지문 조회 (현재 임베딩 모델 문서만)
+        
+        Args:
+            topic_id: 토픽 ID
+            embedding_model: 임베딩 모델 (None이면 현재 모델)
+            exclude_doc_ids: 제외할 문서 ID (증분 동기화로 교체될 문서)
+        
+        Returns:
+            [(simhash (signed 64-bit), document_id, chunk_index)]
+        """
+        if embedding_model is None:
+            embedding_model = self._get_current_embedding_model()
+        
+        cursor = self.conn.execute("""
+            SELECT c.simhash, c.document_id, c.chunk_index
+            FROM chunk_fingerprints c
+            JOIN documents d ON d.id = c.document_id
+            WHERE c.topic_id = ? AND d.embedding_model = ?
+        """, (topic_id, embedding_model))
+        
+        excluded = set(exclude_doc_ids or ())
+        return [tuple(row) for row in cursor.fetchall() if row["document_id"] not in excluded]
+    
+    def add_chunk_fingerprints(self, topic_id: str, document_id: str, rows: List[tuple]):
+        """청크 지문 저장 (rows: [(chunk_index, simhash (signed 64-bit))])"""
+        if not rows:
+            return
+        with self._write_lock:
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO chunk_fingerprints (topic_id, document_id, chunk_index, simhash)
+                VALUES (?, ?, ?, ?)
+            """, [(topic_id, document_id, chunk_index, simhash) for chunk_index, simhash in rows])
+            self.conn.commit()
+    
+    def add_chunk_links(self, topic_id: str, document_id: str, links: List[tuple]):
+        """중복 청크 링크 저장 (links: [(canonical_document_id, canonical_chunk_index)])"""
+        if not links:
+            return
+        with self._write_lock:
+            self.conn.executemany("""
+                INSERT INTO chunk_links (topic_id, document_id, canonical_document_id, canonical_chunk_index)
+                VALUES (?, ?, ?, ?)
+            """, [(topic_id, document_id, canonical_id, canonical_index) for canonical_id, canonical_index in links])
+            self.conn.commit()
+    
+    def get_links_to_documents(self, doc_ids: List[str]) -> List[Dict]:
+        """원본이 doc_ids에 속한 중복 청크 링크 (저장 순)"""
+        if not doc_ids:
+            return []
+        placeholders = ", ".join("?" for _ in doc_ids)
+        cursor = self.conn.execute(f"""
+            SELECT topic_id, document_id, canonical_document_id, canonical_chunk_index
+            FROM chunk_links WHERE canonical_document_id IN ({placeholders})
+            ORDER BY rowid
+        """, tuple(doc_ids))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_chunk_simhash(self, doc_id: str, chunk_index: int) -> Optional[int]:
+        """저장된 청크의 SimHash 지문 (signed 64-bit, 없으면 None)"""
+        cursor = self.conn.execute("""
+            SELECT simhash FROM chunk_fingerprints WHERE document_id = ? AND chunk_index = ?
+        """, (doc_id, chunk_index))
+        row = cursor.fetchone()
+        return row["simhash"] if row else None
+    
+    # ========== Re-embedding Jobs ==========
+    
+    REEMBED_JOB_FIELDS = ("status", "total_documents", "done_documents", "done_chunks", "current_document_id", "error")
+    
+    def get_embedding_model_counts(self) -> Dict[str, int]:
+        """임베딩 모델별 문서 수 ({embedding_model: count}, 모델 미기록 문서 제외)"""
+        cursor = self.conn.execute("""
+            SELECT embedding_model, COUNT(*) AS count FROM documents
+            WHERE embedding_model IS NOT NULL AND embedding_model != ''
+            GROUP BY embedding_model
+        """)
+        return {row["embedding_model"]: row["count"] for row in cursor.fetchall()}
+    
+    def get_documents_by_embedding_model(self, embedding_model: str) -> List[Dict]:
+        """임베딩 모델 기준 전체 문서 목록 (업로드 순)"""
+        cursor = self.conn.execute("""
+            SELECT * FROM documents WHERE embedding_model = ?
+            ORDER BY upload_date, id
+        """, (embedding_model,))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def create_reembed_job(self, source_model: str, target_model: str, total_documents: int) -> str:
+        """
+        재임베딩 작업 생성
+        
+        Args:
+            source_model: 기존 임베딩 모델
+            target_model: 새 임베딩 모델
+            total_documents: 대상 문서 수
+            
+        Returns:
+            작업 ID
+        """
+        job_id = self._generate_id(f"reembed_{source_model}_{target_model}")
+        with self._write_lock:
+            self.conn.execute("""
+                INSERT INTO reembed_jobs (id, source_model, target_model, total_documents)
+                VALUES (?, ?, ?, ?)
+            """, (job_id, source_model, target_model, total_documents))
+            self.conn.commit()
+        
+        logger.info(f"Created re-embedding job {job_id}: {source_model} -> {target_model} ({total_documents} documents)")
+        return job_id
+    
+    def get_reembed_job(self, job_id: str) -> Optional[Dict]:
+        """재임베딩 작업 조회"""
+        cursor = self.conn.execute("SELECT * FROM reembed_jobs WHERE id = ?", (job_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+    
+    def get_reembed_jobs(self, statuses: Optional[List[str]] = None) -> List[Dict]:
+        """재임베딩 작업 목록 (statuses 지정 시 해당 상태만, 생성 순)"""
+        if statuses:
+            placeholders = ", ".join("?" for _ in statuses)
+            cursor = self.conn.execute(f"""
+                SELECT * FROM reembed_jobs WHERE status IN ({placeholders})
+                ORDER BY created_at, id
+            """, tuple(statuses))
+        else:
+            cursor = self.conn.execute("SELECT * FROM reembed_jobs ORDER BY created_at, id")
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def update_reembed_job(self, job_id: str, **fields):
+        """재임베딩 작업 상태/진행 갱신 (REEMBED_JOB_FIELDS만 허용)"""
+        updates = {key: value for key, value in fields.items() if key in self.REEMBED_JOB_FIELDS}
+        if not updates:
+            return
+        assignments = ", ".join(f"{key} = ?" for key in updates)
+        with self._write_lock:
+            self.conn.execute(
+                f"UPDATE reembed_jobs SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (*updates.values(), job_id)
+            )
+            self.conn.commit()
+    
+    def complete_document_reembed(self, job_id: str, doc_id: str, source_model: str,
+                                  target_model: str, chunk_count: int):
+        """
+        문서 재임베딩 완료 체크포인트 (한 트랜잭션)
+        
+        문서의 embedding_model을 새 모델로 바꾸고, 파일 지문을 새 모델로 복사해
+        증분 동기화가 재업로드하지 않도록 하며, 작업 진행 수를 올린다.
+        """
+        with self._write_lock:
+            self.conn.execute("""
+                UPDATE documents SET embedding_model = ?, chunk_count = ?
+                WHERE id = ? AND embedding_model = ?
+            """, (target_model, chunk_count, doc_id, source_model))
+            self.conn.execute("""
+                INSERT OR REPLACE INTO file_fingerprints
+                (topic_id, file_path, embedding_model, file_size, mtime, content_hash, document_id, updated_at)
+                SELECT topic_id, file_path, ?, file_size, mtime, content_hash, document_id, CURRENT_TIMESTAMP
+                FROM file_fingerprints WHERE document_id = ? AND embedding_model = ?
+            """, (target_model, doc_id, source_model))
+            self.conn.execute("""
+                UPDATE reembed_jobs
+                SET done_documents = done_documents + 1, done_chunks = done_chunks + ?,
+                    current_document_id = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (chunk_count, job_id))
+            self.conn.commit()
+    
     # ========== Utility ==========
     
     def _generate_id(self, text: str) -> str:
@@ -0,0 +1,308 @@
+"""
+LanceDB Compaction Scheduler
+삭제/추가로 늘어난 fragment와 삭제 행을 백그라운드에서 정리
+"""
+
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from core.logging import get_logger
+
+logger = get_logger("compaction_scheduler")
+
+
+class CompactionScheduler:
+    """
+    LanceDBStore 테이블의 지연/병합 compaction 관리
+
+    같은 테이블을 여는 스토어 인스턴스들은 acquire_scheduler()로 스케줄러 하나를 공유한다
+    (테이블당 스케줄러 스레드 하나, 삭제 행 수 합산).
+    """
+
+    def __init__(self, store, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize compaction scheduler
+
+        Args:
+            store: LanceDBStore instance
+            config: Compaction config (None to load from RAGConfigManager)
+        """
+        self._stores: List[Any] = [store]
+        self.config = config if config is not None else self._load_config()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_activity = 0.0
+        self._dirty = False
+        self._deleted_rows = 0  # 마지막 compaction 이후 삭제된 행 수
+        # compaction이 남긴 이전 버전의 정리 예정 시각 (보존 기간 경과 후)
+        self._cleanup_due: Optional[float] = None
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    def _load_config(self) -> Dict[str, Any]:
+        """RAG 설정에서 compaction 설정 로드"""
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            return RAGConfigManager().get_compaction_config()
+        except Exception as e:
+            logger.warning(f"Failed to load compaction config, using defaults: {e}")
+            return {}
+
+    @property
+    def store(self):
+        """테이블 접근에 사용할 스토어 (먼저 연결된 인스턴스)"""
+        stores = self._stores
+        return stores[0] if stores else None
+
+    def _attach(self, store):
+        """스토어 인스턴스 연결 (_schedulers_lock 보유 상태에서 호출)"""
+        if store not in self._stores:
+            self._stores = self._stores + [store]
+
+    def _detach(self, store) -> int:
+        """
+        Detach a store instance (called with _schedulers_lock held)
+
+        Returns:
+            Number of stores still attached
+        """
+        self._stores = [attached for attached in self._stores if attached is not store]
+        return len(self._stores)
+
+    # ========== Activity Tracking ==========
+
+    def record_write(self):
+        """행 추가 기록 (fragment 증가)"""
+        self._touch()
+
+    def record_delete(self, deleted_rows: int):
+        """
+        Record logically deleted rows
+
+        Args:
+            deleted_rows: Rows removed by the delete
+        """
+        with self._lock:
+            self._deleted_rows += max(0, deleted_rows)
+        self._touch()
+        self._wakeup.set()
+
+    def _touch(self):
+        """마지막 쓰기 시각 갱신 후 스케줄러 시작"""
+        with self._lock:
+            self._last_activity = time.monotonic()
+            self._dirty = True
+            self._ensure_thread()
+
+    def _ensure_thread(self):
+        """백그라운드 스레드 지연 시작 (self._lock 보유 상태에서 호출)"""
+        if not self.config.get("enabled", True) or self._stopped.is_set():
+            return
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="lancedb-compaction", daemon=True)
+        self._thread.start()
+
+    # ========== Trigger Evaluation ==========
+
+    def _run(self):
+        """주기적으로 트리거 조건 확인"""
+        interval = self.config.get("check_interval_seconds", 30)
+        while not self._stopped.is_set():
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+
+            try:
+                trigger = self._check_trigger()
+                if trigger:
+                    self.compact(trigger)
+            except Exception as e:
+                logger.error(f"Compaction check failed: {e}", exc_info=True)
+
+            with self._lock:
+                if not self._dirty and self._cleanup_due is None:
+                    # 정리할 것 없음: 다음 쓰기 때 재시작
+                    self._thread = None
+                    return
+
+        with self._lock:
+            self._thread = None
+
+    def _check_trigger(self) -> Optional[str]:
+        """
+        Decide whether to compact now
+
+        Returns:
+            Trigger name (fragments / deleted_ratio / idle / cleanup) or None
+        """
+        with self._lock:
+            if not self._dirty:
+                # 보존 기간이 지난 뒤 compaction 이전 버전 삭제
+                if self._cleanup_due is not None and time.monotonic() >= self._cleanup_due:
+                    return "cleanup"
+                return None
+            quiet_for = time.monotonic() - self._last_activity
+            deleted_rows = self._deleted_rows
+
+        # 배치 적재/삭제가 진행 중이면 대기 (연속 쓰기마다 재작성 방지)
+        if quiet_for < self.config.get("quiet_seconds", 5):
+            return None
+
+        stats = self._get_stats()
+        if stats is None:
+            return None
+
+        num_fragments = stats.get("fragment_stats", {}).get("num_fragments", 0)
+        if num_fragments >= self.config.get("max_fragments", 32):
+            return "fragments"
+
+        num_rows = stats.get("num_rows", 0)
+        total_rows = num_rows + deleted_rows
+        if total_rows and deleted_rows / total_rows >= self.config.get("deleted_ratio", 0.1):
+            return "deleted_ratio"
+
+        if quiet_for >= self.config.get("idle_seconds", 300):
+            if num_fragments > 1 or deleted_rows:
+                return "idle"
+            with self._lock:
+                self._dirty = False  # 이미 단일 fragment
+        return None
+
+    def _get_stats(self) -> Optional[Dict[str, Any]]:
+        """테이블 통계 (fragment 수, 행 수, 바이트)"""
+        table = self.store.open_table(refresh=True)
+        if table is None:
+            return None
+        try:
+            return table.stats()
+        except Exception as e:
+            logger.debug(f"Failed to read table stats: {e}")
+            return None
+
+    # ========== Compaction ==========
+
+    def compact(self, trigger: str = "manual") -> Optional[Dict[str, Any]]:
+        """
+        Compact fragments, prune old versions and refresh indexes
+
+        Versions replaced by this run are still inside retain_versions_seconds,
+        so a follow-up "cleanup" run prunes them once that window has passed;
+        its report carries the bytes reclaimed from deleted rows.
+
+        Args:
+            trigger: Reason for this run (for the report)
+
+        Returns:
+            Report dict or None if skipped
+        """
+        table = self.store.open_table(refresh=True)
+        if table is None:
+            return None
+
+        # 인덱스 빌드와 동시 실행 방지
+        maintenance_lock = self.store.index_manager.maintenance_lock
+        if not maintenance_lock.acquire(blocking=False):
+            logger.debug("Index maintenance running, compaction deferred")
+            return None
+
+        try:
+            started = time.monotonic()
+            before = self._get_stats() or {}
+            with self._lock:
+                deleted_rows = self._deleted_rows
+                self._deleted_rows = 0
+                self._dirty = False
+
+            # compaction + 버전 정리 + 인덱스 갱신을 한 번에 (개별 호출 후 optimize()는 같은 작업을 반복)
+            retain_seconds = self.config.get("retain_versions_seconds", 600)
+            table.optimize(cleanup_older_than=timedelta(seconds=retain_seconds))
+            with self._lock:
+                # 방금 만든 이전 버전(삭제 행 포함)은 보존 기간 안이라 남음: 기간 경과 후 한 번 더 정리
+                self._cleanup_due = None if trigger == "cleanup" else time.monotonic() + retain_seconds + 1
+                self._ensure_thread()
+
+            after = self._get_stats() or {}
+            fragments_before = before.get("fragment_stats", {}).get("num_fragments")
+            fragments_after = after.get("fragment_stats", {}).get("num_fragments")
+            bytes_before = before.get("total_bytes")
+            bytes_after = after.get("total_bytes")
+            report = {
+                "trigger": trigger,
+                "fragments_before": fragments_before,
+                "fragments_after": fragments_after,
+                "deleted_rows": deleted_rows,
+                "bytes_before": bytes_before,
+                "bytes_after": bytes_after,
+                "bytes_reclaimed": (
+                    max(bytes_before - bytes_after, 0)
+                    if bytes_before is not None and bytes_after is not None else 0
+                ),
+                "fragments_removed": (
+                    fragments_before - fragments_after
+                    if fragments_before is not None and fragments_after is not None else None
+                ),
+                "elapsed_seconds": round(time.monotonic() - started, 3)
+            }
+            self.last_report = report
+            logger.info(f"Compacted {self.store.table_name} ({trigger}): {report}")
+            return report
+        except Exception as e:
+            logger.error(f"Compaction failed: {e}", exc_info=True)
+            with self._lock:
+                self._dirty = True
+            return None
+        finally:
+            maintenance_lock.release()
+
+    def stop(self, timeout: Optional[float] = None):
+        """스케줄러 종료"""
+        self._stopped.set()
+        self._wakeup.set()
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+
+# 테이블 URI -> 공유 스케줄러
+_schedulers: Dict[str, CompactionScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def acquire_scheduler(store) -> CompactionScheduler:
+    """
+    Get the scheduler shared by every store opening the same table
+
+    Args:
+        store: LanceDBStore instance (keyed by store.table_uri)
+
+    Returns:
+        Shared CompactionScheduler
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(store.table_uri)
+        if scheduler is None:
+            scheduler = _schedulers[store.table_uri] = CompactionScheduler(store)
+        else:
+            scheduler._attach(store)
+        return scheduler
+
+
+def release_scheduler(store, timeout: Optional[float] = None):
+    """
+    Detach a store; the scheduler stops when no store uses the table any more
+
+    Args:
+        store: LanceDBStore instance being closed
+        timeout: Seconds to wait for the scheduler thread
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(store.table_uri)
+        if scheduler is None or scheduler._detach(store):
+            return
+        del _schedulers[store.table_uri]
+    scheduler.stop(timeout)
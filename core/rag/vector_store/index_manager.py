@@ -0,0 +1,479 @@
+"""
+LanceDB Index Manager
+벡터/스칼라/전문 검색 인덱스 생성 및 증분 갱신 (백그라운드 실행)
+"""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from core.logging import get_logger
+
+logger = get_logger("index_manager")
+
+class MaintenanceLock:
+    """
+    Table maintenance lock that remembers work requested while it was held
+
+    Index builds, compaction and storage migration of one table are mutually
+    exclusive. A background task submitted while another holder has the lock
+    is kept as pending and started as soon as the lock is released, so
+    requests are deferred instead of dropped.
+    """
+
+    def __init__(self, name: str = "lancedb-maintenance"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._guard = threading.Lock()
+        self._pending: Dict[Any, Callable[[], None]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """Acquire the lock (same signature as threading.Lock.acquire)"""
+        return self._lock.acquire(blocking, timeout)
+
+    def release(self):
+        """Release the lock and start pending tasks"""
+        self._lock.release()
+        self._start_pending()
+
+    def locked(self) -> bool:
+        """락 보유 여부"""
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def submit(self, key: Any, task: Callable[[], None]) -> bool:
+        """
+        Run task in a background thread while holding the lock
+
+        Args:
+            key: Pending slot (a task resubmitted under the same key replaces the old one)
+            task: Callable run with the lock held
+
+        Returns:
+            True if started now, False if deferred until the current holder releases
+        """
+        with self._guard:
+            self._pending[key] = task
+        return self._start_pending()
+
+    def _start_pending(self) -> bool:
+        """락이 비어 있으면 대기 작업을 한 스레드에서 순서대로 실행"""
+        with self._guard:
+            # 획득 실패 시 현재 보유자가 release에서 다시 시도
+            if not self._pending or not self._lock.acquire(blocking=False):
+                return False
+            tasks = list(self._pending.values())
+            self._pending.clear()
+
+        def run():
+            try:
+                for task in tasks:
+                    try:
+                        task()
+                    except Exception as e:
+                        logger.error(f"Maintenance task failed: {e}", exc_info=True)
+            finally:
+                self.release()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None):
+        """실행 중인 작업과 그 뒤에 이어진 대기 작업까지 대기"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return
+            thread.join(remaining)
+
+
+# 테이블 URI -> 유지보수 락 (같은 테이블을 여는 모든 LanceDBStore 인스턴스가 공유)
+_maintenance_locks: Dict[str, MaintenanceLock] = {}
+_maintenance_locks_guard = threading.Lock()
+
+
+def get_maintenance_lock(table_uri: str) -> MaintenanceLock:
+    """
+    Get the maintenance lock shared by every store opening table_uri
+
+    Args:
+        table_uri: Resolved path of the Lance table
+
+    Returns:
+        Process-wide lock for that table
+    """
+    with _maintenance_locks_guard:
+        lock = _maintenance_locks.get(table_uri)
+        if lock is None:
+            lock = _maintenance_locks[table_uri] = MaintenanceLock()
+        return lock
+
+
+class IndexManager:
+    """LanceDBStore 테이블의 ANN 인덱스 수명 주기 관리"""
+
+    VECTOR_COLUMN = "vector"
+    FTS_COLUMN = "text"
+    
+    # 전문 검색 인덱스가 필요한 검색 모드
+    FTS_SEARCH_MODES = ("fts", "hybrid")
+
+    # 필터용 스칼라 인덱스 (prefilter 가속)
+    SCALAR_INDEXES = {
+        "topic_id": "BITMAP",
+        "document_id": "BTREE",
+        "chunk_index": "BTREE",
+        "file_type": "BITMAP",
+    }
+
+    def __init__(
+        self,
+        store,
+        config: Optional[Dict[str, Any]] = None,
+        fts_config: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize index manager
+
+        Args:
+            store: LanceDBStore instance
+            config: ANN index config (None to load from RAGConfigManager)
+            fts_config: Full-text index config (None to load from RAGConfigManager)
+        """
+        self.store = store
+        self.config = config if config is not None else self._load_config("get_index_config")
+        self.fts_config = fts_config if fts_config is not None else self._load_config("get_hybrid_config")
+        self._maintenance_lock = get_maintenance_lock(store.table_uri)
+        self._index_state = (None, {})  # (table version, {column: index})
+        self._fts_requested = False  # 호출별 search_mode로 FTS가 요청됨
+
+    def _load_config(self, getter: str) -> Dict[str, Any]:
+        """RAG 설정에서 인덱스 설정 로드"""
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            return getattr(RAGConfigManager(), getter)()
+        except Exception as e:
+            logger.warning(f"Failed to load index config ({getter}), using defaults: {e}")
+            return {}
+
+    # ========== Query Tuning ==========
+
+    def apply_search_params(self, query, metric: Optional[str] = None):
+        """
+        Apply metric/nprobes/refine_factor to a vector query
+
+        Args:
+            query: LanceDB vector query builder
+            metric: Metric override (e.g. hamming for binary codes)
+
+        Returns:
+            Tuned query builder
+        """
+        query = query.metric(metric or self.config.get("metric", "l2"))
+        if self.has_vector_index():
+            nprobes = self.config.get("nprobes")
+            refine_factor = self.config.get("refine_factor")
+            if nprobes:
+                query = query.nprobes(nprobes)
+            # binary 코드는 재점수 단계가 refine 역할
+            if refine_factor and metric is None:
+                query = query.refine_factor(refine_factor)
+        return query
+
+    # ========== Index Lifecycle ==========
+
+    def has_vector_index(self) -> bool:
+        """벡터 컬럼 인덱스 존재 여부"""
+        return self._get_vector_index() is not None
+
+    def has_fts_index(self) -> bool:
+        """텍스트 컬럼 전문 검색(INVERTED) 인덱스 존재 여부"""
+        return self._get_column_index(self.FTS_COLUMN) is not None
+
+    def _get_vector_index(self):
+        """벡터 컬럼 인덱스 정보 반환"""
+        return self._get_column_index(self.VECTOR_COLUMN)
+
+    def _get_column_index(self, column: str):
+        """컬럼별 인덱스 정보 반환 (테이블 버전별 캐시)"""
+        table = self.store.table
+        if table is None:
+            return None
+        try:
+            version = table.version
+            if self._index_state[0] != version:
+                indexes = {}
+                for index in table.list_indices():
+                    for indexed_column in getattr(index, "columns", None) or []:
+                        indexes.setdefault(indexed_column, index)
+                self._index_state = (version, indexes)
+            return self._index_state[1].get(column)
+        except Exception as e:
+            logger.debug(f"Failed to list indices: {e}")
+        return None
+
+    def ensure_scalar_indexes(self) -> int:
+        """
+        Create missing scalar indexes on promoted filter columns
+
+        Returns:
+            Number of indexes created
+        """
+        table = self.store.table
+        if table is None:
+            return 0
+
+        indexed_columns = set()
+        for index in table.list_indices():
+            indexed_columns.update(getattr(index, "columns", None) or [])
+
+        schema_names = set(table.schema.names)
+        created = 0
+        for column, index_type in self.SCALAR_INDEXES.items():
+            if column in indexed_columns or column not in schema_names:
+                continue
+            try:
+                table.create_scalar_index(column, index_type=index_type)
+                created += 1
+                logger.info(f"Created {index_type} index on {self.store.table_name}.{column}")
+            except Exception as e:
+                logger.warning(f"Failed to create scalar index on {column}: {e}")
+        return created
+
+    def ensure_fts_index(self) -> bool:
+        """
+        Create the full-text index on the text column (rebuild if tokenizer changed)
+
+        Korean text is indexed with character n-grams by default so that
+        particles and missing spaces (e.g. "오류코드") still match. The index is
+        only built when the configured search mode (or a search call, see
+        request_fts_index) actually uses full-text search.
+
+        Returns:
+            True if the index was (re)built
+        """
+        table = self.store.table
+        if table is None or not self.fts_config.get("fts_enabled", True):
+            return False
+        if not self._fts_requested and self.store.search_mode not in self.FTS_SEARCH_MODES:
+            return False
+
+        base_tokenizer = self.fts_config.get("base_tokenizer", "ngram")
+        index = self._get_column_index(self.FTS_COLUMN)
+        if index is not None:
+            details = getattr(index, "index_details", None) or {}
+            if details.get("base_tokenizer", base_tokenizer) == base_tokenizer:
+                return False
+            logger.info(f"FTS tokenizer changed to {base_tokenizer}, rebuilding index")
+
+        params = {
+            "base_tokenizer": base_tokenizer,
+            "lower_case": True,
+            "ascii_folding": True,
+            # 영어 전용 스테밍/불용어는 한국어·식별자 검색을 방해
+            "stem": False,
+            "remove_stop_words": False,
+            "replace": True
+        }
+        if base_tokenizer == "ngram":
+            params["ngram_min_length"] = self.fts_config.get("ngram_min_length", 2)
+            params["ngram_max_length"] = self.fts_config.get("ngram_max_length", 3)
+
+        try:
+            table.create_fts_index(self.FTS_COLUMN, **params)
+            logger.info(f"FTS index ready: {self.store.table_name}.{self.FTS_COLUMN} ({base_tokenizer})")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to create FTS index: {e}")
+            return False
+
+    def request_fts_index(self) -> bool:
+        """
+        Build the full-text index in the background for a search that asked for fts/hybrid
+
+        The request is recorded once: if the maintenance lock is busy the run is
+        deferred by schedule_maintenance, not dropped, so later searches need
+        not request it again.
+
+        Returns:
+            True if a maintenance run was started now (False if deferred or already requested)
+        """
+        if self._fts_requested or not self.fts_config.get("fts_enabled", True):
+            return False
+        # 지연 실행되는 ensure_fts_index가 이 플래그를 읽으므로 예약 전에 설정
+        self._fts_requested = True
+        started = self.schedule_maintenance()
+        if not started:
+            logger.debug(f"FTS index build for {self.store.table_name} deferred until maintenance lock is free")
+        return started
+
+    def _get_index_stats(self, index) -> Dict[str, int]:
+        """인덱스 통계 (indexed/unindexed rows)"""
+        stats = self.store.table.index_stats(index.name)
+        if stats is None:
+            return {"num_indexed_rows": 0, "num_unindexed_rows": 0}
+        if isinstance(stats, dict):
+            return stats
+        return {
+            "num_indexed_rows": getattr(stats, "num_indexed_rows", 0),
+            "num_unindexed_rows": getattr(stats, "num_unindexed_rows", 0)
+        }
+
+    def ensure_index(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Create or refresh the vector index when needed
+
+        - rows >= min_rows and no index: build index
+        - unindexed rows > reindex_ratio: incremental optimize
+        - table grew past retrain_growth x indexed rows: full rebuild
+
+        Args:
+            force: Rebuild regardless of thresholds
+
+        Returns:
+            Action summary dict
+        """
+        if not self.config.get("enabled", True) and not force:
+            return {"action": "disabled"}
+
+        table = self.store.open_table(refresh=True)
+        if table is None:
+            return {"action": "no_table"}
+
+        row_count = table.count_rows()
+        if row_count:
+            self.ensure_scalar_indexes()
+            if not self.ensure_fts_index():
+                self._refresh_fts_index(row_count)
+        index = self._get_vector_index()
+
+        if self.store.vector_codec.scan_only:
+            # int8 코드는 LanceDB 벡터 인덱스 미지원 (스캔 검색)
+            if row_count > self.store.vector_storage.get("scan_warn_rows", 50000):
+                logger.warning(
+                    f"{self.store.table_name}: {row_count} rows in {self.store.vector_codec.mode} storage are "
+                    f"searched by full scan; migrate to float16 or binary for large tables"
+                )
+            return {"action": "scan_only", "rows": row_count}
+
+        if index is None:
+            if row_count < self.config.get("min_rows", 10000) and not force:
+                return {"action": "below_threshold", "rows": row_count}
+            self._build_index(row_count)
+            return {"action": "built", "rows": row_count}
+
+        stats = self._get_index_stats(index)
+        indexed = stats.get("num_indexed_rows", 0)
+        unindexed = stats.get("num_unindexed_rows", 0)
+
+        if force or indexed * self.config.get("retrain_growth", 2.0) < row_count:
+            self._build_index(row_count)
+            return {"action": "rebuilt", "rows": row_count}
+
+        if row_count and unindexed / row_count > self.config.get("reindex_ratio", 0.1):
+            # 기존 파티션에 신규 행 추가 (재학습 없음)
+            table.optimize()
+            logger.info(f"Vector index optimized: {unindexed} new rows merged")
+            return {"action": "optimized", "rows": row_count, "merged": unindexed}
+
+        return {"action": "up_to_date", "rows": row_count, "unindexed": unindexed}
+
+    def _refresh_fts_index(self, row_count: int):
+        """전문 검색 인덱스에 신규 행 병합 (벡터 인덱스가 없는 소규모 테이블용)"""
+        index = self._get_column_index(self.FTS_COLUMN)
+        if index is None or self._get_vector_index() is not None:
+            return  # 벡터 인덱스 optimize가 모든 인덱스를 함께 갱신
+
+        unindexed = self._get_index_stats(index).get("num_unindexed_rows", 0)
+        if unindexed / row_count > self.config.get("reindex_ratio", 0.1):
+            self.store.table.optimize()
+            logger.info(f"FTS index optimized: {unindexed} new rows merged")
+
+    def _build_index(self, row_count: int):
+        """인덱스 생성 (기존 인덱스 교체)"""
+        table = self.store.table
+        index_type = self.config.get("index_type", "IVF_PQ")
+        metric = self.config.get("metric", "l2")
+        if self.store.vector_codec.mode == "binary":
+            # 패킹된 부호 비트: hamming 거리 + 양자화 없는 IVF
+            index_type, metric = "IVF_FLAT", "hamming"
+        params = {
+            "metric": metric,
+            "vector_column_name": self.VECTOR_COLUMN,
+            "index_type": index_type,
+            # sqrt(N) 파티션, 단 파티션당 최소 256개 학습 벡터 확보
+            "num_partitions": max(1, min(int(math.sqrt(row_count)), row_count // 256)),
+            "replace": True
+        }
+
+        if index_type.endswith("PQ"):
+            dimension = self._get_vector_dimension()
+            if dimension:
+                params["num_sub_vectors"] = self._pick_sub_vectors(dimension)
+
+        logger.info(f"Building {index_type} index on {self.store.table_name} ({row_count} rows): {params}")
+        table.create_index(**params)
+        logger.info(f"Vector index ready: {self.store.table_name}")
+
+    def _get_vector_dimension(self) -> Optional[int]:
+        """벡터 컬럼 차원"""
+        try:
+            field = self.store.table.schema.field(self.VECTOR_COLUMN)
+            return field.type.list_size
+        except Exception as e:
+            logger.debug(f"Failed to read vector dimension: {e}")
+            return None
+
+    @staticmethod
+    def _pick_sub_vectors(dimension: int) -> int:
+        """차원을 나누어 떨어지게 하는 PQ 서브벡터 수 (서브벡터당 ~16차원)"""
+        target = max(1, dimension // 16)
+        for candidate in range(target, 0, -1):
+            if dimension % candidate == 0:
+                return candidate
+        return 1
+
+    # ========== Background Maintenance ==========
+
+    @property
+    def maintenance_lock(self) -> MaintenanceLock:
+        """백그라운드 유지보수 락 (같은 테이블의 인덱스 빌드·compaction·마이그레이션 동시 실행 방지)"""
+        return self._maintenance_lock
+
+    def schedule_maintenance(self, force: bool = False) -> bool:
+        """
+        Run ensure_index in a background thread (UI 스레드 블로킹 방지)
+
+        If another maintenance task holds the table lock, the run is deferred
+        and started when that task releases it.
+
+        Args:
+            force: Rebuild regardless of thresholds
+
+        Returns:
+            True if a maintenance run was started now
+        """
+        def run():
+            result = self.ensure_index(force=force)
+            logger.debug(f"Index maintenance result: {result}")
+
+        started = self._maintenance_lock.submit((id(self), force), run)
+        if not started:
+            logger.debug("Table maintenance running, index maintenance deferred")
+        return started
+
+    def wait(self, timeout: Optional[float] = None):
+        """진행 중인 백그라운드 작업 대기"""
+        self._maintenance_lock.wait(timeout)
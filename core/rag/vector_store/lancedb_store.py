@@ -2,11 +2,16 @@
 LanceDB Vector Store Implementation
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from langchain.schema import Document
 from core.logging import get_logger
 from .base_vector_store import BaseVectorStore
+from .index_manager import IndexManager
+from .compaction_scheduler import acquire_scheduler, release_scheduler
+from .vector_quantization import CODE_COLUMN, SCALE_COLUMN, VECTOR_COLUMN, VectorCodec, estimate_recall
 
 logger = get_logger("lancedb_store")
 
@@ -14,14 +19,34 @@ logger = get_logger("lancedb_store")
 class LanceDBStore(BaseVectorStore):
     """LanceDB 벡터 스토어 구현"""
     
-    def __init__(self, db_path: Optional[str] = None, table_name: Optional[str] = None):
+    # metadata struct에서 최상위 컬럼으로 승격된 필드 (스칼라 인덱스 + prefilter)
+    PROMOTED_COLUMNS = {
+        "topic_id": "metadata.topic_id",
+        "document_id": "metadata.document_id",
+        "chunk_index": "CAST(metadata.chunk_index AS BIGINT)",
+        # 확장자 없는 파일은 '' (첫 번째 대안이 전체 문자열과 일치)
+        "file_type": "lower(regexp_replace(metadata.source, '^[^.]*$|^.*[.]', ''))",
+    }
+    
+    # IN (...) 삭제 조건 하나에 넣을 최대 값 수
+    DELETE_BATCH_SIZE = 500
+    
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        table_name: Optional[str] = None,
+        model_id: Optional[str] = None
+    ):
         """
         Initialize LanceDB store
         
         Args:
             db_path: Database path (None for default user config path)
             table_name: Table name (None for auto-generated based on current embedding model)
+            model_id: Embedding model whose folder is opened (None for current)
         """
+        self.model_id = model_id or self._get_current_model_id()
+        
         if db_path is None:
             db_path = self._get_default_db_path()
         
@@ -30,14 +55,50 @@ class LanceDBStore(BaseVectorStore):
         
         self.db_path = Path(db_path)
         self.table_name = table_name
+        # 인스턴스 간 유지보수 락/compaction 스케줄러 공유 키
+        self.table_uri = str((self.db_path / f"{table_name}.lance").resolve())
         self.db = None
         self.table = None
+        self.index_manager = IndexManager(self)
+        self.compaction_scheduler = acquire_scheduler(self)
+        self._index_checked = False
+        self._schema_checked = False
+        self._promoted_columns = set()
+        self._search_executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+        self._reopen_lock = threading.Lock()
+        self.search_mode, self.hybrid_config = self._load_search_config()
+        self.vector_storage = self._load_vector_storage_config()
+        self.vector_codec = VectorCodec(
+            self.vector_storage.get("mode", "float32"),
+            metric=self.index_manager.config.get("metric", "l2")
+        )
         
         self._init_database()
         logger.info(f"LanceDB initialized: {db_path}/{table_name}")
     
-    def _get_default_db_path(self) -> str:
-        """모델별 벡터 DB 경로 반환 (모델별 폴더 분리)"""
+    def _load_search_config(self):
+        """검색 모드 및 하이브리드 설정 로드"""
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            config_manager = RAGConfigManager()
+            return config_manager.get_search_mode(), config_manager.get_hybrid_config()
+        except Exception as e:
+            logger.warning(f"Failed to load search config, using vector search: {e}")
+            return "vector", {}
+    
+    def _load_vector_storage_config(self) -> Dict[str, Any]:
+        """모델별 벡터 저장 형식 설정 로드"""
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            return RAGConfigManager().get_vector_storage_config(self.model_id)
+        except Exception as e:
+            logger.warning(f"Failed to load vector storage config, using float32: {e}")
+            return {}
+    
+    @staticmethod
+    def get_base_path() -> Path:
+        """모델별 폴더를 담는 벡터 DB 기본 경로"""
         try:
             # 지연 import로 순환 참조 방지
             from utils.config_path import config_path_manager
@@ -47,24 +108,37 @@ class LanceDBStore(BaseVectorStore):
             if user_config_path and user_config_path.exists():
                 base_path = user_config_path / "vectordb"
                 logger.info(f"Using user-configured vector DB base path: {base_path}")
-            else:
-                logger.info("No user config path set, using default")
-                raise Exception("Use default path")
+                return base_path
+            logger.info("No user config path set, using default")
         except Exception:
-            # 폴백: 기본 외부 경로
-            import os
-            
-            if os.name == "nt":  # Windows
-                base_path = Path.home() / "AppData" / "Local" / "ChatAIAgent" / "vectordb"
-            else:  # macOS, Linux
-                base_path = Path.home() / ".chat-ai-agent" / "vectordb"
-            
-            logger.info(f"Using default vector DB base path: {base_path}")
+            pass
         
-        # 모델별 폴더 삘9시 생성
-        model_id = self._get_current_model_id()
+        # 폴백: 기본 외부 경로
+        import os
+        
+        if os.name == "nt":  # Windows
+            base_path = Path.home() / "AppData" / "Local" / "ChatAIAgent" / "vectordb"
+        else:  # macOS, Linux
+            base_path = Path.home() / ".chat-ai-agent" / "vectordb"
+        
+        logger.info(f"Using default vector DB base path: {base_path}")
+        return base_path
+    
+    @classmethod
+    def get_model_db_path(cls, model_id: str) -> Path:
+        """모델 전용 폴더 경로 (생성하지 않음)"""
         safe_model_name = model_id.replace("-", "_").replace(".", "_").replace("/", "_")
-        model_db_path = base_path / safe_model_name
+        return cls.get_base_path() / safe_model_name
+    
+    @classmethod
+    def has_model_data(cls, model_id: str, table_name: str = "documents") -> bool:
+        """모델 폴더에 테이블이 존재하는지 (폴더를 만들지 않고 확인)"""
+        return (cls.get_model_db_path(model_id) / f"{table_name}.lance").is_dir()
+    
+    def _get_default_db_path(self) -> str:
+        """모델별 벡터 DB 경로 반환 (모델별 폴더 분리)"""
+        model_id = self.model_id
+        model_db_path = self.get_model_db_path(model_id)
         
         # 폴더 생성 및 검증
         try:
@@ -120,6 +194,70 @@ class LanceDBStore(BaseVectorStore):
             logger.error(f"Failed to connect to LanceDB: {e}", exc_info=True)
             self.db = None
     
+    def open_table(self, refresh: bool = False):
+        """
+        Open table (if it exists) and migrate legacy schema once
+        
+        Args:
+            refresh: Move an already open table to the latest version
+        
+        Returns:
+            LanceDB table or None
+        """
+        self._ensure_open()
+        if self.db is None:
+            return None
+        
+        if self.table is None:
+            if self.table_name not in self.db.table_names():
+                return None
+            self.table = self.db.open_table(self.table_name)
+        elif refresh and hasattr(self.table, "checkout_latest"):
+            self.table.checkout_latest()
+        
+        if not self._schema_checked:
+            self._migrate_schema()
+            self._sync_vector_codec()
+        
+        return self.table
+    
+    def _migrate_schema(self):
+        """기존 테이블에 승격 컬럼 추가 (metadata struct에서 계산, in-place)"""
+        try:
+            existing = set(self.table.schema.names)
+            missing = {
+                column: expression
+                for column, expression in self.PROMOTED_COLUMNS.items()
+                if column not in existing
+            }
+            if missing:
+                logger.info(f"Migrating {self.db_path}/{self.table_name}: adding columns {list(missing)}")
+                self.table.add_columns(missing)
+                logger.info(f"Schema migration completed for {self.table_name}")
+            self._schema_checked = True
+        except Exception as e:
+            logger.error(f"Schema migration failed: {e}", exc_info=True)
+        
+        # 마이그레이션 실패 시에도 metadata struct 경로로 필터링 가능
+        self._promoted_columns = set(self.table.schema.names) & set(self.PROMOTED_COLUMNS)
+    
+    def _sync_vector_codec(self):
+        """기존 테이블의 실제 벡터 저장 형식 사용 (설정과 다르면 마이그레이션 안내)"""
+        stored_mode = VectorCodec.detect_mode(self.table.schema)
+        if stored_mode != self.vector_codec.mode:
+            logger.warning(
+                f"{self.table_name} stores {stored_mode} vectors but {self.vector_codec.mode} is configured; "
+                f"run scripts/migrate_vector_storage.py to convert"
+            )
+            self.vector_codec = VectorCodec(stored_mode, metric=self.vector_codec.metric)
+    
+    @staticmethod
+    def quote_value(value: Any) -> str:
+        """SQL 리터럴 변환"""
+        if isinstance(value, str):
+            return "'" + value.replace("'", "''") + "'"
+        return str(value)
+    
     def add_documents(self, documents: List[Document], **kwargs) -> List[str]:
         """
         Add documents to LanceDB with extended metadata
@@ -131,10 +269,13 @@ class LanceDBStore(BaseVectorStore):
                 - document_id: SQLite document ID
                 - topic_id: Topic ID
                 - chunking_strategy: Chunking strategy name
+                - file_type: File extension (None to derive from source)
+                - start_index: chunk_index of the first document (streamed parts)
             
         Returns:
             List of chunk IDs
         """
+        self._ensure_open()
         if self.db is None:
             logger.error(f"LanceDB not available: db={self.db}, db_path={self.db_path}")
             return []
@@ -146,8 +287,9 @@ class LanceDBStore(BaseVectorStore):
             document_id = kwargs.get("document_id")
             topic_id = kwargs.get("topic_id")
             chunking_strategy = kwargs.get("chunking_strategy", "sliding_window")
+            start_index = kwargs.get("start_index", 0)
             
-            for i, doc in enumerate(documents):
+            for i, doc in enumerate(documents, start=start_index):
                 chunk_id = f"chunk_{document_id}_{i}" if document_id else f"chunk_{i}_{hash(doc.page_content)}"
                 chunk_ids.append(chunk_id)
                 
@@ -167,22 +309,43 @@ class LanceDBStore(BaseVectorStore):
                 if isinstance(text_content, bytes):
                     text_content = text_content.decode('utf-8', errors='replace')
                 
+                source = str(extended_metadata.get("source") or "")
+                file_type = kwargs.get("file_type") or (
+                    source.rsplit(".", 1)[-1].lower() if "." in source else ""
+                )
+                
                 data.append({
                     "id": chunk_id,
                     "text": text_content,
                     "metadata": extended_metadata,
-                    "vector": kwargs.get("embeddings", [None])[i] if "embeddings" in kwargs else None
+                    "vector": kwargs["embeddings"][i - start_index] if "embeddings" in kwargs else None,
+                    "topic_id": topic_id,
+                    "document_id": document_id,
+                    "chunk_index": i,
+                    "file_type": file_type
                 })
             
+            # 마이그레이션되지 않은 기존 테이블에는 승격 컬럼 없이 추가
+            if self.open_table(refresh=True) is not None:
+                for column in set(self.PROMOTED_COLUMNS) - self._promoted_columns:
+                    for row in data:
+                        row.pop(column, None)
+            
+            # float32 외 형식은 Arrow 컬럼으로 인코딩
+            if "embeddings" in kwargs and self.vector_codec.mode != "float32":
+                data = self._encode_vectors(data)
+            
             # 테이블 생성 또는 추가 (모델별 폴더 분리로 차원 충돌 없음)
-            if self.table_name not in self.db.table_names():
+            if self.table is None:
                 logger.debug(f"Creating new table: {self.table_name}")
                 self.table = self.db.create_table(self.table_name, data)
+                self._schema_checked = True
+                self._promoted_columns = set(self.PROMOTED_COLUMNS)
             else:
-                self.table = self.db.open_table(self.table_name)
                 logger.debug(f"Adding {len(data)} records to existing table")
                 self.table.add(data)
                 logger.debug("Records added successfully")
+                self.compaction_scheduler.record_write()
             
             logger.info(f"Added {len(documents)} chunks to LanceDB (doc_id={document_id}, topic_id={topic_id})")
             return chunk_ids
@@ -191,6 +354,17 @@ class LanceDBStore(BaseVectorStore):
             logger.error(f"Failed to add documents: {e}")
             return []
     
+    def _encode_vectors(self, rows: List[Dict[str, Any]]):
+        """행 목록의 vector를 저장 형식 컬럼으로 변환한 Arrow 테이블"""
+        import numpy as np
+        import pyarrow as pa
+        
+        vectors = np.asarray([row.pop("vector") for row in rows], dtype=np.float32)
+        table = pa.Table.from_pylist(rows)
+        for name, column in self.vector_codec.encode(vectors).items():
+            table = table.append_column(name, column)
+        return table
+    
     def search(
         self, 
         query: str, 
@@ -205,52 +379,362 @@ class LanceDBStore(BaseVectorStore):
             query: Search query
             k: Number of results
             filter: Metadata filter (e.g., {"topic_id": "topic_123"})
-            **kwargs: query_vector for vector search
+            **kwargs: query_vector for vector search,
+                search_mode ("vector" | "fts" | "hybrid", None for config default),
+                mmr (diversify fetch_k candidates with MMR, needs query_vector),
+                fetch_k (MMR candidates, default 4 * k),
+                lambda_mult (MMR relevance weight, default 0.5),
+                merge_adjacent (merge consecutive chunk_index hits into one passage),
+                with_scores (copy the row's raw score into metadata["search_distance"]
+                for vector results, metadata["search_score"] for FTS/hybrid results)
             
         Returns:
             List of similar document chunks
         """
+        self._ensure_open()
         if self.db is None:
             logger.warning("LanceDB not available, returning empty results")
             return []
         
         # 테이블 열기 시도
-        if self.table is None and self.table_name in self.db.table_names():
-            self.table = self.db.open_table(self.table_name)
-        
-        if self.table is None:
+        if self.open_table() is None:
             logger.warning(f"Table {self.table_name} not found, returning empty results")
             return []
         
         try:
-            # 벡터 검색
-            if "query_vector" in kwargs and kwargs["query_vector"]:
-                results = self.table.search(kwargs["query_vector"]).limit(k)
+            # 기존 대용량 테이블도 첫 검색 시 인덱스 점검 (백그라운드)
+            if not self._index_checked:
+                self._index_checked = True
+                self.index_manager.schedule_maintenance()
+            
+            query_vector = kwargs.get("query_vector")
+            search_mode = kwargs.get("search_mode") or self.search_mode
+            where = self.build_filter_expression(filter) if filter else None
+            
+            # MMR: 후보를 더 가져온 뒤 반환된 벡터로 다양성 선택
+            use_mmr = bool(kwargs.get("mmr")) and bool(query_vector)
+            final_k = k
+            if use_mmr:
+                k = max(k, int(kwargs.get("fetch_k") or 4 * k))
+            
+            # FTS 인덱스가 아직 없으면 벡터 검색으로 대체
+            use_fts = search_mode in ("fts", "hybrid") and bool(query) and self.index_manager.has_fts_index()
+            if search_mode in ("fts", "hybrid") and not use_fts and query:
+                self.index_manager.request_fts_index()
+            use_vector = bool(query_vector) and (search_mode != "fts" or not use_fts)
+            
+            if use_vector and use_fts:
+                rows = self._hybrid_search(query, query_vector, k, where)
+            elif use_vector:
+                rows = self._vector_search(query_vector, k, where)
+            elif use_fts:
+                rows = self._fts_search(query, k, where)
             else:
-                # 텍스트 검색 비활성화 (INVERTED 인덱스 필요)
-                logger.warning("Vector search requires query_vector, returning empty results")
+                logger.warning(f"Search mode '{search_mode}' requires query_vector or FTS index, returning empty results")
                 return []
             
-            # 메타데이터 필터 적용
-            if filter:
-                results = results.where(self._build_filter_expression(filter))
+            if use_mmr:
+                rows = self._select_mmr(rows, query_vector, final_k, kwargs.get("lambda_mult", 0.5))
             
             # Document 객체로 변환
+            with_scores = kwargs.get("with_scores", False)
             documents = []
-            for row in results.to_list():
+            for row in rows:
+                metadata = row.get("metadata", {})
+                if with_scores:
+                    metadata = {**metadata, **self._row_score(row)}
                 doc = Document(
                     page_content=row.get("text", ""),
-                    metadata=row.get("metadata", {})
+                    metadata=metadata
                 )
                 documents.append(doc)
             
-            logger.info(f"Found {len(documents)} documents for query: {query[:50]}")
+            if kwargs.get("merge_adjacent"):
+                from ..retrieval.diversity import merge_adjacent_chunks
+                documents = merge_adjacent_chunks(documents)
+            
+            logger.info(f"Found {len(documents)} documents ({search_mode}) for query: {query[:50]}")
             return documents
             
         except Exception as e:
             logger.error(f"Search failed: {e}")
             return []
     
+    @staticmethod
+    def _row_score(row: Dict) -> Dict[str, float]:
+        """검색 행의 원시 점수 (벡터: 거리, 낮을수록 유사 / FTS·RRF: 점수, 높을수록 유사)"""
+        if row.get("_distance") is not None:
+            return {"search_distance": float(row["_distance"])}
+        for column in ("_relevance_score", "_score"):
+            if row.get(column) is not None:
+                return {"search_score": float(row[column])}
+        return {}
+    
+    def _vector_search(self, query_vector: List[float], k: int, where: Optional[str]) -> List[Dict]:
+        """ANN 검색 (인덱스가 있으면 nprobes/refine_factor 적용)"""
+        if self.vector_codec.mode == "int8":
+            return self._scan_search(query_vector, k, where)
+        if self.vector_codec.mode == "binary":
+            return self._binary_search(query_vector, k, where)
+        
+        results = self.index_manager.apply_search_params(self.table.search(query_vector))
+        # 메타데이터 필터 적용 (prefilter: 작은 토픽에서도 k개 보장)
+        if where:
+            results = results.where(where, prefilter=True)
+        return results.limit(k).to_list()
+    
+    def _binary_search(self, query_vector: List[float], k: int, where: Optional[str]) -> List[Dict]:
+        """부호 비트 hamming 후보 검색 → int8 코드로 재점수"""
+        fetch_k = k * max(1, int(self.vector_storage.get("rescore_multiplier", 4)))
+        results = self.index_manager.apply_search_params(
+            self.table.search(self.vector_codec.encode_query(query_vector), vector_column_name=VECTOR_COLUMN),
+            metric="hamming"
+        )
+        if where:
+            results = results.where(where, prefilter=True)
+        return self._rescore(results.limit(fetch_k).to_list(), query_vector, k)
+    
+    def _scan_search(self, query_vector: List[float], k: int, where: Optional[str]) -> List[Dict]:
+        """
+        Full scan over int8 codes, then fetch the top k rows
+        
+        LanceDB cannot index or search int8 vectors, so every query reads the
+        whole code column; int8 storage is meant for small tables only.
+        """
+        import numpy as np
+        
+        scan = self.table.search().select(["id", CODE_COLUMN, SCALE_COLUMN])
+        if where:
+            scan = scan.where(where)
+        
+        best_ids = np.array([], dtype=object)
+        best_distances = np.array([], dtype=np.float32)
+        batch_size = self.vector_storage.get("scan_batch_size", 8192)
+        for batch in scan.limit(None).to_batches(batch_size=batch_size):
+            distances = self.vector_codec.distances(query_vector, self.vector_codec.decode(batch))
+            ids = np.asarray(batch.column("id").to_pylist(), dtype=object)
+            best_ids = np.concatenate([best_ids, ids])
+            best_distances = np.concatenate([best_distances, distances])
+            if len(best_ids) > k:
+                keep = np.argpartition(best_distances, k)[:k]
+                best_ids, best_distances = best_ids[keep], best_distances[keep]
+        
+        if not len(best_ids):
+            return []
+        # 스캔 거리가 곧 최종 int8 거리 (재점수 불필요)
+        distance_by_id = dict(zip(best_ids.tolist(), best_distances.tolist()))
+        id_filter = "id IN (" + ", ".join(self.quote_value(chunk_id) for chunk_id in best_ids) + ")"
+        rows = self.table.search().where(id_filter).limit(None).to_list()
+        for row in rows:
+            row["_distance"] = float(distance_by_id[row["id"]])
+        return sorted(rows, key=lambda row: row["_distance"])[:k]
+    
+    def _rescore(self, rows: List[Dict], query_vector: List[float], k: int) -> List[Dict]:
+        """binary 후보를 복원한 int8 벡터와 float 쿼리 거리로 재정렬 후 상위 k개"""
+        import numpy as np
+        
+        if not rows:
+            return []
+        vectors = self.vector_codec.decode_rows(rows)
+        distances = self.vector_codec.distances(query_vector, vectors)
+        order = np.argsort(distances)[:k]
+        for index in order:
+            rows[index]["_distance"] = float(distances[index])
+        return [rows[index] for index in order]
+    
+    def _select_mmr(self, rows: List[Dict], query_vector: List[float], k: int, lambda_mult: float) -> List[Dict]:
+        """검색 행에 포함된 벡터 컬럼으로 MMR 선택"""
+        from ..retrieval.diversity import maximal_marginal_relevance
+        
+        if len(rows) <= 1:
+            return rows[:k]
+        try:
+            vectors = self.vector_codec.decode_rows(rows)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"MMR skipped, result rows have no usable vectors: {e}")
+            return rows[:k]
+        
+        selected = maximal_marginal_relevance(query_vector, vectors, k, lambda_mult)
+        logger.debug(f"MMR selected {len(selected)}/{len(rows)} candidates (lambda={lambda_mult})")
+        return [rows[index] for index in selected]
+    
+    def _fts_search(self, query: str, k: int, where: Optional[str]) -> List[Dict]:
+        """BM25 전문 검색 (text 컬럼 INVERTED 인덱스)"""
+        results = self.table.search(query, query_type="fts")
+        if where:
+            results = results.where(where, prefilter=True)
+        return results.limit(k).to_list()
+    
+    def _hybrid_search(
+        self, query: str, query_vector: List[float], k: int, where: Optional[str]
+    ) -> List[Dict]:
+        """FTS + ANN 동시 실행 후 RRF 병합"""
+        from ..retrieval.rank_fusion import reciprocal_rank_fusion
+        
+        fetch_k = k * max(1, int(self.hybrid_config.get("candidate_multiplier", 4)))
+        executor = self._get_search_executor()
+        vector_future = executor.submit(self._vector_search, query_vector, fetch_k, where)
+        fts_future = executor.submit(self._fts_search, query, fetch_k, where)
+        
+        vector_rows = vector_future.result()
+        try:
+            fts_rows = fts_future.result()
+        except Exception as e:
+            # FTS 실패 시 벡터 결과만 사용
+            logger.warning(f"FTS leg failed, using vector results only: {e}")
+            fts_rows = []
+        
+        logger.debug(f"Hybrid search: {len(vector_rows)} vector + {len(fts_rows)} FTS candidates")
+        return reciprocal_rank_fusion(
+            [vector_rows, fts_rows],
+            key=lambda row: row.get("id"),
+            k=self.hybrid_config.get("rrf_k", 60),
+            limit=k
+        )
+    
+    def _get_search_executor(self) -> ThreadPoolExecutor:
+        """하이브리드 검색용 스레드 풀 (지연 생성)"""
+        if self._search_executor is None:
+            self._search_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="lancedb-search")
+        return self._search_executor
+    
+    def migrate_vector_storage(self, mode: str, batch_size: int = 4096) -> Dict[str, Any]:
+        """
+        Convert the table's vector columns to another storage mode in place
+        
+        New columns are computed batch by batch from the stored vectors, then
+        the old columns are dropped (the vector index is rebuilt afterwards).
+        Converting from int8/binary back to float keeps the quantization loss;
+        re-embed documents to restore full precision. The report includes the
+        target mode's recall@10 on a sample of the stored vectors and warns
+        when int8 (full-scan search) is chosen for a large table.
+        
+        Args:
+            mode: Target mode (float32, float16, int8, binary)
+            batch_size: Rows converted per batch
+            
+        Returns:
+            Migration report
+        """
+        import time
+        import lance
+        import pyarrow as pa
+        
+        target = VectorCodec(mode, metric=self.vector_codec.metric)
+        if self.open_table(refresh=True) is None:
+            return {"action": "no_table"}
+        
+        source = VectorCodec(VectorCodec.detect_mode(self.table.schema), metric=self.vector_codec.metric)
+        source_columns = source.source_columns(self.table.schema)
+        # 이전 binary 형식(float16 재점수 컬럼)은 같은 형식으로도 재변환
+        if source.mode == target.mode and source_columns == target.columns:
+            return {"action": "unchanged", "mode": mode}
+        
+        started = time.monotonic()
+        rows = self.table.count_rows()
+        bytes_before = self.table.stats().get("total_bytes")
+        recall = self._estimate_migration_recall(source, target) if rows else None
+        temporary = {column: f"__{column}" for column in target.columns}
+        
+        @lance.batch_udf()
+        def convert(batch):
+            encoded = target.encode(source.decode(batch))
+            return pa.RecordBatch.from_arrays(
+                [encoded[column] for column in target.columns],
+                [temporary[column] for column in target.columns]
+            )
+        
+        # 인덱스 빌드/compaction과 동시 실행 방지
+        with self.index_manager.maintenance_lock:
+            dataset = self.table.to_lance()
+            dataset.add_columns(convert, read_columns=source_columns, batch_size=batch_size)
+            dataset = lance.dataset(dataset.uri)
+            dataset.drop_columns(source_columns)
+            dataset = lance.dataset(dataset.uri)
+            dataset.alter_columns(*[
+                {"path": temporary[column], "name": column} for column in target.columns
+            ])
+            self.table.checkout_latest()
+        
+        self.vector_codec = target
+        if target.scan_only and rows > self.vector_storage.get("scan_warn_rows", 50000):
+            logger.warning(
+                f"{self.table_name} has {rows} rows in {target.mode} storage, which has no ANN index; "
+                f"every search scans the whole table (use float16 or binary for large tables)"
+            )
+        self.index_manager.schedule_maintenance()
+        self.compaction_scheduler.record_write()
+        
+        dimension = len(target.decode(self.table.search().select(target.columns).limit(1).to_arrow())[0]) if rows else 0
+        report = {
+            "action": "migrated",
+            "from": source.mode,
+            "to": target.mode,
+            "rows": rows,
+            "bytes_per_vector_before": source.bytes_per_vector(dimension),
+            "bytes_per_vector_after": target.bytes_per_vector(dimension),
+            # 원본 벡터 기준 정확 검색 대비 (원본이 float32가 아니면 원본 코덱의 복원 벡터 기준)
+            "recall_at_10": recall,
+            "size_vs_float16": round(
+                target.bytes_per_vector(dimension) / VectorCodec("float16").bytes_per_vector(dimension), 3
+            ) if dimension else None,
+            "rescoring": "int8" if target.needs_rescoring else None,
+            "search": "full scan" if target.scan_only else "ann",
+            "total_bytes_before": bytes_before,
+            "elapsed_seconds": round(time.monotonic() - started, 3)
+        }
+        logger.info(f"Vector storage migrated for {self.table_name}: {report}")
+        return report
+    
+    def _estimate_migration_recall(self, source: VectorCodec, target: VectorCodec) -> Optional[float]:
+        """저장된 벡터 표본으로 대상 형식의 recall@10 추정 (source 복원 벡터의 정확 검색 기준)"""
+        try:
+            sample_rows = int(self.vector_storage.get("recall_sample_rows", 2000))
+            sample = source.decode(
+                self.table.search().select(source.source_columns(self.table.schema)).limit(sample_rows).to_arrow()
+            )
+            return round(estimate_recall(
+                sample,
+                target.mode,
+                k=10,
+                metric=target.metric,
+                rescore_multiplier=max(1, int(self.vector_storage.get("rescore_multiplier", 4)))
+            ), 4)
+        except Exception as e:
+            logger.warning(f"Recall estimate for {target.mode} failed: {e}")
+            return None
+    
+    def close(self):
+        """백그라운드 스레드 종료 및 테이블/커넥션 해제 (풀에서 제거 시 호출)"""
+        release_scheduler(self, timeout=5)
+        self.index_manager.wait(timeout=5)
+        if self._search_executor is not None:
+            self._search_executor.shutdown(wait=False)
+            self._search_executor = None
+        self._closed = True
+        self.table = None
+        self.db = None
+        logger.info(f"LanceDB store closed: {self.db_path}/{self.table_name}")
+    
+    def _ensure_open(self):
+        """
+        Reconnect a store closed by pool eviction
+        
+        Callers may keep a store from VectorStorePool.get_store after the pool
+        evicted it; the next call reopens the connection instead of returning
+        empty results.
+        """
+        if not self._closed:
+            return
+        with self._reopen_lock:
+            if not self._closed:
+                return
+            self._init_database()
+            self.compaction_scheduler = acquire_scheduler(self)
+            self._index_checked = False
+            self._closed = False
+            logger.info(f"LanceDB store reopened after close: {self.db_path}/{self.table_name}")
+    
     def delete(self, ids: List[str]) -> bool:
         """
         Delete chunks by IDs
@@ -261,7 +745,7 @@ class LanceDBStore(BaseVectorStore):
         Returns:
             Success status
         """
-        if not self.table:
+        if self.open_table(refresh=True) is None:
             logger.error("Table not available for delete")
             return False
         
@@ -270,12 +754,8 @@ class LanceDBStore(BaseVectorStore):
             return False
         
         try:
-            ids_str = ", ".join([f"'{id}'" for id in ids])
-            delete_expr = f"id IN ({ids_str})"
-            logger.info(f"Deleting with expression: {delete_expr}")
-            
-            self.table.delete(delete_expr)
-            logger.info(f"Successfully deleted {len(ids)} chunks")
+            deleted = self._delete_in("id", ids)
+            logger.info(f"Successfully deleted {deleted} chunks")
             return True
         except Exception as e:
             logger.error(f"Delete failed: {e}", exc_info=True)
@@ -288,38 +768,34 @@ class LanceDBStore(BaseVectorStore):
         Args:
             document_id: SQLite document ID
             
+        Returns:
+            Success status
+        """
+        return self.delete_by_document_ids([document_id])
+    
+    def delete_by_document_ids(self, document_ids: List[str]) -> bool:
+        """
+        Delete all chunks belonging to the given documents (batched IN predicates)
+        
+        Physical cleanup is deferred to the compaction scheduler.
+        
+        Args:
+            document_ids: SQLite document IDs
+            
         Returns:
             Success status
         """
         if not self.db:
             logger.warning("LanceDB not initialized")
             return False
-            
+        
         try:
-            if self.table_name not in self.db.table_names():
+            if self.open_table(refresh=True) is None:
                 logger.warning(f"Table {self.table_name} not found")
                 return True
             
-            self.table = self.db.open_table(self.table_name)
-            
-            delete_expr = f"metadata['document_id'] = '{document_id}'"
-            logger.info(f"Deleting with expression: {delete_expr}")
-            
-            self.table.delete(delete_expr)
-            
-            # Optimize to physically remove deleted rows
-            try:
-                self.table.compact_files()
-                from datetime import timedelta
-                self.table.cleanup_old_versions(
-                    older_than=timedelta(seconds=0),
-                    delete_unverified=True
-                )
-                self.table.optimize()
-                logger.info(f"Optimized after deleting document {document_id}")
-            except Exception as e:
-                logger.warning(f"Optimize failed: {e}")
-            
+            deleted = self._delete_in("document_id", document_ids)
+            logger.info(f"Deleted {deleted} chunks for {len(document_ids)} documents")
             return True
         except Exception as e:
             logger.error(f"Delete by document_id failed: {e}", exc_info=True)
@@ -329,6 +805,8 @@ class LanceDBStore(BaseVectorStore):
         """
         Delete all chunks belonging to a topic
         
+        Physical cleanup is deferred to the compaction scheduler.
+        
         Args:
             topic_id: Topic ID
             
@@ -340,35 +818,85 @@ class LanceDBStore(BaseVectorStore):
             return False
             
         try:
-            if self.table_name not in self.db.table_names():
+            if self.open_table(refresh=True) is None:
                 logger.warning(f"Table {self.table_name} not found")
                 return True
             
-            self.table = self.db.open_table(self.table_name)
-            
-            delete_expr = f"metadata['topic_id'] = '{topic_id}'"
             logger.info(f"Deleting chunks for topic: {topic_id}")
-            
-            self.table.delete(delete_expr)
-            
-            # Optimize to physically remove deleted rows
-            try:
-                self.table.compact_files()
-                from datetime import timedelta
-                self.table.cleanup_old_versions(
-                    older_than=timedelta(seconds=0),
-                    delete_unverified=True
-                )
-                self.table.optimize()
-                logger.info(f"Optimized after deleting topic {topic_id}")
-            except Exception as e:
-                logger.warning(f"Optimize failed: {e}")
-            
+            deleted = self._delete_where(self.build_filter_expression({"topic_id": topic_id}))
+            logger.info(f"Deleted {deleted} chunks for topic {topic_id}")
             return True
         except Exception as e:
             logger.error(f"Delete by topic_id failed: {e}", exc_info=True)
             return False
     
+    def _delete_in(self, key: str, values: List[str]) -> int:
+        """IN 조건으로 일괄 삭제 (조건식 길이 제한을 위해 분할)"""
+        deleted = 0
+        for i in range(0, len(values), self.DELETE_BATCH_SIZE):
+            batch = list(values[i:i + self.DELETE_BATCH_SIZE])
+            deleted += self._delete_where(self.build_filter_expression({key: batch}))
+        return deleted
+    
+    def _delete_where(self, delete_expr: str) -> int:
+        """논리 삭제 후 compaction 스케줄러에 기록"""
+        logger.debug(f"Deleting with expression: {delete_expr[:200]}")
+        rows_before = self.table.count_rows()
+        result = self.table.delete(delete_expr)
+        deleted = getattr(result, "num_deleted_rows", None)
+        if deleted is None:
+            # 이전 LanceDB는 삭제 결과를 반환하지 않음: 전후 행 수 차이로 계산
+            deleted = max(0, rows_before - self.table.count_rows())
+        self.compaction_scheduler.record_delete(deleted)
+        return deleted
+    
+    def iter_document_batches(self, document_id: str, columns: List[str], batch_size: int = 256):
+        """
+        Stream a document's rows as Arrow record batches
+        
+        Args:
+            document_id: SQLite document ID
+            columns: Columns to read (e.g. ["text", "metadata"])
+            batch_size: Rows per batch
+            
+        Yields:
+            pyarrow.RecordBatch
+        """
+        if self.open_table() is None:
+            return
+        where = self.build_filter_expression({"document_id": document_id})
+        scan = self.table.search().select(columns).where(where)
+        yield from scan.limit(None).to_batches(batch_size=batch_size)
+    
+    def get_chunk_indexes(self, document_id: str) -> set:
+        """저장된 문서 청크 번호 집합"""
+        indexes = set()
+        for batch in self.iter_document_batches(document_id, ["metadata"], batch_size=4096):
+            for metadata in batch.column("metadata").to_pylist():
+                if metadata and metadata.get("chunk_index") is not None:
+                    indexes.add(int(metadata["chunk_index"]))
+        return indexes
+    
+    def get_table_version(self) -> Optional[int]:
+        """
+        Get latest table version (changes after every add/delete)
+        
+        Returns:
+            Table version or None if table not available
+        """
+        self._ensure_open()
+        if self.db is None:
+            return None
+        
+        try:
+            # 다른 핸들에서 발생한 삭제/추가 반영
+            if self.open_table(refresh=True) is None:
+                return None
+            return self.table.version
+        except Exception as e:
+            logger.warning(f"Failed to get table version: {e}")
+            return None
+    
     def get_document(self, doc_id: str) -> Optional[Document]:
         """
         Get document by ID
@@ -379,11 +907,11 @@ class LanceDBStore(BaseVectorStore):
         Returns:
             Document or None
         """
-        if not self.table:
+        if self.open_table() is None:
             return None
         
         try:
-            results = self.table.search().where(f"id = '{doc_id}'").limit(1).to_list()
+            results = self.table.search().where(f"id = {self.quote_value(doc_id)}").limit(1).to_list()
             if results:
                 row = results[0]
                 return Document(
@@ -423,22 +951,25 @@ class LanceDBStore(BaseVectorStore):
         
         return False
     
-    def _build_filter_expression(self, filter: Dict[str, Any]) -> str:
+    def build_filter_expression(self, filter: Dict[str, Any]) -> str:
         """
         Build filter expression for LanceDB
         
         Args:
-            filter: Metadata filter
+            filter: Metadata filter (list values become IN predicates)
             
         Returns:
             Filter expression string
         """
         expressions = []
         for key, value in filter.items():
-            if isinstance(value, str):
-                expressions.append(f"metadata.{key} = '{value}'")
+            # 승격된 필드는 최상위 컬럼 사용 (스칼라 인덱스 활용)
+            column = key if key in self._promoted_columns else f"metadata.{key}"
+            if isinstance(value, (list, tuple, set)):
+                values = ", ".join(self.quote_value(v) for v in value)
+                expressions.append(f"{column} IN ({values})")
             else:
-                expressions.append(f"metadata.{key} = {value}")
+                expressions.append(f"{column} = {self.quote_value(value)}")
         
         return " AND ".join(expressions)
     
@@ -447,7 +978,9 @@ class LanceDBStore(BaseVectorStore):
         Return LangChain-compatible retriever
         
         Args:
-            **kwargs: search_kwargs (k, filter, etc.)
+            **kwargs: search_kwargs (k, filter, etc.),
+                rerank (rerank config; k candidates are reranked down to final_k),
+                packer (ContextPacker fitting the final results into the prompt budget)
             
         Returns:
             Retriever instance
@@ -462,12 +995,29 @@ class LanceDBStore(BaseVectorStore):
         except ImportError:
             from langchain_core.callbacks.manager import CallbackManagerForRetrieverRun
         
-        # 클래스 레벨 캐시 (모든 인스턴스가 공유)
-        _query_cache = {}
+        from ..retrieval.retrieval_cache import retrieval_cache
         
         class LanceDBRetriever(BaseRetriever):
             vectorstore: Any
             search_kwargs: Dict[str, Any] = {}
+            rerank: Optional[Dict[str, Any]] = None
+            packer: Optional[Any] = None
+            
+            def _rerank(self, query: str, results: List[Document]) -> List[Document]:
+                """Cross-encoder 재정렬 후 컨텍스트 패킹 (설정이 없으면 그대로 반환)"""
+                from ..retrieval.reranker import get_reranker
+                
+                reranker = get_reranker(self.rerank) if self.rerank else None
+                if reranker is not None:
+                    results = reranker.rerank(
+                        query,
+                        results,
+                        top_k=self.rerank.get("final_k", 5),
+                        time_budget_ms=self.rerank.get("time_budget_ms")
+                    )
+                if self.packer is not None:
+                    results = self.packer.pack(results).documents
+                return results
             
             def _get_relevant_documents(
                 self, query: str, *, run_manager: CallbackManagerForRetrieverRun
@@ -475,26 +1025,37 @@ class LanceDBStore(BaseVectorStore):
                 from core.logging import get_logger
                 logger = get_logger("lancedb_retriever")
                 
-                # 캐시 확인
-                cache_key = f"{self.vectorstore.table_name}:{query}"
-                if cache_key in _query_cache:
+                model_id = self.vectorstore.model_id
+                search_kwargs = dict(self.search_kwargs)
+                k = search_kwargs.pop("k", 5)
+                filter = search_kwargs.pop("filter", None)
+                search_kwargs.setdefault("search_mode", self.vectorstore.search_mode)
+                
+                # 캐시 확인 (테이블 버전이 바뀌면 자동 무효화)
+                table_version = self.vectorstore.get_table_version()
+                cache_key = retrieval_cache.make_key(
+                    model_id, table_version, filter, k, query, **search_kwargs
+                )
+                cached = retrieval_cache.get(cache_key)
+                if cached is not None:
                     logger.info(f"[VECTOR QUERY] Using cached results for: {query}")
-                    return _query_cache[cache_key]
+                    return self._rerank(query, list(cached))
                 
-                logger.info(f"[VECTOR QUERY] Table: {self.vectorstore.table_name}, Query: {query}")
+                logger.info(f"[VECTOR QUERY] Model: {model_id}, Table: {self.vectorstore.table_name} (v{table_version}), Query: {query}")
                 
-                # 현재 모델에 맞는 임베딩 생성
+                # 풀에서 현재 모델 임베딩 재사용 (동시 쿼리는 마이크로 배치로 병합)
                 try:
-                    from ..embeddings.embedding_factory import EmbeddingFactory
-                    embeddings = EmbeddingFactory.create_embeddings()
-                    query_vector = embeddings.embed_query(query)
-                    logger.info(f"[VECTOR QUERY] Using current model embeddings")
+                    from ..embeddings.embedding_pool import embedding_pool
+                    query_vector = embedding_pool.embed_query(query, model_id)
+                    logger.info(f"[VECTOR QUERY] Using pooled embeddings")
                     
                 except Exception as e:
                     logger.error(f"Failed to create embeddings: {e}")
                     return []
                 
-                results = self.vectorstore.search(query, query_vector=query_vector, **self.search_kwargs)
+                results = self.vectorstore.search(
+                    query, k=k, filter=filter, query_vector=query_vector, **search_kwargs
+                )
                 
                 logger.info(f"[VECTOR QUERY] Found {len(results)} results for: {query}")
                 if results:
@@ -503,9 +1064,15 @@ class LanceDBStore(BaseVectorStore):
                         logger.info(f"[VECTOR RESULT {idx+1}] Content: {doc.page_content[:200]}...")
                         logger.info(f"[VECTOR RESULT {idx+1}] Metadata: {doc.metadata}")
                 
-                # 캐시 저장 (테이블별로 분리)
-                _query_cache[cache_key] = results
+                # 테이블 버전을 알 수 없으면 캐시하지 않음
+                if table_version is not None:
+                    retrieval_cache.set(cache_key, list(results))
                 
-                return results
+                return self._rerank(query, results)
         
-        return LanceDBRetriever(vectorstore=self, search_kwargs=kwargs.get('search_kwargs', {}))
+        return LanceDBRetriever(
+            vectorstore=self,
+            search_kwargs=kwargs.get('search_kwargs', {}),
+            rerank=kwargs.get('rerank'),
+            packer=kwargs.get('packer')
+        )
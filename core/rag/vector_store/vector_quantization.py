@@ -0,0 +1,331 @@
+"""
+Vector Quantization
+벡터 저장 형식(float32 / float16 / int8 / binary) 인코딩과 재점수 계산
+
+- float16: 절반 크기, LanceDB 인덱스 사용 가능
+- int8: 약 1/4 크기, LanceDB가 int8 벡터 검색을 지원하지 않아 전체 스캔 (소규모 테이블 전용)
+- binary: 부호 비트(hamming 인덱스)로 후보 검색 후 int8 코드+스케일로 재점수
+  (d/8 + d + 4 바이트, float16의 약 절반 크기로 인덱스 검색 가능: 대용량 코퍼스용)
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+import pyarrow as pa
+from core.logging import get_logger
+
+logger = get_logger("vector_quantization")
+
+VECTOR_STORAGE_MODES = ("float32", "float16", "int8", "binary")
+
+VECTOR_COLUMN = "vector"
+CODE_COLUMN = "vector_q"        # int8 스칼라 양자화 코드 (binary 후보 재점수에도 사용)
+SCALE_COLUMN = "vector_scale"   # 행별 int8 역양자화 스케일
+LEGACY_RESCORE_COLUMN = "vector_f16"  # 이전 binary 형식의 float16 재점수 벡터 (읽기/마이그레이션 전용)
+
+# 전체 스캔 검색 형식 (ANN 인덱스 없음)
+SCAN_ONLY_MODES = ("int8",)
+
+
+class VectorCodec:
+    """벡터 저장 형식별 Arrow 컬럼 변환 및 거리 계산"""
+
+    def __init__(self, mode: str = "float32", metric: str = "l2"):
+        """
+        Initialize codec
+
+        Args:
+            mode: Storage mode (float32, float16, int8, binary)
+            metric: Distance metric for rescoring (l2, cosine, dot)
+        """
+        if mode not in VECTOR_STORAGE_MODES:
+            raise ValueError(f"Unknown vector storage mode: {mode} (expected one of {VECTOR_STORAGE_MODES})")
+        self.mode = mode
+        self.metric = metric
+
+    # ========== Schema ==========
+
+    @staticmethod
+    def detect_mode(schema: pa.Schema) -> str:
+        """
+        Storage mode of an existing table
+
+        Args:
+            schema: Table schema
+
+        Returns:
+            Storage mode name
+        """
+        names = set(schema.names)
+        if VECTOR_COLUMN in names and pa.types.is_uint8(schema.field(VECTOR_COLUMN).type.value_type):
+            return "binary"
+        if CODE_COLUMN in names:
+            return "int8"
+        if VECTOR_COLUMN in names and pa.types.is_float16(schema.field(VECTOR_COLUMN).type.value_type):
+            return "float16"
+        return "float32"
+
+    @property
+    def columns(self) -> List[str]:
+        """이 형식이 사용하는 벡터 관련 컬럼"""
+        return {
+            "float32": [VECTOR_COLUMN],
+            "float16": [VECTOR_COLUMN],
+            "int8": [CODE_COLUMN, SCALE_COLUMN],
+            "binary": [VECTOR_COLUMN, CODE_COLUMN, SCALE_COLUMN],
+        }[self.mode]
+
+    def source_columns(self, schema: pa.Schema) -> List[str]:
+        """기존 테이블에서 읽을 벡터 컬럼 (이전 binary 형식 포함)"""
+        if self.mode == "binary" and LEGACY_RESCORE_COLUMN in schema.names:
+            return [VECTOR_COLUMN, LEGACY_RESCORE_COLUMN]
+        return self.columns
+
+    @property
+    def needs_rescoring(self) -> bool:
+        """인덱스 후보를 int8 코드로 재점수해야 하는지 여부 (binary)"""
+        return self.mode == "binary"
+
+    @property
+    def scan_only(self) -> bool:
+        """ANN 인덱스 없이 전체 스캔으로 검색하는 형식인지 여부"""
+        return self.mode in SCAN_ONLY_MODES
+
+    def bytes_per_vector(self, dimension: int) -> int:
+        """벡터 1개당 저장 바이트"""
+        return {
+            "float32": dimension * 4,
+            "float16": dimension * 2,
+            "int8": dimension + 4,
+            "binary": (dimension + 7) // 8 + dimension + 4,
+        }[self.mode]
+
+    # ========== Encoding ==========
+
+    def encode(self, vectors: np.ndarray) -> Dict[str, pa.Array]:
+        """
+        Encode float vectors into this mode's Arrow columns
+
+        Args:
+            vectors: (rows, dimension) float array
+
+        Returns:
+            {column name: Arrow array}
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.mode == "float32":
+            return {VECTOR_COLUMN: _fixed_list(vectors, pa.float32())}
+        if self.mode == "float16":
+            return {VECTOR_COLUMN: _fixed_list(vectors.astype(np.float16), pa.float16())}
+
+        codes, scales = quantize_int8(vectors)
+        columns = {
+            CODE_COLUMN: _fixed_list(codes, pa.int8()),
+            SCALE_COLUMN: pa.array(scales, type=pa.float32())
+        }
+        if self.mode == "binary":
+            columns = {VECTOR_COLUMN: _fixed_list(pack_binary(vectors), pa.uint8()), **columns}
+        return columns
+
+    def decode(self, batch) -> np.ndarray:
+        """
+        Reconstruct float vectors from stored columns (lossy except float32)
+
+        Args:
+            batch: Arrow RecordBatch/Table with this mode's columns
+
+        Returns:
+            (rows, dimension) float32 array
+        """
+        if self.mode in ("float32", "float16"):
+            return _to_matrix(batch.column(VECTOR_COLUMN)).astype(np.float32)
+        if self.mode == "binary" and LEGACY_RESCORE_COLUMN in batch.schema.names:
+            return _to_matrix(batch.column(LEGACY_RESCORE_COLUMN)).astype(np.float32)
+        codes = _to_matrix(batch.column(CODE_COLUMN))
+        scales = np.asarray(batch.column(SCALE_COLUMN).to_numpy(zero_copy_only=False), dtype=np.float32)
+        return dequantize_int8(codes, scales)
+
+    def decode_rows(self, rows: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Reconstruct float vectors from search result rows
+
+        Args:
+            rows: LanceDB result dicts including this mode's columns
+
+        Returns:
+            (rows, dimension) float32 array
+        """
+        if self.mode == "binary" and rows and LEGACY_RESCORE_COLUMN in rows[0]:
+            return np.asarray([row[LEGACY_RESCORE_COLUMN] for row in rows], dtype=np.float32)
+        if self.mode in ("int8", "binary"):
+            return dequantize_int8(
+                np.asarray([row[CODE_COLUMN] for row in rows], dtype=np.int8),
+                np.asarray([row[SCALE_COLUMN] for row in rows], dtype=np.float32)
+            )
+        return np.asarray([row[VECTOR_COLUMN] for row in rows], dtype=np.float32)
+
+    def encode_query(self, query_vector: Sequence[float]):
+        """검색용 쿼리 변환 (binary는 부호 비트로 패킹)"""
+        query = np.asarray(query_vector, dtype=np.float32)
+        if self.mode == "binary":
+            return pack_binary(query[None, :])[0]
+        return query
+
+    # ========== Rescoring ==========
+
+    def distances(self, query_vector: Sequence[float], vectors: np.ndarray) -> np.ndarray:
+        """
+        Distances between a float query and candidate vectors (smaller is closer)
+
+        Args:
+            query_vector: Float query
+            vectors: (rows, dimension) candidate vectors
+
+        Returns:
+            Distance per row, matching LanceDB's metric semantics
+        """
+        query = np.asarray(query_vector, dtype=np.float32)
+        if self.metric == "dot":
+            return -(vectors @ query)
+        if self.metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=1) * max(float(np.linalg.norm(query)), 1e-12)
+            return 1.0 - (vectors @ query) / np.maximum(norms, 1e-12)
+        diff = vectors - query
+        return np.einsum("ij,ij->i", diff, diff)
+
+
+def quantize_int8(vectors: np.ndarray):
+    """
+    Symmetric per-row int8 quantization
+
+    Args:
+        vectors: (rows, dimension) float array
+
+    Returns:
+        (int8 codes, float32 scales) with vector ~= codes * scale
+    """
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """int8 코드 → float32 벡터"""
+    return codes.astype(np.float32) * scales[:, None]
+
+
+def pack_binary(vectors: np.ndarray) -> np.ndarray:
+    """부호 비트를 uint8로 패킹 (hamming 검색용)"""
+    return np.packbits(vectors > 0, axis=1)
+
+
+def _fixed_list(matrix: np.ndarray, value_type: pa.DataType) -> pa.FixedSizeListArray:
+    """2차원 배열 → Arrow FixedSizeList"""
+    return pa.FixedSizeListArray.from_arrays(pa.array(matrix.reshape(-1), type=value_type), matrix.shape[1])
+
+
+def _to_matrix(column) -> np.ndarray:
+    """Arrow FixedSizeList 컬럼 → 2차원 배열"""
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    width = column.type.list_size
+    return column.flatten().to_numpy(zero_copy_only=False).reshape(-1, width)
+
+
+def estimate_recall(
+    vectors: np.ndarray,
+    mode: str,
+    queries: Optional[np.ndarray] = None,
+    k: int = 10,
+    metric: str = "l2",
+    rescore_multiplier: int = 4
+) -> float:
+    """
+    Recall@k of one storage mode against exact float32 search (offline)
+
+    float16/int8 rank by decoded vectors; binary takes k x rescore_multiplier
+    hamming candidates and rescores them with the int8 codes, as
+    LanceDBStore does.
+
+    Args:
+        vectors: (rows, dimension) float32 corpus
+        mode: Storage mode
+        queries: (n, dimension) queries (None to use the first 100 corpus rows)
+        k: Neighbours compared
+        metric: Distance metric
+        rescore_multiplier: Binary candidate multiplier
+
+    Returns:
+        Fraction of exact top-k neighbours found
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    queries = vectors[:100] if queries is None else np.asarray(queries, dtype=np.float32)
+    k = min(k, len(vectors))
+    if not k or not len(queries):
+        return 1.0
+    exact = VectorCodec("float32", metric)
+    codec = VectorCodec(mode, metric)
+    decoded = codec.decode(pa.RecordBatch.from_pydict(codec.encode(vectors)))
+    packed = pack_binary(vectors) if mode == "binary" else None
+
+    hits = 0
+    for query in queries:
+        expected = set(np.argsort(exact.distances(query, vectors))[:k])
+        if mode == "binary":
+            bits = np.unpackbits(packed ^ codec.encode_query(query), axis=1)
+            candidates = np.argsort(bits.sum(axis=1), kind="stable")[:k * rescore_multiplier]
+            order = candidates[np.argsort(codec.distances(query, decoded[candidates]))[:k]]
+        else:
+            order = np.argsort(codec.distances(query, decoded))[:k]
+        hits += len(expected & set(order))
+    return hits / (len(queries) * k)
+
+
+def evaluate_storage_modes(
+    vectors: np.ndarray,
+    queries: Optional[np.ndarray] = None,
+    k: int = 10,
+    metric: str = "l2",
+    rescore_multiplier: int = 4
+) -> List[Dict[str, float]]:
+    """
+    Recall@k vs bytes per vector for each storage mode (offline, exact search)
+
+    Recall is measured offline; at query time int8 has no ANN index and scans
+    the whole table, so it only suits small tables (see the "search" field).
+    size_vs_float16 compares each mode with float16; a quantized mode at or
+    above 1.0 saves no space over it.
+
+    Args:
+        vectors: (rows, dimension) float32 corpus
+        queries: (n, dimension) queries (None to use the first 100 corpus rows)
+        k: Neighbours compared
+        metric: Distance metric
+        rescore_multiplier: Binary candidate multiplier
+
+    Returns:
+        One report row per mode (see estimate_recall)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    dimension = vectors.shape[1]
+    float16_bytes = VectorCodec("float16").bytes_per_vector(dimension)
+
+    report = []
+    for mode in VECTOR_STORAGE_MODES:
+        codec = VectorCodec(mode, metric)
+        report.append({
+            "mode": mode,
+            "bytes_per_vector": codec.bytes_per_vector(dimension),
+            "size_ratio": round(codec.bytes_per_vector(dimension) / (dimension * 4), 3),
+            "size_vs_float16": round(codec.bytes_per_vector(dimension) / float16_bytes, 3),
+            "recall_at_k": round(estimate_recall(vectors, mode, queries, k, metric, rescore_multiplier), 4),
+            "search": "full scan" if codec.scan_only else "ann"
+        })
+    logger.warning(
+        "int8 storage has no ANN index: every query scans the whole table, "
+        "use it only for small tables (float16 or binary for large ones)"
+    )
+    for row in report:
+        if row["mode"] in ("int8", "binary") and row["size_vs_float16"] >= 1.0:
+            logger.warning(f"{row['mode']} storage is not smaller than float16 at dimension {dimension}")
+    return report
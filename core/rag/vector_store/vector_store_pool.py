@@ -2,9 +2,11 @@
 Vector Store Connection Pool (Singleton)
 """
 
-from typing import Dict, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 from threading import Lock
 from core.logging import get_logger
+from ..pool_policy import PoolEvictionPolicy, get_process_rss, release_memory
 
 logger = get_logger("vector_store_pool")
 
@@ -28,13 +30,33 @@ class VectorStorePool:
             return
         
         self._stores: Dict[str, any] = {}  # model_id -> LanceDBStore
+        self._pins: Dict[str, int] = {}  # model_id -> 사용 중인 호출 수 (해제 금지)
+        self._policy = self._create_policy()
         self._initialized = True
         logger.info("VectorStorePool initialized")
     
+    def _create_policy(self) -> PoolEvictionPolicy:
+        """RAG 설정 기반 해제 정책 생성"""
+        try:
+            from ..config.rag_config_manager import RAGConfigManager
+            pool_config = RAGConfigManager().get_pool_config("vector_store")
+        except Exception as e:
+            logger.warning(f"Failed to load pool config, using defaults: {e}")
+            pool_config = {}
+        return PoolEvictionPolicy(
+            max_items=pool_config.get("max_items", 4),
+            idle_ttl_seconds=pool_config.get("idle_ttl_seconds", 1800),
+            memory_budget_mb=pool_config.get("memory_budget_mb", 0)
+        )
+    
     def get_store(self, model_id: Optional[str] = None) -> any:
         """
         Get or create vector store for model
         
+        The store is not pinned: eviction may close it while the caller still
+        holds it, after which it reconnects on next use. Wrap searches that
+        must not be interrupted in use_store.
+        
         Args:
             model_id: Embedding model ID (None for current)
             
@@ -45,25 +67,128 @@ class VectorStorePool:
             model_id = self._get_current_model_id()
         
         # 캐시된 스토어 반환
-        if model_id in self._stores:
+        store = self._stores.get(model_id)
+        if store is not None:
             logger.debug(f"Reusing cached store for model: {model_id}")
-            return self._stores[model_id]
+            self._policy.touch(model_id)
+            return store
         
         # 새 스토어 생성 및 캐시
         with self._lock:
             if model_id not in self._stores:
                 from .lancedb_store import LanceDBStore
-                store = LanceDBStore()
+                rss_before = get_process_rss()
+                store = LanceDBStore(model_id=model_id)
+                rss_after = get_process_rss()
                 self._stores[model_id] = store
+                self._policy.record_load(
+                    model_id,
+                    rss_delta=rss_after - rss_before if rss_before and rss_after else None
+                )
                 logger.info(f"Created new store for model: {model_id}")
+            store = self._stores[model_id]
         
-        return self._stores[model_id]
+        for victim in self._policy.select_over_budget(protect=model_id):
+            self.release(victim)
+        return store
+    
+    @contextmanager
+    def use_store(self, model_id: Optional[str] = None) -> Iterator[Any]:
+        """
+        Get a pooled store and keep it open while the block runs
+        
+        Eviction and budget release skip pinned stores, so a search running
+        in another thread never sees its table closed underneath it.
+        
+        Args:
+            model_id: Embedding model ID (None for current)
+            
+        Yields:
+            LanceDBStore instance
+        """
+        if model_id is None:
+            model_id = self._get_current_model_id()
+        
+        while True:
+            store = self.get_store(model_id)
+            with self._lock:
+                # get_store와 고정 사이에 해제됐으면 다시 생성
+                if self._stores.get(model_id) is store:
+                    self._pins[model_id] = self._pins.get(model_id, 0) + 1
+                    break
+        
+        try:
+            yield store
+        finally:
+            with self._lock:
+                remaining = self._pins[model_id] - 1
+                if remaining:
+                    self._pins[model_id] = remaining
+                else:
+                    del self._pins[model_id]
+            self._policy.touch(model_id)
+    
+    def is_in_use(self, model_id: str) -> bool:
+        """스토어 사용 중 여부 (use_store 블록 실행 중)"""
+        with self._lock:
+            return self._pins.get(model_id, 0) > 0
+    
+    def release(self, model_id: str) -> bool:
+        """
+        Close and remove a pooled store
+        
+        A store pinned by use_store (search in progress) is never closed.
+        
+        Args:
+            model_id: Embedding model ID
+            
+        Returns:
+            True if the store was pooled and closed
+        """
+        with self._lock:
+            if self._pins.get(model_id):
+                logger.debug(f"Store in use, not released: {model_id}")
+                self._policy.touch(model_id)
+                return False
+            store = self._stores.pop(model_id, None)
+            self._policy.forget(model_id)
+        
+        if store is None:
+            return False
+        store.close()
+        release_memory()
+        logger.info(f"Released store for model: {model_id}")
+        return True
+    
+    def evict_idle(self) -> List[str]:
+        """
+        Close stores unused longer than the idle TTL (current model is kept)
+        
+        Returns:
+            Released model IDs
+        """
+        released = [
+            model_id for model_id in self._policy.select_idle(protect=self._get_current_model_id())
+            if self.release(model_id)
+        ]
+        if released:
+            logger.info(f"Evicted idle stores: {released}")
+        return released
+    
+    def get_memory_report(self) -> Dict[str, Any]:
+        """
+        Per-store memory estimate and idle time
+        
+        Returns:
+            {model_id: {memory_mb, rss_delta_mb, idle_seconds, age_seconds}}
+        """
+        return self._policy.get_report()
     
     def clear_cache(self):
         """Clear all cached stores"""
-        with self._lock:
-            self._stores.clear()
-            logger.info("Cleared vector store cache")
+        for model_id in list(self._stores):
+            self.release(model_id)
+        logger.info("Cleared vector store cache")
     
     def _get_current_model_id(self) -> str:
         """Get current embedding model ID"""
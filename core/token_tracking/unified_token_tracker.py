@@ -46,6 +46,18 @@ class AgentExecutionToken:
         return self.input_tokens + self.output_tokens
 
 
+@dataclass
+class ContextPackingStats:
+    """RAG context packing result for single retrieval."""
+    agent_name: str
+    model_name: str
+    packed_chunks: int
+    dropped_chunks: int
+    packed_tokens: int
+    dropped_tokens: int
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
 @dataclass
 class ConversationToken:
     """Token usage for entire conversation."""
@@ -53,6 +65,7 @@ class ConversationToken:
     mode: ChatModeType
     model_name: str
     agents: List[AgentExecutionToken] = field(default_factory=list)
+    context_packing: List[ContextPackingStats] = field(default_factory=list)
     start_time: datetime = field(default_factory=datetime.now)
     end_time: Optional[datetime] = None
     session_id: Optional[int] = None
@@ -206,6 +219,10 @@ class UnifiedTokenTracker(QObject):
             logger.info(f"Started conversation {conversation_id} (mode={mode.value}, model={model}, session_id={session_id})")
             return conversation_id
     
+    def is_conversation_active(self) -> bool:
+        """Whether a conversation is being processed (between start and end)"""
+        return self._current_conversation is not None
+    
     def track_agent(
         self,
         agent_name: str,
@@ -255,6 +272,47 @@ class UnifiedTokenTracker(QObject):
             # Emit signal for UI update
             self._emit_update()
     
+    def track_context_packing(
+        self,
+        agent_name: str,
+        model: str,
+        packed_chunks: int,
+        dropped_chunks: int,
+        packed_tokens: int,
+        dropped_tokens: int
+    ):
+        """
+        Track RAG context packing within current conversation.
+        
+        Args:
+            agent_name: Name of agent (e.g., 'RAGAgent')
+            model: Chat model the context was packed for
+            packed_chunks: Chunks placed into the prompt
+            dropped_chunks: Chunks dropped for the token budget
+            packed_tokens: Estimated context tokens placed into the prompt
+            dropped_tokens: Estimated tokens dropped or truncated away
+        """
+        if not self._current_conversation:
+            logger.debug("No active conversation, skipping context packing stats")
+            return
+        
+        with self._lock:
+            self._current_conversation.context_packing.append(ContextPackingStats(
+                agent_name=agent_name,
+                model_name=model,
+                packed_chunks=packed_chunks,
+                dropped_chunks=dropped_chunks,
+                packed_tokens=packed_tokens,
+                dropped_tokens=dropped_tokens
+            ))
+            
+            logger.info(
+                f"Tracked {agent_name} context: {packed_chunks} chunks packed ({packed_tokens} tokens), "
+                f"{dropped_chunks} dropped ({dropped_tokens} tokens)"
+            )
+            
+            self._emit_update()
+    
     def end_conversation(self) -> Optional[ConversationToken]:
         """
         End current conversation and persist to DB.
@@ -405,7 +463,9 @@ class UnifiedTokenTracker(QObject):
                     'tools': len(a.tool_calls)
                 }
                 for a in conversation.agents
-            ]
+            ],
+            'context_packed_chunks': sum(c.packed_chunks for c in conversation.context_packing),
+            'context_dropped_chunks': sum(c.dropped_chunks for c in conversation.context_packing)
         }
     
     def get_mode_breakdown(self, session_id: Optional[int] = None) -> Dict[str, Dict]:
@@ -508,7 +568,9 @@ class UnifiedTokenTracker(QObject):
             'total_tokens': 0,
             'total_cost': 0.0,
             'agent_count': 0,
-            'agents': []
+            'agents': [],
+            'context_packed_chunks': 0,
+            'context_dropped_chunks': 0
         }
 
 
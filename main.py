@@ -62,6 +62,18 @@ def cleanup_resources():
         mcp_manager.close_all()
     except:
         pass
+    
+    try:
+        from core.rag.embeddings.embedding_pool import embedding_pool
+        embedding_pool.shutdown()
+    except:
+        pass
+    
+    try:
+        from core.rag.loaders.parser_pool import shutdown_parser_pool
+        shutdown_parser_pool()
+    except:
+        pass
 
 
 def main() -> int:
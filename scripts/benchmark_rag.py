@@ -0,0 +1,90 @@
+"""
+RAG Retrieval Benchmark
+합성 코퍼스로 recall@k / MRR / 쿼리 지연 / 적재 속도 / 청크당 디스크 사용량 측정 후 JSON 저장
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.logging import get_logger
+from core.rag.benchmark import BenchmarkCorpus, RetrievalBenchmark, compare_results, generate_corpus, save_result
+
+logger = get_logger("benchmark_rag")
+
+
+def print_summary(result: dict):
+    """결과 요약 출력"""
+    config = result["config"]
+    print(f"\nmodel={config['model_id']} chunking={config['chunking_strategy']} "
+          f"storage={config['vector_storage']} search={config['search_kwargs'] or 'default'}")
+    print(f"ingest: {result['ingest']['chunks']} chunks, {result['ingest']['chunks_per_second']} chunks/s")
+    for key, value in result["retrieval"].items():
+        if not isinstance(value, dict):
+            print(f"{key:<12}{value:>10}")
+    for language, metrics in result["retrieval"]["by_language"].items():
+        print(f"  {language:<6}" + "  ".join(f"{key}={value}" for key, value in metrics.items()))
+    for kind, summary in result["latency_ms"].items():
+        print(f"{kind} latency ms: " + "  ".join(f"{key}={value}" for key, value in summary.items()))
+    print(f"storage: {result['storage']['bytes_per_chunk']} bytes/chunk")
+
+
+def print_comparison(rows: list):
+    """기준 결과 대비 변화 출력"""
+    print(f"\n{'metric':<28}{'baseline':>12}{'current':>12}{'delta':>12}")
+    for row in rows:
+        print(f"{row['metric']:<28}{row['baseline']:>12}{row['current']:>12}{row['delta']:>+12}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark RAG retrieval quality and latency (CPU, offline)")
+    parser.add_argument("--corpus", help="Corpus JSON (generated when omitted)")
+    parser.add_argument("--save-corpus", help="Write the generated corpus to this JSON file")
+    parser.add_argument("--docs-per-language", type=int, default=20, help="Generated documents per language")
+    parser.add_argument("--sentences", type=int, default=40, help="Filler sentences per generated document")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus random seed")
+    parser.add_argument("--model-id", help="Embedding model ID (default: current model)")
+    parser.add_argument("--chunking", default="sliding_window", help="Chunking strategy")
+    parser.add_argument("--search-mode", choices=["vector", "fts", "hybrid"], help="Search mode override")
+    parser.add_argument("--mmr", action="store_true", help="Enable MMR diversity selection")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 5, 10], help="Cutoffs for recall@k")
+    parser.add_argument("--work-dir", help="Keep the benchmark database in this directory")
+    parser.add_argument("--output", default="benchmark_results/rag_benchmark.json", help="Result JSON path")
+    parser.add_argument("--compare", help="Baseline result JSON to compare against")
+
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = BenchmarkCorpus.load(args.corpus)
+    else:
+        corpus = generate_corpus(args.docs_per_language, args.sentences, args.seed)
+        if args.save_corpus:
+            corpus.save(args.save_corpus)
+
+    search_kwargs = {}
+    if args.search_mode:
+        search_kwargs["search_mode"] = args.search_mode
+    if args.mmr:
+        search_kwargs["mmr"] = True
+
+    result = RetrievalBenchmark(
+        corpus,
+        model_id=args.model_id,
+        chunking_strategy=args.chunking,
+        k_values=tuple(args.k),
+        search_kwargs=search_kwargs,
+        work_dir=args.work_dir
+    ).run()
+
+    save_result(result, args.output)
+    print_summary(result)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print_comparison(compare_results(baseline, result))
@@ -0,0 +1,118 @@
+"""
+Vector Storage Migration Tool
+벡터 저장 형식 변환 (float32 / float16 / int8 / binary) 및 recall-vs-size 리포트
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.logging import get_logger
+from core.rag.vector_store.vector_quantization import VECTOR_STORAGE_MODES
+
+logger = get_logger("migrate_vector_storage")
+
+
+def open_store(db_path: str, table_name: str = "documents"):
+    """
+    모델별 벡터 DB 폴더의 스토어 열기
+
+    Args:
+        db_path: 모델별 벡터 DB 경로
+        table_name: 테이블 이름
+    """
+    from core.rag.vector_store.lancedb_store import LanceDBStore
+
+    store = LanceDBStore(db_path=db_path, table_name=table_name)
+    if store.open_table() is None:
+        logger.error(f"Table not found: {db_path}/{table_name}")
+        return None
+    return store
+
+
+def report_recall(store, sample_size: int = 5000, queries: int = 100, k: int = 10):
+    """
+    테이블 샘플로 형식별 recall@k / 벡터당 바이트 리포트 출력
+
+    Args:
+        store: LanceDBStore
+        sample_size: 평가에 사용할 벡터 수
+        queries: 쿼리로 사용할 벡터 수
+        k: 비교할 이웃 수
+    """
+    from core.rag.vector_store.vector_quantization import evaluate_storage_modes
+
+    codec = store.vector_codec
+    sample = store.table.search().select(codec.columns).limit(sample_size).to_arrow()
+    if sample.num_rows == 0:
+        logger.error("Table is empty")
+        return []
+
+    vectors = codec.decode(sample)
+    if codec.mode != "float32":
+        logger.warning(f"Table stores {codec.mode} vectors; recall is measured against decoded vectors")
+
+    report = evaluate_storage_modes(
+        vectors,
+        queries=vectors[:queries],
+        k=k,
+        metric=codec.metric,
+        rescore_multiplier=store.vector_storage.get("rescore_multiplier", 4)
+    )
+
+    print(f"\n{store.db_path}/{store.table_name}: {sample.num_rows} vectors, dim {vectors.shape[1]}, current={codec.mode}")
+    print(f"{'mode':<10}{'bytes/vec':>12}{'size':>10}{'vs f16':>10}{'recall@' + str(k):>12}  search")
+    for row in report:
+        print(
+            f"{row['mode']:<10}{row['bytes_per_vector']:>12}{row['size_ratio']:>10.1%}"
+            f"{row['size_vs_float16']:>10.1%}{row['recall_at_k']:>12.4f}  {row['search']}"
+        )
+    return report
+
+
+def migrate(store, mode: str, model_id: str = None):
+    """
+    저장 형식 변환 후 (선택) 모델 설정에 반영
+
+    Args:
+        store: LanceDBStore
+        mode: 대상 형식
+        model_id: 설정에 기록할 임베딩 모델 ID (새 테이블도 같은 형식 사용)
+    """
+    result = store.migrate_vector_storage(mode)
+    print(result)
+
+    if model_id:
+        from core.rag.config.rag_config_manager import RAGConfigManager
+        RAGConfigManager().set_vector_storage_mode(model_id, mode)
+
+    store.index_manager.wait()
+    store.close()
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert vector storage format / report recall vs size")
+    parser.add_argument("--path", required=True, help="Model-specific vector DB path")
+    parser.add_argument("--table", default="documents", help="Table name")
+    parser.add_argument("--mode", choices=VECTOR_STORAGE_MODES, help="Target storage mode")
+    parser.add_argument("--model-id", help="Also save the mode for this embedding model in rag_config.json")
+    parser.add_argument("--report", action="store_true", help="Print recall-vs-size report")
+    parser.add_argument("--sample", type=int, default=5000, help="Vectors sampled for the report")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours for recall@k")
+
+    args = parser.parse_args()
+
+    vector_store = open_store(args.path, args.table)
+    if vector_store is None:
+        sys.exit(1)
+
+    if args.report or not args.mode:
+        report_recall(vector_store, sample_size=args.sample, k=args.k)
+    if args.mode:
+        migrate(vector_store, args.mode, args.model_id)
@@ -0,0 +1,87 @@
+"""
+ChunkDeduplicator tests
+SimHash 밴드 분할과 Hamming 거리 기반 근접 중복 탐지
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+chunk_dedup = pytest.importorskip("core.rag.batch.chunk_dedup")
+ChunkDeduplicator = chunk_dedup.ChunkDeduplicator
+
+LICENSE = (
+    "Licensed under the Apache License, Version 2.0 (the License); you may not use "
+    "this file except in compliance with the License. You may obtain a copy of the License at"
+)
+
+
+@pytest.mark.parametrize("count", [1, 3, 4, 7, 16])
+def test_band_layout_covers_all_bits(count):
+    layout = ChunkDeduplicator._band_layout(count)
+    assert len(layout) == count
+
+    covered = 0
+    for shift, mask in layout:
+        band = mask << shift
+        assert covered & band == 0
+        covered |= band
+    assert covered == (1 << 64) - 1
+
+
+@pytest.mark.parametrize("max_distance", [0, 1, 3, 5])
+def test_finds_every_fingerprint_within_distance(max_distance):
+    dedup = ChunkDeduplicator(max_distance=max_distance, min_chars=0)
+    base = 0x0123456789ABCDEF
+    dedup.add(base, "base")
+
+    # d개 비트를 뒤집어도 (d + 1)개 밴드 중 하나는 그대로 일치
+    for start in range(0, 64 - max_distance):
+        flipped = base
+        for bit in range(start, start + max_distance):
+            flipped ^= 1 << bit
+        assert dedup.find(flipped) == "base"
+
+
+def test_rejects_fingerprint_beyond_distance():
+    dedup = ChunkDeduplicator(max_distance=3, min_chars=0)
+    dedup.add(0, "zero")
+    assert dedup.find(0b1111) is None
+
+
+def test_signed_round_trip():
+    for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        signed = chunk_dedup.to_signed64(value)
+        assert -(1 << 63) <= signed < (1 << 63)
+        assert chunk_dedup.to_unsigned64(signed) == value
+
+
+def test_simhash_is_stable_for_near_duplicates():
+    near = LICENSE.replace("Version 2.0", "Version 2.0,")
+    assert chunk_dedup.simhash64(LICENSE) == chunk_dedup.simhash64(near)
+    assert chunk_dedup.simhash64("") == 0
+
+
+def test_check_links_near_duplicates():
+    dedup = ChunkDeduplicator(max_distance=3)
+    first = dedup.fingerprint(LICENSE)
+    assert dedup.check(LICENSE, first, "doc-1:0") is None
+
+    copy = LICENSE + " "
+    assert dedup.check(copy, dedup.fingerprint(copy), "doc-2:0") == "doc-1:0"
+    assert dedup.stats["duplicates"] == 1
+    assert dedup.stats["saved_text_bytes"] == len(copy.encode("utf-8"))
+
+
+def test_check_respects_accept_filter():
+    dedup = ChunkDeduplicator(max_distance=3)
+    fingerprint = dedup.fingerprint(LICENSE)
+    dedup.add(fingerprint, "pending")
+
+    assert dedup.find(fingerprint, accept=lambda key: key != "pending") is None
+
+
+def test_short_chunks_are_not_deduplicated():
+    dedup = ChunkDeduplicator(min_chars=64)
+    assert dedup.fingerprint("short") is None
+    assert dedup.check("short", None, "a") is None
+    assert dedup.check("short", None, "b") is None
@@ -0,0 +1,115 @@
+"""
+ContextPacker tests
+토큰 예산 패킹, 같은 문서 오버랩 제거, 문장 경계 절단
+"""
+
+import pytest
+
+pytest.importorskip("langchain")
+context_packer = pytest.importorskip("core.rag.retrieval.context_packer")
+ContextPacker = context_packer.ContextPacker
+Document = context_packer.Document
+
+
+def _packer(**kwargs) -> ContextPacker:
+    """단어 수를 토큰 수로 쓰는 packer (모델별 토큰 추정과 트래커 보고 제외)"""
+    packer = ContextPacker(**kwargs)
+    packer.count_tokens = lambda text: len(text.split())
+    packer._report = lambda result: None
+    return packer
+
+
+def _doc(text, document_id="doc-1"):
+    return Document(page_content=text, metadata={"document_id": document_id})
+
+
+def test_packs_in_relevance_order_within_budget():
+    packer = _packer(max_tokens=100, min_chunk_tokens=1)
+    docs = [_doc("alpha beta", "a"), _doc("gamma delta", "b")]
+
+    result = packer.pack(docs)
+
+    assert [d.page_content for d in result.documents] == ["alpha beta", "gamma delta"]
+    assert result.packed_tokens == 4
+    assert result.dropped_count == 0
+
+
+def test_strips_sliding_window_overlap_of_same_document():
+    packer = _packer(max_tokens=100, min_chunk_tokens=1, min_overlap_chars=8)
+    first = "one two three four five six"
+    second = "four five six seven eight"
+
+    result = packer.pack([_doc(first), _doc(second)])
+
+    assert [d.page_content for d in result.documents] == [first, "seven eight"]
+    assert result.packed_tokens == 8
+
+
+def test_strips_trailing_overlap_with_later_chunk():
+    packer = _packer(max_tokens=100, min_chunk_tokens=1, min_overlap_chars=8)
+    later = "four five six seven eight"
+    earlier = "one two three four five six"
+
+    result = packer.pack([_doc(later), _doc(earlier)])
+
+    assert result.documents[1].page_content == "one two three"
+
+
+def test_overlap_only_within_same_document():
+    packer = _packer(max_tokens=100, min_chunk_tokens=1, min_overlap_chars=8)
+    first = "one two three four five six"
+    second = "four five six seven eight"
+
+    result = packer.pack([_doc(first, "a"), _doc(second, "b")])
+
+    assert result.documents[1].page_content == second
+
+
+def test_contained_chunk_is_deduped():
+    packer = _packer(max_tokens=100, min_chunk_tokens=1)
+    result = packer.pack([_doc("one two three four"), _doc("two three")])
+
+    assert result.packed_count == 1
+    assert result.deduped_count == 1
+
+
+def test_short_overlap_is_kept():
+    packer = _packer(max_tokens=100, min_chunk_tokens=1, min_overlap_chars=16)
+    result = packer.pack([_doc("alpha beta"), _doc("beta gamma")])
+
+    assert result.documents[1].page_content == "beta gamma"
+
+
+def test_truncates_at_sentence_boundary():
+    packer = _packer(max_tokens=6, min_chunk_tokens=1)
+    text = "One two three. Four five six. Seven eight nine."
+
+    result = packer.pack([_doc(text)])
+
+    assert result.documents[0].page_content == "One two three. Four five six."
+    assert result.truncated_count == 1
+    assert result.dropped_tokens == 3
+    assert result.documents[0].metadata == {"document_id": "doc-1"}
+
+
+def test_drops_chunk_when_truncation_too_small():
+    packer = _packer(max_tokens=5, min_chunk_tokens=4)
+    docs = [_doc("a b c", "a"), _doc("One two three. Four five six.", "b")]
+
+    result = packer.pack(docs)
+
+    assert [d.page_content for d in result.documents] == ["a b c"]
+    assert result.dropped_count == 1
+    assert result.dropped_tokens == 6
+
+
+def test_budget_subtracts_history_tokens():
+    packer = _packer(max_tokens=100, min_chunk_tokens=10, history_tokens=lambda: 95)
+    assert packer.budget() == 10
+
+
+def test_from_config_picks_model_budget():
+    config = {"max_tokens": 4000, "model_budgets": {"gpt-4o": 16000}}
+
+    assert ContextPacker.from_config(config, model_name="GPT-4o-mini").max_tokens == 16000
+    assert ContextPacker.from_config(config, model_name="claude").max_tokens == 4000
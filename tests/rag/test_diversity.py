@@ -0,0 +1,71 @@
+"""
+Diversity selection tests
+MMR 후보 선택과 인접 청크 병합
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("langchain")
+diversity = pytest.importorskip("core.rag.retrieval.diversity")
+Document = diversity.Document
+
+QUERY = [1.0, 0.0]
+# 0과 1은 거의 같은 방향, 2는 관련도는 낮지만 다른 방향
+CANDIDATES = np.array([
+    [1.0, 0.05],
+    [1.0, 0.06],
+    [0.6, -0.8],
+])
+
+
+def test_mmr_pure_relevance_keeps_rank_order():
+    selected = diversity.maximal_marginal_relevance(QUERY, CANDIDATES, k=3, lambda_mult=1.0)
+    assert selected == [0, 1, 2]
+
+
+def test_mmr_prefers_diverse_candidate():
+    selected = diversity.maximal_marginal_relevance(QUERY, CANDIDATES, k=2, lambda_mult=0.5)
+    assert selected == [0, 2]
+
+
+def test_mmr_never_repeats_and_caps_k():
+    selected = diversity.maximal_marginal_relevance(QUERY, CANDIDATES, k=10, lambda_mult=0.0)
+    assert sorted(selected) == [0, 1, 2]
+
+
+def test_mmr_empty_input():
+    assert diversity.maximal_marginal_relevance(QUERY, np.empty((0, 2)), k=3) == []
+    assert diversity.maximal_marginal_relevance(QUERY, CANDIDATES, k=0) == []
+
+
+def _chunk(text, document_id, chunk_index):
+    return Document(page_content=text, metadata={"document_id": document_id, "chunk_index": chunk_index})
+
+
+def test_merge_adjacent_chunks_removes_overlap_and_keeps_best_rank():
+    docs = [
+        _chunk("other document", "b", 0),
+        _chunk("the middle part of the text, then the end", "a", 1),
+        _chunk("start of the text, the middle part of the text", "a", 0),
+    ]
+
+    merged = diversity.merge_adjacent_chunks(docs)
+
+    assert [d.metadata["document_id"] for d in merged] == ["b", "a"]
+    assert merged[1].page_content == "start of the text, the middle part of the text, then the end"
+    assert merged[1].metadata["chunk_index"] == 0
+    assert merged[1].metadata["merged_chunk_indexes"] == [0, 1]
+
+
+def test_merge_adjacent_chunks_joins_without_overlap():
+    merged = diversity.merge_adjacent_chunks([_chunk("first", "a", 3), _chunk("second", "a", 4)], separator=" | ")
+    assert [d.page_content for d in merged] == ["first | second"]
+
+
+def test_merge_adjacent_chunks_leaves_gaps_and_unindexed_hits():
+    docs = [_chunk("one", "a", 0), _chunk("three", "a", 2), Document(page_content="web result", metadata={})]
+
+    merged = diversity.merge_adjacent_chunks(docs)
+
+    assert merged == docs
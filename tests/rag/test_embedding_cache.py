@@ -0,0 +1,94 @@
+"""
+EmbeddingCache tests
+메모리/디스크 왕복, 인스턴스 간 영속성, 네임스페이스 분리, 압축
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+embedding_cache = pytest.importorskip("core.rag.embeddings.embedding_cache")
+EmbeddingCache = embedding_cache.EmbeddingCache
+
+
+def _vector(seed, dimension=4):
+    return [float(seed + i) for i in range(dimension)]
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "embedding_cache")
+
+
+def test_memory_round_trip():
+    cache = EmbeddingCache(max_memory_cache=10)
+    cache.set_many(["a", "b"], [_vector(1), _vector(2)])
+
+    assert cache.get_many(["a", "missing", "b"]) == [_vector(1), None, _vector(2)]
+
+
+def test_memory_lru_limit():
+    cache = EmbeddingCache(max_memory_cache=2)
+    cache.set("a", _vector(1))
+    cache.set("b", _vector(2))
+    cache.get("a")
+    cache.set("c", _vector(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == _vector(1)
+
+
+def test_disk_persists_across_instances(cache_dir):
+    writer = EmbeddingCache(cache_dir=cache_dir, namespace="model-a")
+    writer.set_many(["a", "b"], [_vector(1), _vector(2)])
+    writer.close()
+
+    reader = EmbeddingCache(cache_dir=cache_dir, namespace="model-a", dimension=4)
+    found = reader.get_many(["a", "b", "c"])
+    reader.close()
+
+    np.testing.assert_allclose(found[0], _vector(1))
+    np.testing.assert_allclose(found[1], _vector(2))
+    assert found[2] is None
+
+
+def test_namespaces_are_separate(cache_dir):
+    first = EmbeddingCache(cache_dir=cache_dir, namespace="model-a")
+    first.set("a", _vector(1))
+    first.close()
+
+    other = EmbeddingCache(cache_dir=cache_dir, namespace="model-b", dimension=4)
+    assert other.get("a") is None
+    other.close()
+
+
+def test_shared_store_sees_other_instance_writes(cache_dir):
+    first = EmbeddingCache(cache_dir=cache_dir, namespace="model-a", dimension=4)
+    second = EmbeddingCache(cache_dir=cache_dir, namespace="model-a", dimension=4)
+    first.set("a", _vector(1))
+    second.set("b", _vector(2))
+
+    np.testing.assert_allclose(first.get("b"), _vector(2))
+    np.testing.assert_allclose(second.get("a"), _vector(1))
+    first.close()
+    second.close()
+
+
+def test_compact_keeps_readable_rows(cache_dir):
+    cache = EmbeddingCache(cache_dir=cache_dir, namespace="model-a", dimension=4)
+    texts = [f"text-{i}" for i in range(5)]
+    cache.set_many(texts, [_vector(i) for i in range(5)])
+
+    assert cache.compact(max_items=5) == 0
+    cache.memory_cache.clear()
+    for i, text in enumerate(texts):
+        np.testing.assert_allclose(cache.get(text), _vector(i))
+    cache.close()
+
+
+def test_clear_removes_disk_rows(cache_dir):
+    cache = EmbeddingCache(cache_dir=cache_dir, namespace="model-a", dimension=4)
+    cache.set("a", _vector(1))
+    cache.clear()
+
+    assert cache.get("a") is None
+    cache.close()
@@ -0,0 +1,77 @@
+"""
+ONNX Runtime parity tests
+ONNX(fp32 / int8) 출력과 torch 출력의 코사인 유사도 비교
+"""
+
+import os
+import platform
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+onnx_runtime = pytest.importorskip("core.rag.embeddings.onnx_runtime")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# variant -> 최소 코사인 유사도 (fp32는 수치 오차 수준, int8은 기본 parity_threshold)
+VARIANTS = {
+    "fp32": (False, 0.999),
+    "int8": (True, 0.99),
+}
+
+
+def _model_path():
+    """테스트 모델 경로 (RAG_TEST_EMBEDDING_MODEL 또는 번들된 기본 모델)"""
+    configured = os.environ.get("RAG_TEST_EMBEDDING_MODEL")
+    if configured:
+        return configured
+    from core.rag.constants import DEFAULT_EMBEDDING_PATH
+    local_path = PROJECT_ROOT / DEFAULT_EMBEDDING_PATH
+    return str(local_path) if local_path.exists() else None
+
+
+@pytest.fixture(scope="module")
+def torch_model():
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("optimum")
+    sentence_transformers = pytest.importorskip("sentence_transformers")
+    model_path = _model_path()
+    if model_path is None:
+        pytest.skip("No local embedding model (set RAG_TEST_EMBEDDING_MODEL)")
+    return model_path, sentence_transformers.SentenceTransformer(model_path, device="cpu")
+
+
+def test_cosine_parity_identical_rows():
+    vectors = [[1.0, 2.0, 3.0], [0.5, -1.0, 0.0]]
+    assert onnx_runtime.cosine_parity(vectors, vectors) == pytest.approx(1.0)
+
+
+def test_cosine_parity_reports_worst_row():
+    reference = [[1.0, 0.0], [1.0, 0.0]]
+    candidate = [[2.0, 0.0], [0.0, 1.0]]
+    assert onnx_runtime.cosine_parity(reference, candidate) == pytest.approx(0.0)
+
+
+def test_get_variant():
+    assert onnx_runtime.get_variant(False, "avx2") == "fp32"
+    assert onnx_runtime.get_variant(True, "arm64") == "int8_arm64"
+
+
+@pytest.mark.parametrize("variant", sorted(VARIANTS))
+def test_onnx_matches_torch(torch_model, tmp_path, variant):
+    model_path, reference = torch_model
+    quantize, min_cosine = VARIANTS[variant]
+    quantization_config = "arm64" if platform.machine().lower() in ("arm64", "aarch64") else "avx2"
+    runtime = {
+        "quantize": quantize,
+        "quantization_config": quantization_config,
+        "export_dir": str(tmp_path),
+        "parity_threshold": 0.0  # 아래에서 variant별 기준으로 검사
+    }
+
+    onnx_model = onnx_runtime.load_onnx_model(model_path, "parity-test", runtime, reference_model=reference)
+    parity = onnx_runtime.check_parity(reference, onnx_model)
+
+    assert parity["tokenizer_match"]
+    assert parity["min_cosine"] >= min_cosine, parity
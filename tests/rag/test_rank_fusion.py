@@ -0,0 +1,51 @@
+"""
+Reciprocal Rank Fusion tests
+"""
+
+import pytest
+
+rank_fusion = pytest.importorskip("core.rag.retrieval.rank_fusion")
+reciprocal_rank_fusion = rank_fusion.reciprocal_rank_fusion
+
+
+def _identity(item):
+    return item
+
+
+def test_items_in_both_lists_rank_first():
+    vector_hits = ["a", "b", "c"]
+    keyword_hits = ["c", "d"]
+
+    fused = reciprocal_rank_fusion([vector_hits, keyword_hits], key=_identity)
+
+    assert fused[0] == "c"
+    assert set(fused) == {"a", "b", "c", "d"}
+
+
+def test_scores_follow_formula():
+    fused = reciprocal_rank_fusion([["a", "b"], ["b", "a"], ["a"]], key=_identity, k=1)
+    # a: 1/2 + 1/3 + 1/2, b: 1/3 + 1/2
+    assert fused == ["a", "b"]
+
+
+def test_ties_keep_first_occurrence_order():
+    fused = reciprocal_rank_fusion([["a", "b"], ["b", "a"]], key=_identity)
+    assert fused == ["a", "b"]
+
+
+def test_duplicates_keep_first_item_and_merge_by_key():
+    first = {"id": 1, "source": "vector"}
+    second = {"id": 1, "source": "fts"}
+
+    fused = reciprocal_rank_fusion([[first], [second]], key=lambda item: item["id"])
+
+    assert fused == [first]
+
+
+def test_limit():
+    fused = reciprocal_rank_fusion([["a", "b", "c"]], key=_identity, limit=2)
+    assert fused == ["a", "b"]
+
+
+def test_empty_lists():
+    assert reciprocal_rank_fusion([[], []], key=_identity) == []
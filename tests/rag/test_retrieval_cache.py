@@ -0,0 +1,66 @@
+"""
+RetrievalCache tests
+키 생성, LRU/TTL, 모델별 무효화
+"""
+
+import pytest
+
+retrieval_cache = pytest.importorskip("core.rag.retrieval.retrieval_cache")
+RetrievalCache = retrieval_cache.RetrievalCache
+
+
+def test_make_key_ignores_filter_order():
+    first = RetrievalCache.make_key("m", 3, {"topic": ["b", "a"], "lang": "ko"}, 5, "q")
+    second = RetrievalCache.make_key("m", 3, {"lang": "ko", "topic": ["a", "b"]}, 5, "q")
+    assert first == second
+    hash(first)
+
+
+def test_make_key_includes_table_version_and_options():
+    base = RetrievalCache.make_key("m", 3, None, 5, "q", rerank=True)
+    assert base != RetrievalCache.make_key("m", 4, None, 5, "q", rerank=True)
+    assert base != RetrievalCache.make_key("m", 3, None, 5, "q", rerank=False)
+
+
+def test_lru_eviction():
+    cache = RetrievalCache(max_entries=2, ttl_seconds=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a가 최근 사용
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(retrieval_cache.time, "monotonic", lambda: now[0])
+    cache = RetrievalCache(max_entries=4, ttl_seconds=10)
+    cache.set("a", 1)
+
+    now[0] += 5
+    assert cache.get("a") == 1
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_invalidate_by_model():
+    cache = RetrievalCache()
+    first = RetrievalCache.make_key("m1", 1, None, 5, "q")
+    second = RetrievalCache.make_key("m2", 1, None, 5, "q")
+    cache.set(first, "r1")
+    cache.set(second, "r2")
+
+    cache.invalidate("m1")
+
+    assert cache.get(first) is None
+    assert cache.get(second) == "r2"
+
+
+def test_disabled_cache_stores_nothing():
+    cache = RetrievalCache(max_entries=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
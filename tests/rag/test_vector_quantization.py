@@ -0,0 +1,104 @@
+"""
+Vector quantization tests
+저장 형식별 인코딩/디코딩 왕복, 크기, 재점수 거리
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+vector_quantization = pytest.importorskip("core.rag.vector_store.vector_quantization")
+VectorCodec = vector_quantization.VectorCodec
+
+DIMENSION = 64
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).standard_normal((32, DIMENSION)).astype(np.float32)
+
+
+def _round_trip(codec, vectors):
+    return codec.decode(pa.RecordBatch.from_pydict(codec.encode(vectors)))
+
+
+def test_int8_round_trip_error_bounded(vectors):
+    codes, scales = vector_quantization.quantize_int8(vectors)
+    restored = vector_quantization.dequantize_int8(codes, scales)
+
+    assert codes.dtype == np.int8
+    assert np.all(np.abs(restored - vectors) <= scales[:, None] / 2 + 1e-6)
+
+
+def test_int8_zero_vector():
+    codes, scales = vector_quantization.quantize_int8(np.zeros((1, 4), dtype=np.float32))
+    assert scales[0] == 1.0
+    assert not codes.any()
+
+
+def test_pack_binary_sign_bits():
+    packed = vector_quantization.pack_binary(np.array([[1.0, -1.0, 0.0, 2.0, -3.0, 4.0, 5.0, -6.0, 7.0]]))
+    assert packed.shape == (1, 2)
+    assert packed[0, 0] == 0b10010110
+    assert packed[0, 1] == 0b10000000
+
+
+@pytest.mark.parametrize("mode, tolerance", [
+    ("float32", 0.0),
+    ("float16", 1e-2),
+    ("int8", 5e-2),
+    ("binary", 5e-2),
+])
+def test_codec_round_trip(vectors, mode, tolerance):
+    codec = VectorCodec(mode)
+    restored = _round_trip(codec, vectors)
+
+    assert restored.shape == vectors.shape
+    assert restored.dtype == np.float32
+    assert np.max(np.abs(restored - vectors)) <= tolerance
+
+
+@pytest.mark.parametrize("mode", vector_quantization.VECTOR_STORAGE_MODES)
+def test_detect_mode_from_encoded_schema(vectors, mode):
+    batch = pa.RecordBatch.from_pydict(VectorCodec(mode).encode(vectors))
+    assert VectorCodec.detect_mode(batch.schema) == mode
+
+
+@pytest.mark.parametrize("mode", ("int8", "binary"))
+def test_decode_rows_matches_decode(vectors, mode):
+    codec = VectorCodec(mode)
+    batch = pa.RecordBatch.from_pydict(codec.encode(vectors))
+
+    np.testing.assert_allclose(codec.decode_rows(batch.to_pylist()), codec.decode(batch))
+
+
+def test_bytes_per_vector_ordering():
+    sizes = {mode: VectorCodec(mode).bytes_per_vector(384) for mode in vector_quantization.VECTOR_STORAGE_MODES}
+
+    assert sizes["float32"] == 384 * 4
+    assert sizes["float16"] == 384 * 2
+    assert sizes["int8"] < sizes["binary"] < sizes["float16"]
+
+
+def test_binary_encoded_columns_match_reported_size(vectors):
+    codec = VectorCodec("binary")
+    batch = pa.RecordBatch.from_pydict(codec.encode(vectors))
+    assert batch.nbytes == codec.bytes_per_vector(DIMENSION) * len(vectors)
+
+
+def test_distances_match_metric(vectors):
+    query = vectors[0]
+    assert VectorCodec("float32", "l2").distances(query, vectors)[0] == pytest.approx(0.0)
+    assert VectorCodec("float32", "cosine").distances(query, vectors)[0] == pytest.approx(0.0, abs=1e-6)
+    dot = VectorCodec("float32", "dot").distances(query, vectors)
+    assert dot[0] == pytest.approx(-float(query @ query), rel=1e-5)
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        VectorCodec("int4")
+
+
+def test_binary_recall_with_rescoring(vectors):
+    assert vector_quantization.estimate_recall(vectors, "float32", k=5) == 1.0
+    assert vector_quantization.estimate_recall(vectors, "binary", k=5, rescore_multiplier=8) >= 0.8
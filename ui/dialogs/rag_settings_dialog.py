@@ -5,7 +5,8 @@ RAG Settings Dialog (Redesigned)
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget,
                              QWidget, QLabel, QListWidget, QPushButton,
                              QRadioButton, QButtonGroup, QSpinBox, QDoubleSpinBox,
-                             QGroupBox, QFormLayout, QMessageBox, QScrollArea, QFrame)
+                             QGroupBox, QFormLayout, QMessageBox, QScrollArea, QFrame,
+                             QComboBox)
 from PyQt6.QtCore import Qt
 from core.logging import get_logger
 
@@ -509,6 +510,18 @@ class RAGSettingsDialog(QDialog):
         info.setWordWrap(True)
         topk_layout.addRow("", info)
         
+        self.search_mode = QComboBox()
+        self.search_mode.setMinimumHeight(30)
+        self.search_mode.addItem("벡터 (Vector)", "vector")
+        self.search_mode.addItem("하이브리드 (BM25 + Vector)", "hybrid")
+        self.search_mode.addItem("키워드 (BM25)", "fts")
+        self.search_mode.setToolTip(
+            "하이브리드: 키워드(BM25) 검색과 벡터 검색 결과를 RRF로 병합\n"
+            "• 식별자, 오류 코드, 고유명사 검색 정확도 향상\n"
+            "• 전문 검색 인덱스는 백그라운드에서 생성됨"
+        )
+        topk_layout.addRow("검색 모드:", self.search_mode)
+        
         topk_group.setLayout(topk_layout)
         scroll_layout.addWidget(topk_group)
         
@@ -521,10 +534,10 @@ class RAGSettingsDialog(QDialog):
         
         self.max_workers = QSpinBox()
         self.max_workers.setRange(1, 16)
-        self.max_workers.setValue(1)
+        self.max_workers.setValue(4)
         self.max_workers.setSuffix(" 개")
         self.max_workers.setMinimumHeight(30)
-        self.max_workers.setEnabled(False)
+        self.max_workers.setToolTip("파일 파싱/청킹 병렬 작업 수 (DB 저장은 항상 단일 스레드)")
         batch_layout.addRow("동시 작업:", self.max_workers)
         
         self.max_file_size = QSpinBox()
@@ -598,6 +611,8 @@ class RAGSettingsDialog(QDialog):
             # 검색 설정 로드
             retrieval_config = config_manager.get_retrieval_config()
             self.top_k.setValue(retrieval_config.get("top_k", 10))
+            mode_index = self.search_mode.findData(config_manager.get_search_mode())
+            self.search_mode.setCurrentIndex(max(0, mode_index))
             
             # 배치 설정 로드
             batch_config = config_manager.get_batch_config()
@@ -903,7 +918,8 @@ class RAGSettingsDialog(QDialog):
                     }
                 },
                 "retrieval": {
-                    "top_k": self.top_k.value()
+                    "top_k": self.top_k.value(),
+                    "search_mode": self.search_mode.currentData()
                 },
                 "batch_upload": {
                     "max_workers": self.max_workers.value(),
@@ -923,8 +939,13 @@ class RAGSettingsDialog(QDialog):
             config_manager = RAGConfigManager()
             settings = self.get_settings()
             
-            # 설정 업데이트
-            config_manager.config.update(settings)
+            # 설정 업데이트 (섹션 단위 병합: 다이얼로그에 없는 키 유지)
+            for section, values in settings.items():
+                current = config_manager.config.get(section)
+                if isinstance(current, dict) and isinstance(values, dict):
+                    current.update(values)
+                else:
+                    config_manager.config[section] = values
             config_manager._save_config(config_manager.config)
             
             logger.info("Settings saved")
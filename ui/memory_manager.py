@@ -1,4 +1,5 @@
 """메모리 관리 모듈 - 모니터링 전용"""
+import threading
 from core.logging import get_logger
 from PyQt6.QtCore import QTimer, QObject, pyqtSignal
 from ui.performance_optimizer import performance_optimizer
@@ -15,6 +16,7 @@ class MemoryManager(QObject):
         super().__init__(parent)
         self.monitor_timer = QTimer()
         self.monitor_timer.timeout.connect(self.check_memory)
+        self._eviction_thread = None
         
     def start_monitoring(self, interval_ms=60000):
         """메모리 모니터링 시작 (1분마다)"""
@@ -26,7 +28,7 @@ class MemoryManager(QObject):
             self.monitor_timer.stop()
         
     def check_memory(self):
-        """메모리 사용률 확인 (경고만)"""
+        """메모리 사용률 확인 (경고) 및 유휴 RAG 모델/스토어 해제"""
         try:
             memory_info = performance_optimizer.get_memory_usage()
             if memory_info:
@@ -35,6 +37,40 @@ class MemoryManager(QObject):
                     self.memory_warning.emit(memory_percent)
         except Exception as e:
             logger.warning(f"메모리 모니터링 오류: {e}")
+        
+        self.schedule_rag_pool_eviction()
+    
+    def schedule_rag_pool_eviction(self):
+        """유휴 RAG 풀 정리를 백그라운드 스레드에서 실행 (모델 해제·스레드 join으로 UI가 멈추지 않도록)"""
+        if self._eviction_thread is not None and self._eviction_thread.is_alive():
+            return
+        self._eviction_thread = threading.Thread(
+            target=self.evict_idle_rag_pools, name="rag-pool-eviction", daemon=True
+        )
+        self._eviction_thread.start()
+    
+    def evict_idle_rag_pools(self):
+        """유휴 TTL이 지난 임베딩 모델/벡터 스토어 해제 (블로킹, UI 스레드에서 직접 호출 금지)"""
+        try:
+            from core.rag.embeddings.embedding_pool import embedding_pool
+            from core.rag.vector_store.vector_store_pool import vector_store_pool
+            embedding_pool.evict_idle()
+            vector_store_pool.evict_idle()
+        except Exception as e:
+            logger.warning(f"RAG 풀 정리 오류: {e}")
+    
+    def get_rag_pool_report(self):
+        """풀링된 임베딩 모델/벡터 스토어별 메모리 추정치"""
+        try:
+            from core.rag.embeddings.embedding_pool import embedding_pool
+            from core.rag.vector_store.vector_store_pool import vector_store_pool
+            return {
+                'embeddings': embedding_pool.get_memory_report(),
+                'vector_stores': vector_store_pool.get_memory_report()
+            }
+        except Exception as e:
+            logger.warning(f"RAG 풀 상태 조회 오류: {e}")
+            return {}
             
     def light_cleanup(self):
         """가벼운 정리 - 머신 자동 관리"""
@@ -45,8 +81,11 @@ class MemoryManager(QObject):
         pass
             
     def get_memory_status(self):
-        """현재 메모리 상태 반환"""
-        return performance_optimizer.get_memory_usage()
+        """현재 메모리 상태 반환 (RAG 풀 항목별 메모리 포함)"""
+        status = performance_optimizer.get_memory_usage()
+        if status is not None:
+            status['rag_pools'] = self.get_rag_pool_report()
+        return status
 
 
 memory_manager = MemoryManager()
\ No newline at end of file
@@ -445,10 +445,8 @@ class RAGManagementWindow(QMainWindow):
                 # 테이블 초기화 확인 및 재시도
                 logger.info(f"Current model table: {vector_store.table_name}")
                 
-                if vector_store.db and vector_store.table_name in vector_store.db.table_names():
-                    if not vector_store.table:
-                        vector_store.table = vector_store.db.open_table(vector_store.table_name)
-                        logger.info(f"Opened existing table: {vector_store.table_name}")
+                if vector_store.open_table() is not None:
+                    logger.info(f"Opened existing table: {vector_store.table_name}")
                 else:
                     logger.warning(f"Table {vector_store.table_name} not found in available tables: {vector_store.db.table_names() if vector_store.db else 'N/A'}")
                 
@@ -456,7 +454,7 @@ class RAGManagementWindow(QMainWindow):
                 if vector_store.table:
                     try:
                         # Try different query methods
-                        results = vector_store.table.search().where(f"metadata.document_id = '{doc_id}'").limit(10).to_list()
+                        results = vector_store.table.search().where(vector_store.build_filter_expression({"document_id": doc_id})).limit(10).to_list()
                         logger.info(f"Found {len(results)} chunks using where clause")
                     except Exception as e1:
                         logger.warning(f"Where clause failed: {e1}, trying alternative method")
@@ -674,12 +672,15 @@ class RAGManagementWindow(QMainWindow):
             # Get selected chunking strategy
             chunking_strategy = self._get_chunking_strategy()
             
-            # Force max_workers=1 for SQLite stability
+            # 파싱/청킹은 병렬, SQLite/LanceDB 쓰기는 단일 Writer 스레드
             processor = BatchProcessor(
                 self.storage, 
                 self.embeddings, 
-                max_workers=1,  # SQLite WAL 안정성을 위해 순차 처리
-                chunking_strategy=chunking_strategy
+                max_workers=batch_config.get('max_workers', 4),
+                chunking_strategy=chunking_strategy,
+                embed_batch_size=batch_config.get('embed_batch_size', 64),
+                embed_wait_ms=batch_config.get('embed_wait_ms', 200),
+                queue_size=batch_config.get('queue_size', 8)
             )
             
             # Worker thread for file processing
@@ -702,12 +703,16 @@ class RAGManagementWindow(QMainWindow):
                     self.total_chunks = 0
                     self.current_file = ""
                     self.total_files = len(file_paths)
+                    self.embedded = 0
+                    self.embed_queued = 0
+                    self.ingest_stats = {}
                 
                 def run(self):
                     try:
-                        def on_progress(file_path, current, total):
+                        def on_progress(file_path, current, total, stats):
                             self.processed = current
                             self.current_file = file_path.name
+                            self.ingest_stats = (stats or {}).get("batch", {})
                             if self.should_cancel:
                                 return
                         
@@ -717,12 +722,17 @@ class RAGManagementWindow(QMainWindow):
                         def check_cancel():
                             return self.should_cancel
                         
+                        def on_embed_progress(embedded, queued):
+                            self.embedded = embedded
+                            self.embed_queued = queued
+                        
                         self.processor.process_files(
                             self.file_paths,
                             self.topic_id,
                             on_progress=on_progress,
                             on_complete=on_complete,
-                            check_cancel=check_cancel
+                            check_cancel=check_cancel,
+                            on_embed_progress=on_embed_progress
                         )
                         
                         self.finished.emit(self.processed, self.total_chunks)
@@ -735,14 +745,21 @@ class RAGManagementWindow(QMainWindow):
                 def get_status(self):
                     """Get current status for display"""
                     if self.processed == 0:
+                        if self.embed_queued:
+                            return f"임베딩 중: {self.embedded}/{self.embed_queued} 청크"
                         return "처리 시작 중..."
                     
+                    from core.rag.batch.ingest_profiler import IngestProfiler
+                    
                     percent = int((self.processed / self.total_files) * 100) if self.total_files > 0 else 0
-                    return (
+                    status = (
                         f"처리 중: {self.processed}/{self.total_files} 파일 ({percent}%)\n\n"
                         f"현재 파일: {self.current_file}\n"
-                        f"생성된 청크: {self.total_chunks}"
+                        f"생성된 청크: {self.total_chunks}\n"
+                        f"임베딩: {self.embedded}/{self.embed_queued} 청크"
                     )
+                    profile = IngestProfiler.format_summary(self.ingest_stats)
+                    return f"{status}\n{profile}" if profile else status
             
             # Progress dialog
             progress = QProgressDialog(self)
@@ -880,6 +897,9 @@ class RAGManagementWindow(QMainWindow):
                     self.current = 0
                     self.total = 0
                     self.chunks = 0
+                    self.embedded = 0
+                    self.embed_queued = 0
+                    self.ingest_stats = {}
                 
                 def run(self):
                     try:
@@ -889,15 +909,22 @@ class RAGManagementWindow(QMainWindow):
                             self.current = current
                             self.total = total
                             self.chunks = stats.get('total_chunks', 0)
+                            self.ingest_stats = stats.get('ingest', {})
                         
                         def on_complete(stats):
                             self.finished.emit(stats)
                         
+                        def on_embed_progress(embedded, queued):
+                            self.embedded = embedded
+                            self.embed_queued = queued
+                        
                         stats = self.uploader.upload_folder(
                             self.folder,
                             self.topic_id,
                             on_progress=on_progress,
-                            on_complete=on_complete
+                            on_complete=on_complete,
+                            check_cancel=lambda: self.should_cancel,
+                            on_embed_progress=on_embed_progress
                         )
                     except Exception as e:
                         self.error.emit(str(e))
@@ -908,13 +935,20 @@ class RAGManagementWindow(QMainWindow):
                 def get_status(self):
                     """Get current status for display"""
                     if self.total == 0:
+                        if self.embed_queued:
+                            return f"임베딩 중: {self.embedded}/{self.embed_queued} 청크"
                         return "폴더 스캔 중..."
                     
+                    from core.rag.batch.ingest_profiler import IngestProfiler
+                    
                     percent = int((self.current / self.total) * 100) if self.total > 0 else 0
-                    return (
+                    status = (
                         f"처리 중: {self.current}/{self.total} 파일 ({percent}%)\n\n"
-                        f"생성된 청크: {self.chunks}"
+                        f"생성된 청크: {self.chunks}\n"
+                        f"임베딩: {self.embedded}/{self.embed_queued} 청크"
                     )
+                    profile = IngestProfiler.format_summary(self.ingest_stats)
+                    return f"{status}\n{profile}" if profile else status
             
             # Progress dialog
             progress = QProgressDialog(self)
@@ -983,9 +1017,17 @@ class RAGManagementWindow(QMainWindow):
                 if stats.get('skipped_files', 0) > 0:
                     msg += f"\n\n건너뛴 중복 파일: {stats['skipped_files']}개"
                 
+                if stats.get('deleted_files', 0) > 0:
+                    msg += f"\n삭제된 파일 반영: {stats['deleted_files']}개"
+                
                 if stats.get('errors'):
                     msg += f"\n\n오류: {len(stats['errors'])}개"
                 
+                from core.rag.batch.ingest_profiler import IngestProfiler
+                profile = IngestProfiler.format_summary(stats.get('ingest'))
+                if profile:
+                    msg += f"\n\n{profile}"
+                
                 QMessageBox.information(self, "업로드 완료", msg)
                 self._load_documents(self.current_topic_id)
             